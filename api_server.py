@@ -0,0 +1,503 @@
+"""Локальный HTTP/JSON API заметок на asyncio (только стандартная библиотека).
+
+Примеры запуска:
+
+    python api_server.py
+    python api_server.py --port 8765 --file data/notes.json
+    python api_server.py --parallel-workers 4
+
+Маршруты:
+
+    GET  /notes?offset=0&limit=50          список заметок постранично
+    GET  /notes/{id}                       заметка по ID
+    GET  /search?by=keyword&q=...&offset=0&limit=50
+                                           поиск стратегией id/title/date/keyword
+    POST /notes  {"title": ..., "text": ...}
+                                           добавление заметки
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import traceback
+from itertools import islice
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+from core.exceptions import StorageError
+from core.json_storage import JsonStorage
+from core.parallel_search import ParallelSearch
+from core.text_index import TextIndex
+from state.async_base_state import AsyncBaseState
+from state.async_json_state import AsyncJsonState
+from strategies.base_strategy import BaseStrategy
+from strategies.search_by_date_strategy import SearchByDateStrategy
+from strategies.search_by_keyword_strategy import SearchKeywordStrategy
+from strategies.search_by_title_strategy import SearchTitleStrategy
+from strategies.view_by_id_strategy import SearchByIDStrategy
+
+
+class HttpError(Exception):
+    """Ошибка запроса, возвращаемая клиенту с кодом состояния HTTP.
+
+    Attributes:
+        status: Код состояния HTTP.
+        message: Описание ошибки для клиента.
+    """
+
+    def __init__(self, status: int, message: str) -> None:
+        """Инициализирует ошибку запроса.
+
+        Args:
+            status: Код состояния HTTP.
+            message: Описание ошибки для клиента.
+        """
+        super().__init__(message)
+        self.status: int = status
+        self.message: str = message
+
+
+class ApiServer:
+    """HTTP/1.1 сервер JSON API поверх асинхронного состояния заметок.
+
+    Все соединения обслуживаются одним циклом asyncio и читают заметки
+    через AsyncBaseState (по умолчанию AsyncJsonState): разобранные
+    заметки и индекс текстов кэшируются до изменения версии файла,
+    поэтому запрос читает с диска только заголовок файла, а заметки,
+    добавленные другими процессами (например, приложением), видны без
+    перезапуска сервера. Соединения поддерживают keep-alive: несколько
+    запросов подряд обрабатываются без повторного подключения. Поиск и
+    запись файла выполняются в потоках, чтобы сканирование большого
+    корпуса не останавливало обслуживание остальных соединений.
+    Непредвиденная ошибка обработчика возвращается клиенту ответом 500,
+    а ее трассировка печатается в stderr.
+
+    Если задан parallel, сканирующий поиск (по названию и дате, а также
+    по ключевому слову, когда у состояния нет индекса текстов)
+    выполняется через ParallelSearch на нескольких ядрах; на корпусах
+    меньше его порога поиск остается последовательным.
+
+    Attributes:
+        state: Асинхронное состояние заметок.
+        parallel: Параллельный поиск по тому же файлу или None.
+        host: Адрес, на котором принимаются соединения.
+        port: Порт сервера (после start() — фактически занятый порт).
+        idle_timeout: Время ожидания следующего запроса keep-alive в секундах.
+        max_body: Максимальный размер тела запроса в байтах.
+        __server: Запущенный asyncio-сервер или None.
+        __searches: Фабрики стратегий поиска по значению параметра by;
+                    принимают запрос и индекс текстов (или None).
+    """
+
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT = 1000
+    REASONS = {
+        200: "OK",
+        201: "Created",
+        400: "Bad Request",
+        404: "Not Found",
+        405: "Method Not Allowed",
+        409: "Conflict",
+        413: "Payload Too Large",
+        500: "Internal Server Error",
+    }
+
+    def __init__(
+        self,
+        state: AsyncBaseState,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        idle_timeout: float = 15.0,
+        max_body: int = 1 << 20,
+        parallel: Optional[ParallelSearch] = None
+    ) -> None:
+        """Инициализирует сервер.
+
+        Args:
+            state: Асинхронное состояние заметок.
+            host: Адрес, на котором принимаются соединения.
+            port: Порт сервера; 0 — выбрать свободный порт.
+            idle_timeout: Время ожидания следующего запроса keep-alive в секундах.
+            max_body: Максимальный размер тела запроса в байтах.
+            parallel: Параллельный поиск по файлу состояния или None —
+                      искать последовательно.
+        """
+        self.state: AsyncBaseState = state
+        self.host: str = host
+        self.port: int = port
+        self.idle_timeout: float = idle_timeout
+        self.max_body: int = max_body
+        self.parallel: Optional[ParallelSearch] = parallel
+        self.__server: Optional[asyncio.AbstractServer] = None
+        self.__searches: Dict[str, Callable[[str, Optional[TextIndex]], BaseStrategy]] = {
+            "id": lambda query, index: SearchByIDStrategy(self.__parse_int(query, "q")),
+            "title": lambda query, index: SearchTitleStrategy(query),
+            "date": lambda query, index: SearchByDateStrategy(query),
+            "keyword": SearchKeywordStrategy,
+        }
+
+    async def start(self) -> None:
+        """Загружает заметки и начинает принимать соединения."""
+        await self.state.load()
+        self.__server = await asyncio.start_server(self.__handle, self.host, self.port)
+        self.port = self.__server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Запускает сервер и обслуживает соединения до отмены."""
+        if self.__server is None:
+            await self.start()
+        async with self.__server:
+            await self.__server.serve_forever()
+
+    async def close(self) -> None:
+        """Останавливает прием соединений."""
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+            self.__server = None
+
+    async def __handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Обслуживает одно соединение, пока клиент держит его открытым.
+
+        Args:
+            reader: Поток чтения соединения.
+            writer: Поток записи соединения.
+        """
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(
+                        reader.readuntil(b"\r\n\r\n"), self.idle_timeout
+                    )
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    self.__write_response(writer, 413, {"error": "Слишком длинные заголовки"}, False)
+                    await writer.drain()
+                    return
+
+                keep_alive = False
+                try:
+                    method, target, keep_alive, length = self.__parse_head(head)
+                    if length > self.max_body:
+                        keep_alive = False
+                        raise HttpError(413, "Слишком большое тело запроса")
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.__dispatch(method, target, body)
+                except HttpError as error:
+                    status, payload = error.status, {"error": error.message}
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except StorageError as error:
+                    status, payload = 500, {"error": str(error)}
+                except Exception:
+                    traceback.print_exc()
+                    status, payload = 500, {"error": "Внутренняя ошибка сервера"}
+
+                self.__write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            return
+        finally:
+            writer.close()
+
+    @staticmethod
+    def __parse_head(head: bytes) -> Tuple[str, str, bool, int]:
+        """Разбирает стартовую строку и заголовки запроса.
+
+        Args:
+            head: Байты запроса до пустой строки включительно.
+
+        Returns:
+            Кортеж (метод, цель запроса, keep-alive, длина тела).
+
+        Raises:
+            HttpError: Если запрос некорректен.
+        """
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            raise HttpError(400, "Некорректная стартовая строка") from None
+
+        headers: Dict[str, str] = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.1":
+            keep_alive = connection != "close"
+        else:
+            keep_alive = connection == "keep-alive"
+
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HttpError(400, "Некорректный Content-Length") from None
+        if length < 0:
+            raise HttpError(400, "Некорректный Content-Length")
+        return method.upper(), target, keep_alive, length
+
+    def __write_response(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: Any,
+        keep_alive: bool
+    ) -> None:
+        """Записывает JSON-ответ в буфер соединения.
+
+        Args:
+            writer: Поток записи соединения.
+            status: Код состояния HTTP.
+            payload: Объект, сериализуемый в JSON.
+            keep_alive: Оставить ли соединение открытым.
+        """
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {self.REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            f"\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+    async def __dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, Any]:
+        """Выбирает обработчик по методу и пути запроса.
+
+        Args:
+            method: HTTP-метод.
+            target: Цель запроса (путь и строка параметров).
+            body: Тело запроса.
+
+        Returns:
+            Кортеж (код состояния, объект ответа).
+
+        Raises:
+            HttpError: Если маршрут не найден или запрос некорректен.
+        """
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.split("/") if part]
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+        if parts == ["notes"]:
+            if method == "GET":
+                return 200, await self.__list_notes(query)
+            if method == "POST":
+                return 201, await self.__add_note(body)
+            raise HttpError(405, "Метод не поддерживается")
+        if len(parts) == 2 and parts[0] == "notes":
+            if method != "GET":
+                raise HttpError(405, "Метод не поддерживается")
+            return 200, await self.__get_note(parts[1])
+        if parts == ["search"]:
+            if method != "GET":
+                raise HttpError(405, "Метод не поддерживается")
+            return 200, await self.__search(query)
+        raise HttpError(404, "Маршрут не найден")
+
+    async def __list_notes(self, query: Dict[str, str]) -> Dict[str, Any]:
+        """Возвращает страницу списка заметок.
+
+        Args:
+            query: Параметры запроса (offset, limit).
+
+        Returns:
+            Ответ с общим количеством и заметками страницы.
+        """
+        offset, limit = self.__parse_page(query)
+        total, notes = await self.state.page(offset, limit)
+        return {
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "notes": [JsonStorage.note_to_dict(note) for note in notes],
+        }
+
+    async def __get_note(self, raw_id: str) -> Dict[str, Any]:
+        """Возвращает заметку по ID.
+
+        Args:
+            raw_id: ID заметки из пути запроса.
+
+        Returns:
+            Словарь заметки.
+
+        Raises:
+            HttpError: Если ID некорректен или заметка не найдена.
+        """
+        note = await self.state.get(self.__parse_int(raw_id, "id"))
+        if note is None:
+            raise HttpError(404, f"Заметка {raw_id} не найдена")
+        return JsonStorage.note_to_dict(note)
+
+    async def __search(self, query: Dict[str, str]) -> Dict[str, Any]:
+        """Ищет заметки стратегией и возвращает страницу совпадений.
+
+        Совпадения перебираются лениво (AsyncBaseState.search_hits),
+        поэтому запрос первой страницы не сканирует весь корпус. Перебор
+        выполняется в потоке: даже поиск редкого слова по всему корпусу не
+        останавливает цикл событий. Поиск по ключевому слову использует
+        индекс текстов состояния, а сканирующий поиск при заданном
+        parallel выполняется в пуле процессов. Вместо общего количества
+        возвращается флаг has_more.
+
+        Args:
+            query: Параметры запроса (by, q, offset, limit).
+
+        Returns:
+            Ответ с совпадениями страницы и их позициями.
+
+        Raises:
+            HttpError: Если стратегия или запрос не указаны.
+        """
+        by, text = query.get("by", "keyword"), query.get("q")
+        if by not in self.__searches:
+            raise HttpError(400, f"Параметр by должен быть одним из: {', '.join(sorted(self.__searches))}")
+        if not text:
+            raise HttpError(400, "Не указан параметр q")
+        offset, limit = self.__parse_page(query)
+
+        index = await self.state.text_index() if by == "keyword" else None
+        strategy = self.__searches[by](text, index)
+        if self.parallel is not None and by != "id" and index is None:
+            notes = await self.state.load()
+            hits = await asyncio.to_thread(
+                lambda: list(islice(
+                    strategy.iter_hits(self.parallel.search(strategy, notes)),
+                    offset, offset + limit + 1
+                ))
+            )
+        else:
+            hits = await self.state.search_hits(strategy, offset, limit + 1)
+        return {
+            "offset": offset,
+            "limit": limit,
+            "has_more": len(hits) > limit,
+            "hits": [
+                {
+                    "note": JsonStorage.note_to_dict(hit.note),
+                    "field": hit.field,
+                    "spans": [list(span) for span in hit.spans],
+                }
+                for hit in hits[:limit]
+            ],
+        }
+
+    async def __add_note(self, body: bytes) -> Dict[str, Any]:
+        """Добавляет заметку из JSON-тела запроса.
+
+        Args:
+            body: Тело запроса {"title": ..., "text": ...}.
+
+        Returns:
+            Словарь созданной заметки.
+
+        Raises:
+            HttpError: Если тело запроса некорректно.
+        """
+        try:
+            data = json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise HttpError(400, "Тело запроса должно быть JSON-объектом") from None
+        if not isinstance(data, dict):
+            raise HttpError(400, "Тело запроса должно быть JSON-объектом")
+        title, text = data.get("title"), data.get("text")
+        if not isinstance(title, str) or not title.strip():
+            raise HttpError(400, "Не указано название заметки")
+        if not isinstance(text, str):
+            raise HttpError(400, "Не указан текст заметки")
+
+        note = await self.state.add(title, text)
+        return JsonStorage.note_to_dict(note)
+
+    def __parse_page(self, query: Dict[str, str]) -> Tuple[int, int]:
+        """Разбирает параметры пагинации.
+
+        Args:
+            query: Параметры запроса.
+
+        Returns:
+            Кортеж (offset, limit); limit ограничен MAX_LIMIT.
+
+        Raises:
+            HttpError: Если параметры не являются неотрицательными числами.
+        """
+        offset = self.__parse_int(query.get("offset", "0"), "offset")
+        limit = self.__parse_int(query.get("limit", str(self.DEFAULT_LIMIT)), "limit")
+        return offset, min(limit, self.MAX_LIMIT)
+
+    @staticmethod
+    def __parse_int(value: str, name: str) -> int:
+        """Преобразует параметр запроса в неотрицательное целое.
+
+        Args:
+            value: Значение параметра.
+            name: Имя параметра для сообщения об ошибке.
+
+        Returns:
+            Целое число.
+
+        Raises:
+            HttpError: Если значение не является неотрицательным целым.
+        """
+        try:
+            number = int(value)
+        except ValueError:
+            raise HttpError(400, f"Параметр {name} должен быть целым числом") from None
+        if number < 0:
+            raise HttpError(400, f"Параметр {name} не может быть отрицательным")
+        return number
+
+
+def main() -> int:
+    """Разбирает аргументы командной строки и запускает сервер.
+
+    Returns:
+        Код возврата процесса.
+    """
+    parser = argparse.ArgumentParser(description="Локальный HTTP/JSON API заметок")
+    parser.add_argument("--host", default="127.0.0.1", help="адрес сервера")
+    parser.add_argument("--port", type=int, default=8765, help="порт сервера")
+    parser.add_argument("--file", default="data/notes.json", help="файл хранилища заметок")
+    parser.add_argument(
+        "--parallel-workers", type=int, default=0,
+        help="процессов для сканирующего поиска (0 — искать последовательно)"
+    )
+    parser.add_argument(
+        "--parallel-threshold", type=int, default=20000,
+        help="минимальное число заметок для параллельного поиска"
+    )
+    args = parser.parse_args()
+
+    parallel = None
+    if args.parallel_workers > 1:
+        parallel = ParallelSearch(args.file, args.parallel_workers, args.parallel_threshold)
+    server = ApiServer(AsyncJsonState(args.file), args.host, args.port, parallel=parallel)
+
+    async def run() -> None:
+        await server.start()
+        print(f"API заметок: http://{server.host}:{server.port}", file=sys.stderr)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    except StorageError as error:
+        print(f"Ошибка хранилища: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if parallel is not None:
+            parallel.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,34 +1,67 @@
 """Главный модуль приложения менеджера заметок."""
 
+import sys
+from core.startup_profiler import startup_profiler
+
+# Профилировщик включается до остальных импортов, чтобы замерить и их.
+if "--profile-startup" in sys.argv:
+    startup_profiler.enable()
+
+import argparse
+import threading
 import tkinter as tk
+from typing import Optional
+from core.metrics import metrics
 from views.base_view import BaseView
-from PIL import Image, ImageTk
+from state.base_state import BaseState
+from state.note_repository import NoteRepository
+from state.registry import registry
+
+startup_profiler.mark("импорт модулей app.py")
+
+# Тексты длиннее 64 КБ (вставленные логи) хранятся в data/notes.json.blobs.
+BLOB_THRESHOLD = 64 * 1024
 
 
 class Application(tk.Tk):
     """Главное приложение менеджера заметок.
 
     Отвечает за создание главного окна Tkinter, настройку базовых параметров
-    и отображение главного меню через BaseView.
+    и отображение главного меню через BaseView. Загрузка заметок с диска
+    откладывается до первой отрисовки окна и выполняется в фоновом потоке.
+
+    Хранилище передается извне (см. state.registry), поэтому интерфейс
+    можно запустить на любом из них, например на MemoryState для
+    нагрузочной проверки.
 
     Attributes:
+        repository: Общий для всех окон репозиторий заметок.
         __user_widgets: Экземпляр главного меню приложения.
+        __icon: Изображение иконки (хранится, чтобы его не удалил сборщик мусора).
     """
 
-    def __init__(self) -> None:
+    def __init__(self, backend: BaseState) -> None:
         """Инициализирует главное приложение.
 
         Создает главное окно Tkinter, настраивает его параметры,
         инициализирует главное меню и устанавливает иконку приложения.
+
+        Args:
+            backend: Хранилище заметок, общее для всех окон.
         """
-        super().__init__()
+        with startup_profiler.phase("создание окна Tk"):
+            super().__init__()
 
-        self.__configure_windows()
-        self.__configure_widgets()
-        self.__user_widgets = BaseView(self)
-        self.__pack_widgets()
+        self.repository = NoteRepository(backend)
+        self.__icon: Optional[tk.PhotoImage] = None
 
-        self._add_icon()
+        with startup_profiler.phase("создание главного меню"):
+            self.__configure_windows()
+            self.__configure_widgets()
+            self.__pack_widgets()
+
+        with startup_profiler.phase("загрузка иконки"):
+            self._add_icon()
 
     def __configure_windows(self) -> None:
         """Настраивает параметры главного окна.
@@ -36,14 +69,15 @@ class Application(tk.Tk):
         Устанавливает заголовок окна и его геометрию (размеры).
         """
         self.title("Заметки")
-        self.geometry("1000x500")
+        self.geometry("1000x580")
 
     def __configure_widgets(self) -> None:
         """Инициализирует виджеты главного окна.
 
-        Создает экземпляр BaseView для отображения главного меню.
+        Создает экземпляр BaseView для отображения главного меню
+        и передает ему общий репозиторий заметок.
         """
-        self.__user_widgets = BaseView(self)
+        self.__user_widgets = BaseView(self, self.repository)
 
     def __pack_widgets(self) -> None:
         """Размещает виджеты в главном окне.
@@ -55,26 +89,104 @@ class Application(tk.Tk):
     def _add_icon(self) -> None:
         """Устанавливает иконку приложения.
 
-        Загружает изображение из файла 'static/imgs/app_2.png' и устанавливает
-        его как иконку для главного окна приложения.
+        Загружает изображение 'static/imgs/app_2.png' средствами Tk (PNG
+        поддерживается начиная с Tk 8.6). PIL импортируется только для
+        более старых версий Tk, где PNG не поддерживается.
 
         Raises:
-            FileNotFoundError: Если файл иконки не найден.
-            PIL.UnidentifiedImageError: Если файл не является допустимым изображением.
+            tk.TclError: Если файл иконки не найден или не является изображением.
+            PIL.UnidentifiedImageError: Если PIL не смог распознать изображение.
+        """
+        if tk.TkVersion >= 8.6:
+            self.__icon = tk.PhotoImage(file="static/imgs/app_2.png")
+        else:
+            from PIL import Image, ImageTk
+            self.__icon = ImageTk.PhotoImage(Image.open("static/imgs/app_2.png"))
+        self.iconphoto(False, self.__icon)
+
+    def __start_warm_up(self) -> None:
+        """Запускает фоновую загрузку заметок после первой отрисовки окна."""
+        startup_profiler.mark("первый кадр")
+        threading.Thread(target=self.__warm_up, daemon=True).start()
+
+    def __warm_up(self) -> None:
+        """Загружает заметки и строит индекс текстов, печатает отчет о запуске.
+
+        Индекс строится здесь, а не при первом поиске по ключевому слову в
+        главном потоке; до его готовности окно поиска перебирает заметки.
         """
-        img = Image.open("static/imgs/app_2.png")
-        photo = ImageTk.PhotoImage(img)
-        self.iconphoto(False, photo)
+        with startup_profiler.phase("фоновая загрузка заметок"):
+            self.repository.warm()
+        with startup_profiler.phase("фоновое построение индекса текстов"):
+            self.repository.build_index()
+        if startup_profiler.enabled:
+            print(startup_profiler.report(), flush=True)
 
     def run(self) -> None:
         """Запускает основной цикл событий приложения.
 
-        Вызывает метод mainloop() для запуска графического интерфейса
-        и обработки пользовательских событий.
+        Планирует фоновую загрузку заметок на момент, когда окно уже
+        отрисовано, и вызывает метод mainloop() для запуска графического
+        интерфейса и обработки пользовательских событий.
         """
+        self.after_idle(self.__start_warm_up)
         self.mainloop()
 
 
 if __name__ == "__main__":
-    app = Application()
+    parser = argparse.ArgumentParser(description="Менеджер заметок")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="вывести разбивку времени импорта и инициализации"
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="собирать метрики времени операций с запуска (окно «Диагностика»)"
+    )
+    parser.add_argument(
+        "--profile-memory",
+        metavar="FILE",
+        help="профилировать память операций и записать отчет в FILE при выходе"
+    )
+    parser.add_argument(
+        "--watch-loop",
+        metavar="MS",
+        type=float,
+        help="сообщать в stderr о задержках цикла событий и обработчиках дольше MS мс"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=registry.names(),
+        help=f"хранилище заметок (по умолчанию из ${registry.BACKEND_VARIABLE} или файла конфигурации)"
+    )
+    parser.add_argument(
+        "--config",
+        help=f"файл конфигурации хранилища (по умолчанию {registry.CONFIG_PATH})"
+    )
+    args = parser.parse_args()
+    if args.metrics:
+        metrics.enable()
+    if args.profile_memory:
+        from core.memory_profiler import memory_profiler
+        memory_profiler.enable()
+
+    try:
+        with startup_profiler.phase("создание хранилища"):
+            backend = registry.from_config(args.backend, args.config, blob_threshold=BLOB_THRESHOLD)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.watch_loop is not None:
+        from views.event_loop_monitor import event_loop_monitor
+        event_loop_monitor.threshold_ms = args.watch_loop
+        # Обработчики оборачиваются при регистрации: до создания окон.
+        event_loop_monitor.install()
+
+    app = Application(backend)
+    if args.watch_loop is not None:
+        event_loop_monitor.start(app)
     app.run()
+    if args.profile_memory:
+        memory_profiler.write(args.profile_memory)
@@ -0,0 +1,161 @@
+"""Детерминированный генератор синтетического корпуса заметок.
+
+Корпус зависит только от параметров и seed, поэтому замеры на разных
+машинах и в разных запусках выполняются на одинаковых данных. Слова
+текстов выбираются из русского словаря с распределением Ципфа (частые
+слова встречаются почти в каждой заметке, редкие — в единицах), длина
+текста случайно отклоняется от заданной не больше чем вдвое. Теги
+(по желанию) выбираются из TAGS тоже по Ципфу отдельным генератором,
+поэтому включение тегов не меняет остальные поля корпуса.
+
+Распределения дат:
+    uniform — равномерно по всему периоду;
+    recent  — чем ближе к концу периода, тем больше заметок;
+    bursty  — заметки собраны вокруг нескольких случайных дней.
+
+Пример:
+
+    python -m benchmarks.corpus data/bench.json --notes 100000 --words 60
+"""
+
+import argparse
+import random
+import sys
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List
+from core.json_storage import JsonStorage
+from core.note_dates import from_epoch, to_epoch
+
+VOCABULARY = (
+    "заметка отчет встреча проект задача список покупки идея план письмо звонок "
+    "книга фильм поездка бюджет ремонт врач спорт учеба работа дом семья друг "
+    "неделя месяц утро вечер день ночь город дорога машина поезд самолет билет "
+    "гостиница море горы лес река озеро погода дождь снег солнце ветер осень "
+    "зима весна лето праздник подарок ужин обед завтрак рецепт магазин рынок "
+    "молоко хлеб сыр яблоки овощи фрукты кофе чай сахар масло мясо рыба суп "
+    "компьютер телефон ноутбук программа ошибка сервер база данные файл папка "
+    "пароль доступ сеть сайт почта сообщение чат видео фото музыка песня "
+    "концерт театр музей выставка лекция курс экзамен оценка студент учитель "
+    "школа университет библиотека статья журнал газета новости история "
+    "политика экономика рубль цена скидка счет оплата кредит вклад налог "
+    "договор подпись документ справка паспорт виза анкета заявление срок "
+    "дедлайн релиз версия тест сборка ветка коммит ревью задача баг фича "
+    "клиент заказчик партнер команда руководитель коллега отпуск больничный "
+    "премия зарплата собеседование резюме вакансия офис переговоры презентация "
+    "таблица график диаграмма метрика показатель результат вывод решение "
+    "вопрос ответ проблема причина следствие пример идея мысль цель шаг"
+).split()
+
+TAGS = (
+    "работа дом учеба идеи покупки здоровье финансы путешествия книги проекты "
+    "срочно важно позже архив черновик встречи семья спорт код документы"
+).split()
+
+DISTRIBUTIONS = ("uniform", "recent", "bursty")
+
+# Веса Ципфа: k-е по частоте слово встречается в 1/k раз реже первого.
+_CUM_WEIGHTS = list(accumulate(1.0 / rank for rank in range(1, len(VOCABULARY) + 1)))
+_TAG_WEIGHTS = list(accumulate(1.0 / rank for rank in range(1, len(TAGS) + 1)))
+
+
+def generate(
+    count: int,
+    words: int = 40,
+    seed: int = 42,
+    start: str = "01.01.2024 00:00",
+    days: int = 730,
+    distribution: str = "uniform",
+    tags: int = 0
+) -> Iterator[Dict[str, Any]]:
+    """Лениво генерирует словари заметок в формате JsonStorage.
+
+    Args:
+        count: Количество заметок.
+        words: Средняя длина текста в словах.
+        seed: Начальное значение генератора случайных чисел.
+        start: Дата начала периода в формате DATE_FORMAT.
+        days: Длина периода в днях.
+        distribution: Распределение дат (uniform, recent или bursty).
+        tags: Наибольшее количество тегов заметки (от 0 до tags, в среднем
+              половина). 0 — без тегов.
+
+    Yields:
+        Словари с полями id, title, text, date, version и tags (если
+        у заметки есть теги).
+
+    Raises:
+        ValueError: Если распределение или дата начала не поддерживаются.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Неизвестное распределение дат: {distribution}")
+    first = to_epoch(start)
+    if first is None:
+        raise ValueError(f"Некорректная дата начала: {start}")
+
+    rng = random.Random(seed)
+    tag_rng = random.Random(seed + 1)
+    minutes = max(days * 24 * 60, 1)
+    bursts: List[int] = sorted(rng.randrange(minutes) for _ in range(max(days // 30, 1)))
+    for number in range(1, count + 1):
+        if distribution == "uniform":
+            offset = rng.randrange(minutes)
+        elif distribution == "recent":
+            offset = int(minutes * rng.random() ** 0.3)
+        else:
+            offset = int(rng.gauss(rng.choice(bursts), 12 * 60)) % minutes
+        length = rng.randint(max(words // 2, 1), max(words * 3 // 2, 1))
+        title = rng.choices(VOCABULARY, cum_weights=_CUM_WEIGHTS, k=rng.randint(1, 3))
+        record = {
+            "id": number,
+            "title": " ".join(title).capitalize(),
+            "text": " ".join(rng.choices(VOCABULARY, cum_weights=_CUM_WEIGHTS, k=length)),
+            "date": from_epoch(first + offset * 60),
+            "version": 1,
+        }
+        if tags:
+            chosen = tag_rng.choices(TAGS, cum_weights=_TAG_WEIGHTS, k=tag_rng.randint(0, tags))
+            if chosen:
+                record["tags"] = list(dict.fromkeys(chosen))
+        yield record
+
+
+def write(filepath: str, count: int, **options: Any) -> int:
+    """Потоково записывает корпус в JSON-файл хранилища.
+
+    Args:
+        filepath: Путь к создаваемому файлу.
+        count: Количество заметок.
+        **options: Параметры generate.
+
+    Returns:
+        Версия записанного файла.
+    """
+    return JsonStorage(filepath).write_data(generate(count, **options))
+
+
+def main() -> int:
+    """Разбирает аргументы командной строки и записывает корпус.
+
+    Returns:
+        Код возврата процесса.
+    """
+    parser = argparse.ArgumentParser(description="Синтетический корпус заметок")
+    parser.add_argument("file", help="путь к создаваемому JSON-файлу")
+    parser.add_argument("--notes", type=int, default=10000, help="количество заметок")
+    parser.add_argument("--words", type=int, default=40, help="средняя длина текста в словах")
+    parser.add_argument("--seed", type=int, default=42, help="начальное значение генератора")
+    parser.add_argument("--start", default="01.01.2024 00:00", help="дата начала периода")
+    parser.add_argument("--days", type=int, default=730, help="длина периода в днях")
+    parser.add_argument("--dates", choices=DISTRIBUTIONS, default="uniform", help="распределение дат")
+    parser.add_argument("--tags", type=int, default=0, help="наибольшее количество тегов заметки")
+    args = parser.parse_args()
+    write(
+        args.file, args.notes, words=args.words, seed=args.seed,
+        start=args.start, days=args.days, distribution=args.dates, tags=args.tags
+    )
+    print(f"Записано заметок: {args.notes} в {args.file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""Замер памяти на заметку и времени загрузки для разных представлений.
+
+Запуск из корня проекта:
+
+    python -m benchmarks.note_memory --notes 100000
+
+Сравниваются:
+    dict      — заметка со словарем атрибутов и неинтернированной датой
+                (прежнее представление Note, воспроизведено для сравнения);
+    slots     — текущий Note с __slots__ в MemoryState;
+    columnar  — MemoryState(columnar=True) на NoteColumns.
+
+Для каждого печатается память на заметку (tracemalloc), время загрузки
+корпуса из словарей и время получения всех заметок через load_notes
+(копия) и view_notes (представление без копирования).
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+from core.json_storage import JsonStorage
+from state.memory_state import MemoryState
+
+
+class _DictNote:
+    """Заметка со словарем атрибутов — прежнее представление Note."""
+
+    VERSIONED_FIELDS = frozenset(("title", "text", "date"))
+
+    def __init__(self, number: int, title: str, text: str, date: str, version: int) -> None:
+        """Инициализирует заметку.
+
+        Args:
+            number: ID заметки.
+            title: Название заметки.
+            text: Текст заметки.
+            date: Дата заметки.
+            version: Версия заметки.
+        """
+        self.version = version
+        self.id = number
+        self.title = title
+        self.text = text
+        self.date = date
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Устанавливает атрибут и увеличивает версию, как прежний Note.
+
+        Args:
+            name: Имя атрибута.
+            value: Новое значение атрибута.
+        """
+        if name in self.VERSIONED_FIELDS and name in self.__dict__:
+            object.__setattr__(self, "version", self.version + 1)
+        object.__setattr__(self, name, value)
+
+
+def _records(count: int) -> List[Dict[str, Any]]:
+    """Создает словари заметок, как после чтения JSON-файла.
+
+    Args:
+        count: Количество заметок.
+
+    Returns:
+        Список словарей заметок.
+    """
+    rng = random.Random(7)
+    return [
+        {
+            "id": i,
+            "title": f"Заметка {rng.randrange(count // 4 + 1)}",
+            "text": f"Текст заметки номер {i} " * 3,
+            # Отдельный объект строки на каждую запись, как после json.loads.
+            "date": f"{rng.randrange(1, 29):02d}.01.2026 12:{rng.randrange(60):02d}",
+            "version": 1,
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def _measure(build: Callable[[], Any]) -> Tuple[Any, int, float]:
+    """Замеряет время построения и выделенную при нем память.
+
+    Время и память замеряются в двух отдельных построениях, потому что
+    tracemalloc многократно замедляет выделение памяти.
+
+    Args:
+        build: Функция построения хранилища.
+
+    Returns:
+        Кортеж (результат, байт памяти, секунд).
+    """
+    started = time.perf_counter()
+    build()
+    seconds = time.perf_counter() - started
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, seconds
+
+
+def main() -> int:
+    """Разбирает аргументы командной строки и печатает таблицу.
+
+    Returns:
+        Код возврата процесса.
+    """
+    parser = argparse.ArgumentParser(description="Память на заметку и время загрузки")
+    parser.add_argument("--notes", type=int, default=100000, help="количество заметок")
+    args = parser.parse_args()
+    records = _records(args.notes)
+
+    def build_dict() -> List[_DictNote]:
+        return [
+            _DictNote(r["id"], r["title"], r["text"], r["date"], r["version"]) for r in records
+        ]
+
+    def build_state(columnar: bool) -> MemoryState:
+        state = MemoryState(columnar)
+        state.save_notes([JsonStorage.dict_to_note(r) for r in records])
+        return state
+
+    # Строки названий и текстов уже созданы в records и общие для всех
+    # вариантов, поэтому в замер входит только их представление.
+    print(f"{'вариант':>9} {'байт/заметку':>13} {'загрузка, мс':>13} {'load_notes, мс':>15} {'view_notes, мс':>15}")
+    notes, size, seconds = _measure(build_dict)
+    started = time.perf_counter()
+    notes[:]
+    copy_ms = (time.perf_counter() - started) * 1000
+    print(f"{'dict':>9} {size / args.notes:>13.0f} {seconds * 1000:>13.1f} {copy_ms:>15.2f} {'—':>15}")
+    del notes
+
+    for name, columnar in (("slots", False), ("columnar", True)):
+        state, size, seconds = _measure(lambda: build_state(columnar))
+        started = time.perf_counter()
+        state.load_notes()
+        load_ms = (time.perf_counter() - started) * 1000
+        gc.collect()
+        view_ms = float("inf")
+        for _ in range(3):
+            started = time.perf_counter()
+            view = state.view_notes()
+            len(view), view[0], view[-1]
+            view_ms = min(view_ms, (time.perf_counter() - started) * 1000)
+        print(
+            f"{name:>9} {size / args.notes:>13.0f} {seconds * 1000:>13.1f} "
+            f"{load_ms:>15.2f} {view_ms:>15.3f}"
+        )
+        del state
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Замер масштабирования ParallelSearch по числу процессов.
+
+Запуск из корня проекта:
+
+    python -m benchmarks.parallel_search --notes 200000 --repeat 3
+
+Создает во временном каталоге корпус случайных заметок, затем выполняет
+поиск по ключевому слову (сканированием, без индекса) последовательно
+и в пулах из 2, 4, … процессов до числа ядер. Время загрузки корпуса в
+процессы в замер не входит: пул прогревается одним поиском заранее.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+from core.json_storage import JsonStorage
+from core.note import Note
+from core.parallel_search import ParallelSearch
+from strategies.search_by_keyword_strategy import SearchKeywordStrategy
+
+WORDS = (
+    "заметка отчет встреча проект задача список покупки идея план письмо "
+    "звонок книга фильм поездка бюджет ремонт врач спорт учеба работа"
+).split()
+
+
+def _make_corpus(filepath: str, count: int, words: int) -> List[Note]:
+    """Записывает случайный корпус в файл и возвращает его заметки.
+
+    Args:
+        filepath: Путь к создаваемому JSON-файлу.
+        count: Количество заметок.
+        words: Количество слов в тексте заметки.
+
+    Returns:
+        Заметки корпуса в порядке хранения.
+    """
+    rng = random.Random(42)
+    records = (
+        {
+            "title": f"Заметка {i}",
+            "text": " ".join(rng.choice(WORDS) + str(rng.randrange(100)) for _ in range(words)),
+            "date": "01.01.2026 12:00",
+        }
+        for i in range(count)
+    )
+    storage = JsonStorage(filepath)
+    storage.append_stream(records)
+    return [JsonStorage.dict_to_note(item) for item in storage.read_data()]
+
+
+def _measure(search: ParallelSearch, notes: List[Note], query: str, repeat: int) -> float:
+    """Возвращает лучшее время поиска из нескольких повторов.
+
+    Args:
+        search: Параллельный поиск.
+        notes: Заметки корпуса.
+        query: Ключевое слово.
+        repeat: Количество повторов.
+
+    Returns:
+        Лучшее время в секундах.
+    """
+    search.search(SearchKeywordStrategy(query), notes)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        search.search(SearchKeywordStrategy(query), notes)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> int:
+    """Разбирает аргументы командной строки и печатает таблицу масштабирования.
+
+    Returns:
+        Код возврата процесса.
+    """
+    parser = argparse.ArgumentParser(description="Масштабирование параллельного поиска")
+    parser.add_argument("--notes", type=int, default=200000, help="размер корпуса")
+    parser.add_argument("--words", type=int, default=40, help="слов в тексте заметки")
+    parser.add_argument("--repeat", type=int, default=3, help="повторов на замер")
+    parser.add_argument("--query", default="отчет7", help="ключевое слово")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = str(Path(directory) / "notes.json")
+        notes = _make_corpus(filepath, args.notes, args.words)
+        print(f"Корпус: {len(notes)} заметок, ядер: {cores}")
+        print(f"{'процессов':>10} {'время, мс':>10} {'ускорение':>10}")
+        baseline = None
+        for workers in counts:
+            with ParallelSearch(filepath, workers=workers, threshold=0) as search:
+                seconds = _measure(search, notes, args.query, args.repeat)
+            baseline = baseline or seconds
+            print(f"{workers:>10} {seconds * 1000:>10.1f} {baseline / seconds:>9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,399 @@
+"""Набор замеров хранилища, состояний и стратегий с базовой линией.
+
+Для каждого размера корпуса (см. benchmarks.corpus) замеряются чтение
+и запись JsonStorage, загрузка и сохранение JsonState, LazyJsonState и
+MemoryState, построение индексов текстов и тегов и статистики,
+каждая стратегия из strategies/, а также потоковый вывод всех заметок
+(путь окна AllNote: ViewAllStrategy.iter_results по заметкам
+LazyJsonState, порциями по STREAM_CHUNK, как в ResultStream). Результат — лучшее время из нескольких
+повторов — сохраняется в JSON-файл базовой линии.
+В режиме сравнения результаты сверяются с базовой линией, и замеры,
+ставшие медленнее больше чем на порог, считаются регрессией (код
+возврата 1). Tk не используется, поэтому набор запускается без дисплея.
+
+С --memory для каждой операции дополнительно замеряется пик памяти
+(core.memory_profiler), для потокового вывода — с разбивкой пика по
+строкам (MemoryProfiler.stream), а --budget проверяет его по бюджетам из
+JSON-файла {"замер": байт на заметку}; превышение бюджета тоже дает код
+возврата 1. Бюджеты по умолчанию — benchmarks/memory_budget.json.
+
+Запуск из корня проекта:
+
+    python -m benchmarks.suite --notes 1000 10000 --output baseline.json
+    python -m benchmarks.suite --notes 1000 10000 --compare baseline.json --threshold 0.2
+    python -m benchmarks.suite --notes 10000 --budget benchmarks/memory_budget.json
+"""
+
+import argparse
+import gc
+import importlib
+import json
+import platform
+import pkgutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from benchmarks import corpus
+from core.json_storage import JsonStorage
+from core.memory_profiler import memory_profiler
+from core.note import Note
+from core.note_statistics import NoteStatistics
+from core.tag_index import TagIndex
+from core.text_index import TextIndex
+from state.json_state import JsonState
+from state.lazy_json_state import LazyJsonState
+from state.memory_state import MemoryState
+from strategies.base_strategy import BaseStrategy
+from strategies.search_by_date_strategy import SearchByDateStrategy
+from strategies.search_by_keyword_strategy import SearchKeywordStrategy
+from strategies.search_by_tags_strategy import SearchByTagsStrategy
+from strategies.search_by_title_strategy import SearchTitleStrategy
+from strategies.view_all_strategy import ViewAllStrategy
+from strategies.view_by_id_strategy import SearchByIDStrategy
+from strategies.view_titles_strategy import SearchTitlesStrategy
+
+# Наибольшее количество тегов заметки в корпусе замеров.
+TAGS_PER_NOTE = 3
+
+# Выражение над тегами для замеров поиска по тегам.
+TAG_EXPRESSION = f"{corpus.TAGS[0]} & ({corpus.TAGS[1]} | {corpus.TAGS[2]}) & !{corpus.TAGS[3]}"
+
+# Размер порции потокового вывода (ResultStream.chunk_size по умолчанию).
+STREAM_CHUNK = 50
+
+# Замеры короче этого порога (в секундах) не считаются регрессией:
+# их разброс сравним с самим временем.
+NOISE_FLOOR = 0.001
+
+
+def _best(action: Callable[[], object], repeat: int) -> float:
+    """Возвращает лучшее время выполнения из нескольких повторов.
+
+    Args:
+        action: Замеряемая функция.
+        repeat: Количество повторов.
+
+    Returns:
+        Лучшее время в секундах.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _strategies(
+    notes: List[Note],
+    index: TextIndex,
+    tags: TagIndex
+) -> Dict[str, BaseStrategy]:
+    """Создает по стратегии каждого вида с запросами из середины корпуса.
+
+    Args:
+        notes: Заметки корпуса.
+        index: Индекс текстов тех же заметок.
+        tags: Индекс тегов тех же заметок.
+
+    Returns:
+        Словарь имя замера -> стратегия.
+    """
+    sample = notes[len(notes) // 2]
+    word = corpus.VOCABULARY[len(corpus.VOCABULARY) // 4]
+    return {
+        "view_all": ViewAllStrategy(),
+        "view_titles": SearchTitlesStrategy(),
+        "by_id": SearchByIDStrategy(sample.id),
+        "title": SearchTitleStrategy(sample.title),
+        "date.minute": SearchByDateStrategy(sample.date),
+        "date.day": SearchByDateStrategy(sample.date[:10]),
+        "date.month": SearchByDateStrategy(sample.date[3:10]),
+        "keyword.scan": SearchKeywordStrategy(word),
+        "keyword.index": SearchKeywordStrategy(word, index),
+        "tags.scan": SearchByTagsStrategy(TAG_EXPRESSION),
+        "tags.index": SearchByTagsStrategy(TAG_EXPRESSION, tags),
+    }
+
+
+def _uncovered(covered: List[type]) -> List[str]:
+    """Находит стратегии из strategies/, для которых нет замера.
+
+    Args:
+        covered: Классы стратегий, которые замеряются.
+
+    Returns:
+        Имена классов без замера.
+    """
+    directory = Path(__file__).resolve().parent.parent / "strategies"
+    missing = []
+    for module_info in pkgutil.iter_modules([str(directory)]):
+        module = importlib.import_module(f"strategies.{module_info.name}")
+        for value in vars(module).values():
+            if (
+                isinstance(value, type) and issubclass(value, BaseStrategy)
+                and value is not BaseStrategy and value.__module__ == module.__name__
+                and value not in covered
+            ):
+                missing.append(value.__name__)
+    return missing
+
+
+def _drain_stream(blocks: Iterator[str]) -> int:
+    """Забирает блоки порциями, как ResultStream, и склеивает каждую порцию.
+
+    Args:
+        blocks: Итератор отформатированных блоков.
+
+    Returns:
+        Количество символов выведенного текста.
+    """
+    written = 0
+    while True:
+        chunk = list(islice(blocks, STREAM_CHUNK))
+        written += len("\n".join(chunk))
+        if len(chunk) < STREAM_CHUNK:
+            return written
+
+
+def run(
+    count: int,
+    words: int,
+    repeat: int,
+    seed: int,
+    memory: bool = False
+) -> Tuple[Dict[str, float], Dict[str, int]]:
+    """Выполняет все замеры на корпусе заданного размера.
+
+    Пик памяти замеряется отдельным вызовом под tracemalloc, чтобы
+    трассировка не искажала время.
+
+    Args:
+        count: Количество заметок.
+        words: Средняя длина текста в словах.
+        repeat: Количество повторов каждого замера.
+        seed: Начальное значение генератора корпуса.
+        memory: Замерять пик памяти каждой операции.
+
+    Returns:
+        Кортеж словарей: имя замера -> лучшее время в секундах и
+        имя замера -> пик памяти в байтах (пустой без memory).
+    """
+    times: Dict[str, float] = {}
+    peaks: Dict[str, int] = {}
+
+    def measure(name: str, action: Callable[[], object], repeats: int = repeat) -> None:
+        times[name] = _best(action, repeats)
+        if memory:
+            gc.collect()
+            memory_profiler.enable(snapshots=False)
+            try:
+                peaks[name] = memory_profiler.measure(name, action)[0]
+            finally:
+                memory_profiler.disable()
+
+    records = list(corpus.generate(count, words=words, seed=seed, tags=TAGS_PER_NOTE))
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = str(Path(directory) / "notes.json")
+        storage = JsonStorage(filepath)
+        measure("storage.write", lambda: storage.write_data(records))
+        measure("storage.read", storage.read_data)
+        measure("storage.iter", lambda: sum(1 for _ in storage.iter_data()))
+
+        json_state = JsonState(filepath)
+        measure("json_state.load", json_state.load_notes)
+        notes = json_state.load_notes()
+        measure("json_state.save", lambda: json_state.save_notes(notes))
+
+        lazy_state = LazyJsonState(filepath)
+        measure("lazy_json_state.load", lazy_state.load_notes)
+
+        def stream_all() -> int:
+            blocks = ViewAllStrategy().iter_results(iter(lazy_state.load_notes()))
+            return _drain_stream(memory_profiler.stream("stream.view_all.iter", blocks))
+
+        measure("stream.view_all", stream_all)
+
+    for name, columnar in (("memory_state", False), ("columnar_state", True)):
+        memory_state = MemoryState(columnar)
+        measure(f"{name}.save", lambda: memory_state.save_notes(notes))
+        measure(f"{name}.load", memory_state.load_notes)
+
+    def build_index() -> TextIndex:
+        index = TextIndex()
+        for note in notes:
+            index.add(note)
+        return index
+
+    def build_tags() -> TagIndex:
+        tags = TagIndex()
+        tags.update(notes)
+        return tags
+
+    measure("text_index.build", build_index, 1)
+    measure("tag_index.build", build_tags, 1)
+    measure("note_statistics.build", lambda: NoteStatistics(notes), 1)
+    saved = NoteStatistics(notes).to_dict()
+    measure("note_statistics.restore", lambda: NoteStatistics.from_dict(saved), 1)
+    tags = build_tags()
+    measure("tag_index.query", lambda: tags.query(TAG_EXPRESSION))
+    for name, strategy in _strategies(notes, build_index(), tags).items():
+        measure(f"strategy.{name}", lambda: sum(1 for _ in strategy.iter_matches(notes)))
+    return times, peaks
+
+
+def check_budgets(
+    peaks: Dict[str, Dict[str, int]],
+    budgets: Dict[str, float]
+) -> List[Tuple[str, str, int, int]]:
+    """Проверяет пики памяти по бюджетам в байтах на заметку.
+
+    Args:
+        peaks: Пики памяти: размер корпуса -> замер -> байты.
+        budgets: Бюджет: замер -> допустимые байты на одну заметку.
+
+    Returns:
+        Превышения: кортежи (размер, замер, допустимо, пик) в байтах.
+    """
+    exceeded = []
+    for size, results in peaks.items():
+        for name, peak in results.items():
+            budget = budgets.get(name)
+            if budget is not None and peak > budget * int(size):
+                exceeded.append((size, name, int(budget * int(size)), peak))
+    return exceeded
+
+
+def compare(
+    baseline: Dict[str, Dict[str, float]],
+    current: Dict[str, Dict[str, float]],
+    threshold: float
+) -> List[Tuple[str, str, float, float]]:
+    """Сравнивает результаты с базовой линией.
+
+    Args:
+        baseline: Результаты базовой линии: размер -> замер -> секунды.
+        current: Текущие результаты в том же виде.
+        threshold: Допустимое относительное замедление (0.2 — на 20%).
+
+    Returns:
+        Регрессии: кортежи (размер, замер, было, стало).
+    """
+    regressions = []
+    for size, results in current.items():
+        for name, seconds in results.items():
+            before = baseline.get(size, {}).get(name)
+            if before is None or seconds < NOISE_FLOOR:
+                continue
+            if seconds > before * (1 + threshold):
+                regressions.append((size, name, before, seconds))
+    return regressions
+
+
+def main() -> int:
+    """Разбирает аргументы командной строки, выполняет замеры и сравнение.
+
+    Returns:
+        Код возврата процесса: 1, если найдены регрессии или превышены
+        бюджеты памяти, иначе 0.
+    """
+    parser = argparse.ArgumentParser(description="Замеры хранилища, состояний и стратегий")
+    parser.add_argument(
+        "--notes", type=int, nargs="+", default=[1000, 10000], help="размеры корпуса"
+    )
+    parser.add_argument("--words", type=int, default=40, help="средняя длина текста в словах")
+    parser.add_argument("--repeat", type=int, default=3, help="повторов на замер")
+    parser.add_argument("--seed", type=int, default=42, help="начальное значение генератора")
+    parser.add_argument("--output", help="записать результаты в JSON-файл базовой линии")
+    parser.add_argument("--compare", help="сравнить с JSON-файлом базовой линии")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="допустимое замедление (0.2 — 20%%)"
+    )
+    parser.add_argument("--memory", action="store_true", help="замерять пик памяти операций")
+    parser.add_argument(
+        "--budget", help="проверить пики памяти по JSON-файлу бюджетов (включает --memory)"
+    )
+    args = parser.parse_args()
+    budgets: Optional[Dict[str, float]] = None
+    if args.budget:
+        with open(args.budget, "r", encoding="utf-8") as f:
+            budgets = json.load(f)
+
+    missing = _uncovered([
+        ViewAllStrategy, SearchTitlesStrategy, SearchByIDStrategy, SearchTitleStrategy,
+        SearchByDateStrategy, SearchKeywordStrategy, SearchByTagsStrategy,
+    ])
+    if missing:
+        print(f"Нет замеров для стратегий: {', '.join(missing)}", file=sys.stderr)
+
+    baseline: Optional[Dict[str, Dict[str, float]]] = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    current: Dict[str, Dict[str, float]] = {}
+    peaks: Dict[str, Dict[str, int]] = {}
+    memory = args.memory or budgets is not None
+    for count in args.notes:
+        memory_profiler.reset()
+        results, peaks[str(count)] = run(count, args.words, args.repeat, args.seed, memory)
+        current[str(count)] = results
+        print(f"\nКорпус: {count} заметок")
+        for name, seconds in results.items():
+            line = f"  {name:<24} {seconds * 1000:>10.2f} мс"
+            if memory:
+                line += f" {peaks[str(count)][name] / 1024:>10.1f} КБ"
+            before = (baseline or {}).get(str(count), {}).get(name)
+            if before:
+                line += f" {seconds / before:>7.2f}x"
+            print(line)
+        for name, stats in memory_profiler.to_dict().items():
+            if stats["peak_lines"]:
+                print(f"  Память на пике {name}, КБ:")
+                for where, size in stats["peak_lines"].items():
+                    print(f"    {size / 1024:>10.1f}  {where}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "meta": {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "words": args.words,
+                    "repeat": args.repeat,
+                    "seed": args.seed,
+                    "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                },
+                "results": current,
+                "memory": peaks if memory else {},
+            }, f, ensure_ascii=False, indent=2)
+
+    failed = False
+    if budgets is not None:
+        exceeded = check_budgets(peaks, budgets)
+        if exceeded:
+            failed = True
+            print("\nПревышены бюджеты памяти:")
+            for size, name, budget, peak in exceeded:
+                print(f"  {size:>8} {name:<24} {peak / 1024:.1f} КБ > {budget / 1024:.1f} КБ")
+        else:
+            print("\nБюджеты памяти соблюдены")
+
+    if baseline is not None:
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            failed = True
+            print(f"\nРегрессии (порог {args.threshold:.0%}):")
+            for size, name, before, seconds in regressions:
+                print(f"  {size:>8} {name:<24} {before * 1000:.2f} -> {seconds * 1000:.2f} мс")
+        else:
+            print(f"\nРегрессий нет (порог {args.threshold:.0%})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
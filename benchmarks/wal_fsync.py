@@ -0,0 +1,68 @@
+"""Замер скорости добавления заметок при разных политиках fsync журнала.
+
+Запуск из корня проекта:
+
+    python -m benchmarks.wal_fsync --notes 2000
+
+Для каждой политики (always, batch, os) добавляет заметки через
+DurableJsonState в пустое хранилище и печатает скорость с учетом
+контрольных точек. Для сравнения замеряется JsonState.add_note, который
+перезаписывает весь файл на каждое добавление.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from core.write_ahead_log import WriteAheadLog
+from state.base_state import BaseState
+from state.durable_json_state import DurableJsonState
+from state.json_state import JsonState
+
+
+def _measure(state: BaseState, count: int) -> float:
+    """Добавляет заметки и возвращает скорость.
+
+    Args:
+        state: Состояние, в которое добавляются заметки.
+        count: Количество заметок.
+
+    Returns:
+        Скорость в заметках в секунду.
+    """
+    started = time.perf_counter()
+    for i in range(count):
+        state.add_note(f"Заметка {i}", "Текст заметки для замера журнала " * 4)
+    return count / (time.perf_counter() - started)
+
+
+def main() -> int:
+    """Разбирает аргументы командной строки и печатает результаты.
+
+    Returns:
+        Код возврата процесса.
+    """
+    parser = argparse.ArgumentParser(description="Скорость журнала при разных политиках fsync")
+    parser.add_argument("--notes", type=int, default=2000, help="количество заметок")
+    parser.add_argument("--checkpoint-every", type=int, default=1000, help="записей до контрольной точки")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'режим':>22} {'заметок/с':>12}")
+        for policy in WriteAheadLog.POLICIES:
+            state = DurableJsonState(
+                str(Path(directory) / f"{policy}.json"), policy, args.checkpoint_every
+            )
+            rate = _measure(state, args.notes)
+            state.close()
+            print(f"{'WAL fsync=' + policy:>22} {rate:>12,.0f}")
+
+        baseline = JsonState(str(Path(directory) / "rewrite.json"))
+        rate = _measure(baseline, min(args.notes, 500))
+        print(f"{'перезапись файла':>22} {rate:>12,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
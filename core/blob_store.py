@@ -0,0 +1,230 @@
+"""Модуль хранилища больших текстов заметок по адресу содержимого."""
+
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional
+from core.exceptions import StorageCorruptedError
+
+
+class BlobStore:
+    """Каталог текстов, адресуемых хешем SHA-256 их содержимого.
+
+    Текст сохраняется в файл "<первые два символа хеша>/<хеш>", поэтому
+    одинаковые тексты хранятся один раз. Если сжатие zlib уменьшает текст,
+    файл сохраняется сжатым с суффиксом ".z"; хеш всегда считается по
+    исходному тексту.
+
+    Счетчики ссылок хранятся в файле "refs.json" каталога: владелец
+    (например, JsonStorage) после каждой записи передает в update_refs
+    количество ссылок на каждый хеш, и тексты, на которые больше никто не
+    ссылается, удаляются. Вызывающий отвечает за то, чтобы update_refs не
+    вызывался одновременно из нескольких процессов.
+
+    Attributes:
+        directory: Путь к каталогу текстов.
+        compress: Сжимать тексты zlib, если это уменьшает их размер.
+    """
+
+    COMPRESSED_SUFFIX = ".z"
+
+    def __init__(self, directory: str, compress: bool = True) -> None:
+        """Инициализирует хранилище. Каталог создается при первой записи.
+
+        Args:
+            directory: Путь к каталогу текстов.
+            compress: Сжимать тексты zlib. По умолчанию True.
+        """
+        self.directory: Path = Path(directory)
+        self.compress: bool = compress
+
+    def put(self, text: str) -> str:
+        """Сохраняет текст, если такого еще нет, и возвращает его адрес.
+
+        Файл записывается во временный файл и атомарно переименовывается
+        после fsync, поэтому по адресу никогда не лежит недописанный текст.
+
+        Args:
+            text: Текст.
+
+        Returns:
+            Хеш текста.
+        """
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        if self.__find(digest) is not None:
+            return digest
+
+        path = self.__path(digest)
+        if self.compress:
+            packed = zlib.compress(data, 6)
+            if len(packed) < len(data):
+                data = packed
+                path = path.with_name(path.name + self.COMPRESSED_SUFFIX)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=digest[:16] + ".", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return digest
+
+    def get(self, digest: str) -> str:
+        """Читает текст по адресу.
+
+        Args:
+            digest: Хеш текста.
+
+        Returns:
+            Текст.
+
+        Raises:
+            StorageCorruptedError: Если текста нет или его содержимое не
+                                   совпадает с хешем.
+        """
+        path = self.__find(digest)
+        if path is None:
+            raise StorageCorruptedError(f"Текст {digest} не найден в {self.directory}")
+        data = path.read_bytes()
+        if path.suffix == self.COMPRESSED_SUFFIX:
+            data = zlib.decompress(data)
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise StorageCorruptedError(f"Текст {digest} в {self.directory} поврежден")
+        return data.decode("utf-8")
+
+    def __contains__(self, digest: str) -> bool:
+        """Проверяет, сохранен ли текст с таким адресом.
+
+        Args:
+            digest: Хеш текста.
+
+        Returns:
+            True, если текст есть в хранилище.
+        """
+        return self.__find(digest) is not None
+
+    def update_refs(self, refs: Mapping[str, int]) -> List[str]:
+        """Заменяет счетчики ссылок и удаляет тексты без ссылок.
+
+        Удаляются тексты, счетчик которых был положительным и стал нулевым.
+        Тексты, сохраненные через put, но ни разу не учтенные в счетчиках
+        (например, после падения до записи владельца), удаляет collect.
+
+        Args:
+            refs: Количество ссылок на каждый хеш.
+
+        Returns:
+            Хеши удаленных текстов.
+        """
+        old = self.__load_refs()
+        new = {digest: count for digest, count in refs.items() if count > 0}
+        removed = [digest for digest in old if digest not in new]
+        if new == old:
+            return removed
+        if new or self.directory.exists():
+            self.__write_refs(new)
+        for digest in removed:
+            self.__remove(digest)
+        return removed
+
+    def collect(self) -> List[str]:
+        """Удаляет все тексты, на которые нет ссылок в счетчиках.
+
+        Returns:
+            Хеши удаленных текстов.
+        """
+        refs = self.__load_refs()
+        removed = []
+        for path in self.directory.glob("??/*"):
+            digest = path.name.split(".", 1)[0]
+            if digest not in refs and not path.name.endswith(".tmp"):
+                path.unlink()
+                removed.append(digest)
+        return removed
+
+    def __path(self, digest: str) -> Path:
+        """Возвращает путь к несжатому файлу текста.
+
+        Args:
+            digest: Хеш текста.
+
+        Returns:
+            Путь к файлу.
+        """
+        return self.directory / digest[:2] / digest
+
+    def __find(self, digest: str) -> Optional[Path]:
+        """Ищет файл текста в несжатом или сжатом виде.
+
+        Args:
+            digest: Хеш текста.
+
+        Returns:
+            Путь к существующему файлу или None.
+        """
+        path = self.__path(digest)
+        for candidate in (path, path.with_name(path.name + self.COMPRESSED_SUFFIX)):
+            if candidate.exists():
+                return candidate
+        return None
+
+    def __remove(self, digest: str) -> None:
+        """Удаляет файл текста и опустевший подкаталог.
+
+        Args:
+            digest: Хеш текста.
+        """
+        path = self.__find(digest)
+        if path is not None:
+            path.unlink()
+            try:
+                path.parent.rmdir()
+            except OSError:  # в подкаталоге остались другие тексты
+                pass
+
+    def __load_refs(self) -> Dict[str, int]:
+        """Читает счетчики ссылок.
+
+        Счетчики не кэшируются: их мог обновить владелец в другом процессе.
+
+        Returns:
+            Словарь счетчиков ссылок.
+
+        Raises:
+            StorageCorruptedError: Если файл счетчиков поврежден.
+        """
+        try:
+            with open(self.directory / "refs.json", "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError as error:
+            raise StorageCorruptedError(
+                f"Счетчики ссылок в {self.directory} повреждены: {error}"
+            ) from error
+
+    def __write_refs(self, refs: Dict[str, int]) -> None:
+        """Атомарно записывает счетчики ссылок.
+
+        Args:
+            refs: Словарь счетчиков ссылок.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix="refs.", suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(refs, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.directory / "refs.json")
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,49 @@
+"""Модуль исключений слоя хранения заметок."""
+
+
+class StorageError(Exception):
+    """Базовое исключение ошибок хранилища заметок."""
+
+
+class StorageConflictError(StorageError):
+    """Файл был изменен другим процессом после последнего чтения.
+
+    Attributes:
+        expected: Версия, которую ожидал записывающий.
+        actual: Текущая версия файла.
+    """
+
+    def __init__(self, expected: int, actual: int) -> None:
+        """Инициализирует исключение конфликта версий.
+
+        Args:
+            expected: Версия, которую ожидал записывающий.
+            actual: Текущая версия файла.
+        """
+        super().__init__(
+            f"Конфликт версий хранилища: ожидалась версия {expected}, "
+            f"текущая версия {actual}"
+        )
+        self.expected: int = expected
+        self.actual: int = actual
+
+
+class StorageCorruptedError(StorageError):
+    """Файл хранилища поврежден и не может быть прочитан."""
+
+
+class NoteNotFoundError(StorageError):
+    """Заметки с указанным ID нет в хранилище.
+
+    Attributes:
+        note_id: ID отсутствующей заметки.
+    """
+
+    def __init__(self, note_id: int) -> None:
+        """Инициализирует исключение отсутствующей заметки.
+
+        Args:
+            note_id: ID отсутствующей заметки.
+        """
+        super().__init__(f"Заметка с ID {note_id} не найдена")
+        self.note_id: int = note_id
@@ -1,9 +1,90 @@
 """Модуль для работы с JSON-хранилищем заметок."""
 
 import json
+import os
+import re
+import tempfile
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from functools import partial
+from itertools import chain, islice
+from operator import itemgetter
+from threading import Lock
+from core.blob_store import BlobStore
+from core.exceptions import StorageConflictError, StorageCorruptedError
+from core.lazy_note import LazyNote
+from core.metrics import metrics
 from core.note import Note
+from core.note_dates import from_epoch, to_epoch
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировки между процессами недоступны
+    fcntl = None
+
+_HEADER_RE = re.compile(r'\s*\{\s*"version"\s*:\s*(\d+)\s*,\s*"notes"\s*:\s*\[')
+_LEGACY_RE = re.compile(r"\s*\[")
+_NEXT_ID_RE = re.compile(rb'"next_id"\s*:\s*(\d+)\s*\}\s*$')
+_TAIL_SIZE = 128
+_CHUNK_SIZE = 1 << 16
+_WHITESPACE = " \t\r\n,"
+_RECORD_INDENT = b"        "
+_RECORD_PREFIX = _RECORD_INDENT + b"{"
+
+# Запись бокового индекса: (id, смещение, длина, название, дата, версия,
+# [хеш, длина] вынесенного текста или None, список тегов). Дата — строка
+# или, в компактном формате, число секунд.
+IndexEntry = Tuple[int, int, int, str, Union[str, int], int, Optional[List[Any]], List[str]]
+
+_record_id = itemgetter("id")
+
+
+def _decode_log_line(line: bytes) -> Optional[Dict[str, Any]]:
+    """Разбирает строку журнала или ленты изменений и проверяет контрольную сумму.
+
+    Args:
+        line: Строка вида "<crc32> <json>\\n".
+
+    Returns:
+        Разобранная запись или None, если строка недописана или повреждена.
+    """
+    if not line.endswith(b"\n") or len(line) < 10 or line[8:9] != b" ":
+        return None
+    payload = line[9:-1]
+    try:
+        if int(line[:8], 16) != zlib.crc32(payload):
+            return None
+        entry = json.loads(payload.decode("utf-8"))
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+def fsync_directory(directory: Path) -> None:
+    """Сбрасывает на диск запись каталога после os.replace.
+
+    Без этого переименование может потеряться при сбое питания, даже
+    если данные самого файла уже сброшены. На Windows каталог нельзя
+    открыть для fsync, и вызов ничего не делает.
+
+    Args:
+        directory: Каталог, в котором заменялся файл.
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
 
 
 class JsonStorage:
@@ -12,73 +93,1220 @@ class JsonStorage:
     Обеспечивает сериализацию и десериализацию объектов Note в формат JSON
     и обратно. Работает с файловой системой через pathlib.Path.
 
+    Файл безопасен для одновременной работы нескольких процессов:
+    чтение выполняется под разделяемой, а запись под исключительной
+    блокировкой fcntl соседнего файла '<имя>.lock'; запись идет во временный
+    файл, который затем атомарно заменяет основной. В файле хранится
+    счетчик версий, увеличивающийся при каждой записи, и следующий
+    свободный ID заметки:
+
+        {"version": 3, "notes": [...], "next_id": 8}
+
+    Счетчик next_id только растет, поэтому ID удаленных заметок не
+    выдаются повторно, а выделение ID не требует перебора заметок: он
+    записывается последней строкой файла и читается с его конца.
+
+    Добавление, изменение и удаление отдельных заметок (append_record,
+    update_record, apply_changes) не переписывают файл: новые версии
+    записей и надгробия удаленных заметок дописываются одной строкой
+    в журнал изменений '<имя>.log' (с контрольной суммой, как в
+    WriteAheadLog) с новой версией файла и счетчиком next_id. Все чтения
+    накладывают журнал на записи файла, поэтому видят те же данные, что и
+    после полной перезаписи. Когда журнал дорастает до
+    LOG_COMPACT_RATIO размера файла (но не меньше LOG_COMPACT_MIN байт),
+    запись, которая его удлинила, переносит журнал в файл (уплотнение,
+    см. compact) и удаляет его: мертвые записи вычищаются, а цена
+    изменения в среднем не зависит от числа заметок. Любая полная запись
+    файла (write_data, modify, append_stream) тоже включает журнал в файл.
+    Записи журнала с версией не больше версии файла пропускаются, поэтому
+    падение между заменой файла и удалением журнала ничего не портит.
+    Процесс дочитывает журнал с места, до которого разобрал его раньше, а
+    для поиска записи по ID держит отсортированные смещения строк файла
+    (по боковому индексу), пока файл не заменен.
+
+    Каждая запись, меняющая версию, сначала отмечается в ленте изменений
+    '<имя>.feed': строка с новой версией и ID затронутых заметок (для
+    полной перезаписи — без ID). По ленте changes_after отвечает, какие
+    заметки изменились после версии, не читая заметок. Лента не
+    сбрасывается на диск и обрезается, когда дорастает до FEED_MAX_BYTES:
+    пропуски в ней видны по версиям, и тогда ответ — "неизвестно".
+
+    Файлы старого формата (просто список заметок) читаются как версия 0.
+    Каждая заметка записывается отдельной строкой, а iter_data и
+    append_stream обрабатывают файл потоково, не загружая его целиком.
+
+    Вместе с файлом записывается боковой индекс '<имя>.idx': для каждой
+    заметки — смещение и длина ее строки в байтах, а также название, дата,
+    версия и теги. По индексу open_indexed позволяет получить заголовки заметок
+    без разбора текстов, а read_text — прочитать текст одной заметки.
+
+    По умолчанию дата заметки хранится строкой "ДД.ММ.ГГГГ ЧЧ:ММ", как
+    раньше. В компактном формате (compact_dates=True) вместо поля "date"
+    записывается "ts" — число секунд (см. core.note_dates); читаются оба
+    варианта, поэтому файлы можно переключать между форматами.
+
+    Если задан blob_threshold, тексты не короче порога выносятся в
+    BlobStore — каталог '<имя>.blobs' рядом с файлом, — а в записи заметки
+    остаются только "blob" (хеш) и "length" (длина текста). Одинаковые
+    тексты хранятся один раз. После каждой записи пересчитываются ссылки
+    на вынесенные тексты, и тексты удаленных заметок удаляются. Записи
+    с вынесенным текстом читаются всегда, независимо от порога; to_note
+    возвращает для них LazyNote, читающую текст при обращении.
+
+    Время чтения и записи замеряется через core.metrics под именами
+    "JsonStorage.<метод>".
+
     Attributes:
         filepath: Путь к JSON-файлу для хранения заметок.
+        lockpath: Путь к файлу блокировки.
+        indexpath: Путь к файлу бокового индекса.
+        logpath: Путь к журналу изменений.
+        feedpath: Путь к ленте изменений.
+        compact_dates: Записывать даты числом секунд в поле "ts".
+        blob_threshold: Длина текста в символах, начиная с которой текст
+                        выносится в blobs, или None — не выносить.
+        blobs: Хранилище вынесенных текстов.
+        __log_lock: Блокировка разобранного состояния журнала между потоками.
+        __log_base: Версия файла, к которой относится разобранный журнал.
+        __log_parsed: Количество разобранных байт журнала.
+        __log_version: Версия файла с учетом журнала.
+        __log_next_id: Счетчик next_id из журнала или 0.
+        __log_latest: Последняя запись журнала по ID (None — надгробие) в
+                      порядке первого появления ID.
+        __offsets: ((версия, размер) файла, отсортированные ID, смещения и
+                   длины их строк) или None.
     """
 
-    def __init__(self, filepath: str = "data/notes.json") -> None:
+    LOG_COMPACT_RATIO = 0.5
+    LOG_COMPACT_MIN = 1 << 16
+    FEED_MAX_BYTES = 1 << 20
+
+    def __init__(
+        self,
+        filepath: str = "data/notes.json",
+        compact_dates: bool = False,
+        blob_threshold: Optional[int] = None
+    ) -> None:
         """Инициализирует JSON-хранилище.
 
         Args:
             filepath: Путь к JSON-файлу для хранения заметок.
                       По умолчанию "data/notes.json".
+            compact_dates: Записывать даты числом секунд. По умолчанию False.
+            blob_threshold: Выносить тексты не короче этой длины в
+                            BlobStore. По умолчанию None — не выносить.
         """
+        self.compact_dates: bool = compact_dates
+        self.blob_threshold: Optional[int] = blob_threshold
         self.filepath: Path = Path(filepath)
+        self.lockpath: Path = self.filepath.with_name(self.filepath.name + ".lock")
+        self.indexpath: Path = self.filepath.with_name(self.filepath.name + ".idx")
+        self.logpath: Path = self.filepath.with_name(self.filepath.name + ".log")
+        self.feedpath: Path = self.filepath.with_name(self.filepath.name + ".feed")
+        self.blobs: BlobStore = BlobStore(str(self.filepath.with_name(self.filepath.name + ".blobs")))
+        self.__log_lock = Lock()
+        self.__log_base: Optional[int] = None
+        self.__log_parsed: int = 0
+        self.__log_version: int = 0
+        self.__log_next_id: int = 0
+        self.__log_latest: Dict[int, Optional[Dict[str, Any]]] = {}
+        self.__offsets: Optional[Tuple[Tuple[int, int], Tuple[array, array, array]]] = None
 
+    @metrics.timed("JsonStorage.read_data")
     def read_data(self) -> List[Dict[str, Any]]:
         """Читает данные из JSON-файла.
 
         Загружает данные из указанного JSON-файла. В случае отсутствия файла
-        или ошибки парсинга JSON возвращает пустой список.
+        возвращает пустой список.
 
         Returns:
-            Список словарей с данными заметок или пустой список при ошибке.
+            Список словарей с данными заметок.
+
+        Raises:
+            StorageCorruptedError: Если файл не является корректным JSON.
         """
-        try:
-            with open(self.filepath, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        return self.read_versioned()[1]
+
+    @metrics.timed("JsonStorage.read_versioned")
+    def read_versioned(self) -> Tuple[int, List[Dict[str, Any]]]:
+        """Читает данные и версию файла под разделяемой блокировкой.
+
+        Returns:
+            Кортеж (версия, список словарей с данными заметок). Для
+            отсутствующего файла возвращается (0, []).
+
+        Raises:
+            StorageCorruptedError: Если файл не является корректным JSON.
+        """
+        with self._locked(exclusive=False):
+            return self._read_unlocked()
+
+    def read_version(self) -> int:
+        """Возвращает текущую версию файла под разделяемой блокировкой.
+
+        Версия берется из заголовка, заметки не разбираются.
+
+        Returns:
+            Версия файла (0 для отсутствующего файла или старого формата).
+        """
+        with self._locked(exclusive=False):
+            return self._read_version_unlocked()
+
+    def read_records(self, note_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Читает записи по ID под разделяемой блокировкой, не перебирая файл.
+
+        Записи находятся так же, как в update_record: по журналу изменений
+        или по смещению строки в файле.
+
+        Args:
+            note_ids: ID записей.
+
+        Returns:
+            Найденные записи в порядке переданных ID.
+
+        Raises:
+            StorageCorruptedError: Если файл поврежден.
+        """
+        with self._locked(exclusive=False):
+            found = (self.__find_record_unlocked(note_id) for note_id in note_ids)
+            return [record for record in found if record is not None]
+
+    def changes_after(self, version: Optional[int]) -> Tuple[int, Optional[Set[int]]]:
+        """Возвращает текущую версию и ID записей, измененных после version.
+
+        Ответ собирается по ленте изменений: для каждой версии после
+        version в ней должна быть строка с ID. Лишние ID (например, от
+        записи, прерванной после отметки в ленте) возможны, пропущенные —
+        нет.
+
+        Args:
+            version: Версия, с которой нужны изменения, или None.
+
+        Returns:
+            Кортеж (текущая версия, множество ID добавленных, измененных и
+            удаленных записей). Вместо множества возвращается None, если
+            version не задана или изменения после нее неизвестны: лента
+            обрезана или потеряна, файл перезаписан целиком.
+        """
+        with self._locked(exclusive=False):
+            current = self._read_version_unlocked()
+            if version is None or version > current:
+                return current, None
+            if version == current:
+                return current, set()
+            try:
+                with open(self.feedpath, "rb") as f:
+                    lines = f.read().splitlines(keepends=True)
+            except FileNotFoundError:
+                return current, None
+        changed: Set[int] = set()
+        expected = version + 1
+        for line in lines:
+            entry = _decode_log_line(line)
+            if entry is None or entry["version"] <= version:
+                continue
+            if entry["version"] > expected or entry["ids"] is None:
+                return current, None
+            changed.update(entry["ids"])
+            expected = max(expected, entry["version"] + 1)
+        if expected <= current:
+            return current, None
+        return current, changed
+
+    def open_indexed(
+        self
+    ) -> Optional[Tuple[int, BinaryIO, List[Union[IndexEntry, Dict[str, Any]]]]]:
+        """Открывает файл для чтения текстов по боковому индексу.
+
+        Индекс сверяется с версией и размером файла; устаревший или
+        отсутствующий индекс перестраивается одним проходом по файлу.
+        Возвращаемый дескриптор ссылается на прочитанную версию файла,
+        поэтому тексты читаются из нее, даже если файл уже заменен.
+        Журнал изменений накладывается на записи индекса: заметки,
+        измененные или добавленные через журнал, возвращаются словарями
+        записей на своих местах, удаленные пропускаются.
+
+        Returns:
+            Кортеж (версия, открытый двоичный файл, записи индекса и
+            словари записей журнала) или None, если файла нет или его
+            раскладка не построчная (файлы, записанные старыми версиями
+            приложения).
+
+        Raises:
+            StorageCorruptedError: Если строка заметки повреждена.
+        """
+        with self._locked(exclusive=False):
+            try:
+                f = open(self.filepath, "rb")
+            except FileNotFoundError:
+                return None
+            base_version = self._read_base_version_unlocked()
+            size = os.fstat(f.fileno()).st_size
+            entries = self.__read_index(base_version, size)
+            if entries is None:
+                entries = self.__build_index(f, base_version, size)
+            if entries is None:
+                f.close()
+                return None
+            version, latest = self.__log_changes()
+            if latest:
+                entries = list(self.__merge(entries, latest, itemgetter(0)))
+            return version, f, entries
+
+    def read_text(self, f: BinaryIO, offset: int, length: int) -> str:
+        """Читает текст одной заметки по смещению из бокового индекса.
+
+        Вынесенный в BlobStore текст читается оттуда.
+
+        Args:
+            f: Файл, открытый через open_indexed.
+            offset: Смещение строки заметки в байтах.
+            length: Длина строки заметки в байтах.
+
+        Returns:
+            Текст заметки.
+        """
+        f.seek(offset)
+        item = json.loads(f.read(length).decode("utf-8"))
+        return item["text"] if "text" in item else self.blobs.get(item["blob"])
+
+    @metrics.timed("JsonStorage.iter_data")
+    def iter_data(self) -> Iterator[Dict[str, Any]]:
+        """Потоково читает заметки из JSON-файла.
+
+        Файл разбирается порциями, поэтому в памяти одновременно находится
+        только одна заметка (и буфер чтения). Разделяемая блокировка
+        удерживается до окончания перебора.
+
+        Yields:
+            Словари с данными заметок в порядке хранения.
+
+        Raises:
+            StorageCorruptedError: Если файл не является корректным JSON.
+        """
+        with self._locked(exclusive=False):
+            yield from self._iter_unlocked()
+
+    def read_next_id(self) -> int:
+        """Возвращает сохраненный счетчик следующего ID под разделяемой блокировкой.
 
-    def write_data(self, data: List[Dict[str, Any]]) -> None:
+        Счетчик читается с конца файла, заметки не разбираются.
+
+        Returns:
+            Следующий свободный ID или 0, если файла нет или он записан
+            без счетчика (старый формат).
+        """
+        with self._locked(exclusive=False):
+            return self._read_next_id_unlocked()
+
+    @metrics.timed("JsonStorage.write_data")
+    def write_data(
+        self,
+        data: Iterable[Dict[str, Any]],
+        expected_version: Optional[int] = None,
+        next_id: int = 0
+    ) -> int:
         """Записывает данные в JSON-файл.
 
         Сохраняет переданные данные в указанный JSON-файл с форматированием
-        и поддержкой кириллицы.
+        и поддержкой кириллицы. Запись атомарна: другие процессы видят либо
+        старое, либо новое содержимое файла целиком.
+
+        Args:
+            data: Последовательность словарей с данными заметок для сохранения.
+            expected_version: Версия файла, на основе которой подготовлены
+                              данные. Если файл с тех пор изменился, запись
+                              отклоняется. None — записать без проверки.
+            next_id: Нижняя граница счетчика следующего ID (см.
+                     _write_unlocked).
+
+        Returns:
+            Новая версия файла.
+
+        Raises:
+            StorageConflictError: Если текущая версия файла не совпадает
+                                  с expected_version.
+        """
+        with self._locked(exclusive=True):
+            version = self._read_version_unlocked()
+            if expected_version is not None and version != expected_version:
+                raise StorageConflictError(expected_version, version)
+            self._write_unlocked(data, version + 1, next_id)
+            return version + 1
+
+    @metrics.timed("JsonStorage.modify")
+    def modify(
+        self,
+        mutator: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+    ) -> Tuple[int, int]:
+        """Атомарно читает, изменяет и записывает данные.
+
+        Вся операция выполняется под исключительной блокировкой, поэтому
+        изменения нескольких процессов применяются последовательно и не
+        теряются (например, одновременное добавление заметок).
+
+        Args:
+            mutator: Функция, получающая текущий список словарей и
+                     возвращающая новый.
+
+        Returns:
+            Кортеж (версия до изменения, новая версия).
+
+        Raises:
+            StorageCorruptedError: Если файл не является корректным JSON.
+        """
+        with self._locked(exclusive=True):
+            version, data = self._read_unlocked()
+            self._write_unlocked(mutator(data), version + 1)
+            return version, version + 1
+
+    @metrics.timed("JsonStorage.apply_changes")
+    def apply_changes(
+        self,
+        records: List[Dict[str, Any]],
+        deleted: Iterable[int] = ()
+    ) -> Tuple[int, int]:
+        """Атомарно заменяет, дописывает и удаляет записи по ID.
+
+        Запись с тем же ID заменяется на месте, новая дописывается в
+        конец, записи с ID из deleted удаляются. Изменения дописываются
+        одной строкой в журнал изменений под исключительной блокировкой,
+        поэтому цена зависит от их числа, а не от размера файла.
+
+        Args:
+            records: Словари заметок с ID.
+            deleted: ID удаляемых записей; отсутствующие пропускаются.
+
+        Returns:
+            Кортеж (версия до изменения, новая версия).
+
+        Raises:
+            StorageCorruptedError: Если файл поврежден.
+        """
+        with self._locked(exclusive=True):
+            version = self._read_version_unlocked()
+            put = [self.__prepare(item) for item in records]
+            next_id = max([self._read_next_id_unlocked()] + [item["id"] + 1 for item in put])
+            self.__append_log(put, list(deleted), version + 1, next_id)
+            self.__maybe_compact(version + 1)
+            return version, version + 1
+
+    @metrics.timed("JsonStorage.update_record")
+    def update_record(
+        self,
+        note_id: int,
+        mutator: Callable[[Optional[Dict[str, Any]]], Optional[Dict[str, Any]]]
+    ) -> Tuple[int, int]:
+        """Атомарно заменяет или удаляет одну запись по ID.
+
+        Текущая запись находится по журналу изменений или по смещению ее
+        строки в файле, без чтения остальных записей, а новая версия или
+        надгробие дописывается в журнал. Вся операция выполняется под
+        исключительной блокировкой.
+
+        Args:
+            note_id: ID записи.
+            mutator: Функция, получающая текущую запись (None, если ее
+                     нет) и возвращающая новую запись или None, чтобы
+                     удалить ее. Может выбросить исключение, тогда ничего
+                     не записывается.
+
+        Returns:
+            Кортеж (версия до изменения, новая версия).
+
+        Raises:
+            StorageCorruptedError: Если файл поврежден.
+        """
+        with self._locked(exclusive=True):
+            version = self._read_version_unlocked()
+            record = mutator(self.__find_record_unlocked(note_id))
+            put = [] if record is None else [self.__prepare(record)]
+            deleted = [note_id] if record is None else []
+            next_id = max(self._read_next_id_unlocked(), note_id + 1)
+            self.__append_log(put, deleted, version + 1, next_id)
+            self.__maybe_compact(version + 1)
+            return version, version + 1
+
+    @metrics.timed("JsonStorage.compact")
+    def compact(self) -> None:
+        """Переносит журнал изменений в файл и удаляет журнал.
+
+        Файл перезаписывается с той же версией: содержимое для читателей
+        не меняется.
+        """
+        with self._locked(exclusive=True):
+            version = self._read_version_unlocked()
+            if self.logpath.exists():
+                self._write_unlocked(self._iter_unlocked(), version)
+
+    @metrics.timed("JsonStorage.append_record")
+    def append_record(self, build: Callable[[int], Dict[str, Any]]) -> Tuple[int, int]:
+        """Атомарно дописывает запись с новым ID из счетчика файла.
+
+        ID берется из сохраненного счетчика next_id, поэтому не совпадает
+        с ID ранее удаленных заметок; для файлов без счетчика он
+        вычисляется по максимальному ID. Запись дописывается в журнал
+        изменений под исключительной блокировкой, файл не перезаписывается.
+
+        Args:
+            build: Функция, получающая выделенный ID и возвращающая
+                   словарь заметки.
+
+        Returns:
+            Кортеж (версия до изменения, новая версия).
+
+        Raises:
+            StorageCorruptedError: Если файл поврежден.
+        """
+        with self._locked(exclusive=True):
+            version = self._read_version_unlocked()
+            next_id = self._read_next_id_unlocked()
+            if not self.__read_base_next_id_unlocked():
+                # Файл без счетчика (старый формат): ID считаем по записям.
+                next_id = max(
+                    next_id, max((item["id"] for item in self._iter_unlocked()), default=0) + 1
+                )
+            next_id = max(next_id, 1)
+            self.__append_log([self.__prepare(build(next_id))], [], version + 1, next_id + 1)
+            self.__maybe_compact(version + 1)
+            return version, version + 1
+
+    @metrics.timed("JsonStorage.append_stream")
+    def append_stream(
+        self,
+        records: Iterable[Dict[str, Any]],
+        batch_size: int = 10000,
+        on_batch: Optional[Callable[[int], None]] = None
+    ) -> Tuple[int, int]:
+        """Потоково дописывает заметки в конец файла одной атомарной записью.
+
+        Существующие заметки и новые записи копируются во временный файл
+        без загрузки в память целиком; новым записям выделяются ID блоками
+        по batch_size, начиная со счетчика next_id (но не меньше следующего
+        после максимального ID).
+        Файл заменяется один раз в конце, поэтому прерванный импорт не
+        оставляет частично записанных данных.
+
+        Args:
+            records: Словари заметок без поля id.
+            batch_size: Размер блока записей (и выделяемых ID).
+            on_batch: Функция, вызываемая после каждого блока с общим
+                      количеством дописанных записей.
+
+        Returns:
+            Кортеж (количество дописанных записей, новая версия файла).
+
+        Raises:
+            StorageCorruptedError: Если текущий файл поврежден.
+        """
+        counters = {"next_id": 1, "count": 0}
+
+        def existing() -> Iterator[Dict[str, Any]]:
+            for item in self._iter_unlocked():
+                counters["next_id"] = max(counters["next_id"], item["id"] + 1)
+                yield item
+
+        def appended() -> Iterator[Dict[str, Any]]:
+            iterator = iter(records)
+            while True:
+                batch = list(islice(iterator, batch_size))
+                if not batch:
+                    return
+                first_id = counters["next_id"]
+                counters["next_id"] += len(batch)
+                for note_id, item in zip(range(first_id, first_id + len(batch)), batch):
+                    yield {"id": note_id, **item}
+                counters["count"] += len(batch)
+                if on_batch is not None:
+                    on_batch(counters["count"])
+
+        with self._locked(exclusive=True):
+            version = self._read_version_unlocked() + 1
+            counters["next_id"] = max(1, self._read_next_id_unlocked())
+            self._write_unlocked(chain(existing(), appended()), version)
+            return counters["count"], version
+
+    @contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[None]:
+        """Удерживает блокировку файла на время операции.
+
+        Args:
+            exclusive: True — исключительная блокировка для записи,
+                       False — разделяемая для чтения.
+        """
+        if fcntl is None:
+            yield
+            return
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lockpath, "a+") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _read_unlocked(self) -> Tuple[int, List[Dict[str, Any]]]:
+        """Читает версию и данные файла с наложенным журналом без блокировки.
+
+        Returns:
+            Кортеж (версия, список словарей с данными заметок).
+
+        Raises:
+            StorageCorruptedError: Если файл не является корректным JSON.
+        """
+        version, latest = self.__log_changes()
+        data = self.__read_base_unlocked()[1]
+        if latest:
+            data = list(self.__merge(data, latest, _record_id))
+        return version, data
+
+    def _iter_unlocked(self) -> Iterator[Dict[str, Any]]:
+        """Потоково разбирает заметки файла с наложенным журналом без блокировки.
+
+        Yields:
+            Словари с данными заметок.
+
+        Raises:
+            StorageCorruptedError: Если файл не является корректным JSON.
+        """
+        latest = self.__log_changes()[1]
+        items = self.__iter_base_unlocked()
+        yield from self.__merge(items, latest, _record_id) if latest else items
+
+    def __read_base_unlocked(self) -> Tuple[int, List[Dict[str, Any]]]:
+        """Читает версию и записи самого файла, без журнала.
+
+        Returns:
+            Кортеж (версия, список словарей с данными заметок).
+
+        Raises:
+            StorageCorruptedError: Если файл не является корректным JSON.
+        """
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return 0, []
+        if not content.strip():
+            return 0, []
+        try:
+            payload = json.loads(content)
+        except json.JSONDecodeError as error:
+            raise StorageCorruptedError(f"Файл {self.filepath} поврежден: {error}") from error
+        if isinstance(payload, list):
+            return 0, payload
+        return payload.get("version", 0), payload.get("notes", [])
+
+    def __iter_base_unlocked(self) -> Iterator[Dict[str, Any]]:
+        """Потоково разбирает записи самого файла, без журнала.
+
+        Yields:
+            Словари с данными заметок.
+
+        Raises:
+            StorageCorruptedError: Если файл не является корректным JSON.
+        """
+        try:
+            f = open(self.filepath, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            buffer = f.read(_CHUNK_SIZE)
+            match = _HEADER_RE.match(buffer) or _LEGACY_RE.match(buffer)
+            if match is None:
+                # Пустой файл или нестандартная раскладка: разбираем целиком.
+                yield from self.__read_base_unlocked()[1]
+                return
+
+            decoder = json.JSONDecoder()
+            position = match.end()
+            eof = False
+            while True:
+                while position < len(buffer) and buffer[position] in _WHITESPACE:
+                    position += 1
+                if position == len(buffer):
+                    if eof:
+                        raise StorageCorruptedError(f"Файл {self.filepath} обрывается")
+                    more = f.read(_CHUNK_SIZE)
+                    eof = not more
+                    buffer, position = more, 0
+                    continue
+                if buffer[position] == "]":
+                    return
+                try:
+                    item, position = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError as error:
+                    if eof:
+                        raise StorageCorruptedError(
+                            f"Файл {self.filepath} поврежден: {error}"
+                        ) from error
+                    # Запись не поместилась в буфер: дочитываем и повторяем.
+                    more = f.read(max(_CHUNK_SIZE, len(buffer)))
+                    eof = not more
+                    buffer, position = buffer[position:] + more, 0
+                    continue
+                yield item
+
+    def _read_version_unlocked(self) -> int:
+        """Возвращает текущую версию файла с учетом журнала без блокировки.
+
+        Returns:
+            Версия файла (0 для отсутствующего файла или старого формата
+            без журнала).
+        """
+        self.__sync_log()
+        return self.__log_version
+
+    def _read_base_version_unlocked(self) -> int:
+        """Возвращает версию из заголовка самого файла без блокировки.
+
+        Версия читается без разбора заметок.
+
+        Returns:
+            Версия файла (0 для отсутствующего файла или старого формата).
+        """
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                head = f.read(_CHUNK_SIZE)
+        except FileNotFoundError:
+            return 0
+        match = _HEADER_RE.match(head)
+        if match is not None:
+            return int(match.group(1))
+        if _LEGACY_RE.match(head) or not head.strip():
+            return 0
+        return self.__read_base_unlocked()[0]
+
+    def _read_next_id_unlocked(self) -> int:
+        """Возвращает сохраненный счетчик следующего ID без блокировки.
+
+        Returns:
+            Наибольшее из значений next_id с конца файла и из журнала
+            или 0, если их нет.
+        """
+        self.__sync_log()
+        return max(self.__read_base_next_id_unlocked(), self.__log_next_id)
+
+    def __read_base_next_id_unlocked(self) -> int:
+        """Возвращает счетчик следующего ID с конца самого файла.
+
+        Returns:
+            Значение next_id или 0, если его нет.
+        """
+        try:
+            with open(self.filepath, "rb") as f:
+                f.seek(max(0, os.fstat(f.fileno()).st_size - _TAIL_SIZE))
+                tail = f.read()
+        except FileNotFoundError:
+            return 0
+        match = _NEXT_ID_RE.search(tail)
+        return int(match.group(1)) if match is not None else 0
+
+    def _write_unlocked(
+        self, data: Iterable[Dict[str, Any]], version: int, next_id: int = 0
+    ) -> None:
+        """Атомарно записывает данные и версию без блокировки.
+
+        Данные записываются потоково во временный файл в том же каталоге
+        (по одной заметке на строку), который после fsync заменяет
+        основной файл через os.replace. Боковой индекс пишется в том же
+        проходе и заменяется следом; если запись прервется между двумя
+        заменами, индекс не совпадет по версии и будет перестроен. После
+        замен сбрасывается на диск и сам каталог (fsync_directory).
+
+        Вынесенные тексты сохраняются до замены файла, а тексты, на которые
+        новый файл больше не ссылается, удаляются после нее.
+
+        Счетчик next_id записывается последней строкой файла, когда все
+        ID уже известны: это максимум из переданного next_id, счетчика
+        заменяемого файла и следующего после наибольшего записанного ID.
+
+        Журнал изменений удаляется после замены файла: переданные данные
+        уже включают его (или намеренно заменяют все заметки).
+
+        Args:
+            data: Последовательность словарей с данными заметок.
+            version: Версия, записываемая в файл.
+            next_id: Нижняя граница счетчика следующего ID.
+        """
+        if version != self._read_version_unlocked():
+            # Уплотнение журнала версию не меняет; остальные записи
+            # заменяют заметки целиком.
+            self.__append_feed(version, None)
+        next_id = max(next_id, self._read_next_id_unlocked(), 1)
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=self.filepath.name + ".", suffix=".tmp", dir=self.filepath.parent
+        )
+        index_fd, index_tmp_path = tempfile.mkstemp(
+            prefix=self.indexpath.name + ".", suffix=".tmp", dir=self.filepath.parent
+        )
+        try:
+            os.chmod(tmp_path, 0o644)
+            os.chmod(index_tmp_path, 0o644)
+            with os.fdopen(fd, "wb") as f, os.fdopen(index_fd, "wb") as index:
+                offset = f.write(b'{\n    "version": %d,\n    "notes": [' % version)
+                separator = b"\n"
+                entries = []
+                refs: Counter = Counter()
+                for item in data:
+                    item = self.__prepare(item)
+                    if "blob" in item:
+                        refs[item["blob"]] += 1
+                    next_id = max(next_id, item["id"] + 1)
+                    offset += f.write(separator)
+                    line = _RECORD_INDENT + json.dumps(item, ensure_ascii=False).encode("utf-8")
+                    entries.append(self.__index_line(item, offset, len(line)))
+                    if len(entries) >= 1000:
+                        index.write(b"".join(entries))
+                        entries.clear()
+                    offset += f.write(line)
+                    separator = b",\n"
+                offset += f.write(
+                    (b"\n    ],\n" if separator != b"\n" else b"],\n")
+                    + b'    "next_id": %d\n}\n' % next_id
+                )
+                f.flush()
+                os.fsync(f.fileno())
+                index.write(b"".join(entries))
+                index.write(json.dumps({"version": version, "size": offset}).encode("utf-8") + b"\n")
+            os.replace(tmp_path, self.filepath)
+            os.replace(index_tmp_path, self.indexpath)
+            fsync_directory(self.filepath.parent)
+            try:
+                os.unlink(self.logpath)
+            except FileNotFoundError:
+                pass
+        except BaseException:
+            for path in (tmp_path, index_tmp_path):
+                if os.path.exists(path):
+                    os.unlink(path)
+            raise
+        if refs or self.blobs.directory.exists():
+            self.blobs.update_refs(refs)
+
+    def __prepare(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Приводит запись заметки к виду, в котором она хранится в этом файле.
+
+        Args:
+            item: Словарь с данными заметки.
+
+        Returns:
+            Словарь с датой в компактном формате и вынесенным текстом,
+            если это включено.
+        """
+        if self.compact_dates:
+            item = self.__compact(item)
+        if self.blob_threshold is not None and len(item.get("text", "")) >= self.blob_threshold:
+            item = self.__externalize(item)
+        return item
+
+    def __sync_log(self) -> None:
+        """Дочитывает журнал изменений с места, до которого он уже разобран.
+
+        Вызывается под блокировкой файла. Если файл заменен (изменилась
+        его версия) или журнал укорочен, журнал разбирается заново.
+        Разбор останавливается на первой недописанной или поврежденной
+        строке.
+        """
+        base = self._read_base_version_unlocked()
+        with self.__log_lock:
+            try:
+                size = os.stat(self.logpath).st_size
+            except FileNotFoundError:
+                size = 0
+            if self.__log_base != base or size < self.__log_parsed:
+                self.__log_base = base
+                self.__log_parsed = 0
+                self.__log_version = base
+                self.__log_next_id = 0
+                self.__log_latest = {}
+            if size <= self.__log_parsed:
+                return
+            with open(self.logpath, "rb") as f:
+                f.seek(self.__log_parsed)
+                chunk = f.read(size - self.__log_parsed)
+            for line in chunk.splitlines(keepends=True):
+                entry = _decode_log_line(line)
+                if entry is None:
+                    break
+                self.__log_parsed += len(line)
+                if entry["version"] <= base:
+                    # Уже в файле: сбой между заменой файла и удалением журнала.
+                    continue
+                self.__log_version = max(self.__log_version, entry["version"])
+                self.__log_next_id = max(self.__log_next_id, entry["next_id"])
+                for item in entry["put"]:
+                    self.__log_latest[item["id"]] = item
+                for note_id in entry["delete"]:
+                    self.__log_latest[note_id] = None
+
+    def __log_changes(self) -> Tuple[int, Dict[int, Optional[Dict[str, Any]]]]:
+        """Возвращает версию файла с учетом журнала и свертку журнала.
+
+        Вызывается под блокировкой файла.
+
+        Returns:
+            Кортеж (версия, копия последних записей журнала по ID; None —
+            заметка удалена).
+        """
+        self.__sync_log()
+        with self.__log_lock:
+            return self.__log_version, dict(self.__log_latest)
+
+    @staticmethod
+    def __merge(
+        items: Iterable[Any],
+        latest: Dict[int, Optional[Dict[str, Any]]],
+        key: Callable[[Any], int]
+    ) -> Iterator[Any]:
+        """Накладывает свертку журнала на записи файла.
+
+        Записи с ID из журнала заменяются его версией на своем месте или
+        пропускаются, если заметка удалена; заметки, которых в файле нет,
+        дописываются в конец в порядке журнала.
+
+        Args:
+            items: Записи файла (словари или записи индекса).
+            latest: Последние записи журнала по ID.
+            key: Функция, возвращающая ID записи файла.
+
+        Yields:
+            Записи файла и словари записей журнала.
+        """
+        seen = set()
+        for item in items:
+            note_id = key(item)
+            if note_id not in latest:
+                yield item
+                continue
+            seen.add(note_id)
+            if latest[note_id] is not None:
+                yield latest[note_id]
+        for note_id, record in latest.items():
+            if record is not None and note_id not in seen:
+                yield record
+
+    def __append_log(
+        self, put: List[Dict[str, Any]], deleted: List[int], version: int, next_id: int
+    ) -> None:
+        """Дописывает в журнал изменений одну строку и сбрасывает ее на диск.
+
+        Вызывается под исключительной блокировкой. Рваный хвост прерванной
+        записи отрезается перед дозаписью.
+
+        Args:
+            put: Новые версии записей.
+            deleted: ID удаленных записей.
+            version: Версия файла после изменения.
+            next_id: Счетчик следующего ID после изменения.
+        """
+        payload = json.dumps(
+            {"version": version, "next_id": next_id, "put": put, "delete": deleted},
+            ensure_ascii=False
+        ).encode("utf-8")
+        self.__append_feed(version, [item["id"] for item in put] + deleted)
+        self.__sync_log()
+        created = not self.logpath.exists()
+        with open(self.logpath, "ab") as f:
+            if f.tell() > self.__log_parsed:
+                f.truncate(self.__log_parsed)
+            f.write(b"%08x %s\n" % (zlib.crc32(payload), payload))
+            f.flush()
+            os.fsync(f.fileno())
+        if created:
+            fsync_directory(self.filepath.parent)
+
+    def __append_feed(self, version: int, ids: Optional[List[int]]) -> None:
+        """Отмечает в ленте изменений новую версию и затронутые ID.
+
+        Вызывается под исключительной блокировкой до самой записи, поэтому
+        лента может назвать лишний ID, но не пропустить измененный. Лента,
+        доросшая до FEED_MAX_BYTES, начинается заново.
+
+        Args:
+            version: Версия файла после изменения.
+            ids: ID затронутых записей или None для полной перезаписи.
+        """
+        payload = json.dumps({"version": version, "ids": ids}).encode("utf-8")
+        with open(self.feedpath, "ab") as f:
+            if f.tell() >= self.FEED_MAX_BYTES:
+                f.truncate(0)
+            f.write(b"%08x %s\n" % (zlib.crc32(payload), payload))
+
+    def __maybe_compact(self, version: int) -> None:
+        """Переносит журнал в файл, если он стал слишком длинным.
+
+        Вызывается под исключительной блокировкой после дозаписи журнала.
+        Файлы без счетчика next_id (старый формат) переписываются сразу,
+        чтобы следующие добавления не перебирали записи.
+
+        Args:
+            version: Текущая версия файла.
+        """
+        try:
+            log_size = os.stat(self.logpath).st_size
+        except FileNotFoundError:
+            return
+        try:
+            size = os.stat(self.filepath).st_size
+        except FileNotFoundError:
+            size = 0
+        legacy = size > 0 and not self.__read_base_next_id_unlocked()
+        if legacy or log_size >= max(self.LOG_COMPACT_MIN, size * self.LOG_COMPACT_RATIO):
+            self._write_unlocked(self._iter_unlocked(), version)
+
+    def __find_record_unlocked(self, note_id: int) -> Optional[Dict[str, Any]]:
+        """Находит текущую запись по ID без перебора файла.
+
+        Сначала проверяется журнал, затем строка файла читается по
+        смещению из отсортированных смещений (см. __base_offsets). Для
+        файлов с раскладкой не по строкам записи перебираются.
 
         Args:
-            data: Список словарей с данными заметок для сохранения.
+            note_id: ID записи.
+
+        Returns:
+            Словарь записи или None, если ее нет.
+
+        Raises:
+            StorageCorruptedError: Если файл поврежден.
+        """
+        self.__sync_log()
+        with self.__log_lock:
+            if note_id in self.__log_latest:
+                return self.__log_latest[note_id]
+        offsets = self.__base_offsets()
+        if offsets is None:
+            return next(
+                (item for item in self.__iter_base_unlocked() if item["id"] == note_id), None
+            )
+        ids, starts, lengths = offsets
+        position = bisect_left(ids, note_id)
+        if position == len(ids) or ids[position] != note_id:
+            return None
+        with open(self.filepath, "rb") as f:
+            f.seek(starts[position])
+            line = f.read(lengths[position])
+        try:
+            return json.loads(line.decode("utf-8"))
+        except ValueError as error:
+            raise StorageCorruptedError(f"Файл {self.filepath} поврежден: {error}") from error
+
+    def __base_offsets(self) -> Optional[Tuple[array, array, array]]:
+        """Возвращает отсортированные ID записей файла и смещения их строк.
+
+        Строятся по боковому индексу один раз для каждой версии и размера
+        файла (8 байт на значение в массивах).
+
+        Returns:
+            Кортеж массивов (ID, смещения, длины) или None, если файла нет
+            или его раскладка не построчная.
         """
-        with open(self.filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        try:
+            f = open(self.filepath, "rb")
+        except FileNotFoundError:
+            return None
+        with f:
+            key = (self._read_base_version_unlocked(), os.fstat(f.fileno()).st_size)
+            cached = self.__offsets
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            entries = self.__read_index(*key)
+            if entries is None:
+                entries = self.__build_index(f, *key)
+        if entries is None:
+            return None
+        entries.sort(key=itemgetter(0))
+        offsets = (
+            array("q", (entry[0] for entry in entries)),
+            array("q", (entry[1] for entry in entries)),
+            array("q", (entry[2] for entry in entries)),
+        )
+        self.__offsets = (key, offsets)
+        return offsets
+
+    def __externalize(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Выносит текст записи в BlobStore, оставляя хеш и длину.
+
+        Args:
+            item: Словарь с данными заметки.
+
+        Returns:
+            Словарь для записи со ссылкой на текст.
+        """
+        text = item["text"]
+        external: Dict[str, Any] = {}
+        for key, value in item.items():
+            if key == "text":
+                external["blob"] = self.blobs.put(text)
+                external["length"] = len(text)
+            else:
+                external[key] = value
+        return external
+
+    @staticmethod
+    def __compact(item: Dict[str, Any]) -> Dict[str, Any]:
+        """Заменяет строковую дату записи числом секунд в поле "ts".
+
+        Нестандартная запись даты, которую нельзя восстановить из числа
+        секунд без изменений, остается строкой.
+
+        Args:
+            item: Словарь с данными заметки.
+
+        Returns:
+            Словарь для записи в компактном формате.
+        """
+        date = item.get("date")
+        seconds = to_epoch(date) if isinstance(date, str) else None
+        if seconds is None or from_epoch(seconds) != date:
+            return item
+        compact = {key: value for key, value in item.items() if key != "date"}
+        compact["ts"] = seconds
+        return compact
+
+    @staticmethod
+    def __index_line(item: Dict[str, Any], offset: int, length: int) -> bytes:
+        """Возвращает строку бокового индекса для одной заметки.
+
+        Args:
+            item: Словарь с данными заметки.
+            offset: Смещение строки заметки в байтах.
+            length: Длина строки заметки в байтах.
+
+        Returns:
+            Строка индекса в кодировке UTF-8.
+        """
+        blob = [item["blob"], item["length"]] if "blob" in item else None
+        entry = [
+            item["id"], offset, length, item["title"],
+            item.get("date", item.get("ts")), item.get("version", 1), blob,
+            item.get("tags", [])
+        ]
+        return json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    def __read_index(self, version: int, size: int) -> Optional[List[IndexEntry]]:
+        """Читает боковой индекс, если он соответствует файлу.
+
+        Последняя строка индекса — {"version": ..., "size": ...}: она
+        записывается в конце, поэтому недописанный индекс не проходит
+        проверку.
+
+        Args:
+            version: Текущая версия файла.
+            size: Текущий размер файла в байтах.
+
+        Returns:
+            Записи индекса или None, если индекса нет или он устарел.
+        """
+        try:
+            with open(self.indexpath, "rb") as index:
+                lines = index.read().splitlines()
+        except FileNotFoundError:
+            return None
+        try:
+            footer = json.loads(lines[-1]) if lines else None
+            if footer != {"version": version, "size": size}:
+                return None
+            entries = [tuple(json.loads(line)) for line in lines[:-1]]
+        except (ValueError, TypeError):
+            return None
+        # Индексы прежних версий не содержат вынесенных текстов и тегов.
+        if any(len(entry) != 8 for entry in entries):
+            return None
+        return entries
+
+    def __build_index(self, f: BinaryIO, version: int, size: int) -> Optional[List[IndexEntry]]:
+        """Строит боковой индекс по построчному файлу и сохраняет его.
+
+        Args:
+            f: Открытый двоичный файл заметок.
+            version: Версия файла.
+            size: Размер файла в байтах.
+
+        Returns:
+            Записи индекса или None, если раскладка файла не построчная.
+
+        Raises:
+            StorageCorruptedError: Если строка заметки повреждена.
+        """
+        f.seek(0)
+        header = f.readline()
+        if not header.lstrip().startswith(b"{"):
+            return None
+        lines: List[bytes] = []
+        entries: List[IndexEntry] = []
+        offset = len(header)
+        for raw in iter(f.readline, b""):
+            if raw.startswith(_RECORD_PREFIX):
+                line = raw.rstrip(b",\r\n")
+                try:
+                    item = json.loads(line.decode("utf-8"))
+                except ValueError as error:
+                    raise StorageCorruptedError(f"Файл {self.filepath} поврежден: {error}") from error
+                if not isinstance(item, dict) or "id" not in item:
+                    return None
+                lines.append(self.__index_line(item, offset, len(line)))
+                entries.append(tuple(json.loads(lines[-1])))
+            elif not raw.strip().startswith((b'"version"', b'"next_id"')) and raw.strip() not in (
+                b'"notes": [', b'"notes": []', b'"notes": [],', b"]", b"],", b"}", b""
+            ):
+                return None
+            offset += len(raw)
+        lines.append(json.dumps({"version": version, "size": size}).encode("utf-8") + b"\n")
+
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=self.indexpath.name + ".", suffix=".tmp", dir=self.filepath.parent
+        )
+        try:
+            os.chmod(tmp_path, 0o644)
+            with os.fdopen(fd, "wb") as index:
+                index.write(b"".join(lines))
+            os.replace(tmp_path, self.indexpath)
+        except OSError:
+            # Индекс — только ускорение: без права записи работаем без него.
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        return entries
 
     @staticmethod
     def note_to_dict(note: Note) -> Dict[str, Any]:
         """Преобразует объект Note в словарь.
 
         Сериализует объект Note в формат словаря, подходящий для JSON.
+        Поле tags записывается только для заметок с тегами, поэтому
+        записи без тегов не отличаются от прежнего формата.
 
         Args:
             note: Объект Note для преобразования.
 
         Returns:
-            Словарь с полями id, title, text и date.
+            Словарь с полями id, title, text, date, version и
+            (при наличии тегов) tags.
         """
-        return {
+        data = {
             "id": note.id,
             "title": note.title,
             "text": note.text,
-            "date": note.date
+            "date": note.date,
+            "version": note.version
         }
+        if note.tags:
+            data["tags"] = list(note.tags)
+        return data
 
     @staticmethod
     def dict_to_note(data: Dict[str, Any]) -> Note:
         """Преобразует словарь в объект Note.
 
-        Десериализует словарь с данными заметки в объект Note.
+        Десериализует словарь с данными заметки в объект Note. Поле version
+        необязательно: для записей старого формата используется версия 1.
+        Дата берется из поля "date" или, в компактном формате, "ts".
 
         Args:
-            data: Словарь с полями id, title, text и date.
+            data: Словарь с полями id, title, text, date (или ts) и
+                  (необязательно) version и tags.
 
         Returns:
             Объект Note, созданный из данных словаря.
@@ -90,5 +1318,60 @@ class JsonStorage:
             number=data["id"],
             title=data["title"],
             text=data["text"],
-            date=data["date"]
-        )
\ No newline at end of file
+            date=data["date"] if "date" in data else data["ts"],
+            version=data.get("version", 1),
+            tags=data.get("tags", ())
+        )
+
+    def to_note(self, data: Dict[str, Any]) -> Note:
+        """Преобразует запись файла в объект Note.
+
+        Для записи с вынесенным текстом возвращает LazyNote, которая
+        читает текст из BlobStore при первом обращении; остальные записи
+        преобразуются через dict_to_note.
+
+        Args:
+            data: Словарь с данными заметки из файла.
+
+        Returns:
+            Объект Note или LazyNote.
+        """
+        if "blob" not in data:
+            return self.dict_to_note(data)
+        return LazyNote(
+            data["id"],
+            data["title"],
+            data["date"] if "date" in data else data["ts"],
+            data.get("version", 1),
+            partial(self.blobs.get, data["blob"]),
+            (data["blob"], data["length"]),
+            data.get("tags", ())
+        )
+
+    def to_record(self, note: Note) -> Dict[str, Any]:
+        """Преобразует объект Note в запись для этого файла.
+
+        Если текст заметки уже лежит в BlobStore этого хранилища и не
+        менялся, в запись попадает только ссылка на него, и текст не
+        читается. Иначе запись совпадает с note_to_dict.
+
+        Args:
+            note: Объект Note для преобразования.
+
+        Returns:
+            Словарь с данными заметки.
+        """
+        blob = getattr(note, "blob", None)
+        if blob is None or blob[0] not in self.blobs:
+            return self.note_to_dict(note)
+        record = {
+            "id": note.id,
+            "title": note.title,
+            "blob": blob[0],
+            "length": blob[1],
+            "date": note.date,
+            "version": note.version
+        }
+        if note.tags:
+            record["tags"] = list(note.tags)
+        return record
@@ -0,0 +1,110 @@
+"""Модуль заметки с отложенной загрузкой текста."""
+
+from typing import Any, Callable, Iterable, Optional, Tuple, Union
+from core.note import Note
+
+
+class _LazyText:
+    """Дескриптор поля text, загружающий текст при первом обращении.
+
+    Загруженный или присвоенный текст хранится в слоте "_text" экземпляра
+    и повторно не читается.
+    """
+
+    def __get__(self, note: Optional["LazyNote"], owner: type) -> Any:
+        """Возвращает текст заметки, при необходимости загружая его.
+
+        Args:
+            note: Экземпляр заметки или None при обращении через класс.
+            owner: Класс заметки.
+
+        Returns:
+            Текст заметки или сам дескриптор при обращении через класс.
+        """
+        if note is None:
+            return self
+        try:
+            return note._text
+        except AttributeError:
+            text = note._loader()
+            object.__setattr__(note, "_text", text)
+            return text
+
+    def __set__(self, note: "LazyNote", value: str) -> None:
+        """Заменяет текст заметки без загрузки прежнего.
+
+        Args:
+            note: Экземпляр заметки.
+            value: Новый текст.
+        """
+        object.__setattr__(note, "_text", value)
+
+
+class LazyNote(Note):
+    """Заметка, текст которой читается из хранилища только при обращении.
+
+    Название, дата и версия известны сразу, а текст загружается функцией
+    loader при первом чтении поля text. Так перебор заголовков и дат не
+    требует чтения и разбора текстов. Изменение текста, как и у Note,
+    увеличивает версию.
+
+    Attributes:
+        blob: (хеш, длина) текста в BlobStore или None. Пока текст не
+              загружен и не изменен, при записи сохраняется только ссылка.
+    """
+
+    __slots__ = ("_loader", "_text", "blob")
+
+    text = _LazyText()
+
+    def __init__(
+        self,
+        number: int,
+        title: str,
+        date: Union[str, int],
+        version: int,
+        loader: Callable[[], str],
+        blob: Optional[Tuple[str, int]] = None,
+        tags: Iterable[str] = ()
+    ) -> None:
+        """Инициализирует заметку без текста.
+
+        Args:
+            number: Уникальный числовой идентификатор заметки.
+            title: Название (заголовок) заметки.
+            date: Дата создания заметки строкой или числом секунд.
+            version: Номер версии заметки.
+            loader: Функция, возвращающая текст заметки.
+            blob: (хеш, длина) текста в BlobStore, если текст вынесен туда.
+            tags: Теги заметки.
+        """
+        setattr_ = object.__setattr__
+        setattr_(self, "_loader", loader)
+        setattr_(self, "blob", blob)
+        setattr_(self, "version", version)
+        setattr_(self, "id", number)
+        setattr_(self, "title", title)
+        setattr_(self, "tags", self.normalize_tags(tags))
+        setattr_(self, "date", date)
+
+    @property
+    def text_loaded(self) -> bool:
+        """Возвращает True, если текст уже загружен или присвоен."""
+        return hasattr(self, "_text")
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Устанавливает атрибут и увеличивает версию при изменении данных.
+
+        Присваивание текста не загружает прежний текст из хранилища.
+
+        Args:
+            name: Имя атрибута.
+            value: Новое значение атрибута.
+        """
+        if name == "text":
+            # Мимо Note.__setattr__, чтобы не читать прежний текст.
+            object.__setattr__(self, "version", self.version + 1)
+            object.__setattr__(self, "blob", None)
+            object.__setattr__(self, name, value)
+            return
+        super().__setattr__(name, value)
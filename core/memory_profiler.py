@@ -0,0 +1,386 @@
+"""Модуль профилирования памяти операций состояний и стратегий."""
+
+import json
+import os
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+from core.metrics import metrics
+
+T = TypeVar("T")
+
+
+class _OperationStats:
+    """Накопленная статистика памяти одной операции.
+
+    Attributes:
+        calls: Количество профилированных вызовов.
+        peak: Наибольший пик памяти за вызов, в байтах сверх памяти на входе.
+        retained: Суммарная память, оставшаяся занятой после вызовов.
+        lines: Оставшаяся занятой память по (файл, строка).
+        modules: Оставшаяся занятой память по модулям.
+        peak_lines: Занятая память по (файл, строка) на пике вызова с
+                    наибольшим пиком (только для stream).
+    """
+
+    __slots__ = ("calls", "peak", "retained", "lines", "modules", "peak_lines")
+
+    def __init__(self) -> None:
+        """Инициализирует пустую статистику."""
+        self.calls: int = 0
+        self.peak: int = 0
+        self.retained: int = 0
+        self.lines: Counter = Counter()
+        self.modules: Counter = Counter()
+        self.peak_lines: List[Tuple[str, int]] = []
+
+
+class _Frame:
+    """Незавершенная операция на стеке профилировщика.
+
+    Attributes:
+        name: Имя операции.
+        start: Память, занятая на входе, в байтах.
+        peak: Пик памяти, замеченный до вложенных операций.
+        snapshot: Снимок tracemalloc на входе или None.
+        sampled: Память на момент последнего снимка пика, в байтах.
+        peak_lines: Занятая память по (файл, строка) в последнем снимке пика.
+    """
+
+    __slots__ = ("name", "start", "peak", "snapshot", "sampled", "peak_lines")
+
+    def __init__(self, name: str, start: int, snapshot: Optional[tracemalloc.Snapshot]) -> None:
+        """Инициализирует запись операции.
+
+        Args:
+            name: Имя операции.
+            start: Память, занятая на входе, в байтах.
+            snapshot: Снимок tracemalloc на входе или None.
+        """
+        self.name = name
+        self.start = start
+        self.peak = start
+        self.snapshot = snapshot
+        self.sampled = start
+        self.peak_lines: List[Tuple[str, int]] = []
+
+
+class MemoryProfiler:
+    """Замеряет пиковую и оставшуюся память каждой операции через tracemalloc.
+
+    Во включенном состоянии подключается к core.metrics, поэтому
+    профилируются все операции, которые там замеряются: load_notes,
+    save_notes и add_note состояний, execute стратегий, чтение и запись
+    JsonStorage и отрисовка окон. Для каждой операции запоминаются пик
+    памяти относительно входа и память, оставшаяся занятой после выхода.
+    Со снимками (snapshots=True) оставшаяся память дополнительно
+    раскладывается по строкам и модулям, где она была выделена.
+
+    Пик tracemalloc считает только общим числом, поэтому для потоковых
+    переборов (stream: вывод ResultStream, iter_results стратегий) пик
+    раскладывается по строкам отдельно: каждые sample_every элементов
+    проверяется занятая память, и когда она превышает память прошлого
+    снимка больше чем на PEAK_STEP, делается новый снимок и запоминаются
+    top_lines строк snapshot.statistics("lineno"). Последний такой снимок
+    отстоит от пика не больше чем на PEAK_STEP.
+
+    Вложенные операции (JsonState.load_notes вызывает
+    JsonStorage.read_versioned) учитываются и отдельно, и в пике внешней
+    операции. tracemalloc считает память всего процесса, поэтому операции
+    в других потоках попадают в пик текущей операции.
+
+    Attributes:
+        enabled: Флаг включенного профилирования.
+        snapshots: Делать снимки для разбивки по строкам и модулям.
+        frames: Глубина трассировки стека при выделении памяти.
+        sample_every: Количество элементов stream между проверками памяти.
+        top_lines: Количество строк в разбивке пика stream.
+        __operations: Статистика по имени операции.
+        __local: Стек незавершенных операций каждого потока.
+        __lock: Блокировка изменения статистики.
+        __started_tracing: Флаг того, что tracemalloc запущен профилировщиком.
+    """
+
+    PEAK_STEP = 0.1
+
+    def __init__(self) -> None:
+        """Инициализирует профилировщик в выключенном состоянии."""
+        self.enabled: bool = False
+        self.snapshots: bool = True
+        self.frames: int = 1
+        self.sample_every: int = 64
+        self.top_lines: int = 10
+        self.__operations: Dict[str, _OperationStats] = {}
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+        self.__started_tracing: bool = False
+
+    def enable(self, snapshots: bool = True, frames: int = 1) -> None:
+        """Включает профилирование и запускает tracemalloc.
+
+        Args:
+            snapshots: Делать снимки для разбивки по строкам и модулям
+                       (заметно медленнее). По умолчанию True.
+            frames: Глубина трассировки стека при выделении памяти.
+        """
+        self.snapshots = snapshots
+        self.frames = frames
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self.__started_tracing = True
+        self.enabled = True
+        metrics.attach_profiler(self)
+
+    def disable(self) -> None:
+        """Выключает профилирование, сохраняя собранную статистику."""
+        if not self.enabled:
+            return
+        metrics.detach_profiler()
+        self.enabled = False
+        if self.__started_tracing:
+            tracemalloc.stop()
+            self.__started_tracing = False
+
+    def reset(self) -> None:
+        """Удаляет собранную статистику."""
+        with self.__lock:
+            self.__operations.clear()
+
+    def begin(self, name: str) -> Optional[_Frame]:
+        """Отмечает начало операции.
+
+        Args:
+            name: Имя операции.
+
+        Returns:
+            Запись операции для end или None, если tracemalloc не запущен.
+        """
+        if not tracemalloc.is_tracing():
+            return None
+        stack: List[_Frame] = self.__stack()
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            # Сброс пика ниже потеряет пик внешней операции: сохраняем его.
+            stack[-1].peak = max(stack[-1].peak, peak)
+        snapshot = self.__snapshot() if self.snapshots else None
+        if snapshot is not None:
+            current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        frame = _Frame(name, current, snapshot)
+        stack.append(frame)
+        return frame
+
+    def end(self, frame: _Frame) -> None:
+        """Отмечает окончание операции и добавляет ее в статистику.
+
+        Args:
+            frame: Запись, возвращенная begin.
+        """
+        if not tracemalloc.is_tracing():
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        peak = max(frame.peak, peak)
+        stack: List[_Frame] = self.__stack()
+        while stack and stack.pop() is not frame:
+            pass
+        if stack:
+            stack[-1].peak = max(stack[-1].peak, peak)
+
+        lines: List[Tuple[str, int, int]] = []
+        if frame.snapshot is not None:
+            for stat in self.__snapshot().compare_to(frame.snapshot, "lineno"):
+                if stat.size_diff > 0:
+                    trace = stat.traceback[0]
+                    lines.append((trace.filename, trace.lineno, stat.size_diff))
+
+        with self.__lock:
+            stats = self.__operations.get(frame.name)
+            if stats is None:
+                stats = self.__operations[frame.name] = _OperationStats()
+            stats.calls += 1
+            if frame.peak_lines and peak - frame.start >= stats.peak:
+                stats.peak_lines = frame.peak_lines
+            stats.peak = max(stats.peak, peak - frame.start)
+            stats.retained += current - frame.start
+            for filename, lineno, size in lines:
+                stats.lines[f"{filename}:{lineno}"] += size
+                stats.modules[self.__module_name(filename)] += size
+
+    def stream(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        """Перебирает items как операцию name и раскладывает ее пик по строкам.
+
+        Операция длится от первого до последнего элемента (или до
+        закрытия итератора). Если tracemalloc не запущен, элементы
+        просто передаются дальше.
+
+        Args:
+            name: Имя операции.
+            items: Потоковый перебор, например iter_results стратегии.
+
+        Yields:
+            Элементы items.
+        """
+        frame = self.begin(name)
+        if frame is None:
+            yield from items
+            return
+        try:
+            for count, item in enumerate(items, 1):
+                yield item
+                if count % self.sample_every == 0:
+                    self.__sample_peak(frame)
+            self.__sample_peak(frame)
+        finally:
+            self.end(frame)
+
+    def measure(self, name: str, action: Callable[[], Any]) -> Tuple[int, int]:
+        """Выполняет действие как операцию и возвращает его память.
+
+        Профилировщик должен быть включен.
+
+        Args:
+            name: Имя операции.
+            action: Выполняемая функция.
+
+        Returns:
+            Кортеж (пик, оставшаяся память) этого вызова в байтах.
+        """
+        frame = self.begin(name)
+        if frame is None:
+            return 0, 0
+        try:
+            action()
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(frame.peak, peak) - frame.start
+            self.end(frame)
+        return peak, current - frame.start
+
+    def to_dict(self, top: int = 10) -> Dict[str, Any]:
+        """Возвращает статистику в виде словаря для JSON.
+
+        Args:
+            top: Количество строк и модулей с наибольшей памятью.
+
+        Returns:
+            Словарь имя операции -> {"calls", "peak", "retained",
+            "lines", "modules", "peak_lines"}; размеры в байтах.
+        """
+        with self.__lock:
+            return {
+                name: {
+                    "calls": stats.calls,
+                    "peak": stats.peak,
+                    "retained": stats.retained,
+                    "lines": dict(stats.lines.most_common(top)),
+                    "modules": dict(stats.modules.most_common(top)),
+                    "peak_lines": dict(stats.peak_lines[:top]),
+                }
+                for name, stats in sorted(self.__operations.items())
+            }
+
+    def report(self, top: int = 10) -> str:
+        """Формирует текстовый отчет.
+
+        Args:
+            top: Количество строк и модулей с наибольшей памятью на операцию.
+
+        Returns:
+            Многострочный отчет: пик и оставшаяся память каждой операции,
+            их разбивка по модулям и строкам и разбивка пика потоковых
+            переборов по строкам.
+        """
+        data = self.to_dict(top)
+        ordered = sorted(data.items(), key=lambda item: item[1]["peak"], reverse=True)
+        lines = ["Память операций (пик за вызов / оставлено всего, КБ):"]
+        for name, stats in ordered:
+            lines.append(
+                f"  {stats['peak'] / 1024:10.1f} {stats['retained'] / 1024:10.1f}  "
+                f"{name} ({stats['calls']} вызовов)"
+            )
+            for module, size in stats["modules"].items():
+                lines.append(f"      {size / 1024:10.1f}  модуль {module}")
+            for line, size in stats["lines"].items():
+                lines.append(f"      {size / 1024:10.1f}  {line}")
+            for line, size in stats["peak_lines"].items():
+                lines.append(f"      {size / 1024:10.1f}  на пике {line}")
+        return "\n".join(lines)
+
+    def write(self, path: str, top: int = 10) -> None:
+        """Записывает отчет в файл: JSON для '.json', иначе текст.
+
+        Args:
+            path: Путь к файлу отчета.
+            top: Количество строк и модулей с наибольшей памятью на операцию.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            if path.endswith(".json"):
+                json.dump(self.to_dict(top), f, ensure_ascii=False, indent=2)
+            else:
+                f.write(self.report(top) + "\n")
+
+    def __sample_peak(self, frame: _Frame) -> None:
+        """Делает снимок пика потокового перебора, если память заметно выросла.
+
+        Пик до снимка сохраняется в записи операции, а после снимка
+        сбрасывается, чтобы память самого снимка в него не попала.
+
+        Args:
+            frame: Запись операции stream.
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        frame.peak = max(frame.peak, peak)
+        if current <= frame.sampled + (frame.sampled - frame.start) * self.PEAK_STEP:
+            return
+        frame.sampled = current
+        frame.peak_lines = [
+            (f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size)
+            for stat in self.__snapshot().statistics("lineno")[:self.top_lines]
+        ]
+        tracemalloc.reset_peak()
+
+    def __stack(self) -> List[_Frame]:
+        """Возвращает стек незавершенных операций текущего потока.
+
+        Returns:
+            Список записей операций.
+        """
+        stack = getattr(self.__local, "stack", None)
+        if stack is None:
+            stack = self.__local.stack = []
+        return stack
+
+    @staticmethod
+    def __snapshot() -> tracemalloc.Snapshot:
+        """Делает снимок без выделений самого профилировщика и tracemalloc.
+
+        Returns:
+            Отфильтрованный снимок.
+        """
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+
+    @staticmethod
+    def __module_name(filename: str) -> str:
+        """Преобразует путь к файлу в имя модуля по sys.path.
+
+        Args:
+            filename: Путь к файлу исходного кода.
+
+        Returns:
+            Имя модуля вида "core.json_storage" или имя файла.
+        """
+        best = ""
+        for entry in sys.path:
+            root = os.path.abspath(entry or os.curdir) + os.sep
+            if filename.startswith(root) and len(root) > len(best):
+                best = root
+        relative = filename[len(best):] if best else os.path.basename(filename)
+        return os.path.splitext(relative)[0].replace(os.sep, ".")
+
+
+memory_profiler = MemoryProfiler()
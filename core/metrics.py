@@ -0,0 +1,316 @@
+"""Модуль сбора метрик времени выполнения горячих операций."""
+
+import inspect
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+from functools import wraps
+from threading import Lock
+from typing import Any, Callable, ContextManager, Deque, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+F = TypeVar("F", bound=Callable[..., Any])
+
+_DISABLED = nullcontext()
+
+
+class Metrics:
+    """Собирает длительности операций и счетчики для окна диагностики.
+
+    Операции оборачиваются через timed (функции и генераторы), timer
+    (участок кода) или iterate (перебор итератора). Для каждой операции
+    хранятся последние capacity длительностей, по которым summary считает
+    p50, p95 и максимум, а также общее число вызовов и суммарное время.
+
+    В выключенном состоянии обертки сразу вызывают исходную функцию, а
+    timer возвращает общий пустой контекстный менеджер, поэтому
+    накладные расходы сводятся к проверке флага.
+
+    Для генераторов учитывается только время внутри самого генератора:
+    время, которое потребитель тратит между получением элементов
+    (например, на вывод в Tk), в замер не входит.
+
+    К сборщику можно подключить профилировщик (attach_profiler) с
+    методами begin(name) и end(token): тогда те же обертки обычных
+    функций и timer сообщают ему о начале и конце каждой операции,
+    даже если замер времени выключен. Генераторы профилировщику не
+    передаются: их выполнение перемежается с кодом потребителя.
+
+    Attributes:
+        enabled: Флаг включенного сбора метрик.
+        active: Флаг того, что обертки должны что-то замерять (включен
+                сбор метрик или подключен профилировщик).
+        profiler: Подключенный профилировщик или None.
+        capacity: Количество последних длительностей, хранимых на операцию.
+        __samples: Последние длительности по имени операции, в секундах.
+        __calls: Общее число вызовов по имени операции.
+        __totals: Суммарное время по имени операции, в секундах.
+        __counters: Счетчики событий по имени.
+        __lock: Блокировка изменения словарей из разных потоков.
+    """
+
+    def __init__(self, capacity: int = 10000) -> None:
+        """Инициализирует сборщик в выключенном состоянии.
+
+        Args:
+            capacity: Количество последних длительностей на операцию.
+        """
+        self.enabled: bool = False
+        self.active: bool = False
+        self.profiler: Optional[Any] = None
+        self.capacity: int = capacity
+        self.__samples: Dict[str, Deque[float]] = {}
+        self.__calls: Dict[str, int] = {}
+        self.__totals: Dict[str, float] = {}
+        self.__counters: Dict[str, int] = {}
+        self.__lock = Lock()
+
+    def enable(self) -> None:
+        """Включает сбор метрик."""
+        self.enabled = True
+        self.active = True
+
+    def disable(self) -> None:
+        """Выключает сбор метрик, сохраняя собранные данные."""
+        self.enabled = False
+        self.active = self.profiler is not None
+
+    def attach_profiler(self, profiler: Any) -> None:
+        """Подключает профилировщик операций.
+
+        Args:
+            profiler: Объект с методами begin(name) -> token и end(token).
+        """
+        self.profiler = profiler
+        self.active = True
+
+    def detach_profiler(self) -> None:
+        """Отключает профилировщик операций."""
+        self.profiler = None
+        self.active = self.enabled
+
+    def reset(self) -> None:
+        """Удаляет все собранные длительности и счетчики."""
+        with self.__lock:
+            self.__samples.clear()
+            self.__calls.clear()
+            self.__totals.clear()
+            self.__counters.clear()
+
+    def record(self, name: str, seconds: float) -> None:
+        """Записывает длительность одного выполнения операции.
+
+        Args:
+            name: Имя операции.
+            seconds: Длительность в секундах.
+        """
+        with self.__lock:
+            samples = self.__samples.get(name)
+            if samples is None:
+                samples = self.__samples[name] = deque(maxlen=self.capacity)
+            samples.append(seconds)
+            self.__calls[name] = self.__calls.get(name, 0) + 1
+            self.__totals[name] = self.__totals.get(name, 0.0) + seconds
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Увеличивает счетчик события, если сбор включен.
+
+        Args:
+            name: Имя счетчика.
+            value: Величина увеличения.
+        """
+        if not self.enabled:
+            return
+        with self.__lock:
+            self.__counters[name] = self.__counters.get(name, 0) + value
+
+    def timer(self, name: str) -> ContextManager[Any]:
+        """Возвращает контекстный менеджер, замеряющий участок кода.
+
+        Args:
+            name: Имя операции.
+
+        Returns:
+            Замеряющий контекстный менеджер или пустой, если замерять нечего.
+        """
+        if not self.active:
+            return _DISABLED
+        return _Span(self, name)
+
+    def iterate(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """Перебирает итератор, суммируя время, проведенное внутри него.
+
+        Длительность записывается одной операцией, когда перебор
+        закончен или прерван.
+
+        Args:
+            name: Имя операции.
+            iterable: Замеряемая последовательность.
+
+        Yields:
+            Элементы исходной последовательности.
+        """
+        iterator = iter(iterable)
+        spent = 0.0
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    spent += time.perf_counter() - started
+                    return
+                spent += time.perf_counter() - started
+                yield item
+        finally:
+            self.record(name, spent)
+
+    def timed(self, name: str) -> Callable[[F], F]:
+        """Возвращает декоратор, замеряющий каждый вызов функции.
+
+        Для функций-генераторов замеряется весь перебор результата
+        (см. iterate). У обертки есть атрибут timed_name, исходная
+        функция доступна как __wrapped__.
+
+        Args:
+            name: Имя операции.
+
+        Returns:
+            Декоратор функции.
+        """
+        def decorate(func: F) -> F:
+            if inspect.isgeneratorfunction(func):
+                @wraps(func)
+                def generator_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    if not self.enabled:
+                        return func(*args, **kwargs)
+                    return self.iterate(name, func(*args, **kwargs))
+                generator_wrapper.timed_name = name  # type: ignore[attr-defined]
+                return generator_wrapper  # type: ignore[return-value]
+
+            @wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.active:
+                    return func(*args, **kwargs)
+                with _Span(self, name):
+                    return func(*args, **kwargs)
+            wrapper.timed_name = name  # type: ignore[attr-defined]
+            return wrapper  # type: ignore[return-value]
+        return decorate
+
+    def instrument(self, cls: type, names: Iterable[str]) -> None:
+        """Оборачивает методы класса в замер с именами "<Класс>.<метод>".
+
+        Унаследованные методы тоже оборачиваются, но под именем класса
+        cls; повторно обернутые методы сначала разворачиваются, поэтому
+        обертки не накапливаются по иерархии.
+
+        Args:
+            cls: Класс, методы которого оборачиваются.
+            names: Имена методов.
+        """
+        for method in names:
+            func = getattr(cls, method, None)
+            if func is None:
+                continue
+            while hasattr(func, "timed_name"):
+                func = func.__wrapped__
+            setattr(cls, method, self.timed(f"{cls.__name__}.{method}")(func))
+
+    def summary(self) -> Dict[str, Any]:
+        """Возвращает сводку по операциям и счетчикам.
+
+        Returns:
+            Словарь {"operations": {имя: {"count", "p50", "p95", "max",
+            "total"}}, "counters": {имя: значение}}; длительности в
+            миллисекундах.
+        """
+        with self.__lock:
+            samples = {name: sorted(values) for name, values in self.__samples.items()}
+            calls = dict(self.__calls)
+            totals = dict(self.__totals)
+            counters = dict(self.__counters)
+        operations = {}
+        for name in sorted(samples):
+            values = samples[name]
+            operations[name] = {
+                "count": calls[name],
+                "p50": self.__percentile(values, 0.50) * 1000,
+                "p95": self.__percentile(values, 0.95) * 1000,
+                "max": values[-1] * 1000,
+                "total": totals[name] * 1000,
+            }
+        return {"operations": operations, "counters": dict(sorted(counters.items()))}
+
+    def dump(self, path: str) -> None:
+        """Записывает сводку в JSON-файл.
+
+        Args:
+            path: Путь к файлу.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def __percentile(values: List[float], fraction: float) -> float:
+        """Возвращает перцентиль отсортированных значений (ближайший ранг).
+
+        Args:
+            values: Отсортированные значения.
+            fraction: Доля от 0 до 1.
+
+        Returns:
+            Значение перцентиля.
+        """
+        index = max(int(len(values) * fraction + 0.5) - 1, 0)
+        return values[min(index, len(values) - 1)]
+
+
+class _Span:
+    """Контекстный менеджер одной операции: замер времени и профилировщик.
+
+    Профилировщик начинает работу до замера времени и заканчивает после,
+    чтобы его собственные затраты не попадали в длительность операции.
+
+    Attributes:
+        __metrics: Сборщик метрик.
+        __name: Имя операции.
+        __started: Момент входа (time.perf_counter()) или None, если
+                   сбор времени выключен.
+        __token: Значение, возвращенное профилировщиком при начале операции.
+    """
+
+    __slots__ = ("__metrics", "__name", "__started", "__token")
+
+    def __init__(self, owner: Metrics, name: str) -> None:
+        """Инициализирует замер.
+
+        Args:
+            owner: Сборщик метрик.
+            name: Имя операции.
+        """
+        self.__metrics = owner
+        self.__name = name
+        self.__started: Optional[float] = None
+        self.__token: Any = None
+
+    def __enter__(self) -> "_Span":
+        """Сообщает профилировщику о начале операции и запоминает момент входа."""
+        profiler = self.__metrics.profiler
+        if profiler is not None:
+            self.__token = profiler.begin(self.__name)
+        if self.__metrics.enabled:
+            self.__started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Записывает длительность и сообщает профилировщику о конце операции."""
+        if self.__started is not None:
+            self.__metrics.record(self.__name, time.perf_counter() - self.__started)
+        profiler = self.__metrics.profiler
+        if profiler is not None and self.__token is not None:
+            profiler.end(self.__token)
+
+
+metrics = Metrics()
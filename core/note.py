@@ -1,28 +1,52 @@
 """Модуль модели заметки."""
 
-from datetime import datetime
-from typing import Optional
+from typing import Any, Iterable, Optional, Tuple, Union
+from core.note_dates import from_epoch, now_epoch, to_epoch
 
 
 class Note:
     """Модель данных для представления заметки.
 
     Хранит основную информацию о заметке: идентификатор, название,
-    текстовое содержание и дату создания.
+    текстовое содержание и дату создания. Любое изменение названия,
+    текста или даты увеличивает номер версии заметки, что позволяет
+    кэшам автоматически определять устаревшие данные.
+
+    Поля хранятся в __slots__, без словаря атрибутов на каждый экземпляр.
+    Дата хранится числом секунд (timestamp), поэтому сортировка и отбор
+    по диапазону дат — сравнения целых чисел. Строка даты в формате
+    "ДД.ММ.ГГГГ ЧЧ:ММ" создается при обращении к date и кэшируется
+    (общая для всех заметок той же минуты). Строка, не являющаяся датой
+    в этом формате, хранится как есть.
+
+    Теги хранятся кортежем без повторов в нижнем регистре и без
+    начального "#" (см. normalize_tags), поэтому "#Работа" и "работа" —
+    один тег.
 
     Attributes:
         id: Уникальный числовой идентификатор заметки.
         title: Название (заголовок) заметки.
         text: Текстовое содержание заметки.
-        date: Дата создания заметки в строковом формате.
+        timestamp: Дата создания в секундах (см. core.note_dates) или None,
+                   если дата задана строкой не в формате даты.
+        version: Номер версии заметки, увеличивается при каждом изменении.
+        tags: Теги заметки.
+        _raw_date: Исходная строка даты, если она не восстанавливается
+                   из timestamp, иначе None.
     """
 
+    __slots__ = ("id", "title", "text", "timestamp", "version", "tags", "_raw_date")
+
+    VERSIONED_FIELDS = frozenset(("title", "text", "date", "tags"))
+
     def __init__(
         self, 
         number: int, 
         title: str, 
         text: str, 
-        date: Optional[str] = None
+        date: Optional[Union[str, int]] = None,
+        version: int = 1,
+        tags: Iterable[str] = ()
     ) -> None:
         """Инициализирует объект заметки.
 
@@ -30,10 +54,99 @@ class Note:
             number: Уникальный числовой идентификатор заметки.
             title: Название (заголовок) заметки.
             text: Текстовое содержание заметки.
-            date: Дата создания заметки в строковом формате.
-                  Если не указана, будет использована текущая дата и время.
+            date: Дата создания заметки: строка "ДД.ММ.ГГГГ ЧЧ:ММ" или число
+                  секунд. Если не указана, будет использована текущая дата
+                  и время.
+            version: Номер версии заметки. По умолчанию 1.
+            tags: Теги заметки. По умолчанию без тегов.
+        """
+        # Первичная установка полей идет мимо __setattr__ и версию не меняет.
+        setattr_ = object.__setattr__
+        setattr_(self, "version", version)
+        setattr_(self, "id", number)
+        setattr_(self, "title", title)
+        setattr_(self, "text", text)
+        setattr_(self, "tags", self.normalize_tags(tags))
+        setattr_(self, "date", now_epoch() if date is None or date == "" else date)
+
+    @staticmethod
+    def normalize_tags(tags: Iterable[str]) -> Tuple[str, ...]:
+        """Приводит теги к виду, в котором они хранятся.
+
+        Args:
+            tags: Теги в любом регистре, с "#" или без.
+
+        Returns:
+            Кортеж непустых тегов в нижнем регистре без "#" и без
+            повторов, в исходном порядке.
+        """
+        if not tags:
+            return ()
+        cleaned = (tag.strip().lstrip("#").strip().lower() for tag in tags)
+        return tuple(dict.fromkeys(tag for tag in cleaned if tag))
+
+    @property
+    def date(self) -> str:
+        """Дата создания заметки в строковом формате."""
+        if self._raw_date is not None:
+            return self._raw_date
+        return from_epoch(self.timestamp)
+
+    @date.setter
+    def date(self, value: Union[str, int]) -> None:
+        """Устанавливает дату строкой или числом секунд.
+
+        Args:
+            value: Строка даты или число секунд.
+        """
+        setattr_ = object.__setattr__
+        if isinstance(value, int):
+            setattr_(self, "timestamp", value)
+            setattr_(self, "_raw_date", None)
+            return
+        timestamp = to_epoch(value)
+        setattr_(self, "timestamp", timestamp)
+        if timestamp is not None and from_epoch(timestamp) == value:
+            setattr_(self, "_raw_date", None)
+        else:
+            setattr_(self, "_raw_date", "" if value is None else str(value))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Устанавливает атрибут и увеличивает версию при изменении данных.
+
+        Args:
+            name: Имя атрибута.
+            value: Новое значение атрибута.
+        """
+        if name in self.VERSIONED_FIELDS or name == "timestamp":
+            object.__setattr__(self, "version", self.version + 1)
+        if name == "tags":
+            value = self.normalize_tags(value)
+        object.__setattr__(self, name, value)
+
+    def edited(self, title: str, text: str, tags: Optional[Iterable[str]] = None) -> "Note":
+        """Возвращает новую версию заметки с другим названием и текстом.
+
+        Исходная заметка не меняется, поэтому читатели, получившие ее
+        раньше, видят прежнее содержимое. ID и дата создания сохраняются.
+
+        Args:
+            title: Новое название.
+            text: Новый текст.
+            tags: Новые теги или None, чтобы оставить прежние.
+
+        Returns:
+            Новый объект Note с версией на единицу больше.
+        """
+        date = self.timestamp if self._raw_date is None else self._raw_date
+        tags = self.tags if tags is None else tags
+        return Note(self.id, title, text, date, self.version + 1, tags)
+
+    def __reduce__(self) -> Tuple[type, tuple]:
+        """Возвращает описание заметки для pickle без повышения версии.
+
+        Returns:
+            Кортеж (класс, аргументы конструктора).
         """
-        self.id: int = number
-        self.title: str = title
-        self.text: str = text
-        self.date: str = date or datetime.now().strftime("%d.%m.%Y %H:%M")
\ No newline at end of file
+        date = self.timestamp if self._raw_date is None else self._raw_date
+        return Note, (self.id, self.title, self.text, date, self.version, self.tags)
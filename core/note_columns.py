@@ -0,0 +1,319 @@
+"""Модуль поколоночного хранения заметок в памяти."""
+
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from core.note import Note
+from core.note_dates import from_epoch
+from core.tombstones import Tombstones
+
+# Отметка в колонке дат для строки, не разбираемой как дата заметки.
+_RAW_DATE = -(1 << 63)
+
+
+class NoteColumns(Sequence[Note]):
+    """Компактное хранилище заметок по колонкам.
+
+    ID, версии и даты (Note.timestamp) хранятся в массивах
+    array('q') по 8 байт на значение, названия и тексты — в таблице строк,
+    на которую ссылаются массивы индексов; одинаковые названия хранятся
+    в таблице один раз. Теги есть не у всех заметок и хранятся отдельно
+    по позиции заметки; строки тегов интернируются. Объекты Note не
+    хранятся: при обращении по индексу создается новая заметка из
+    значений колонок, поэтому изменения полученной заметки не попадают в
+    хранилище без replace.
+
+    replace и remove меняют колонки на месте: строка заметки находится
+    двоичным поиском по колонке ID (пока ID добавлялись по возрастанию),
+    замена переписывает значения строки, а удаление помечает ее в
+    Tombstones и освобождает текст. Когда удаленных строк больше живых
+    (или в таблице строк копятся названия, на которые никто не
+    ссылается), колонки уплотняются на месте. Объект хранилища не
+    заменяется, так что представления (SequenceView) над ним остаются
+    действительными.
+
+    Attributes:
+        __ids: ID заметок.
+        __versions: Версии заметок.
+        __dates: Даты заметок в секундах или _RAW_DATE.
+        __title_refs: Индексы названий в таблице строк.
+        __text_refs: Индексы текстов в таблице строк.
+        __strings: Таблица строк (названия и тексты).
+        __title_index: Индекс названия в таблице строк по его значению.
+        __raw_dates: Даты, не разбираемые как DATE_FORMAT, по позиции заметки.
+        __tags: Теги заметок с тегами по позиции заметки.
+        __dead: Отметки удаленных строк.
+        __sorted: Флаг того, что колонка ID упорядочена по возрастанию.
+    """
+
+    def __init__(self, notes: Iterable[Note] = ()) -> None:
+        """Инициализирует хранилище и добавляет заметки.
+
+        Args:
+            notes: Начальные заметки.
+        """
+        self.__ids = array("q")
+        self.__versions = array("q")
+        self.__dates = array("q")
+        self.__title_refs = array("q")
+        self.__text_refs = array("q")
+        self.__strings: List[str] = []
+        self.__title_index: Dict[str, int] = {}
+        self.__raw_dates: Dict[int, str] = {}
+        self.__tags: Dict[int, Tuple[str, ...]] = {}
+        self.__dead = Tombstones()
+        self.__sorted: bool = True
+        self.extend(notes)
+
+    def append(self, note: Note) -> None:
+        """Добавляет заметку в конец.
+
+        Args:
+            note: Добавляемая заметка.
+        """
+        position = len(self.__ids)
+        if position and note.id <= self.__ids[-1]:
+            self.__sorted = False
+        self.__title_refs.append(self.__title_ref(note.title))
+        self.__text_refs.append(len(self.__strings))
+        self.__strings.append(note.text)
+        self.__dates.append(self.__date(position, note))
+        if note.tags:
+            self.__tags[position] = tuple(sys.intern(tag) for tag in note.tags)
+        self.__ids.append(note.id)
+        self.__versions.append(note.version)
+
+    def extend(self, notes: Iterable[Note]) -> None:
+        """Добавляет заметки в конец.
+
+        Args:
+            notes: Добавляемые заметки.
+        """
+        for note in notes:
+            self.append(note)
+
+    def clear(self) -> None:
+        """Удаляет все заметки, не заменяя объект хранилища."""
+        for column in (self.__ids, self.__versions, self.__dates, self.__title_refs, self.__text_refs):
+            del column[:]
+        self.__strings.clear()
+        self.__title_index.clear()
+        self.__raw_dates.clear()
+        self.__tags.clear()
+        self.__dead.clear()
+        self.__sorted = True
+
+    def find(self, note_id: int) -> Optional[int]:
+        """Возвращает позицию заметки с заданным ID.
+
+        Args:
+            note_id: ID заметки.
+
+        Returns:
+            Позиция заметки среди заметок или None, если заметки нет.
+        """
+        position = self.__locate(note_id)
+        return None if position is None else self.__dead.logical(position)
+
+    def get(self, note_id: int) -> Optional[Note]:
+        """Возвращает заметку по ID.
+
+        Args:
+            note_id: ID заметки.
+
+        Returns:
+            Новый объект Note или None, если заметки нет.
+        """
+        position = self.__locate(note_id)
+        return None if position is None else self.__note(position)
+
+    def replace(self, note: Note) -> bool:
+        """Переписывает значения строки заметки с тем же ID на месте.
+
+        Args:
+            note: Новая версия заметки.
+
+        Returns:
+            True, если заметка найдена и заменена.
+        """
+        position = self.__locate(note.id)
+        if position is None:
+            return False
+        self.__raw_dates.pop(position, None)
+        self.__title_refs[position] = self.__title_ref(note.title)
+        self.__strings[self.__text_refs[position]] = note.text
+        self.__dates[position] = self.__date(position, note)
+        if note.tags:
+            self.__tags[position] = tuple(sys.intern(tag) for tag in note.tags)
+        else:
+            self.__tags.pop(position, None)
+        self.__versions[position] = note.version
+        if len(self.__strings) > 4 * len(self.__ids):
+            # Названия, на которые больше никто не ссылается.
+            self.__compact()
+        return True
+
+    def remove(self, note_id: int) -> bool:
+        """Помечает строку заметки удаленной и освобождает ее текст.
+
+        Args:
+            note_id: ID заметки.
+
+        Returns:
+            True, если заметка найдена и удалена.
+        """
+        position = self.__locate(note_id)
+        if position is None:
+            return False
+        self.__strings[self.__text_refs[position]] = ""
+        self.__raw_dates.pop(position, None)
+        self.__tags.pop(position, None)
+        self.__dead.add(position)
+        if len(self.__dead) * 2 > len(self.__ids):
+            self.__compact()
+        return True
+
+    def max_id(self) -> int:
+        """Возвращает наибольший ID или 0 для пустого хранилища."""
+        return max((self.__ids[p] for p in self.__dead.live(len(self.__ids))), default=0)
+
+    def __len__(self) -> int:
+        """Возвращает количество заметок."""
+        return len(self.__ids) - len(self.__dead)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Note, List[Note]]:
+        """Создает заметку (или список заметок среза) из значений колонок.
+
+        Args:
+            index: Позиция или срез.
+
+        Returns:
+            Новый объект Note или список объектов Note.
+        """
+        if isinstance(index, slice):
+            physical = self.__dead.physical
+            return [self.__note(physical(i)) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Индекс заметки вне диапазона")
+        return self.__note(self.__dead.physical(index))
+
+    def __iter__(self) -> Iterator[Note]:
+        """Перебирает заметки, создавая их по одной.
+
+        Заметки, удаленные во время перебора, пропускаются.
+        """
+        ids, dead = self.__ids, self.__dead
+        for position in dead.live(len(ids)):
+            if position < len(ids) and (not dead or position not in dead):
+                yield self.__note(position)
+
+    def nbytes(self) -> int:
+        """Оценивает объем памяти колонок и таблицы строк в байтах.
+
+        Returns:
+            Сумма размеров массивов, списка и уникальных строк.
+        """
+        arrays = (self.__ids, self.__versions, self.__dates, self.__title_refs, self.__text_refs)
+        return (
+            sum(sys.getsizeof(column) for column in arrays)
+            + sys.getsizeof(self.__strings)
+            + sum(sys.getsizeof(value) for value in self.__strings)
+            + sys.getsizeof(self.__title_index)
+            + sys.getsizeof(self.__tags)
+        )
+
+    def __locate(self, note_id: int) -> Optional[int]:
+        """Возвращает позицию строки живой заметки с заданным ID.
+
+        Args:
+            note_id: ID заметки.
+
+        Returns:
+            Позиция строки или None, если заметки нет.
+        """
+        ids = self.__ids
+        if self.__sorted:
+            position = bisect_left(ids, note_id)
+            while position < len(ids) and ids[position] == note_id:
+                if position not in self.__dead:
+                    return position
+                position += 1
+            return None
+        start = 0
+        while True:
+            try:
+                position = ids.index(note_id, start)
+            except ValueError:
+                return None
+            if position not in self.__dead:
+                return position
+            start = position + 1
+
+    def __title_ref(self, title: str) -> int:
+        """Возвращает индекс названия в таблице строк, добавляя его при необходимости.
+
+        Args:
+            title: Название заметки.
+
+        Returns:
+            Индекс названия в таблице строк.
+        """
+        ref = self.__title_index.get(title)
+        if ref is None:
+            ref = len(self.__strings)
+            self.__strings.append(title)
+            self.__title_index[title] = ref
+        return ref
+
+    def __date(self, position: int, note: Note) -> int:
+        """Возвращает значение колонки дат для заметки в позиции position.
+
+        Нестандартную запись даты (например, без ведущих нулей) хранит
+        как есть в __raw_dates, чтобы заметка возвращалась без изменений.
+
+        Args:
+            position: Позиция строки.
+            note: Заметка.
+
+        Returns:
+            Дата в секундах или _RAW_DATE.
+        """
+        seconds = note.timestamp
+        if seconds is not None and from_epoch(seconds) != note.date:
+            seconds = None
+        if seconds is None:
+            self.__raw_dates[position] = note.date
+            return _RAW_DATE
+        return seconds
+
+    def __compact(self) -> None:
+        """Убирает удаленные строки и лишние строки таблицы, не заменяя колонки.
+
+        Живые заметки собираются и записываются заново в те же колонки и
+        таблицу строк (clear и extend).
+        """
+        notes = list(self)
+        self.clear()
+        self.extend(notes)
+
+    def __note(self, index: int) -> Note:
+        """Создает заметку из значений колонок в позиции index.
+
+        Args:
+            index: Позиция заметки.
+
+        Returns:
+            Новый объект Note.
+        """
+        seconds = self.__dates[index]
+        return Note(
+            self.__ids[index],
+            self.__strings[self.__title_refs[index]],
+            self.__strings[self.__text_refs[index]],
+            self.__raw_dates[index] if seconds == _RAW_DATE else seconds,
+            self.__versions[index],
+            self.__tags.get(index, ())
+        )
@@ -0,0 +1,101 @@
+"""Модуль преобразования дат заметок между строкой и числом секунд."""
+
+import calendar
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Tuple
+
+DATE_FORMAT = "%d.%m.%Y %H:%M"
+DAY_FORMAT = "%d.%m.%Y"
+MONTH_FORMAT = "%m.%Y"
+
+
+@lru_cache(maxsize=1 << 16)
+def to_epoch(date: str) -> Optional[int]:
+    """Преобразует дату заметки в число секунд.
+
+    Дата трактуется как время без часового пояса (календарное время UTC),
+    поэтому преобразование обратимо через from_epoch без влияния
+    перехода на летнее время. Строки вида "ДД.ММ.ГГГГ ЧЧ:ММ" разбираются
+    срезами без strptime, а результаты кэшируются: у корпуса заметок
+    обычно немного различных минут.
+
+    Args:
+        date: Дата в формате DATE_FORMAT.
+
+    Returns:
+        Число секунд от начала эпохи или None, если строка не в формате
+        DATE_FORMAT.
+    """
+    if not isinstance(date, str):
+        return None
+    if (
+        len(date) == 16 and date[2] == "." and date[5] == "." and date[10] == " "
+        and date[13] == ":" and date.replace(".", "").replace(" ", "").replace(":", "").isdigit()
+    ):
+        day, month, year = int(date[0:2]), int(date[3:5]), int(date[6:10])
+        hour, minute = int(date[11:13]), int(date[14:16])
+        if 1 <= month <= 12 and 1 <= day <= calendar.monthrange(year, month)[1] \
+                and hour < 24 and minute < 60:
+            return calendar.timegm((year, month, day, hour, minute, 0))
+        return None
+    try:
+        return calendar.timegm(time.strptime(date, DATE_FORMAT))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=1 << 16)
+def from_epoch(seconds: int) -> str:
+    """Форматирует число секунд как дату заметки.
+
+    Результаты кэшируются, поэтому у заметок одной минуты дата
+    возвращается одним и тем же объектом строки.
+
+    Args:
+        seconds: Число секунд, полученное через to_epoch.
+
+    Returns:
+        Дата в формате DATE_FORMAT.
+    """
+    return time.strftime(DATE_FORMAT, time.gmtime(seconds))
+
+
+def now_epoch() -> int:
+    """Возвращает текущее местное время в секундах, как его вернул бы to_epoch.
+
+    Returns:
+        Число секунд с точностью до минуты.
+    """
+    now = datetime.now()
+    return calendar.timegm((now.year, now.month, now.day, now.hour, now.minute, 0))
+
+
+def parse_range(query: str) -> Optional[Tuple[int, int]]:
+    """Преобразует запрос даты в полуинтервал секунд [начало, конец).
+
+    Поддерживаются дата со временем ("ДД.ММ.ГГГГ ЧЧ:ММ" — одна минута),
+    день ("ДД.ММ.ГГГГ") и месяц ("ММ.ГГГГ").
+
+    Args:
+        query: Строка запроса.
+
+    Returns:
+        Кортеж (начало, конец) или None, если запрос не является датой.
+    """
+    query = query.strip()
+    start = to_epoch(query)
+    if start is not None:
+        return start, start + 60
+    for fmt in (DAY_FORMAT, MONTH_FORMAT):
+        try:
+            parsed = time.strptime(query, fmt)
+        except ValueError:
+            continue
+        start = calendar.timegm(parsed)
+        if fmt == DAY_FORMAT:
+            return start, start + 86400
+        year, month = parsed.tm_year + parsed.tm_mon // 12, parsed.tm_mon % 12 + 1
+        return start, calendar.timegm((year, month, 1, 0, 0, 0))
+    return None
@@ -0,0 +1,170 @@
+"""Модуль потокового экспорта заметок в JSONL, CSV и Markdown."""
+
+import csv
+import gzip
+import json
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional, TextIO
+from core.json_storage import JsonStorage
+from core.note import Note
+from state.base_state import BaseState
+from strategies.base_strategy import BaseStrategy
+
+
+class ExportReport:
+    """Итоги экспорта.
+
+    Attributes:
+        count: Количество выгруженных заметок.
+        seconds: Длительность экспорта в секундах.
+    """
+
+    def __init__(self, count: int, seconds: float) -> None:
+        """Инициализирует итоги экспорта.
+
+        Args:
+            count: Количество выгруженных заметок.
+            seconds: Длительность экспорта в секундах.
+        """
+        self.count: int = count
+        self.seconds: float = seconds
+
+
+class NoteExporter:
+    """Потоково выгружает заметки из любого состояния в файл.
+
+    Заметки берутся из BaseState.iter_notes по одной, при необходимости
+    фильтруются ленивым BaseStrategy.iter_matches и сразу записываются в
+    выходной поток, поэтому потребление памяти не зависит от размера
+    корпуса.
+
+    Attributes:
+        fmt: Формат выгрузки ("jsonl", "csv" или "md").
+    """
+
+    FORMATS = ("jsonl", "csv", "md")
+    CSV_FIELDS = ("id", "title", "text", "date", "version", "tags")
+
+    def __init__(self, fmt: str = "jsonl") -> None:
+        """Инициализирует экспортер.
+
+        Args:
+            fmt: Формат выгрузки ("jsonl", "csv" или "md").
+
+        Raises:
+            ValueError: Если формат не поддерживается.
+        """
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Неподдерживаемый формат экспорта: {fmt!r}")
+        self.fmt: str = fmt
+
+    def export(
+        self,
+        state: BaseState,
+        output: TextIO,
+        strategy: Optional[BaseStrategy] = None
+    ) -> ExportReport:
+        """Выгружает заметки состояния в открытый текстовый поток.
+
+        Args:
+            state: Источник заметок.
+            output: Текстовый поток для записи.
+            strategy: Стратегия поиска для фильтрации заметок или None.
+
+        Returns:
+            Итоги экспорта.
+        """
+        started = time.perf_counter()
+        notes: Iterable[Note] = state.iter_notes()
+        if strategy is not None:
+            notes = strategy.iter_matches(notes)
+        count = self.write(notes, output)
+        return ExportReport(count, time.perf_counter() - started)
+
+    def export_to_path(
+        self,
+        state: BaseState,
+        path: str,
+        strategy: Optional[BaseStrategy] = None,
+        compress: Optional[bool] = None
+    ) -> ExportReport:
+        """Выгружает заметки состояния в файл (или в stdout при path == "-").
+
+        Args:
+            state: Источник заметок.
+            path: Путь к выходному файлу или "-" для стандартного вывода.
+            strategy: Стратегия поиска для фильтрации заметок или None.
+            compress: Сжимать ли вывод gzip. По умолчанию — если путь
+                      оканчивается на ".gz".
+
+        Returns:
+            Итоги экспорта.
+        """
+        if compress is None:
+            compress = path.endswith(".gz")
+        with self.__open(path, compress) as output:
+            return self.export(state, output, strategy)
+
+    def write(self, notes: Iterable[Note], output: TextIO) -> int:
+        """Записывает заметки в поток в формате fmt.
+
+        Args:
+            notes: Заметки для записи.
+            output: Текстовый поток для записи.
+
+        Returns:
+            Количество записанных заметок.
+        """
+        count = 0
+        if self.fmt == "csv":
+            writer = csv.writer(output)
+            writer.writerow(self.CSV_FIELDS)
+            for note in notes:
+                writer.writerow(
+                    (note.id, note.title, note.text, note.date, note.version, " ".join(note.tags))
+                )
+                count += 1
+        elif self.fmt == "md":
+            for note in notes:
+                tags = " ".join("#" + tag for tag in note.tags)
+                output.write(
+                    f"## {note.title}\n\n"
+                    f"*{note.date}* · ID {note.id}\n\n"
+                    + (f"{tags}\n\n" if tags else "")
+                    + f"{note.text}\n\n---\n\n"
+                )
+                count += 1
+        else:
+            for note in notes:
+                output.write(json.dumps(JsonStorage.note_to_dict(note), ensure_ascii=False))
+                output.write("\n")
+                count += 1
+        return count
+
+    @staticmethod
+    @contextmanager
+    def __open(path: str, compress: bool) -> Iterator[TextIO]:
+        """Открывает выходной поток с учетом сжатия.
+
+        Args:
+            path: Путь к файлу или "-" для стандартного вывода.
+            compress: Сжимать ли вывод gzip.
+
+        Yields:
+            Открытый текстовый поток.
+        """
+        if path == "-":
+            if compress:
+                with gzip.open(sys.stdout.buffer, "wt", encoding="utf-8", newline="") as f:
+                    yield f
+            else:
+                yield sys.stdout
+            return
+        if compress:
+            with gzip.open(path, "wt", encoding="utf-8", newline="") as f:
+                yield f
+        else:
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                yield f
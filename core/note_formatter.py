@@ -0,0 +1,189 @@
+"""Модуль форматирования заметок с кэшем готовых текстовых блоков."""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Tuple
+from core.note import Note
+
+# Положения полей заметки в блоке: (имя поля, начало, конец).
+Fields = Tuple[Tuple[str, int, int], ...]
+
+
+class NoteFormatter:
+    """Форматирует заметки в текстовые блоки и кэширует результат.
+
+    Хранит ограниченный по размеру LRU-кэш уже отформатированных блоков,
+    ключом которого служат формат и ID заметки, а значение помечено
+    версией заметки. Изменение заметки увеличивает ее версию, поэтому
+    устаревший блок автоматически не используется и перестраивается.
+    Попадание в кэш проверяется только по ID и версии: поля заметки не
+    читаются, поэтому текст LazyNote для этого не загружается.
+    Хранилище, в котором под тем же ID и версией может оказаться другая
+    заметка (удаление, запись чужой версии), сбрасывает ее блоки через
+    invalidate (см. NoteRepository).
+
+    Вместе с блоком кэшируются положения в нем названия, текста и даты
+    (render_fields), чтобы виджеты с подсветкой (HitText) выводили тот
+    же блок, а не собирали его раскладку заново.
+
+    Поддерживаемые форматы:
+        FULL: ID, название, текст, дата и теги (если есть) с линией из '='
+              (просмотр всех заметок, просмотр по ID, поиск по ключевому слову).
+        TITLE: Только название заметки (просмотр названий).
+        HIT: Название, текст, дата и теги с линией из '-' (поиск по названию,
+             дате и тегам).
+
+    Attributes:
+        maxsize: Максимальное количество блоков в кэше.
+        hits: Количество обращений, обслуженных из кэша.
+        misses: Количество обращений, потребовавших форматирования.
+        __cache: Кэш блоков: (формат, ID) -> (версия, блок, положения полей).
+        __lock: Блокировка для безопасного доступа из нескольких потоков.
+    """
+
+    FULL = "full"
+    TITLE = "title"
+    HIT = "hit"
+
+    def __init__(self, maxsize: int = 10000) -> None:
+        """Инициализирует форматтер.
+
+        Args:
+            maxsize: Максимальное количество блоков в кэше. По умолчанию 10000.
+        """
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self.__cache: OrderedDict = OrderedDict()
+        self.__lock = Lock()
+
+    def render(self, note: Note, fmt: str = FULL) -> str:
+        """Возвращает отформатированный блок заметки.
+
+        Если в кэше есть блок той же версии заметки, он возвращается без
+        повторного форматирования и без обращения к полям заметки.
+
+        Args:
+            note: Объект Note для форматирования.
+            fmt: Формат блока (FULL, TITLE или HIT).
+
+        Returns:
+            Отформатированный блок текста.
+
+        Raises:
+            ValueError: Если формат не поддерживается.
+        """
+        if fmt == self.TITLE:
+            return note.title
+        return self.render_fields(note, fmt)[0]
+
+    def render_fields(self, note: Note, fmt: str = FULL) -> Tuple[str, Fields]:
+        """Возвращает блок заметки вместе с положениями ее полей в блоке.
+
+        Блок тот же, что возвращает render, и берется из того же кэша.
+
+        Args:
+            note: Объект Note для форматирования.
+            fmt: Формат блока (FULL, TITLE или HIT).
+
+        Returns:
+            Кортеж (блок, положения полей): для каждого из полей "title",
+            "text" и "date", входящих в формат, — (имя поля, начало,
+            конец) в блоке, в порядке следования.
+
+        Raises:
+            ValueError: Если формат не поддерживается.
+        """
+        if fmt == self.TITLE:
+            return note.title, (("title", 0, len(note.title)),)
+
+        key = (fmt, note.id)
+        with self.__lock:
+            entry = self.__cache.get(key)
+            if entry is not None and entry[0] == note.version:
+                self.__cache.move_to_end(key)
+                self.hits += 1
+                return entry[1], entry[2]
+
+        block, fields = self.__format(note, fmt)
+        with self.__lock:
+            self.misses += 1
+            self.__cache[key] = (note.version, block, fields)
+            self.__cache.move_to_end(key)
+            while len(self.__cache) > self.maxsize:
+                self.__cache.popitem(last=False)
+        return block, fields
+
+    def invalidate(self, note_id: int) -> None:
+        """Удаляет из кэша все блоки заметки.
+
+        Args:
+            note_id: ID заметки, блоки которой нужно удалить.
+        """
+        with self.__lock:
+            for fmt in (self.FULL, self.HIT):
+                self.__cache.pop((fmt, note_id), None)
+
+    def clear(self) -> None:
+        """Полностью очищает кэш и счетчики."""
+        with self.__lock:
+            self.__cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        """Возвращает количество блоков в кэше."""
+        return len(self.__cache)
+
+    @staticmethod
+    def tags_line(note: Note) -> str:
+        """Возвращает строку тегов заметки для блока.
+
+        Args:
+            note: Объект Note.
+
+        Returns:
+            Строка вида "Теги: #работа #срочно" с переводом строки или
+            пустая строка, если тегов нет.
+        """
+        if not note.tags:
+            return ""
+        return "Теги: " + " ".join("#" + tag for tag in note.tags) + "\n"
+
+    def __format(self, note: Note, fmt: str) -> Tuple[str, Fields]:
+        """Форматирует заметку без использования кэша.
+
+        Args:
+            note: Объект Note для форматирования.
+            fmt: Формат блока (FULL или HIT).
+
+        Returns:
+            Кортеж (блок, положения полей), см. render_fields.
+
+        Raises:
+            ValueError: Если формат не поддерживается.
+        """
+        if fmt == self.FULL:
+            parts = [f"ID: {note.id}\nНазвание: "]
+            line = "=" * 40
+        elif fmt == self.HIT:
+            parts = ["Название: "]
+            line = "-" * 40
+        else:
+            raise ValueError(f"Неизвестный формат заметки: {fmt}")
+
+        fields = []
+        position = len(parts[0])
+        for name, value, after in (
+            ("title", note.title, "\nТекст: \n"),
+            ("text", note.text, "\nДата: "),
+            ("date", note.date, "\n" + self.tags_line(note) + line),
+        ):
+            fields.append((name, position, position + len(value)))
+            parts.append(value)
+            parts.append(after)
+            position += len(value) + len(after)
+        return "".join(parts), tuple(fields)
+
+
+note_formatter = NoteFormatter()
@@ -0,0 +1,242 @@
+"""Модуль потокового массового импорта заметок."""
+
+import csv
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+from core.json_storage import JsonStorage
+from core.note import Note
+from core.note_dates import DATE_FORMAT
+
+
+class ImportReport:
+    """Итоги массового импорта.
+
+    Attributes:
+        count: Количество импортированных заметок.
+        seconds: Длительность импорта в секундах.
+        version: Версия файла хранилища после импорта.
+    """
+
+    def __init__(self, count: int, seconds: float, version: int) -> None:
+        """Инициализирует итоги импорта.
+
+        Args:
+            count: Количество импортированных заметок.
+            seconds: Длительность импорта в секундах.
+            version: Версия файла хранилища после импорта.
+        """
+        self.count: int = count
+        self.seconds: float = seconds
+        self.version: int = version
+
+    @property
+    def rate(self) -> float:
+        """Скорость импорта в заметках в секунду."""
+        return self.count / self.seconds if self.seconds else 0.0
+
+
+class NoteImporter:
+    """Потоково импортирует заметки из JSONL, CSV или каталога текстовых файлов.
+
+    Источник читается построчно (или пофайлово), записи передаются в
+    JsonStorage.append_stream блоками фиксированного размера, поэтому
+    потребление памяти не зависит ни от размера источника, ни от размера
+    уже сохраненного корпуса. Весь импорт фиксируется одной атомарной
+    заменой файла.
+
+    Attributes:
+        storage: Хранилище, в которое импортируются заметки.
+        batch_size: Размер блока записей и выделяемых ID.
+    """
+
+    FORMATS = ("jsonl", "csv", "dir")
+
+    def __init__(self, storage: JsonStorage, batch_size: int = 10000) -> None:
+        """Инициализирует импортер.
+
+        Args:
+            storage: Хранилище, в которое импортируются заметки.
+            batch_size: Размер блока записей и выделяемых ID.
+        """
+        self.storage: JsonStorage = storage
+        self.batch_size: int = batch_size
+
+    def import_path(
+        self,
+        path: str,
+        fmt: Optional[str] = None,
+        on_batch: Optional[Callable[[int], None]] = None
+    ) -> ImportReport:
+        """Импортирует заметки из файла или каталога.
+
+        Args:
+            path: Путь к файлу JSONL/CSV или к каталогу с текстовыми файлами.
+            fmt: Формат источника ("jsonl", "csv" или "dir"). Если не указан,
+                 определяется по пути.
+            on_batch: Функция, вызываемая после каждого блока с общим
+                      количеством импортированных заметок.
+
+        Returns:
+            Итоги импорта.
+
+        Raises:
+            ValueError: Если формат не поддерживается или запись некорректна.
+        """
+        return self.import_records(self.read_source(path, fmt), on_batch)
+
+    def import_records(
+        self,
+        records: Iterator[Dict[str, Any]],
+        on_batch: Optional[Callable[[int], None]] = None
+    ) -> ImportReport:
+        """Импортирует готовые записи заметок.
+
+        Args:
+            records: Словари с полями title, text, date и version (без id).
+            on_batch: Функция, вызываемая после каждого блока с общим
+                      количеством импортированных заметок.
+
+        Returns:
+            Итоги импорта.
+        """
+        started = time.perf_counter()
+        count, version = self.storage.append_stream(records, self.batch_size, on_batch)
+        return ImportReport(count, time.perf_counter() - started, version)
+
+    @classmethod
+    def read_source(cls, path: str, fmt: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Возвращает итератор записей из источника.
+
+        Args:
+            path: Путь к файлу JSONL/CSV или к каталогу с текстовыми файлами.
+            fmt: Формат источника. Если не указан, определяется по пути.
+
+        Returns:
+            Итератор словарей заметок без поля id.
+
+        Raises:
+            ValueError: Если формат не поддерживается.
+        """
+        if fmt is None:
+            if os.path.isdir(path):
+                fmt = "dir"
+            else:
+                fmt = Path(path).suffix.lstrip(".").lower()
+        if fmt == "jsonl":
+            return cls.__read_jsonl(path)
+        if fmt == "csv":
+            return cls.__read_csv(path)
+        if fmt == "dir":
+            return cls.__read_directory(path)
+        raise ValueError(f"Неподдерживаемый формат импорта: {fmt!r}")
+
+    @staticmethod
+    def make_record(
+        title: Any,
+        text: Any,
+        date: Optional[str],
+        default_date: str,
+        tags: Any = None
+    ) -> Dict[str, Any]:
+        """Создает запись заметки в формате JsonStorage (без id).
+
+        Args:
+            title: Название заметки.
+            text: Текст заметки.
+            date: Дата в формате "ДД.ММ.ГГГГ ЧЧ:ММ" или None.
+            default_date: Дата для записей без даты.
+            tags: Список тегов, строка тегов через пробел или None.
+
+        Returns:
+            Словарь с полями title, text, date, version и tags (если теги
+            есть).
+
+        Raises:
+            ValueError: Если отсутствует название или текст.
+        """
+        if title is None or text is None:
+            raise ValueError("У заметки должны быть поля title и text")
+        record = {"title": str(title), "text": str(text), "date": date or default_date, "version": 1}
+        if isinstance(tags, str):
+            tags = tags.split()
+        tags = Note.normalize_tags(tags or ())
+        if tags:
+            record["tags"] = list(tags)
+        return record
+
+    @classmethod
+    def __read_jsonl(cls, path: str) -> Iterator[Dict[str, Any]]:
+        """Построчно читает заметки из JSONL-файла.
+
+        Args:
+            path: Путь к файлу, по одному JSON-объекту на строку.
+
+        Yields:
+            Словари заметок без поля id.
+
+        Raises:
+            ValueError: Если строка не является корректной заметкой.
+        """
+        default_date = datetime.now().strftime(DATE_FORMAT)
+        with open(path, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    item = json.loads(line)
+                    yield cls.make_record(
+                        item.get("title"), item.get("text"), item.get("date"), default_date,
+                        item.get("tags")
+                    )
+                except (json.JSONDecodeError, AttributeError, ValueError) as error:
+                    raise ValueError(f"{path}:{number}: некорректная запись: {error}") from error
+
+    @classmethod
+    def __read_csv(cls, path: str) -> Iterator[Dict[str, Any]]:
+        """Построчно читает заметки из CSV-файла с колонками title, text[, date, tags].
+
+        Args:
+            path: Путь к CSV-файлу с заголовком.
+
+        Yields:
+            Словари заметок без поля id.
+
+        Raises:
+            ValueError: Если в строке нет названия или текста.
+        """
+        default_date = datetime.now().strftime(DATE_FORMAT)
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for number, row in enumerate(csv.DictReader(f), start=2):
+                try:
+                    yield cls.make_record(
+                        row.get("title"), row.get("text"), row.get("date"), default_date,
+                        row.get("tags")
+                    )
+                except ValueError as error:
+                    raise ValueError(f"{path}:{number}: {error}") from error
+
+    @classmethod
+    def __read_directory(cls, path: str) -> Iterator[Dict[str, Any]]:
+        """Читает заметки из каталога текстовых файлов.
+
+        Название заметки — имя файла без расширения, текст — содержимое,
+        дата — время последнего изменения файла.
+
+        Args:
+            path: Путь к каталогу.
+
+        Yields:
+            Словари заметок без поля id.
+        """
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.endswith(".txt"):
+                    continue
+                with open(entry.path, "r", encoding="utf-8") as f:
+                    text = f.read()
+                date = datetime.fromtimestamp(entry.stat().st_mtime).strftime(DATE_FORMAT)
+                yield cls.make_record(Path(entry.name).stem, text, date, date)
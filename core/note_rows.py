@@ -0,0 +1,144 @@
+"""Модуль построчного хранения заметок в памяти."""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+from core.note import Note
+from core.tombstones import Tombstones
+
+
+class NoteRows(Sequence[Note]):
+    """Список заметок, изменяемый на месте за O(1).
+
+    Заметки хранятся в списке строк, а позиция строки каждой заметки — в
+    словаре по ID, поэтому замена и удаление не ищут заметку перебором.
+    Удаление не сдвигает строки: строка очищается и помечается в
+    Tombstones, а когда удаленных строк становится больше живых, список
+    уплотняется на месте. Объект хранилища при этом не заменяется, так
+    что представления (SequenceView) над ним остаются действительными.
+
+    Attributes:
+        __rows: Заметки по позициям строк; None — удаленная строка.
+        __positions: Позиция строки заметки по ID.
+        __dead: Отметки удаленных строк.
+    """
+
+    def __init__(self, notes: Iterable[Note] = ()) -> None:
+        """Инициализирует хранилище и добавляет заметки.
+
+        Args:
+            notes: Начальные заметки.
+        """
+        self.__rows: List[Optional[Note]] = []
+        self.__positions: Dict[int, int] = {}
+        self.__dead = Tombstones()
+        self.extend(notes)
+
+    def append(self, note: Note) -> None:
+        """Добавляет заметку в конец.
+
+        Args:
+            note: Добавляемая заметка.
+        """
+        self.__positions[note.id] = len(self.__rows)
+        self.__rows.append(note)
+
+    def extend(self, notes: Iterable[Note]) -> None:
+        """Добавляет заметки в конец.
+
+        Args:
+            notes: Добавляемые заметки.
+        """
+        for note in notes:
+            self.append(note)
+
+    def clear(self) -> None:
+        """Удаляет все заметки, не заменяя объект хранилища."""
+        self.__rows.clear()
+        self.__positions.clear()
+        self.__dead.clear()
+
+    def get(self, note_id: int) -> Optional[Note]:
+        """Возвращает заметку по ID.
+
+        Args:
+            note_id: ID заметки.
+
+        Returns:
+            Объект Note или None, если заметки нет.
+        """
+        position = self.__positions.get(note_id)
+        return None if position is None else self.__rows[position]
+
+    def replace(self, note: Note) -> bool:
+        """Заменяет заметку с тем же ID на ее месте.
+
+        Args:
+            note: Новая версия заметки.
+
+        Returns:
+            True, если заметка найдена и заменена.
+        """
+        position = self.__positions.get(note.id)
+        if position is None:
+            return False
+        self.__rows[position] = note
+        return True
+
+    def remove(self, note_id: int) -> bool:
+        """Удаляет заметку по ID.
+
+        Args:
+            note_id: ID заметки.
+
+        Returns:
+            True, если заметка найдена и удалена.
+        """
+        position = self.__positions.pop(note_id, None)
+        if position is None:
+            return False
+        self.__rows[position] = None
+        self.__dead.add(position)
+        if len(self.__dead) * 2 > len(self.__rows):
+            self.__compact()
+        return True
+
+    def __len__(self) -> int:
+        """Возвращает количество заметок."""
+        return len(self.__rows) - len(self.__dead)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Note, List[Note]]:
+        """Возвращает заметку по индексу или список заметок среза.
+
+        Args:
+            index: Позиция среди заметок или срез.
+
+        Returns:
+            Объект Note или список объектов Note.
+        """
+        if isinstance(index, slice):
+            if not self.__dead:
+                return self.__rows[index]
+            return [self.__rows[self.__dead.physical(i)] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Индекс заметки вне диапазона")
+        return self.__rows[self.__dead.physical(index)]
+
+    def __iter__(self) -> Iterator[Note]:
+        """Перебирает заметки в порядке добавления.
+
+        Заметки, удаленные во время перебора, пропускаются.
+        """
+        rows = self.__rows
+        for position in self.__dead.live(len(rows)):
+            note = rows[position] if position < len(rows) else None
+            if note is not None:
+                yield note
+
+    def __compact(self) -> None:
+        """Убирает удаленные строки, не заменяя список строк."""
+        self.__rows[:] = [note for note in self.__rows if note is not None]
+        self.__positions.clear()
+        for position, note in enumerate(self.__rows):
+            self.__positions[note.id] = position
+        self.__dead.clear()
@@ -0,0 +1,444 @@
+"""Модуль инкрементальной статистики заметок."""
+
+import heapq
+import re
+import sys
+from array import array
+from collections import Counter
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from core.note import Note
+from core.note_dates import from_epoch
+
+# Слова для частотного словаря: начинаются с буквы и не короче трех
+# символов (короткие слова и числа не учитываются).
+_TERM_RE = re.compile(r"[^\W\d_]\w{2,}")
+
+# Учтенные атрибуты заметки: (версия, длина названия, длина текста, число
+# слов, секунды даты или None, слова текста, их количества в тексте).
+_Counted = Tuple[int, int, int, int, Optional[int], Tuple[str, ...], array]
+
+
+def _count(note: Note) -> _Counted:
+    """Подсчитывает вклад заметки в статистику.
+
+    Слова интернируются: строки слов общие у всех заметок и частотного
+    словаря.
+
+    Args:
+        note: Учитываемая заметка.
+
+    Returns:
+        Учтенные атрибуты заметки.
+    """
+    text = note.text
+    terms = Counter(_TERM_RE.findall(text.lower()))
+    return (
+        note.version, len(note.title), len(text), len(text.split()), note.timestamp,
+        tuple(sys.intern(term) for term in terms), array("I", terms.values())
+    )
+
+
+def _day_key(day: str) -> Tuple[str, str, str]:
+    """Возвращает ключ сортировки дня "ДД.ММ.ГГГГ" по времени."""
+    return day[6:10], day[3:5], day[:2]
+
+
+def _month_key(month: str) -> Tuple[str, str]:
+    """Возвращает ключ сортировки месяца "ММ.ГГГГ" по времени."""
+    return month[3:], month[:2]
+
+
+class NoteStatistics:
+    """Агрегаты по заметкам, обновляемые при каждом изменении.
+
+    Хранит ID заметок по дням ("ДД.ММ.ГГГГ") и количество заметок по
+    месяцам ("ММ.ГГГГ") — в тех же форматах, что принимает
+    SearchByDateStrategy, — общее количество заметок, суммарные длины
+    названий и текстов, число слов и частоты слов текстов. Заметки
+    добавляются и удаляются по одной (add, remove), поэтому цена изменения
+    зависит только от размера заметки, а ответы на вопросы "сколько всего",
+    "сколько за день или месяц" и "какие заметки за день" не обращаются к
+    самим заметкам.
+
+    Для каждой заметки запоминаются учтенные атрибуты — версия, длины
+    названия и текста, число слов, дата и количества слов текста, но не
+    сам текст, — и изменение вычитает именно их, а не атрибуты
+    переданного объекта. Поэтому повторный add той же заметки, в том
+    числе измененной на месте, не искажает агрегаты, а sync по версиям
+    находит заметки, учтенные не в той версии.
+
+    Агрегаты и учтенные атрибуты сохраняются в словарь (to_dict) и
+    восстанавливаются из него (from_dict) без текстов заметок; так их
+    хранит рядом с хранилищем StatisticsFile.
+
+    Упорядоченные списки (хронология месяцев, самые частые слова)
+    строятся по агрегатам при первом запросе после изменения и
+    кэшируются; их цена зависит от числа месяцев и слов, а не заметок.
+
+    Attributes:
+        total: Количество заметок.
+        title_chars: Суммарная длина названий в символах.
+        text_chars: Суммарная длина текстов в символах.
+        words: Суммарное количество слов в текстах.
+        undated: Количество заметок с датой не в формате DATE_FORMAT.
+        __counted: Учтенные атрибуты по ID заметки.
+        __months: Месяц -> {день -> ID заметок дня}.
+        __month_totals: Месяц -> количество заметок.
+        __terms: Слово -> количество вхождений во всех текстах (слова
+                 начинаются с буквы и не короче трех символов).
+        __timeline: Кэш месяцев в хронологическом порядке или None.
+        __top: Кэш самых частых слов или None.
+        __lock: Блокировка агрегатов для чтения из других потоков.
+    """
+
+    def __init__(self, notes: Iterable[Note] = ()) -> None:
+        """Инициализирует статистику и учитывает заметки.
+
+        Args:
+            notes: Начальные заметки.
+        """
+        self.total: int = 0
+        self.title_chars: int = 0
+        self.text_chars: int = 0
+        self.words: int = 0
+        self.undated: int = 0
+        self.__counted: Dict[int, _Counted] = {}
+        self.__months: Dict[str, Dict[str, Set[int]]] = {}
+        self.__month_totals: Dict[str, int] = {}
+        self.__terms: Counter = Counter()
+        self.__timeline: Optional[List[str]] = None
+        self.__top: Optional[List[Tuple[str, int]]] = None
+        self.__lock = Lock()
+        for note in notes:
+            self.add(note)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "NoteStatistics":
+        """Восстанавливает статистику из словаря to_dict без пересчета.
+
+        Args:
+            data: Словарь, полученный из to_dict.
+
+        Returns:
+            Объект NoteStatistics.
+
+        Raises:
+            KeyError, TypeError, ValueError, OverflowError: Если словарь не
+                в формате to_dict.
+        """
+        statistics = cls()
+        statistics.total = int(data["total"])
+        statistics.title_chars = int(data["title_chars"])
+        statistics.text_chars = int(data["text_chars"])
+        statistics.words = int(data["words"])
+        statistics.undated = int(data["undated"])
+        statistics.__counted = {
+            int(note_id): cls.__from_entry(entry) for note_id, entry in data["notes"].items()
+        }
+        for month, days in data["months"].items():
+            statistics.__months[month] = {day: set(ids) for day, ids in days.items()}
+            statistics.__month_totals[month] = sum(len(ids) for ids in days.values())
+        statistics.__terms.update({sys.intern(term): count for term, count in data["terms"].items()})
+        return statistics
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Возвращает агрегаты и учтенные атрибуты заметок словарем для JSON.
+
+        Returns:
+            Словарь с общими счетчиками, таблицей "месяц -> день -> ID",
+            частотами слов и учтенными атрибутами по ID заметки.
+        """
+        with self.__lock:
+            return {
+                "total": self.total,
+                "title_chars": self.title_chars,
+                "text_chars": self.text_chars,
+                "words": self.words,
+                "undated": self.undated,
+                "months": {
+                    month: {day: sorted(ids) for day, ids in days.items()}
+                    for month, days in self.__months.items()
+                },
+                "terms": dict(self.__terms),
+                "notes": {
+                    str(note_id): self.__to_entry(counted)
+                    for note_id, counted in self.__counted.items()
+                },
+            }
+
+    def add(self, note: Note) -> None:
+        """Учитывает новую заметку или новую версию учтенной.
+
+        Если заметка с тем же ID уже учтена, сначала вычитается ее
+        запомненный вклад; если атрибуты не изменились, агрегаты не
+        трогаются.
+
+        Args:
+            note: Добавленная или измененная заметка.
+        """
+        self.__put(note.id, _count(note))
+
+    def add_entry(self, note_id: int, entry: List[Any]) -> None:
+        """Учитывает заметку по ее учтенным атрибутам из entry, без текста.
+
+        Args:
+            note_id: ID заметки.
+            entry: Учтенные атрибуты в формате entry.
+
+        Raises:
+            TypeError, ValueError, OverflowError: Если entry не в формате entry.
+        """
+        self.__put(note_id, self.__from_entry(entry))
+
+    def entry(self, note_id: int) -> Optional[List[Any]]:
+        """Возвращает учтенные атрибуты заметки списком для JSON.
+
+        Args:
+            note_id: ID заметки.
+
+        Returns:
+            Список [версия, длина названия, длина текста, число слов,
+            секунды даты или None, слова, их количества] или None, если
+            заметка не учтена.
+        """
+        counted = self.__counted.get(note_id)
+        return None if counted is None else self.__to_entry(counted)
+
+    def remove(self, note_id: int) -> None:
+        """Перестает учитывать заметку.
+
+        Args:
+            note_id: ID заметки; неучтенные ID пропускаются.
+        """
+        with self.__lock:
+            old = self.__counted.pop(note_id, None)
+            if old is not None:
+                self.__apply(note_id, old, -1)
+
+    def sync(self, notes: Iterable[Note]) -> bool:
+        """Сверяет учтенные заметки с notes по ID и версиям.
+
+        Заметки, которые не учтены или учтены в другой версии,
+        пересчитываются (читаются только их тексты), а учтенные заметки,
+        которых нет в notes, перестают учитываться.
+
+        Args:
+            notes: Полный набор заметок.
+
+        Returns:
+            True, если статистика изменилась.
+        """
+        seen: Set[int] = set()
+        changed = False
+        for note in notes:
+            seen.add(note.id)
+            counted = self.__counted.get(note.id)
+            if counted is None or counted[0] != note.version:
+                self.add(note)
+                changed = True
+        with self.__lock:
+            extra = [note_id for note_id in self.__counted if note_id not in seen]
+        for note_id in extra:
+            self.remove(note_id)
+        return changed or bool(extra)
+
+    def clear(self) -> None:
+        """Обнуляет все агрегаты."""
+        with self.__lock:
+            self.total = self.title_chars = self.text_chars = self.words = self.undated = 0
+            self.__counted.clear()
+            self.__months.clear()
+            self.__month_totals.clear()
+            self.__terms.clear()
+            self.__timeline = None
+            self.__top = None
+
+    def count_day(self, day: str) -> int:
+        """Возвращает количество заметок за день.
+
+        Args:
+            day: День в формате "ДД.ММ.ГГГГ".
+
+        Returns:
+            Количество заметок, созданных в этот день.
+        """
+        return len(self.__months.get(day[3:], {}).get(day, ()))
+
+    def day_ids(self, day: str) -> List[int]:
+        """Возвращает ID заметок дня.
+
+        Args:
+            day: День в формате "ДД.ММ.ГГГГ".
+
+        Returns:
+            ID заметок, созданных в этот день, по возрастанию.
+        """
+        with self.__lock:
+            return sorted(self.__months.get(day[3:], {}).get(day, ()))
+
+    def count_month(self, month: str) -> int:
+        """Возвращает количество заметок за месяц.
+
+        Args:
+            month: Месяц в формате "ММ.ГГГГ".
+
+        Returns:
+            Количество заметок, созданных в этом месяце.
+        """
+        return self.__month_totals.get(month, 0)
+
+    def months(self) -> List[Tuple[str, int]]:
+        """Возвращает хронологию: месяцы с заметками по порядку.
+
+        Returns:
+            Список пар (месяц "ММ.ГГГГ", количество заметок) от ранних
+            к поздним.
+        """
+        with self.__lock:
+            if self.__timeline is None:
+                self.__timeline = sorted(self.__month_totals, key=_month_key)
+            return [(month, self.__month_totals[month]) for month in self.__timeline]
+
+    def days(self, month: str) -> List[Tuple[str, int]]:
+        """Возвращает дни месяца, в которые создавались заметки.
+
+        Args:
+            month: Месяц в формате "ММ.ГГГГ".
+
+        Returns:
+            Список пар (день "ДД.ММ.ГГГГ", количество заметок) по порядку.
+        """
+        with self.__lock:
+            days = [(day, len(ids)) for day, ids in self.__months.get(month, {}).items()]
+        return sorted(days, key=lambda item: _day_key(item[0]))
+
+    def top_terms(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """Возвращает самые частые слова текстов.
+
+        Args:
+            limit: Количество слов.
+
+        Returns:
+            Список пар (слово, количество вхождений) по убыванию частоты.
+        """
+        with self.__lock:
+            top = self.__top
+            if top is None or len(top) < min(limit, len(self.__terms)):
+                self.__top = heapq.nlargest(
+                    max(limit, 50), self.__terms.items(), key=lambda item: item[1]
+                )
+            return self.__top[:limit]
+
+    def summary(self) -> Dict[str, Any]:
+        """Возвращает сводку статистики.
+
+        Returns:
+            Словарь с количеством заметок и слов, суммарной и средней
+            длиной текстов, числом дней и месяцев с заметками, первым и
+            последним месяцем и количеством заметок без разбираемой даты.
+        """
+        timeline = self.months()
+        with self.__lock:
+            return {
+                "total": self.total,
+                "title_chars": self.title_chars,
+                "text_chars": self.text_chars,
+                "words": self.words,
+                "average_text": self.text_chars / self.total if self.total else 0.0,
+                "days": sum(len(days) for days in self.__months.values()),
+                "months": len(timeline),
+                "first_month": timeline[0][0] if timeline else None,
+                "last_month": timeline[-1][0] if timeline else None,
+                "undated": self.undated,
+            }
+
+    def __len__(self) -> int:
+        """Возвращает количество учтенных заметок."""
+        return self.total
+
+    def __put(self, note_id: int, counted: _Counted) -> None:
+        """Заменяет вклад заметки вкладом counted.
+
+        Args:
+            note_id: ID заметки.
+            counted: Новые учтенные атрибуты заметки.
+        """
+        with self.__lock:
+            old = self.__counted.get(note_id)
+            self.__counted[note_id] = counted
+            if old is not None:
+                if old[1:] == counted[1:]:
+                    # Изменилась только версия: агрегаты те же.
+                    return
+                self.__apply(note_id, old, -1)
+            self.__apply(note_id, counted, 1)
+
+    def __apply(self, note_id: int, counted: _Counted, sign: int) -> None:
+        """Добавляет вклад учтенных атрибутов в агрегаты со знаком sign.
+
+        Вызывается под __lock.
+
+        Args:
+            note_id: ID заметки.
+            counted: Учтенные атрибуты заметки.
+            sign: 1 при добавлении, -1 при удалении.
+        """
+        _, title_chars, text_chars, words, timestamp, terms, counts = counted
+        self.total += sign
+        self.title_chars += sign * title_chars
+        self.text_chars += sign * text_chars
+        self.words += sign * words
+
+        if timestamp is None:
+            self.undated += sign
+        else:
+            day = from_epoch(timestamp)[:10]
+            month = day[3:]
+            days = self.__months.setdefault(month, {})
+            ids = days.setdefault(day, set())
+            if sign > 0:
+                ids.add(note_id)
+            else:
+                ids.discard(note_id)
+                if not ids:
+                    del days[day]
+            self.__month_totals[month] = self.__month_totals.get(month, 0) + sign
+            if not self.__month_totals[month]:
+                del self.__month_totals[month]
+                del self.__months[month]
+                self.__timeline = None
+            elif sign > 0 and self.__month_totals[month] == 1:
+                self.__timeline = None
+
+        if terms:
+            totals = self.__terms
+            for term, count in zip(terms, counts):
+                left = totals[term] + sign * count
+                if left > 0:
+                    totals[term] = left
+                else:
+                    totals.pop(term, None)
+            self.__top = None
+
+    @staticmethod
+    def __to_entry(counted: _Counted) -> List[Any]:
+        """Переводит учтенные атрибуты в список для JSON (см. entry)."""
+        version, title_chars, text_chars, words, timestamp, terms, counts = counted
+        return [version, title_chars, text_chars, words, timestamp, list(terms), counts.tolist()]
+
+    @staticmethod
+    def __from_entry(entry: List[Any]) -> _Counted:
+        """Переводит список из entry обратно в учтенные атрибуты.
+
+        Raises:
+            TypeError, ValueError, OverflowError: Если entry не в формате entry.
+        """
+        version, title_chars, text_chars, words, timestamp, terms, counts = entry
+        if len(terms) != len(counts):
+            raise ValueError("Количество слов и их частот не совпадает")
+        return (
+            int(version), int(title_chars), int(text_chars), int(words),
+            None if timestamp is None else int(timestamp),
+            tuple(sys.intern(term) for term in terms), array("I", counts)
+        )
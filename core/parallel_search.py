@@ -0,0 +1,204 @@
+"""Модуль параллельного выполнения стратегий поиска в пуле процессов."""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+from core.json_storage import JsonStorage
+from core.note import Note
+from strategies.base_strategy import BaseStrategy
+
+# Корпус, загруженный в процессе-исполнителе: путь -> (версия, заметки).
+_corpus: Dict[str, Tuple[int, List[Note]]] = {}
+
+
+def _load_corpus(filepath: str, version: Optional[int] = None) -> Optional[List[Note]]:
+    """Загружает корпус в память процесса-исполнителя или берет его из кэша.
+
+    Args:
+        filepath: Путь к JSON-файлу с заметками.
+        version: Требуемая версия файла или None для любой.
+
+    Returns:
+        Заметки требуемой версии или None, если файл уже изменился.
+    """
+    cached = _corpus.get(filepath)
+    if cached is None or (version is not None and cached[0] != version):
+        storage = JsonStorage(filepath)
+        loaded_version, data = storage.read_versioned()
+        cached = (loaded_version, [storage.to_note(item) for item in data])
+        _corpus[filepath] = cached
+    if version is not None and cached[0] != version:
+        return None
+    return cached[1]
+
+
+def _search_partition(
+    filepath: str,
+    version: int,
+    strategy: BaseStrategy,
+    part: int,
+    parts: int
+) -> Optional[List[int]]:
+    """Выполняет стратегию на одной части корпуса в процессе-исполнителе.
+
+    Args:
+        filepath: Путь к JSON-файлу с заметками.
+        version: Версия файла, на которой выполняется поиск.
+        strategy: Стратегия поиска (передается в процесс через pickle).
+        part: Номер части от 0.
+        parts: Общее количество частей.
+
+    Returns:
+        ID найденных заметок в порядке хранения или None, если версия
+        файла в процессе не совпала с требуемой.
+    """
+    notes = _load_corpus(filepath, version)
+    if notes is None:
+        return None
+    size = len(notes)
+    low, high = size * part // parts, size * (part + 1) // parts
+    return [note.id for note in strategy.iter_matches(notes[low:high])]
+
+
+class ParallelSearch:
+    """Выполняет стратегии поиска параллельно на частях корпуса.
+
+    Корпус делится на равные непрерывные части по порядку хранения, каждая
+    часть проверяется предикатом стратегии в отдельном процессе пула, а
+    найденные ID склеиваются в порядке частей, то есть в том же порядке,
+    что дал бы последовательный обход. Процессы загружают заметки из файла
+    один раз (при старте пула) и держат их в памяти до изменения версии
+    файла, поэтому в задачу передаются только стратегия и номер части.
+
+    На корпусах меньше threshold заметок, а также если версия файла
+    разошлась с версией заметок в процессах, поиск выполняется
+    последовательно в текущем процессе.
+
+    Стратегии передаются в процессы через pickle, поэтому
+    SearchKeywordStrategy следует создавать без индекса: с индексом
+    последовательный поиск и так не сканирует тексты.
+
+    Поиск можно вызывать из нескольких потоков одновременно (так его
+    использует api_server.py): пул создается один раз под блокировкой.
+    Где возможно, процессы запускаются через forkserver, а не fork:
+    иначе они наследуют открытые сокеты вызывающего процесса, и закрытое
+    сервером соединение остается открытым для клиента.
+
+    Attributes:
+        storage: Хранилище, из которого процессы загружают корпус.
+        workers: Количество процессов пула.
+        threshold: Минимальный размер корпуса для параллельного поиска.
+        parallel_runs: Количество поисков, выполненных в пуле.
+        serial_runs: Количество поисков, выполненных последовательно.
+        __executor: Пул процессов или None до первого параллельного поиска.
+        __lock: Блокировка создания и остановки пула.
+    """
+
+    def __init__(
+        self,
+        filepath: str = "data/notes.json",
+        workers: Optional[int] = None,
+        threshold: int = 20000
+    ) -> None:
+        """Инициализирует параллельный поиск.
+
+        Args:
+            filepath: Путь к JSON-файлу с заметками.
+            workers: Количество процессов пула. По умолчанию — число ядер.
+            threshold: Минимальный размер корпуса для параллельного поиска.
+        """
+        self.storage: JsonStorage = JsonStorage(filepath)
+        self.workers: int = workers or os.cpu_count() or 1
+        self.threshold: int = threshold
+        self.parallel_runs: int = 0
+        self.serial_runs: int = 0
+        self.__executor: Optional[ProcessPoolExecutor] = None
+        self.__lock = Lock()
+
+    def search(self, strategy: BaseStrategy, notes: Sequence[Note]) -> List[Note]:
+        """Находит заметки, подходящие под стратегию.
+
+        Args:
+            strategy: Стратегия поиска.
+            notes: Заметки того же хранилища в порядке хранения; по ним
+                   ведется последовательный поиск и восстанавливаются
+                   объекты Note по найденным ID.
+
+        Returns:
+            Найденные заметки в порядке хранения.
+        """
+        if self.workers < 2 or len(notes) < self.threshold:
+            return self.__serial(strategy, notes)
+
+        ids = self.search_ids(strategy)
+        if ids is None:
+            return self.__serial(strategy, notes)
+        self.parallel_runs += 1
+        by_id = {note.id: note for note in notes}
+        return [by_id[note_id] for note_id in ids if note_id in by_id]
+
+    def search_ids(self, strategy: BaseStrategy) -> Optional[List[int]]:
+        """Находит ID подходящих заметок в пуле процессов.
+
+        Args:
+            strategy: Стратегия поиска.
+
+        Returns:
+            ID найденных заметок в порядке хранения или None, если файл
+            изменился во время поиска.
+        """
+        with self.__lock:
+            if self.__executor is None:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver") if "forkserver" in methods else None
+                self.__executor = ProcessPoolExecutor(
+                    self.workers,
+                    mp_context=context,
+                    initializer=_load_corpus,
+                    initargs=(self.storage.filepath,)
+                )
+            executor = self.__executor
+        version = self.storage.read_version()
+        futures = [
+            executor.submit(
+                _search_partition, self.storage.filepath, version, strategy, part, self.workers
+            )
+            for part in range(self.workers)
+        ]
+        ids: List[int] = []
+        for future in futures:
+            part_ids = future.result()
+            if part_ids is None:
+                return None
+            ids.extend(part_ids)
+        return ids
+
+    def close(self) -> None:
+        """Останавливает пул процессов."""
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def __enter__(self) -> "ParallelSearch":
+        """Возвращает объект для использования в операторе with."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Останавливает пул процессов при выходе из блока with."""
+        self.close()
+
+    def __serial(self, strategy: BaseStrategy, notes: Sequence[Note]) -> List[Note]:
+        """Выполняет стратегию последовательно в текущем процессе.
+
+        Args:
+            strategy: Стратегия поиска.
+            notes: Заметки для поиска.
+
+        Returns:
+            Найденные заметки в порядке хранения.
+        """
+        self.serial_runs += 1
+        return list(strategy.iter_matches(notes))
@@ -0,0 +1,40 @@
+"""Модуль результата поиска с позициями совпадений."""
+
+from typing import List, Tuple
+from core.note import Note
+
+
+class SearchHit:
+    """Найденная заметка вместе с позициями совпадений.
+
+    Позиции вычисляются стратегией один раз при поиске (по индексу или
+    токенизатору), поэтому интерфейсу не нужно повторно сканировать текст,
+    чтобы подсветить совпадения.
+
+    Attributes:
+        note: Найденная заметка.
+        field: Поле заметки, в котором найдено совпадение
+               ("text", "title" или "date").
+        spans: Список пар (начало, конец) — смещения символов в поле field.
+    """
+
+    TEXT = "text"
+    TITLE = "title"
+    DATE = "date"
+
+    def __init__(
+        self,
+        note: Note,
+        field: str = TEXT,
+        spans: List[Tuple[int, int]] = None
+    ) -> None:
+        """Инициализирует результат поиска.
+
+        Args:
+            note: Найденная заметка.
+            field: Поле заметки, в котором найдено совпадение.
+            spans: Список пар (начало, конец) совпадений в поле field.
+        """
+        self.note: Note = note
+        self.field: str = field
+        self.spans: List[Tuple[int, int]] = spans or []
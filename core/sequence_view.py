@@ -0,0 +1,52 @@
+"""Модуль представления последовательности только для чтения."""
+
+from typing import Iterator, List, Sequence, TypeVar, Union
+
+T = TypeVar("T")
+
+
+class SequenceView(Sequence[T]):
+    """Представление чужой последовательности только для чтения.
+
+    Не копирует элементы: длина, обращение по индексу и перебор
+    передаются исходной последовательности, а методов изменения нет.
+    Изменения исходной последовательности сразу видны через представление.
+
+    Attributes:
+        __items: Исходная последовательность.
+    """
+
+    __slots__ = ("__items",)
+
+    def __init__(self, items: Sequence[T]) -> None:
+        """Инициализирует представление.
+
+        Args:
+            items: Исходная последовательность.
+        """
+        self.__items = items
+
+    def __len__(self) -> int:
+        """Возвращает количество элементов."""
+        return len(self.__items)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
+        """Возвращает элемент по индексу или список элементов среза.
+
+        Args:
+            index: Индекс или срез.
+
+        Returns:
+            Элемент или новый список элементов среза.
+        """
+        if isinstance(index, slice):
+            return list(self.__items[index])
+        return self.__items[index]
+
+    def __iter__(self) -> Iterator[T]:
+        """Перебирает элементы исходной последовательности."""
+        return iter(self.__items)
+
+    def __repr__(self) -> str:
+        """Возвращает строковое представление для отладки."""
+        return f"SequenceView(len={len(self.__items)})"
@@ -0,0 +1,168 @@
+"""Модуль замера времени запуска приложения."""
+
+import importlib.machinery
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, Tuple
+
+
+class StartupProfiler:
+    """Собирает разбивку времени запуска: импорты модулей и этапы инициализации.
+
+    Во включенном состоянии устанавливает в sys.meta_path искатель модулей,
+    который замеряет время выполнения каждого импортируемого Python-модуля
+    (собственное и с учетом вложенных импортов). Этапы инициализации
+    отмечаются через phase() и mark(). В выключенном состоянии phase()
+    и mark() ничего не записывают.
+
+    Attributes:
+        enabled: Флаг включенного профилирования.
+        started: Момент создания профилировщика (time.perf_counter()).
+        phases: Этапы: (название, начало от старта, длительность) в секундах.
+        imports: Импорты: (модуль, собственное время, полное время) в секундах.
+        __stack: Стек времени вложенных импортов для подсчета собственного времени.
+    """
+
+    def __init__(self) -> None:
+        """Инициализирует профилировщик в выключенном состоянии."""
+        self.enabled: bool = False
+        self.started: float = time.perf_counter()
+        self.phases: List[Tuple[str, float, float]] = []
+        self.imports: List[Tuple[str, float, float]] = []
+        self.__stack: List[float] = []
+
+    def enable(self) -> None:
+        """Включает профилирование и замер последующих импортов."""
+        if self.enabled:
+            return
+        self.enabled = True
+        sys.meta_path.insert(0, _TimingFinder(self))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Замеряет длительность этапа запуска.
+
+        Args:
+            name: Название этапа.
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.phases.append((name, start - self.started, end - start))
+
+    def mark(self, name: str) -> None:
+        """Отмечает момент времени (этап нулевой длительности).
+
+        Args:
+            name: Название отметки.
+        """
+        if self.enabled:
+            self.phases.append((name, time.perf_counter() - self.started, 0.0))
+
+    def report(self, top: int = 15) -> str:
+        """Формирует текстовый отчет о времени запуска.
+
+        Args:
+            top: Количество самых медленных импортов в отчете.
+
+        Returns:
+            Многострочный отчет с этапами и самыми медленными импортами.
+        """
+        lines = ["Этапы запуска (начало / длительность, мс):"]
+        for name, offset, duration in self.phases:
+            lines.append(f"  {offset * 1000:9.1f} {duration * 1000:9.1f}  {name}")
+
+        total_self = sum(item[1] for item in self.imports)
+        lines.append(
+            f"Импорты: {len(self.imports)} модулей, {total_self * 1000:.1f} мс "
+            f"(собственное / полное время, мс):"
+        )
+        slowest = sorted(self.imports, key=lambda item: item[2], reverse=True)[:top]
+        for module, self_time, cumulative in slowest:
+            lines.append(f"  {self_time * 1000:9.1f} {cumulative * 1000:9.1f}  {module}")
+        return "\n".join(lines)
+
+    def _exec_module(self, name: str, exec_module: Any, module: Any) -> None:
+        """Выполняет модуль с замером собственного и полного времени.
+
+        Args:
+            name: Полное имя модуля.
+            exec_module: Исходный метод загрузчика exec_module.
+            module: Объект создаваемого модуля.
+        """
+        self.__stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            exec_module(module)
+        finally:
+            cumulative = time.perf_counter() - start
+            children = self.__stack.pop()
+            if self.__stack:
+                self.__stack[-1] += cumulative
+            self.imports.append((name, cumulative - children, cumulative))
+
+
+class _TimingFinder:
+    """Искатель модулей, оборачивающий загрузчики исходных файлов в замер времени.
+
+    Сам модули не находит: передает поиск следующим искателям из
+    sys.meta_path и подменяет exec_module у найденного загрузчика.
+
+    Attributes:
+        __profiler: Профилировщик, в который записываются замеры.
+    """
+
+    def __init__(self, profiler: StartupProfiler) -> None:
+        """Инициализирует искатель.
+
+        Args:
+            profiler: Профилировщик, в который записываются замеры.
+        """
+        self.__profiler = profiler
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Optional[Any],
+        target: Optional[Any] = None
+    ) -> Optional[importlib.machinery.ModuleSpec]:
+        """Находит спецификацию модуля через остальные искатели.
+
+        Args:
+            fullname: Полное имя модуля.
+            path: Путь поиска для подмодулей.
+            target: Модуль, перезагружаемый через importlib.reload.
+
+        Returns:
+            Спецификация модуля или None, если модуль не найден.
+        """
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            loader = spec.loader
+            # Загрузчики исходных файлов создаются на каждый модуль, поэтому
+            # подмена метода у экземпляра не затрагивает другие модули.
+            if isinstance(loader, (
+                importlib.machinery.SourceFileLoader,
+                importlib.machinery.SourcelessFileLoader
+            )):
+                exec_module = loader.exec_module
+                profiler = self.__profiler
+                loader.exec_module = (
+                    lambda module, _name=fullname, _exec=exec_module:
+                    profiler._exec_module(_name, _exec, module)
+                )
+            return spec
+        return None
+
+
+startup_profiler = StartupProfiler()
@@ -0,0 +1,170 @@
+"""Модуль файла статистики заметок рядом с хранилищем."""
+
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+from core.note_statistics import NoteStatistics
+
+
+class StatisticsFile:
+    """Сохраненная статистика NoteStatistics, дописываемая при каждом изменении.
+
+    Первая строка файла — снимок NoteStatistics.to_dict(): общие
+    счетчики, таблица "месяц -> день -> ID", частоты слов и учтенные
+    атрибуты каждой заметки (без текстов). Каждое изменение заметок
+    дописывает одну строку {"put": {ID: атрибуты}, "delete": [ID]}, так что
+    запись не зависит от числа заметок. Строки имеют вид "<crc32> <json>\\n",
+    как в WriteAheadLog; чтение останавливается на первой поврежденной
+    или недописанной строке. Когда дописанные строки дорастают до
+    COMPACT_RATIO размера снимка (но не меньше COMPACT_MIN байт), файл
+    переписывается одним снимком.
+
+    Файл — кэш, а не источник данных: load восстанавливает статистику без
+    чтения текстов, а расхождения с заметками (запись другим процессом,
+    потерянная строка) находит NoteStatistics.sync по версиям заметок.
+    Поэтому ошибки записи файла не прерывают изменение заметок.
+
+    Attributes:
+        COMPACT_RATIO: Доля размера снимка, при которой файл переписывается.
+        COMPACT_MIN: Размер дописанных строк в байтах, до которого файл
+                     не переписывается.
+        path: Путь к файлу статистики.
+        __snapshot_bytes: Размер строки снимка в байтах.
+        __log_bytes: Размер дописанных после снимка строк в байтах.
+    """
+
+    COMPACT_RATIO = 0.5
+    COMPACT_MIN = 1 << 16
+
+    def __init__(self, path: str) -> None:
+        """Инициализирует файл статистики. Файл создается при первой записи.
+
+        Args:
+            path: Путь к файлу статистики.
+        """
+        self.path: Path = Path(path)
+        self.__snapshot_bytes: int = 0
+        self.__log_bytes: int = 0
+
+    def load(self) -> Optional[Tuple[NoteStatistics, bool]]:
+        """Восстанавливает статистику из снимка и дописанных строк.
+
+        Returns:
+            Кортеж (статистика, True, если файл прочитан целиком) или None,
+            если файла нет или снимок поврежден.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                lines = f.read().splitlines(keepends=True)
+        except OSError:
+            return None
+        if not lines:
+            return None
+        snapshot = self.__decode(lines[0])
+        if snapshot is None:
+            return None
+        try:
+            statistics = NoteStatistics.from_dict(snapshot)
+        except (KeyError, TypeError, ValueError, OverflowError):
+            return None
+        self.__snapshot_bytes, self.__log_bytes = len(lines[0]), 0
+        for line in lines[1:]:
+            change = self.__decode(line)
+            if change is None:
+                return statistics, False
+            try:
+                for note_id, entry in change.get("put", {}).items():
+                    statistics.add_entry(int(note_id), entry)
+                for note_id in change.get("delete", ()):
+                    statistics.remove(int(note_id))
+            except (AttributeError, TypeError, ValueError, OverflowError):
+                return statistics, False
+            self.__log_bytes += len(line)
+        return statistics, True
+
+    def save(self, statistics: NoteStatistics) -> None:
+        """Атомарно переписывает файл одним снимком статистики.
+
+        Args:
+            statistics: Сохраняемая статистика.
+        """
+        line = self.__encode(statistics.to_dict())
+        temp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp, "wb") as f:
+                f.write(line)
+            os.replace(temp, self.path)
+        except OSError:
+            # Статистика пересчитается по заметкам при следующей загрузке.
+            self.__snapshot_bytes = 0
+            return
+        self.__snapshot_bytes, self.__log_bytes = len(line), 0
+
+    def append(self, statistics: NoteStatistics, put: Iterable[int], deleted: Iterable[int]) -> None:
+        """Дописывает учтенные атрибуты измененных заметок и ID удаленных.
+
+        Если дописанные строки выросли до COMPACT_RATIO снимка, файл
+        переписывается снимком. Пока снимок не загружен и не записан
+        (load, save), строки не дописываются.
+
+        Args:
+            statistics: Статистика, уже учитывающая изменение.
+            put: ID добавленных и измененных заметок.
+            deleted: ID удаленных заметок.
+        """
+        if not self.__snapshot_bytes:
+            # Снимок не записан (load или save не удались): дописывать не к чему.
+            return
+        change: Dict[str, Any] = {"put": {}, "delete": list(deleted)}
+        for note_id in put:
+            entry = statistics.entry(note_id)
+            if entry is not None:
+                change["put"][str(note_id)] = entry
+        if not change["put"] and not change["delete"]:
+            return
+        line = self.__encode(change)
+        try:
+            with open(self.path, "ab") as f:
+                f.write(line)
+        except OSError:
+            return
+        self.__log_bytes += len(line)
+        if self.__log_bytes >= max(self.COMPACT_MIN, self.COMPACT_RATIO * self.__snapshot_bytes):
+            self.save(statistics)
+
+    @staticmethod
+    def __encode(record: Dict[str, Any]) -> bytes:
+        """Кодирует запись строкой "<crc32> <json>\\n".
+
+        Args:
+            record: Запись (словарь, сериализуемый в JSON).
+
+        Returns:
+            Строка файла в байтах.
+        """
+        payload = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return b"%08x %s\n" % (zlib.crc32(payload), payload)
+
+    @staticmethod
+    def __decode(line: bytes) -> Optional[Dict[str, Any]]:
+        """Разбирает строку файла и проверяет контрольную сумму.
+
+        Args:
+            line: Строка файла.
+
+        Returns:
+            Запись или None, если строка недописана или повреждена.
+        """
+        if not line.endswith(b"\n") or len(line) < 10 or line[8:9] != b" ":
+            return None
+        payload = line[9:-1]
+        try:
+            if int(line[:8], 16) != zlib.crc32(payload):
+                return None
+            record = json.loads(payload.decode("utf-8"))
+        except (ValueError, UnicodeDecodeError):
+            return None
+        return record if isinstance(record, dict) else None
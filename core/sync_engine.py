@@ -0,0 +1,344 @@
+"""Модуль инкрементальной синхронизации двух хранилищ заметок."""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from core.json_storage import JsonStorage
+from core.note import Note
+from state.base_state import BaseState
+
+
+class SyncDelta:
+    """Изменения хранилища-источника между двумя номерами изменений.
+
+    Attributes:
+        from_seq: Номер изменения, после которого собраны изменения.
+        to_seq: Номер последнего изменения источника.
+        notes: Словари добавленных и измененных заметок.
+        deleted: ID удаленных заметок.
+    """
+
+    def __init__(
+        self,
+        from_seq: int,
+        to_seq: int,
+        notes: Optional[List[Dict[str, Any]]] = None,
+        deleted: Optional[List[int]] = None
+    ) -> None:
+        """Инициализирует дельту.
+
+        Args:
+            from_seq: Номер изменения, после которого собраны изменения.
+            to_seq: Номер последнего изменения источника.
+            notes: Словари добавленных и измененных заметок.
+            deleted: ID удаленных заметок.
+        """
+        self.from_seq: int = from_seq
+        self.to_seq: int = to_seq
+        self.notes: List[Dict[str, Any]] = notes or []
+        self.deleted: List[int] = deleted or []
+
+    def __bool__(self) -> bool:
+        """Возвращает True, если дельта содержит хотя бы одно изменение."""
+        return bool(self.notes or self.deleted)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Преобразует дельту в словарь для передачи в JSON.
+
+        Returns:
+            Словарь с полями from_seq, to_seq, notes и deleted.
+        """
+        return {
+            "from_seq": self.from_seq,
+            "to_seq": self.to_seq,
+            "notes": self.notes,
+            "deleted": self.deleted,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SyncDelta":
+        """Создает дельту из словаря, полученного через to_dict.
+
+        Args:
+            data: Словарь с полями from_seq, to_seq, notes и deleted.
+
+        Returns:
+            Объект SyncDelta.
+        """
+        return cls(data["from_seq"], data["to_seq"], data["notes"], data["deleted"])
+
+
+class SyncReport:
+    """Итоги применения дельты к хранилищу-приемнику.
+
+    Attributes:
+        applied: ID добавленных или обновленных заметок.
+        deleted: ID удаленных заметок.
+        conflicts: ID заметок, оставленных без изменений из-за конфликта
+                   (в приемнике версия новее или та же версия с другим
+                   содержимым).
+        seq: Номер изменения источника, до которого синхронизирован приемник.
+    """
+
+    def __init__(self, seq: int) -> None:
+        """Инициализирует пустые итоги.
+
+        Args:
+            seq: Номер изменения источника, до которого синхронизирован приемник.
+        """
+        self.applied: List[int] = []
+        self.deleted: List[int] = []
+        self.conflicts: List[int] = []
+        self.seq: int = seq
+
+
+class SyncEngine:
+    """Передает изменения заметок из хранилища-источника в любое BaseState.
+
+    Ведет рядом с источником журнал изменений: для каждой заметки — ее
+    версию и номер изменения (seq), на котором эта версия была замечена,
+    а для удаленных заметок — номер изменения удаления. Заметки с новой
+    версией получают следующий номер изменения. Какие заметки могли
+    измениться, источник сообщает сам (BaseState.changes_after): JSON-
+    хранилище отмечает ID затронутых заметок при каждой записи, и
+    движок читает из источника только их (BaseState.get_notes). Если
+    источник историю не ведет или она неполна (файл перезаписан
+    целиком, лента изменений обрезана), источник один раз перебирается
+    через iter_notes. Дельта с заданной контрольной точки содержит
+    только заметки с большим номером, поэтому после нескольких правок
+    передаются и применяются только они.
+
+    Контрольная точка приемника (последний примененный номер изменения
+    источника) хранится в отдельном файле рядом с приемником.
+
+    В приемник записываются только заметки и удаления из дельты — через
+    BaseState.apply_changes, поэтому, например, DurableJsonState
+    дописывает их в журнал, не переписывая хранилище.
+
+    Конфликты решаются по версии заметки: заметка приемника заменяется,
+    только если версия из источника больше. Если в приемнике версия
+    больше или та же версия с другим содержимым, заметка приемника
+    сохраняется и попадает в SyncReport.conflicts.
+
+    Attributes:
+        source: Хранилище-источник.
+        journal_path: Путь к файлу журнала изменений источника.
+        seq: Номер последнего изменения источника.
+        version: Версия источника, до которой учтены изменения, или None.
+        __notes: Версия и номер изменения каждой заметки источника.
+        __deleted: Номер изменения удаления для удаленных заметок.
+    """
+
+    def __init__(self, source: BaseState, journal_path: str) -> None:
+        """Инициализирует движок и читает журнал изменений.
+
+        Args:
+            source: Хранилище-источник.
+            journal_path: Путь к файлу журнала изменений источника.
+        """
+        self.source: BaseState = source
+        self.journal_path: Path = Path(journal_path)
+        journal = self.__read_json(self.journal_path) or {}
+        self.seq: int = journal.get("seq", 0)
+        self.version: Optional[int] = journal.get("version")
+        self.__notes: Dict[int, List[int]] = {
+            int(key): value for key, value in journal.get("notes", {}).items()
+        }
+        self.__deleted: Dict[int, int] = {
+            int(key): value for key, value in journal.get("deleted", {}).items()
+        }
+
+    def changes_since(self, seq: int, record: bool = True) -> SyncDelta:
+        """Отмечает новые изменения источника и возвращает дельту после seq.
+
+        Args:
+            seq: Номер изменения, уже примененный приемником (0 — с начала).
+            record: Сохранить новые номера изменений в журнал. При False
+                    журнал не меняется ни в памяти, ни на диске (пробный
+                    запуск); новым изменениям выдаются те же номера, что
+                    и при последующем вызове с record=True.
+
+        Returns:
+            Дельта с заметками и удалениями, номер которых больше seq.
+        """
+        last_seq = self.seq
+        notes = self.__notes if record else dict(self.__notes)
+        deleted = self.__deleted if record else dict(self.__deleted)
+        delta = SyncDelta(seq, last_seq)
+        version, changed = self.source.changes_after(self.version)
+        if changed is None:
+            # Истории изменений нет: перебираем источник целиком.
+            seen = set()
+            for note in self.source.iter_notes():
+                seen.add(note.id)
+                last_seq = self.__mark(notes, deleted, note, last_seq)
+                if notes[note.id][1] > seq:
+                    delta.notes.append(JsonStorage.note_to_dict(note))
+            gone = [i for i in notes if i not in seen]
+        else:
+            fresh = {note.id: note for note in self.source.get_notes(sorted(changed))}
+            for note in fresh.values():
+                last_seq = self.__mark(notes, deleted, note, last_seq)
+            gone = [i for i in sorted(changed) if i in notes and i not in fresh]
+
+        for note_id in gone:
+            del notes[note_id]
+            last_seq += 1
+            deleted[note_id] = last_seq
+        if changed is not None:
+            wanted = [i for i, entry in notes.items() if entry[1] > seq]
+            fresh.update(
+                (note.id, note) for note in self.source.get_notes(i for i in wanted if i not in fresh)
+            )
+            delta.notes = [JsonStorage.note_to_dict(fresh[i]) for i in wanted if i in fresh]
+        delta.deleted = [i for i, deleted_seq in deleted.items() if deleted_seq > seq]
+        delta.to_seq = last_seq
+        if record:
+            self.seq = last_seq
+            self.version = version
+            self.__write_json(self.journal_path, {
+                "seq": self.seq,
+                "version": self.version,
+                "notes": self.__notes,
+                "deleted": self.__deleted,
+            })
+        return delta
+
+    @staticmethod
+    def __mark(
+        notes: Dict[int, List[int]], deleted: Dict[int, int], note: Note, last_seq: int
+    ) -> int:
+        """Выдает заметке следующий номер изменения, если ее версия новая.
+
+        Args:
+            notes: Версия и номер изменения каждой заметки.
+            deleted: Номер изменения удаления для удаленных заметок.
+            note: Заметка источника.
+            last_seq: Номер последнего выданного изменения.
+
+        Returns:
+            Номер последнего выданного изменения после отметки.
+        """
+        entry = notes.get(note.id)
+        if entry is None or entry[0] != note.version:
+            last_seq += 1
+            notes[note.id] = [note.version, last_seq]
+            deleted.pop(note.id, None)
+        return last_seq
+
+    def pending(self, checkpoint_path: str) -> SyncDelta:
+        """Возвращает дельту, которую передала бы sync, ничего не записывая.
+
+        Args:
+            checkpoint_path: Путь к файлу контрольной точки приемника.
+
+        Returns:
+            Дельта изменений после контрольной точки приемника.
+        """
+        state = self.__read_json(Path(checkpoint_path)) or {}
+        return self.changes_since(state.get(str(self.journal_path.resolve()), 0), record=False)
+
+    def sync(self, target: BaseState, checkpoint_path: str) -> SyncReport:
+        """Передает в приемник изменения после его контрольной точки.
+
+        Args:
+            target: Хранилище-приемник.
+            checkpoint_path: Путь к файлу контрольной точки приемника.
+
+        Returns:
+            Итоги применения дельты.
+        """
+        checkpoint = Path(checkpoint_path)
+        state = self.__read_json(checkpoint) or {}
+        key = str(self.journal_path.resolve())
+        delta = self.changes_since(state.get(key, 0))
+        report = self.apply(delta, target)
+        state[key] = delta.to_seq
+        self.__write_json(checkpoint, state)
+        return report
+
+    @staticmethod
+    def apply(delta: SyncDelta, target: BaseState) -> SyncReport:
+        """Применяет дельту к хранилищу-приемнику.
+
+        Из приемника читаются только заметки с ID из дельты (для проверки
+        версий) через get_notes, поэтому JSON-хранилище и репозиторий
+        находят их по ID, не перебирая остальные.
+        Записываются только заметки и удаления, которые действительно
+        применяются, одним вызовом apply_changes; порядок заметок
+        приемника сохраняется, новые дописываются в конец. Повторное
+        применение той же дельты ничего не записывает.
+
+        Args:
+            delta: Дельта изменений источника.
+            target: Хранилище-приемник.
+
+        Returns:
+            Итоги применения дельты.
+        """
+        report = SyncReport(delta.to_seq)
+        if not delta:
+            return report
+
+        wanted = {data["id"] for data in delta.notes}
+        removed = set(delta.deleted)
+        current: Dict[int, Note] = {
+            note.id: note for note in target.get_notes(sorted(wanted | removed))
+        }
+        present = {note_id for note_id in removed if note_id in current}
+
+        changed: List[Note] = []
+        for data in delta.notes:
+            incoming = JsonStorage.dict_to_note(data)
+            existing = current.get(incoming.id)
+            if existing is None or existing.version < incoming.version:
+                changed.append(incoming)
+                report.applied.append(incoming.id)
+            elif (
+                existing.version > incoming.version
+                or JsonStorage.note_to_dict(existing) != JsonStorage.note_to_dict(incoming)
+            ):
+                report.conflicts.append(incoming.id)
+        report.deleted = [note_id for note_id in delta.deleted if note_id in present]
+
+        if changed or report.deleted:
+            target.apply_changes(changed, report.deleted)
+        return report
+
+    @staticmethod
+    def __read_json(path: Path) -> Optional[Dict[str, Any]]:
+        """Читает служебный JSON-файл.
+
+        Args:
+            path: Путь к файлу.
+
+        Returns:
+            Содержимое файла или None, если файла нет.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def __write_json(path: Path, data: Dict[str, Any]) -> None:
+        """Атомарно записывает служебный JSON-файл.
+
+        Args:
+            path: Путь к файлу.
+            data: Данные для записи.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,71 @@
+"""Модуль инвертированного индекса слов в текстах заметок."""
+
+from typing import Dict, List, Set
+from core.note import Note
+from core.tokenizer import iter_tokens
+
+
+class TextIndex:
+    """Инвертированный индекс: слово -> заметки и позиции слова в тексте.
+
+    Строится по тем же словам, что и str.split(), и хранит смещения начала
+    каждого вхождения, чтобы стратегии могли вернуть позиции совпадений
+    без повторного сканирования текста. Поддерживает точечное добавление
+    и удаление заметок.
+
+    Attributes:
+        __postings: Слово -> {ID заметки: список смещений начала слова}.
+        __note_words: ID заметки -> множество слов, встречающихся в ней.
+    """
+
+    def __init__(self) -> None:
+        """Инициализирует пустой индекс."""
+        self.__postings: Dict[str, Dict[int, List[int]]] = {}
+        self.__note_words: Dict[int, Set[str]] = {}
+
+    def add(self, note: Note) -> None:
+        """Добавляет заметку в индекс (или переиндексирует ее).
+
+        Args:
+            note: Заметка для индексации.
+        """
+        if note.id in self.__note_words:
+            self.remove(note.id)
+        words: Set[str] = set()
+        for word, start, _ in iter_tokens(note.text):
+            self.__postings.setdefault(word, {}).setdefault(note.id, []).append(start)
+            words.add(word)
+        self.__note_words[note.id] = words
+
+    def remove(self, note_id: int) -> None:
+        """Удаляет заметку из индекса.
+
+        Args:
+            note_id: ID удаляемой заметки.
+        """
+        for word in self.__note_words.pop(note_id, ()):
+            postings = self.__postings[word]
+            del postings[note_id]
+            if not postings:
+                del self.__postings[word]
+
+    def lookup(self, word: str) -> Dict[int, List[int]]:
+        """Возвращает заметки, содержащие слово, и позиции вхождений.
+
+        Args:
+            word: Искомое слово (точное совпадение).
+
+        Returns:
+            Словарь ID заметки -> смещения начала слова. Пустой словарь,
+            если слово не встречается.
+        """
+        return self.__postings.get(word, {})
+
+    def clear(self) -> None:
+        """Удаляет из индекса все заметки."""
+        self.__postings.clear()
+        self.__note_words.clear()
+
+    def __len__(self) -> int:
+        """Возвращает количество проиндексированных заметок."""
+        return len(self.__note_words)
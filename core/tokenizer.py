@@ -0,0 +1,23 @@
+"""Модуль разбиения текста заметок на слова с позициями."""
+
+import re
+from typing import Iterator, Tuple
+
+_WORD_RE = re.compile(r"\S+")
+
+
+def iter_tokens(text: str) -> Iterator[Tuple[str, int, int]]:
+    """Разбивает текст на слова, разделенные пробельными символами.
+
+    Слова совпадают с результатом str.split(), но дополнительно
+    возвращаются их позиции в исходном тексте.
+
+    Args:
+        text: Текст для разбиения.
+
+    Yields:
+        Кортежи (слово, начало, конец), где начало и конец — смещения
+        символов в тексте (конец не включается).
+    """
+    for match in _WORD_RE.finditer(text):
+        yield match.group(), match.start(), match.end()
@@ -0,0 +1,97 @@
+"""Модуль отметок удаленных строк хранилищ заметок в памяти."""
+
+from bisect import bisect_left, insort
+from typing import Iterator, List
+
+
+class Tombstones:
+    """Отсортированные позиции удаленных строк.
+
+    Хранилища NoteRows и NoteColumns не сдвигают строки при удалении:
+    позиция строки помечается здесь, а индекс заметки (среди живых)
+    переводится в позицию строки двоичным поиском по отметкам, за
+    O(log k) для k отметок. Отметки снимаются уплотнением хранилища.
+
+    Attributes:
+        __positions: Позиции удаленных строк по возрастанию.
+    """
+
+    __slots__ = ("__positions",)
+
+    def __init__(self) -> None:
+        """Инициализирует пустой набор отметок."""
+        self.__positions: List[int] = []
+
+    def __len__(self) -> int:
+        """Возвращает количество удаленных строк."""
+        return len(self.__positions)
+
+    def __contains__(self, position: int) -> bool:
+        """Проверяет, удалена ли строка в позиции position."""
+        index = bisect_left(self.__positions, position)
+        return index < len(self.__positions) and self.__positions[index] == position
+
+    def add(self, position: int) -> None:
+        """Помечает строку удаленной.
+
+        Args:
+            position: Позиция строки.
+        """
+        insort(self.__positions, position)
+
+    def clear(self) -> None:
+        """Снимает все отметки (после уплотнения хранилища)."""
+        self.__positions.clear()
+
+    def physical(self, index: int) -> int:
+        """Переводит индекс живой строки в позицию строки.
+
+        Ищется наименьшее j, при котором j-я отметка стоит дальше, чем
+        index + j: разность "позиция отметки минус ее номер" не убывает.
+
+        Args:
+            index: Индекс среди живых строк.
+
+        Returns:
+            Позиция строки.
+        """
+        positions = self.__positions
+        low, high = 0, len(positions)
+        while low < high:
+            middle = (low + high) // 2
+            if positions[middle] - middle > index:
+                high = middle
+            else:
+                low = middle + 1
+        return index + low
+
+    def logical(self, position: int) -> int:
+        """Переводит позицию живой строки в ее индекс среди живых строк.
+
+        Args:
+            position: Позиция строки.
+
+        Returns:
+            Индекс среди живых строк.
+        """
+        return position - bisect_left(self.__positions, position)
+
+    def live(self, end: int) -> Iterator[int]:
+        """Перебирает позиции живых строк до end.
+
+        Отметки копируются в начале перебора, поэтому удаление во время
+        перебора его не сбивает.
+
+        Args:
+            end: Количество строк хранилища.
+
+        Yields:
+            Позиции живых строк по возрастанию.
+        """
+        start = 0
+        for position in list(self.__positions):
+            if position >= end:
+                break
+            yield from range(start, position)
+            start = position + 1
+        yield from range(start, end)
@@ -0,0 +1,235 @@
+"""Модуль журнала упреждающей записи (WAL) изменений заметок."""
+
+import json
+import os
+import time
+import zlib
+from core.json_storage import fsync_directory
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+
+class WriteAheadLog:
+    """Журнал изменений, дописываемый в конец файла до применения к снимку.
+
+    Каждая запись — одна строка "<crc32> <json>\\n", где crc32 считается по
+    байтам JSON. Запись считается зафиксированной, когда ее строка
+    дописана в файл (и, в зависимости от политики, сброшена на диск).
+    При восстановлении записи читаются по порядку до первой поврежденной
+    или недописанной строки: такой "рваный хвост" остается от прерванной
+    записи и отрезается.
+
+    Политики fsync:
+        ALWAYS: fsync после каждой записи — зафиксированная запись
+                переживает и падение процесса, и отключение питания.
+        BATCH: групповой fsync раз в batch_size записей или batch_interval
+               секунд; при отключении питания теряется не больше
+               последней группы.
+        OS: только запись в файл, сброс на диск выполняет ОС; переживает
+            падение процесса, но не отключение питания.
+
+    Attributes:
+        path: Путь к файлу журнала.
+        fsync: Политика fsync (ALWAYS, BATCH или OS).
+        batch_size: Количество записей в группе для политики BATCH.
+        batch_interval: Максимальный интервал между fsync для политики BATCH.
+        seq: Порядковый номер последней записи.
+        records: Количество записей в журнале после последнего усечения.
+        __file: Открытый на дозапись файл журнала или None.
+        __pending: Количество записей, еще не сброшенных на диск.
+        __synced_at: Момент последнего fsync (time.monotonic()).
+    """
+
+    ALWAYS = "always"
+    BATCH = "batch"
+    OS = "os"
+    POLICIES = (ALWAYS, BATCH, OS)
+
+    def __init__(
+        self,
+        path: str,
+        fsync: str = ALWAYS,
+        batch_size: int = 64,
+        batch_interval: float = 0.05
+    ) -> None:
+        """Инициализирует журнал. Файл открывается при первой записи.
+
+        Args:
+            path: Путь к файлу журнала.
+            fsync: Политика fsync (ALWAYS, BATCH или OS).
+            batch_size: Количество записей в группе для политики BATCH.
+            batch_interval: Максимальный интервал между fsync в секундах
+                            для политики BATCH.
+
+        Raises:
+            ValueError: Если политика fsync не поддерживается.
+        """
+        if fsync not in self.POLICIES:
+            raise ValueError(f"Неизвестная политика fsync: {fsync}")
+        self.path: Path = Path(path)
+        self.fsync: str = fsync
+        self.batch_size: int = batch_size
+        self.batch_interval: float = batch_interval
+        self.seq: int = 0
+        self.records: int = 0
+        self.__file: Optional[BinaryIO] = None
+        self.__pending: int = 0
+        self.__synced_at: float = time.monotonic()
+
+    def replay(self) -> Iterator[Dict[str, Any]]:
+        """Перебирает зафиксированные записи журнала и отрезает рваный хвост.
+
+        Вызывается при восстановлении до первой новой записи.
+
+        Yields:
+            Записи журнала в порядке добавления.
+        """
+        self.records = 0
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        valid_end = 0
+        with f:
+            for line in f:
+                record = self.__decode(line)
+                if record is None:
+                    break
+                valid_end += len(line)
+                self.seq = max(self.seq, record.get("seq", 0))
+                self.records += 1
+                yield record
+            size = f.seek(0, os.SEEK_END)
+        if valid_end < size:
+            os.truncate(self.path, valid_end)
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """Дописывает запись в журнал с учетом политики fsync.
+
+        Args:
+            record: Запись (словарь, сериализуемый в JSON). Поле seq
+                    заполняется журналом.
+
+        Returns:
+            Порядковый номер записи.
+        """
+        return self.append_many([record])
+
+    def append_many(self, records: List[Dict[str, Any]]) -> int:
+        """Дописывает несколько записей одной операцией записи.
+
+        Args:
+            records: Записи (словари, сериализуемые в JSON).
+
+        Returns:
+            Порядковый номер последней записи.
+        """
+        lines = []
+        for record in records:
+            self.seq += 1
+            payload = json.dumps({**record, "seq": self.seq}, ensure_ascii=False).encode("utf-8")
+            lines.append(b"%08x %s\n" % (zlib.crc32(payload), payload))
+        f = self.__open()
+        f.write(b"".join(lines))
+        f.flush()
+        self.records += len(records)
+        self.__pending += len(records)
+        if self.fsync == self.ALWAYS or (
+            self.fsync == self.BATCH
+            and (
+                self.__pending >= self.batch_size
+                or time.monotonic() - self.__synced_at >= self.batch_interval
+            )
+        ):
+            self.sync()
+        return self.seq
+
+    def sync(self) -> None:
+        """Сбрасывает на диск все дописанные записи."""
+        if self.__file is not None and self.__pending:
+            os.fsync(self.__file.fileno())
+        self.__pending = 0
+        self.__synced_at = time.monotonic()
+
+    def truncate(self) -> None:
+        """Очищает журнал после контрольной точки.
+
+        Вызывается, когда все записи журнала уже сохранены в снимке.
+        """
+        f = self.__open()
+        f.truncate(0)
+        os.fsync(f.fileno())
+        self.records = 0
+        self.__pending = 0
+        self.__synced_at = time.monotonic()
+
+    def discard(self, count: int) -> None:
+        """Удаляет из начала журнала записи, уже сохраненные в снимке.
+
+        Нужен контрольной точке, которая пишет снимок, не останавливая
+        запись в журнал: записи, добавленные во время записи снимка,
+        остаются. Оставшиеся записи копируются в новый файл, который
+        атомарно заменяет журнал.
+
+        Args:
+            count: Количество первых записей, которые нужно удалить.
+        """
+        if count >= self.records:
+            self.truncate()
+            return
+        if count <= 0:
+            return
+        self.close()
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        kept = 0
+        with open(self.path, "rb") as source, open(tmp_path, "wb") as target:
+            for number, line in enumerate(source):
+                if self.__decode(line) is None:
+                    break
+                if number >= count:
+                    target.write(line)
+                    kept += 1
+            target.flush()
+            os.fsync(target.fileno())
+        os.replace(tmp_path, self.path)
+        fsync_directory(self.path.parent)
+        self.records = kept
+
+    def close(self) -> None:
+        """Сбрасывает записи на диск и закрывает файл журнала."""
+        if self.__file is not None:
+            self.sync()
+            self.__file.close()
+            self.__file = None
+
+    def __open(self) -> BinaryIO:
+        """Открывает файл журнала на дозапись, если он еще не открыт.
+
+        Returns:
+            Открытый файл журнала.
+        """
+        if self.__file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.__file = open(self.path, "ab")
+        return self.__file
+
+    @staticmethod
+    def __decode(line: bytes) -> Optional[Dict[str, Any]]:
+        """Разбирает строку журнала и проверяет контрольную сумму.
+
+        Args:
+            line: Строка журнала.
+
+        Returns:
+            Запись или None, если строка недописана или повреждена.
+        """
+        if not line.endswith(b"\n") or len(line) < 10 or line[8:9] != b" ":
+            return None
+        payload = line[9:-1]
+        try:
+            if int(line[:8], 16) != zlib.crc32(payload):
+                return None
+            record = json.loads(payload.decode("utf-8"))
+        except (ValueError, UnicodeDecodeError):
+            return None
+        return record if isinstance(record, dict) else None
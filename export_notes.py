@@ -0,0 +1,65 @@
+"""Консольный потоковый экспорт заметок в JSONL, CSV или Markdown.
+
+Примеры запуска:
+
+    python export_notes.py --output notes.jsonl
+    python export_notes.py --format csv --output notes.csv.gz
+    python export_notes.py --format md --by keyword --query отчет --output -
+"""
+
+import argparse
+import sys
+from typing import Optional
+from core.exceptions import StorageError
+from core.note_exporter import NoteExporter
+from state.json_state import JsonState
+from strategies.base_strategy import BaseStrategy
+from strategies.search_by_date_strategy import SearchByDateStrategy
+from strategies.search_by_keyword_strategy import SearchKeywordStrategy
+from strategies.search_by_title_strategy import SearchTitleStrategy
+from strategies.view_by_id_strategy import SearchByIDStrategy
+
+FILTERS = {
+    "id": lambda query: SearchByIDStrategy(int(query)),
+    "title": SearchTitleStrategy,
+    "date": SearchByDateStrategy,
+    "keyword": SearchKeywordStrategy,
+}
+
+
+def main() -> int:
+    """Разбирает аргументы командной строки и выполняет экспорт.
+
+    Returns:
+        Код возврата процесса: 0 при успехе, 1 при ошибке.
+    """
+    parser = argparse.ArgumentParser(description="Потоковый экспорт заметок")
+    parser.add_argument("--format", choices=NoteExporter.FORMATS, default="jsonl", help="формат вывода")
+    parser.add_argument("--output", default="-", help="выходной файл или '-' для stdout")
+    parser.add_argument("--gzip", action="store_true", help="сжать вывод gzip (по умолчанию для *.gz)")
+    parser.add_argument("--file", default="data/notes.json", help="файл хранилища заметок")
+    parser.add_argument("--by", choices=sorted(FILTERS), help="фильтр по стратегии поиска")
+    parser.add_argument("--query", help="значение для фильтра --by")
+    args = parser.parse_args()
+
+    strategy: Optional[BaseStrategy] = None
+    if args.by is not None:
+        if args.query is None:
+            parser.error("для --by требуется --query")
+        strategy = FILTERS[args.by](args.query)
+
+    exporter = NoteExporter(args.format)
+    try:
+        report = exporter.export_to_path(
+            JsonState(args.file), args.output, strategy, compress=args.gzip or None
+        )
+    except (OSError, ValueError, StorageError) as error:
+        print(f"Ошибка экспорта: {error}", file=sys.stderr)
+        return 1
+
+    print(f"Выгружено заметок: {report.count} за {report.seconds:.2f} с", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""Консольный массовый импорт заметок из JSONL, CSV или каталога текстовых файлов.
+
+Примеры запуска:
+
+    python import_notes.py notes.jsonl
+    python import_notes.py export.csv --batch-size 50000
+    python import_notes.py ./texts --format dir --file data/notes.json
+"""
+
+import argparse
+import sys
+import time
+from core.exceptions import StorageError
+from core.json_storage import JsonStorage
+from core.note_importer import NoteImporter
+
+
+def main() -> int:
+    """Разбирает аргументы командной строки и выполняет импорт.
+
+    Returns:
+        Код возврата процесса: 0 при успехе, 1 при ошибке.
+    """
+    parser = argparse.ArgumentParser(description="Массовый импорт заметок")
+    parser.add_argument("source", help="файл JSONL/CSV или каталог с .txt файлами")
+    parser.add_argument("--format", choices=NoteImporter.FORMATS, help="формат источника")
+    parser.add_argument("--file", default="data/notes.json", help="файл хранилища заметок")
+    parser.add_argument("--batch-size", type=int, default=10000, help="размер блока записей")
+    args = parser.parse_args()
+
+    importer = NoteImporter(JsonStorage(args.file), args.batch_size)
+    started = time.perf_counter()
+
+    def progress(count: int) -> None:
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed else 0.0
+        print(f"\rимпортировано: {count} ({rate:,.0f} заметок/с)", end="", file=sys.stderr, flush=True)
+
+    try:
+        report = importer.import_path(args.source, args.format, progress)
+    except (OSError, ValueError, StorageError) as error:
+        print(f"\nОшибка импорта: {error}", file=sys.stderr)
+        return 1
+
+    print(file=sys.stderr)
+    print(
+        f"Импортировано заметок: {report.count} за {report.seconds:.2f} с "
+        f"({report.rate:,.0f} заметок/с), версия хранилища: {report.version}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Модуль базового класса асинхронного состояния."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+from core.note import Note
+from core.search_hit import SearchHit
+from core.text_index import TextIndex
+from strategies.base_strategy import BaseStrategy
+
+T = TypeVar("T")
+
+
+class AsyncBaseState(ABC):
+    """Абстрактный асинхронный аналог BaseState.
+
+    Предназначен для потребителей, работающих в цикле asyncio (HTTP API
+    api_server.py, фоновая индексация): методы не блокируют цикл, а чтение и запись
+    файлов выполняются в потоках. Одинаковые одновременные чтения
+    объединяются через _coalesce: пока чтение выполняется, остальные
+    вызывающие ждут его результата, а не запускают свое.
+    """
+
+    def __init__(self) -> None:
+        """Инициализирует таблицу выполняющихся запросов."""
+        self.__inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    @abstractmethod
+    async def load(self) -> List[Note]:
+        """Загружает все заметки.
+
+        Returns:
+            Новый список объектов Note в порядке хранения.
+        """
+        pass
+
+    @abstractmethod
+    async def add(self, title: str, text: str) -> Note:
+        """Создает заметку со следующим свободным ID и сохраняет ее.
+
+        Args:
+            title: Название заметки.
+            text: Текст заметки.
+
+        Returns:
+            Созданный объект Note.
+        """
+        pass
+
+    async def get(self, note_id: int) -> Optional[Note]:
+        """Возвращает заметку по ID.
+
+        Базовая реализация ищет заметку в результате load.
+
+        Args:
+            note_id: ID заметки.
+
+        Returns:
+            Объект Note или None, если заметки нет.
+        """
+        for note in await self.load():
+            if note.id == note_id:
+                return note
+        return None
+
+    async def page(self, offset: int, limit: int) -> Tuple[int, List[Note]]:
+        """Возвращает страницу заметок.
+
+        Базовая реализация берет срез результата load.
+
+        Args:
+            offset: Количество пропускаемых заметок.
+            limit: Максимальное количество заметок на странице.
+
+        Returns:
+            Кортеж (общее количество заметок, заметки страницы).
+        """
+        notes = await self.load()
+        return len(notes), notes[offset:offset + limit]
+
+    async def text_index(self) -> Optional[TextIndex]:
+        """Возвращает индекс текстов заметок для SearchKeywordStrategy.
+
+        Базовая реализация индекса не держит, и тексты сканируются.
+
+        Returns:
+            Индекс, построенный по заметкам последней загрузки, или None.
+        """
+        return None
+
+    async def search_hits(
+        self, strategy: BaseStrategy, offset: int = 0, limit: Optional[int] = None
+    ) -> List[SearchHit]:
+        """Находит совпадения стратегии с позициями, начиная с offset.
+
+        Совпадения перебираются лениво и в потоке: страница из начала
+        выдачи не сканирует весь корпус и не останавливает цикл событий.
+
+        Args:
+            strategy: Стратегия поиска.
+            offset: Количество пропускаемых совпадений.
+            limit: Максимальное количество совпадений или None — все.
+
+        Returns:
+            Совпадения в порядке хранения заметок.
+        """
+        notes = await self.load()
+        stop = None if limit is None else offset + limit
+        return await asyncio.to_thread(
+            lambda: list(islice(strategy.iter_hits(notes), offset, stop))
+        )
+
+    async def search(self, strategy: BaseStrategy) -> List[Note]:
+        """Находит заметки, подходящие под стратегию.
+
+        Перебор выполняется в потоке, чтобы сканирование большого корпуса
+        не останавливало цикл событий.
+
+        Args:
+            strategy: Стратегия поиска.
+
+        Returns:
+            Найденные заметки в порядке хранения.
+        """
+        notes = await self.load()
+        return await asyncio.to_thread(lambda: list(strategy.iter_matches(notes)))
+
+    async def _coalesce(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """Объединяет одновременные одинаковые запросы в один.
+
+        Если запрос с тем же ключом уже выполняется, ожидает его результат;
+        иначе запускает factory(). Отмена одного из ожидающих не отменяет
+        общий запрос для остальных.
+
+        Args:
+            key: Ключ запроса (одинаковые запросы имеют равные ключи).
+            factory: Функция, создающая корутину запроса.
+
+        Returns:
+            Результат запроса.
+        """
+        future = self.__inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self.__inflight[key] = future
+            future.add_done_callback(lambda _: self.__inflight.pop(key, None))
+        return await asyncio.shield(future)
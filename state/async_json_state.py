@@ -0,0 +1,258 @@
+"""Модуль асинхронного состояния для работы с JSON-хранилищем заметок."""
+
+import asyncio
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
+from state.async_base_state import AsyncBaseState
+from core.json_storage import JsonStorage
+from core.note import Note
+from core.search_hit import SearchHit
+from core.text_index import TextIndex
+from strategies.base_strategy import BaseStrategy
+
+
+class AsyncJsonState(AsyncBaseState):
+    """Асинхронное состояние поверх JSON-файла.
+
+    Чтение и запись файла выполняются в потоках через asyncio.to_thread.
+    Разобранные заметки кэшируются вместе с версией файла: повторная
+    загрузка читает только заголовок файла и разбирает заметки заново,
+    лишь если версия изменилась, поэтому заметки, добавленные другими
+    процессами, видны без перезапуска. Одновременные загрузки
+    объединяются в одно чтение диска, добавления выполняются по одному.
+
+    Собственное добавление не сбрасывает кэш: если файл с прошлой
+    загрузки не менялся, заметка дописывается в кэш и индекс на месте.
+    Индекс текстов строится в потоке при первом запросе text_index и
+    перестраивается, только когда кэш перечитан из файла.
+
+    Поиски (search_hits) читают кэш и индекс в потоках, поэтому запись
+    в них на месте ждет, пока выполняющиеся поиски закончатся, а новые
+    поиски ждут, пока запись не выполнится. Поиски друг друга не ждут.
+
+    Attributes:
+        storage: Экземпляр JsonStorage для работы с файлом.
+        __cache: Версия файла и заметки последней загрузки или None.
+        __by_id: Заметки последней загрузки по ID.
+        __index: Версия файла и индекс текстов по ее заметкам или None.
+        __write_lock: Блокировка, упорядочивающая добавления.
+        __idle: Условие, по которому поиски и запись в кэш ждут друг друга.
+        __searches: Количество выполняющихся поисков.
+        __writers: Количество добавлений, ждущих записи в кэш.
+    """
+
+    def __init__(self, filepath: str = "data/notes.json") -> None:
+        """Инициализирует асинхронное состояние JSON-хранилища.
+
+        Args:
+            filepath: Путь к JSON-файлу для хранения заметок.
+                      По умолчанию "data/notes.json".
+        """
+        super().__init__()
+        self.storage: JsonStorage = JsonStorage(filepath)
+        self.__cache: Optional[Tuple[int, List[Note]]] = None
+        self.__by_id: Dict[int, Note] = {}
+        self.__index: Optional[Tuple[int, TextIndex]] = None
+        self.__write_lock: Optional[asyncio.Lock] = None
+        self.__idle: Optional[asyncio.Condition] = None
+        self.__searches: int = 0
+        self.__writers: int = 0
+
+    async def load(self) -> List[Note]:
+        """Загружает заметки из файла или из кэша, если файл не менялся.
+
+        Returns:
+            Новый список объектов Note в порядке хранения.
+
+        Raises:
+            StorageCorruptedError: Если файл поврежден.
+        """
+        return list(await self._coalesce("load", self.__refresh))
+
+    async def get(self, note_id: int) -> Optional[Note]:
+        """Возвращает заметку по ID.
+
+        Args:
+            note_id: ID заметки.
+
+        Returns:
+            Объект Note или None, если заметки нет.
+        """
+        await self._coalesce("load", self.__refresh)
+        return self.__by_id.get(note_id)
+
+    async def page(self, offset: int, limit: int) -> Tuple[int, List[Note]]:
+        """Возвращает страницу заметок без копирования всего списка.
+
+        Args:
+            offset: Количество пропускаемых заметок.
+            limit: Максимальное количество заметок на странице.
+
+        Returns:
+            Кортеж (общее количество заметок, заметки страницы).
+        """
+        notes = await self._coalesce("load", self.__refresh)
+        return len(notes), notes[offset:offset + limit]
+
+    async def text_index(self) -> Optional[TextIndex]:
+        """Возвращает индекс текстов заметок текущей версии файла.
+
+        Returns:
+            Индекс, построенный по заметкам последней загрузки.
+        """
+        await self._coalesce("load", self.__refresh)
+        return await self._coalesce("index", self.__build_index)
+
+    async def search_hits(
+        self, strategy: BaseStrategy, offset: int = 0, limit: Optional[int] = None
+    ) -> List[SearchHit]:
+        """Находит совпадения стратегии без копирования списка заметок.
+
+        Args:
+            strategy: Стратегия поиска.
+            offset: Количество пропускаемых совпадений.
+            limit: Максимальное количество совпадений или None — все.
+
+        Returns:
+            Совпадения в порядке хранения заметок.
+        """
+        idle = self.__condition()
+        async with idle:
+            await idle.wait_for(lambda: not self.__writers)
+            self.__searches += 1
+        try:
+            notes = await self._coalesce("load", self.__refresh)
+            stop = None if limit is None else offset + limit
+            return await asyncio.to_thread(
+                lambda: list(islice(strategy.iter_hits(notes), offset, stop))
+            )
+        finally:
+            async with idle:
+                self.__searches -= 1
+                idle.notify_all()
+
+    async def add(self, title: str, text: str) -> Note:
+        """Атомарно добавляет заметку со следующим свободным ID.
+
+        ID выделяется из счетчика файла под исключительной блокировкой
+        JsonStorage (см. JsonStorage.append_record), поэтому добавление не
+        конфликтует с другими процессами и не выдает ID удаленных заметок.
+
+        Args:
+            title: Название заметки.
+            text: Текст заметки.
+
+        Returns:
+            Созданный объект Note.
+        """
+        if self.__write_lock is None:
+            self.__write_lock = asyncio.Lock()
+        async with self.__write_lock:
+            note, old_version, new_version = await asyncio.to_thread(self.__append, title, text)
+            idle = self.__condition()
+            async with idle:
+                self.__writers += 1
+                try:
+                    # Кэш и индекс читают потоки поисков: ждем их окончания.
+                    await idle.wait_for(lambda: not self.__searches)
+                    self.__append_cached(note, old_version, new_version)
+                finally:
+                    self.__writers -= 1
+                    idle.notify_all()
+            return note
+
+    def __append_cached(self, note: Note, old_version: int, new_version: int) -> None:
+        """Дописывает свою заметку в кэш и индекс, если файл менялся только нами.
+
+        Вызывается, когда ни один поиск не выполняется.
+
+        Args:
+            note: Добавленная заметка.
+            old_version: Версия файла до добавления.
+            new_version: Версия файла после добавления.
+        """
+        cache = self.__cache
+        if cache is None or cache[0] != old_version:
+            return
+        cache[1].append(note)
+        self.__cache = (new_version, cache[1])
+        self.__by_id[note.id] = note
+        if self.__index is not None and self.__index[0] == old_version:
+            self.__index[1].add(note)
+            self.__index = (new_version, self.__index[1])
+
+    def __condition(self) -> asyncio.Condition:
+        """Возвращает условие ожидания поисков и записи, создавая его в цикле событий.
+
+        Returns:
+            Общее условие __idle.
+        """
+        if self.__idle is None:
+            self.__idle = asyncio.Condition()
+        return self.__idle
+
+    async def __refresh(self) -> List[Note]:
+        """Перечитывает файл в потоке, если изменилась его версия.
+
+        Returns:
+            Заметки текущей версии файла (общий список кэша).
+        """
+        cache = self.__cache
+        version = await asyncio.to_thread(self.storage.read_version)
+        if cache is not None and cache[0] == version:
+            return cache[1]
+        version, notes = await asyncio.to_thread(self.__read)
+        self.__cache = (version, notes)
+        self.__by_id = {note.id: note for note in notes}
+        return notes
+
+    async def __build_index(self) -> TextIndex:
+        """Строит индекс текстов по кэшу в потоке, если он устарел.
+
+        Returns:
+            Индекс текстов заметок текущего кэша.
+        """
+        version, notes = self.__cache
+        if self.__index is not None and self.__index[0] == version:
+            return self.__index[1]
+
+        def build() -> TextIndex:
+            index = TextIndex()
+            for note in notes:
+                index.add(note)
+            return index
+
+        index = await asyncio.to_thread(build)
+        if self.__cache is not None and self.__cache[0] == version:
+            self.__index = (version, index)
+        return index
+
+    def __read(self) -> Tuple[int, List[Note]]:
+        """Читает и разбирает файл (выполняется в потоке).
+
+        Returns:
+            Кортеж (версия файла, заметки).
+        """
+        version, data = self.storage.read_versioned()
+        return version, [self.storage.to_note(item) for item in data]
+
+    def __append(self, title: str, text: str) -> Tuple[Note, int, int]:
+        """Добавляет заметку в файл (выполняется в потоке).
+
+        Args:
+            title: Название заметки.
+            text: Текст заметки.
+
+        Returns:
+            Кортеж (созданный объект Note, версия файла до добавления,
+            новая версия).
+        """
+        created: List[Note] = []
+
+        def build(next_id: int) -> dict:
+            note = Note(next_id, title, text)
+            created.append(note)
+            return self.storage.note_to_dict(note)
+
+        old_version, new_version = self.storage.append_record(build)
+        return created[0], old_version, new_version
@@ -0,0 +1,59 @@
+"""Модуль асинхронного состояния для работы с заметками в оперативной памяти."""
+
+from typing import Dict, List, Optional
+from state.async_base_state import AsyncBaseState
+from core.note import Note
+
+
+class AsyncMemoryState(AsyncBaseState):
+    """Асинхронное состояние для хранения заметок в оперативной памяти.
+
+    Ввода-вывода нет, поэтому операции выполняются сразу в цикле событий;
+    в поток выносится только перебор при поиске (см. AsyncBaseState.search).
+    Подходит для тестов асинхронных потребителей.
+
+    Attributes:
+        _notes: Заметки по ID в порядке добавления.
+    """
+
+    def __init__(self, notes: Optional[List[Note]] = None) -> None:
+        """Инициализирует состояние оперативной памяти.
+
+        Args:
+            notes: Начальный список заметок. По умолчанию пустой.
+        """
+        super().__init__()
+        self._notes: Dict[int, Note] = {note.id: note for note in notes or []}
+
+    async def load(self) -> List[Note]:
+        """Возвращает копию списка заметок из памяти.
+
+        Returns:
+            Новый список объектов Note в порядке добавления.
+        """
+        return list(self._notes.values())
+
+    async def get(self, note_id: int) -> Optional[Note]:
+        """Возвращает заметку по ID.
+
+        Args:
+            note_id: ID заметки.
+
+        Returns:
+            Объект Note или None, если заметки нет.
+        """
+        return self._notes.get(note_id)
+
+    async def add(self, title: str, text: str) -> Note:
+        """Создает заметку со следующим свободным ID.
+
+        Args:
+            title: Название заметки.
+            text: Текст заметки.
+
+        Returns:
+            Созданный объект Note.
+        """
+        note = Note(max(self._notes, default=0) + 1, title, text)
+        self._notes[note.id] = note
+        return note
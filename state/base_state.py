@@ -1,7 +1,9 @@
 """Модуль базового класса состояния для паттерна 'Состояние'."""
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, Iterable, Iterator, List, Optional, Set, Tuple
+from core.exceptions import NoteNotFoundError
+from core.metrics import metrics
 from core.note import Note
 
 
@@ -12,10 +14,27 @@ class BaseState(ABC):
     данными заметок. Каждое конкретное состояние должно реализовать методы
     для загрузки и сохранения заметок.
 
+    Методы INSTRUMENTED каждого подкласса оборачиваются в замер
+    core.metrics под именем "<Класс>.<метод>".
+
     Attributes:
         notes: Список объектов Note для управления данными.
     """
 
+    INSTRUMENTED = (
+        "load_notes", "save_notes", "iter_notes", "add_note", "update_note", "delete_note",
+        "apply_changes"
+    )
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Оборачивает методы подкласса в замер времени.
+
+        Args:
+            **kwargs: Параметры, передаваемые родительскому классу.
+        """
+        super().__init_subclass__(**kwargs)
+        metrics.instrument(cls, cls.INSTRUMENTED)
+
     @abstractmethod
     def load_notes(self) -> List[Note]:
         """Загружает список заметок из источника данных.
@@ -45,4 +64,155 @@ class BaseState(ABC):
         Raises:
             NotImplementedError: Если метод не реализован в дочернем классе.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def iter_notes(self) -> Iterator[Note]:
+        """Перебирает заметки источника данных по одной.
+
+        Базовая реализация перебирает результат load_notes. Состояния,
+        умеющие читать хранилище потоково, переопределяют метод, чтобы
+        перебор не требовал загрузки всех заметок в память.
+
+        Yields:
+            Объекты Note в порядке хранения.
+        """
+        yield from self.load_notes()
+
+    def get_notes(self, note_ids: Iterable[int]) -> List[Note]:
+        """Возвращает существующие заметки по списку ID.
+
+        Базовая реализация перебирает iter_notes. Состояния, умеющие
+        читать заметку по ID, переопределяют метод.
+
+        Args:
+            note_ids: ID заметок.
+
+        Returns:
+            Список найденных объектов Note в порядке переданных ID.
+        """
+        wanted = list(note_ids)
+        ids = set(wanted)
+        found = {note.id: note for note in self.iter_notes() if note.id in ids}
+        return [found[note_id] for note_id in wanted if note_id in found]
+
+    def changes_after(self, version: Optional[int]) -> Tuple[Optional[int], Optional[Set[int]]]:
+        """Возвращает версию хранилища и ID заметок, измененных после version.
+
+        Нужен синхронизации, чтобы читать только измененные заметки.
+        Базовая реализация истории изменений не знает.
+
+        Args:
+            version: Версия хранилища из предыдущего вызова или None.
+
+        Returns:
+            Кортеж (текущая версия или None, если хранилище не
+            версионируется; ID добавленных, измененных и удаленных заметок
+            или None, если они неизвестны).
+        """
+        return None, None
+
+    def side_path(self, suffix: str) -> Optional[str]:
+        """Возвращает путь служебного файла рядом с хранилищем.
+
+        Базовая реализация хранилищем-файлом не владеет.
+
+        Args:
+            suffix: Суффикс, дописываемый к имени файла хранилища.
+
+        Returns:
+            Путь служебного файла или None, если хранилище не файловое.
+        """
+        return None
+
+    def add_note(self, title: str, text: str, tags: Iterable[str] = ()) -> Note:
+        """Создает заметку со следующим свободным ID и сохраняет ее.
+
+        Базовая реализация загружает все заметки, добавляет новую и
+        сохраняет список целиком. Состояния, которые умеют добавлять
+        заметку атомарно, переопределяют этот метод.
+
+        Args:
+            title: Название заметки.
+            text: Текст заметки.
+            tags: Теги заметки.
+
+        Returns:
+            Созданный объект Note.
+        """
+        notes = self.load_notes()
+        note = Note(max((n.id for n in notes), default=0) + 1, title, text, tags=tags)
+        notes.append(note)
+        self.save_notes(notes)
+        return note
+
+    def update_note(
+        self, note_id: int, title: str, text: str, tags: Optional[Iterable[str]] = None
+    ) -> Note:
+        """Заменяет название и текст заметки, сохраняя ID и дату.
+
+        Базовая реализация загружает все заметки и сохраняет список
+        целиком. Состояния, которые умеют записывать одну заметку,
+        переопределяют этот метод.
+
+        Args:
+            note_id: ID изменяемой заметки.
+            title: Новое название.
+            text: Новый текст.
+            tags: Новые теги или None, чтобы оставить прежние.
+
+        Returns:
+            Новая версия заметки (см. Note.edited).
+
+        Raises:
+            NoteNotFoundError: Если заметки с таким ID нет.
+        """
+        notes = self.load_notes()
+        for position, note in enumerate(notes):
+            if note.id == note_id:
+                notes[position] = note.edited(title, text, tags)
+                self.save_notes(notes)
+                return notes[position]
+        raise NoteNotFoundError(note_id)
+
+    def delete_note(self, note_id: int) -> None:
+        """Удаляет заметку.
+
+        Базовая реализация загружает все заметки и сохраняет список
+        без удаленной.
+
+        Args:
+            note_id: ID удаляемой заметки.
+
+        Raises:
+            NoteNotFoundError: Если заметки с таким ID нет.
+        """
+        notes = self.load_notes()
+        remaining = [note for note in notes if note.id != note_id]
+        if len(remaining) == len(notes):
+            raise NoteNotFoundError(note_id)
+        self.save_notes(remaining)
+
+    def apply_changes(self, notes: List[Note], deleted: Iterable[int] = ()) -> None:
+        """Записывает заметки с их ID и версиями и удаляет заметки.
+
+        В отличие от add_note и update_note, ID и версии не выделяются
+        заново: заметка с тем же ID заменяется, новая дописывается в
+        конец. Нужен синхронизации, которая переносит чужие версии.
+
+        Базовая реализация загружает все заметки и сохраняет список
+        целиком. Состояния, которые умеют записывать отдельные заметки,
+        переопределяют этот метод.
+
+        Args:
+            notes: Добавляемые и заменяемые заметки.
+            deleted: ID удаляемых заметок; отсутствующие пропускаются.
+        """
+        incoming = {note.id: note for note in notes}
+        removed = set(deleted)
+        merged = []
+        for note in self.load_notes():
+            if note.id in removed:
+                continue
+            merged.append(incoming.pop(note.id, note))
+        merged.extend(incoming.values())
+        self.save_notes(merged)
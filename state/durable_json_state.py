@@ -0,0 +1,346 @@
+"""Модуль состояния JSON-хранилища с журналом упреждающей записи."""
+
+import sys
+import traceback
+from threading import RLock, Thread
+from typing import Callable, Dict, Iterable, List, Optional
+from state.base_state import BaseState
+from core.exceptions import NoteNotFoundError
+from core.json_storage import JsonStorage
+from core.note import Note
+from core.write_ahead_log import WriteAheadLog
+
+
+def _stderr(message: str) -> None:
+    """Печатает сообщение состояния в stderr.
+
+    Args:
+        message: Текст сообщения.
+    """
+    print(message, file=sys.stderr, flush=True)
+
+
+class DurableJsonState(BaseState):
+    """Состояние, фиксирующее изменения в WAL и периодически сохраняющее снимок.
+
+    Снимок — обычный JSON-файл JsonStorage, который записывается атомарно.
+    Каждое изменение сначала дописывается в журнал "<файл>.wal" и только
+    потом считается выполненным: добавление и изменение — записью "put"
+    с новой версией заметки, удаление — записью-надгробием "delete".
+    Поэтому любое изменение стоит одну короткую запись в конец журнала и
+    не зависит от числа заметок.
+
+    Старые версии измененных заметок и удаленные заметки остаются в
+    снимке и журнале мертвыми записями. Когда их доля среди всех записей
+    достигает compact_ratio или в журнале накапливается checkpoint_every
+    записей, в фоновом потоке запускается уплотнение (контрольная точка):
+    живые заметки записываются новым снимком, а из журнала удаляются
+    вошедшие в снимок записи. Изменения во время уплотнения не
+    блокируются и остаются в журнале. Ошибка фонового уплотнения (например,
+    нехватка места на диске) не теряется вместе с потоком: она
+    записывается через log и сохраняется в compaction_error, а журнал
+    остается нетронутым, и следующее изменение попробует уплотнить
+    хранилище снова.
+
+    При создании состояние восстанавливается: читает снимок и применяет
+    поверх него записи журнала. Применение записи идемпотентно (заметка
+    записывается или удаляется по своему ID), поэтому падение между
+    сохранением снимка и очисткой журнала ничего не портит.
+
+    Следующий свободный ID держится счетчиком: при восстановлении он
+    берется как максимум из счетчика снимка (next_id, см. JsonStorage) и
+    ID записей снимка и журнала, включая надгробия, а каждая
+    контрольная точка сохраняет его в снимок. Поэтому добавление не
+    перебирает заметки, а ID удаленных заметок не выдаются повторно.
+
+    Заметки держатся в памяти, а журнал пишет один процесс: в отличие от
+    JsonState, состояние не предназначено для одновременной записи из
+    нескольких процессов.
+
+    Attributes:
+        storage: Хранилище снимка.
+        wal: Журнал упреждающей записи.
+        checkpoint_every: Количество записей журнала до контрольной точки.
+        compact_ratio: Доля мертвых записей, при которой запускается
+                       уплотнение.
+        compaction_error: Исключение последнего неудачного фонового
+                          уплотнения или None.
+        __log: Функция записи сообщений об ошибках.
+        __notes: Заметки по ID в порядке добавления.
+        __snapshot_size: Количество записей в текущем снимке.
+        __next_id: Следующий свободный ID заметки.
+        __lock: Блокировка заметок и журнала.
+        __compaction: Блокировка записи снимка; берется до __lock.
+        __compactor: Поток фонового уплотнения или None.
+    """
+
+    def __init__(
+        self,
+        filepath: str = "data/notes.json",
+        fsync: str = WriteAheadLog.ALWAYS,
+        checkpoint_every: int = 1000,
+        compact_ratio: float = 0.5,
+        log: Callable[[str], None] = _stderr
+    ) -> None:
+        """Инициализирует состояние и восстанавливает заметки.
+
+        Args:
+            filepath: Путь к JSON-файлу снимка. Журнал хранится рядом
+                      в файле с суффиксом ".wal".
+            fsync: Политика fsync журнала (см. WriteAheadLog).
+            checkpoint_every: Количество записей журнала до контрольной
+                              точки.
+            compact_ratio: Доля мертвых записей в снимке и журнале, при
+                           которой запускается уплотнение.
+            log: Функция записи сообщений об ошибках фонового уплотнения.
+                 По умолчанию печать в stderr.
+
+        Raises:
+            StorageCorruptedError: Если снимок поврежден.
+        """
+        self.storage: JsonStorage = JsonStorage(filepath)
+        self.wal: WriteAheadLog = WriteAheadLog(str(self.storage.filepath) + ".wal", fsync)
+        self.checkpoint_every: int = checkpoint_every
+        self.compact_ratio: float = compact_ratio
+        self.compaction_error: Optional[BaseException] = None
+        self.__log: Callable[[str], None] = log
+        self.__notes: Dict[int, Note] = {}
+        self.__snapshot_size: int = 0
+        self.__next_id: int = 1
+        self.__lock = RLock()
+        self.__compaction = RLock()
+        self.__compactor: Optional[Thread] = None
+        self.__recover()
+
+    def load_notes(self) -> List[Note]:
+        """Возвращает восстановленные заметки из памяти.
+
+        Returns:
+            Новый список объектов Note в порядке добавления.
+        """
+        with self.__lock:
+            return list(self.__notes.values())
+
+    def get_notes(self, note_ids: Iterable[int]) -> List[Note]:
+        """Возвращает заметки из памяти по списку ID.
+
+        Args:
+            note_ids: ID заметок.
+
+        Returns:
+            Список найденных объектов Note в порядке переданных ID.
+        """
+        with self.__lock:
+            return [self.__notes[i] for i in note_ids if i in self.__notes]
+
+    def side_path(self, suffix: str) -> Optional[str]:
+        """Возвращает путь служебного файла рядом с JSON-файлом.
+
+        Args:
+            suffix: Суффикс, дописываемый к имени JSON-файла.
+
+        Returns:
+            Путь служебного файла.
+        """
+        return str(self.storage.filepath) + suffix
+
+    def save_notes(self, notes: List[Note]) -> None:
+        """Заменяет все заметки, сразу сохраняя снимок.
+
+        Полная замена списка записывается как контрольная точка: снимок
+        заменяется атомарно, после чего журнал очищается.
+
+        Args:
+            notes: Список объектов Note для сохранения.
+        """
+        with self.__compaction, self.__lock:
+            self.__notes = {note.id: note for note in notes}
+            self.__next_id = max(self.__next_id, max(self.__notes, default=0) + 1)
+            self.checkpoint()
+
+    def add_note(self, title: str, text: str, tags: Iterable[str] = ()) -> Note:
+        """Добавляет заметку через журнал.
+
+        Заметка зафиксирована, когда метод вернул управление (при политике
+        ALWAYS — в том числе на случай отключения питания).
+
+        Args:
+            title: Название заметки.
+            text: Текст заметки.
+            tags: Теги заметки.
+
+        Returns:
+            Созданный объект Note.
+        """
+        with self.__lock:
+            note = Note(self.__next_id, title, text, tags=tags)
+            self.wal.append({"op": "put", "note": self.storage.note_to_dict(note)})
+            self.__notes[note.id] = note
+            self.__next_id += 1
+            self.__maybe_compact()
+            return note
+
+    def update_note(
+        self, note_id: int, title: str, text: str, tags: Optional[Iterable[str]] = None
+    ) -> Note:
+        """Записывает новую версию заметки в журнал.
+
+        Args:
+            note_id: ID изменяемой заметки.
+            title: Новое название.
+            text: Новый текст.
+            tags: Новые теги или None, чтобы оставить прежние.
+
+        Returns:
+            Новая версия заметки.
+
+        Raises:
+            NoteNotFoundError: Если заметки с таким ID нет.
+        """
+        with self.__lock:
+            old = self.__notes.get(note_id)
+            if old is None:
+                raise NoteNotFoundError(note_id)
+            note = old.edited(title, text, tags)
+            self.wal.append({"op": "put", "note": self.storage.note_to_dict(note)})
+            self.__notes[note_id] = note
+            self.__maybe_compact()
+            return note
+
+    def delete_note(self, note_id: int) -> None:
+        """Записывает в журнал надгробие заметки.
+
+        Args:
+            note_id: ID удаляемой заметки.
+
+        Raises:
+            NoteNotFoundError: Если заметки с таким ID нет.
+        """
+        with self.__lock:
+            if note_id not in self.__notes:
+                raise NoteNotFoundError(note_id)
+            self.wal.append({"op": "delete", "id": note_id})
+            del self.__notes[note_id]
+            self.__maybe_compact()
+
+    def apply_changes(self, notes: List[Note], deleted: Iterable[int] = ()) -> None:
+        """Записывает заметки с их ID и версиями и удаляет заметки через журнал.
+
+        Все изменения дописываются в журнал одной записью в файл, поэтому
+        цена зависит от числа изменений, а не заметок.
+
+        Args:
+            notes: Добавляемые и заменяемые заметки.
+            deleted: ID удаляемых заметок; отсутствующие пропускаются.
+        """
+        with self.__lock:
+            removed = [note_id for note_id in deleted if note_id in self.__notes]
+            records = [{"op": "put", "note": self.storage.note_to_dict(note)} for note in notes]
+            records.extend({"op": "delete", "id": note_id} for note_id in removed)
+            if not records:
+                return
+            self.wal.append_many(records)
+            for note in notes:
+                self.__notes[note.id] = note
+                self.__next_id = max(self.__next_id, note.id + 1)
+            for note_id in removed:
+                del self.__notes[note_id]
+            self.__maybe_compact()
+
+    def dead_ratio(self) -> float:
+        """Возвращает долю мертвых записей в снимке и журнале.
+
+        Returns:
+            Число от 0 до 1: доля записей, не соответствующих текущим
+            заметкам (старые версии и удаленные заметки, надгробия).
+        """
+        with self.__lock:
+            total = self.__snapshot_size + self.wal.records
+            return (total - len(self.__notes)) / total if total else 0.0
+
+    def checkpoint(self) -> None:
+        """Сохраняет снимок всех заметок и очищает журнал."""
+        with self.__compaction, self.__lock:
+            self.wal.sync()
+            self.storage.write_data(
+                [self.storage.to_record(note) for note in self.__notes.values()],
+                next_id=self.__next_id
+            )
+            self.wal.truncate()
+            self.__snapshot_size = len(self.__notes)
+
+    def compact(self) -> None:
+        """Уплотняет хранилище, не блокируя изменения на время записи снимка.
+
+        Снимок заметок берется под блокировкой, записывается без нее, а
+        затем из журнала удаляются записи, вошедшие в снимок.
+        """
+        with self.__compaction:
+            with self.__lock:
+                if not self.wal.records:
+                    return
+                self.wal.sync()
+                notes = list(self.__notes.values())
+                next_id = self.__next_id
+                applied = self.wal.records
+            self.storage.write_data(
+                [self.storage.to_record(note) for note in notes], next_id=next_id
+            )
+            with self.__lock:
+                self.wal.discard(applied)
+                self.__snapshot_size = len(notes)
+
+    def close(self) -> None:
+        """Дожидается уплотнения, сбрасывает журнал на диск и закрывает его."""
+        compactor = self.__compactor
+        if compactor is not None:
+            compactor.join()
+        with self.__lock:
+            self.wal.close()
+
+    def __maybe_compact(self) -> None:
+        """Запускает фоновое уплотнение, если журнал длинный или мертвых записей много.
+
+        Вызывается под __lock после записи в журнал.
+        """
+        if self.__compactor is not None and self.__compactor.is_alive():
+            return
+        if self.wal.records < self.checkpoint_every and self.dead_ratio() < self.compact_ratio:
+            return
+        self.__compactor = Thread(
+            target=self.__compact_in_background, name="notes-compactor", daemon=True
+        )
+        self.__compactor.start()
+
+    def __compact_in_background(self) -> None:
+        """Выполняет уплотнение в фоновом потоке и сообщает о его ошибках."""
+        try:
+            self.compact()
+        except Exception as error:
+            self.compaction_error = error
+            self.__log(
+                f"Фоновое уплотнение {self.storage.filepath} не удалось:\n"
+                + "".join(traceback.format_exception(type(error), error, error.__traceback__))
+            )
+        else:
+            self.compaction_error = None
+
+    def __recover(self) -> None:
+        """Читает снимок и применяет поверх него записи журнала.
+
+        Заодно восстанавливает счетчик следующего ID.
+        """
+        self.__notes = {
+            item["id"]: self.storage.to_note(item) for item in self.storage.iter_data()
+        }
+        self.__snapshot_size = len(self.__notes)
+        next_id = max(self.storage.read_next_id(), max(self.__notes, default=0) + 1)
+        for record in self.wal.replay():
+            if record.get("op") == "put":
+                note = self.storage.to_note(record["note"])
+                self.__notes[note.id] = note
+                next_id = max(next_id, note.id + 1)
+            elif record.get("op") == "delete":
+                self.__notes.pop(record["id"], None)
+                next_id = max(next_id, record["id"] + 1)
+        self.__next_id = next_id
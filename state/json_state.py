@@ -2,8 +2,10 @@
 
 from state.base_state import BaseState
 from core.json_storage import JsonStorage
+from core.exceptions import NoteNotFoundError
 from core.note import Note
-from typing import List
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 
 class JsonState(BaseState):
@@ -11,30 +13,66 @@ class JsonState(BaseState):
 
     Реализует паттерн 'Состояние' и 'Singleton' для работы с заметками,
     хранящимися в JSON-файле. Обеспечивает загрузку и сохранение данных
-    через JsonStorage.
+    через JsonStorage. Экземпляр создается один на каждый файл: вызовы с
+    тем же путем возвращают общий экземпляр, с другим — отдельный.
+    Повторный вызов для того же файла с другими compact_dates или
+    blob_threshold отклоняется с ValueError, а не молча возвращает
+    экземпляр с прежними параметрами.
+
+    Запоминает версию файла при загрузке: сохранение полного списка
+    заметок отклоняется с StorageConflictError, если файл успел изменить
+    другой процесс. Добавление заметки выполняется атомарно и не
+    конфликтует с другими процессами.
 
     Attributes:
-        __instance: Экземпляр класса для реализации паттерна Singleton.
+        __instances: Экземпляры класса по абсолютному пути к файлу.
         storage: Экземпляр JsonStorage для работы с файловой системой.
         _initialized: Флаг инициализации для предотвращения повторной инициализации.
+        _version: Версия файла, на основе которой загружены заметки.
     """
 
-    __instance: 'JsonState' = None
+    __instances: Dict[str, 'JsonState'] = {}
 
-    def __new__(cls) -> 'JsonState':
-        """Создает или возвращает существующий экземпляр класса (Singleton).
+    def __new__(
+        cls,
+        filepath: str = "data/notes.json",
+        compact_dates: bool = False,
+        blob_threshold: Optional[int] = None
+    ) -> 'JsonState':
+        """Создает или возвращает существующий экземпляр для файла (Singleton).
 
-        Реализует паттерн Singleton, обеспечивая существование только одного
-        экземпляра класса JsonState.
+        Args:
+            filepath: Путь к JSON-файлу для хранения заметок.
+            compact_dates: Записывать даты числом секунд.
+            blob_threshold: Длина текста для выноса в BlobStore.
 
         Returns:
-            Единственный экземпляр класса JsonState.
+            Единственный экземпляр класса JsonState для этого файла.
+
+        Raises:
+            ValueError: Если экземпляр для файла уже создан с другими
+                        compact_dates или blob_threshold.
         """
-        if cls.__instance is None:
-            cls.__instance = super().__new__(cls)
-        return cls.__instance
+        key = os.path.abspath(filepath)
+        instance = cls.__instances.get(key)
+        if instance is None:
+            instance = super().__new__(cls)
+            cls.__instances[key] = instance
+        elif getattr(instance, "_initialized", False):
+            storage = instance.storage
+            if (storage.compact_dates, storage.blob_threshold) != (compact_dates, blob_threshold):
+                raise ValueError(
+                    f"Хранилище {key} уже открыто с compact_dates={storage.compact_dates}, "
+                    f"blob_threshold={storage.blob_threshold}"
+                )
+        return instance
 
-    def __init__(self, filepath: str = "data/notes.json") -> None:
+    def __init__(
+        self,
+        filepath: str = "data/notes.json",
+        compact_dates: bool = False,
+        blob_threshold: Optional[int] = None
+    ) -> None:
         """Инициализирует состояние JSON-хранилища.
 
         Инициализирует JsonStorage с указанным путем к файлу. Благодаря флагу
@@ -44,25 +82,48 @@ class JsonState(BaseState):
         Args:
             filepath: Путь к JSON-файлу для хранения заметок.
                       По умолчанию "data/notes.json".
+            compact_dates: Записывать даты числом секунд в поле "ts"
+                           (см. JsonStorage). По умолчанию False.
+            blob_threshold: Выносить тексты не короче этой длины в
+                            BlobStore (см. JsonStorage). По умолчанию None.
         """
         if getattr(self, '_initialized', False):
             return
         else:
             self._initialized = True
 
-        self.storage = JsonStorage(filepath)
+        self.storage = JsonStorage(filepath, compact_dates, blob_threshold)
+        self._version: Optional[int] = None
 
     def load_notes(self) -> List[Note]:
         """Загружает список заметок из JSON-файла.
 
         Читает данные из JSON-файла через JsonStorage и преобразует их
-        в список объектов Note.
+        в список объектов Note. Запоминает версию прочитанного файла.
 
         Returns:
             Список объектов Note, загруженных из JSON-файла.
+
+        Raises:
+            StorageCorruptedError: Если файл поврежден.
         """
-        data = self.storage.read_data()
-        return [self.storage.dict_to_note(item) for item in data]
+        self._version, data = self.storage.read_versioned()
+        return [self.storage.to_note(item) for item in data]
+
+    def iter_notes(self) -> Iterator[Note]:
+        """Потоково перебирает заметки JSON-файла.
+
+        Заметки разбираются по одной через JsonStorage.iter_data, поэтому
+        память не зависит от размера файла.
+
+        Yields:
+            Объекты Note в порядке хранения.
+
+        Raises:
+            StorageCorruptedError: Если файл поврежден.
+        """
+        for item in self.storage.iter_data():
+            yield self.storage.to_note(item)
 
     def save_notes(self, notes: List[Note]) -> None:
         """Сохраняет список заметок в JSON-файл.
@@ -70,8 +131,146 @@ class JsonState(BaseState):
         Преобразует список объектов Note в формат, подходящий для JSON,
         и записывает данные в файл через JsonStorage.
 
+        Если заметки были загружены этим состоянием, запись выполняется
+        только при неизменной с момента загрузки версии файла.
+
         Args:
             notes: Список объектов Note для сохранения.
+
+        Raises:
+            StorageConflictError: Если файл изменил другой процесс.
+        """
+        data = [self.storage.to_record(note) for note in notes]
+        self._version = self.storage.write_data(data, expected_version=self._version)
+
+    def get_notes(self, note_ids: Iterable[int]) -> List[Note]:
+        """Читает заметки по ID, не перебирая файл (см. JsonStorage.read_records).
+
+        Args:
+            note_ids: ID заметок.
+
+        Returns:
+            Список найденных объектов Note в порядке переданных ID.
+        """
+        return [self.storage.to_note(item) for item in self.storage.read_records(note_ids)]
+
+    def changes_after(self, version: Optional[int]) -> Tuple[Optional[int], Optional[Set[int]]]:
+        """Возвращает версию файла и ID заметок, измененных после version.
+
+        Args:
+            version: Версия файла из предыдущего вызова или None.
+
+        Returns:
+            Кортеж (версия файла, ID или None, см. JsonStorage.changes_after).
+        """
+        return self.storage.changes_after(version)
+
+    def side_path(self, suffix: str) -> Optional[str]:
+        """Возвращает путь служебного файла рядом с JSON-файлом.
+
+        Args:
+            suffix: Суффикс, дописываемый к имени JSON-файла.
+
+        Returns:
+            Путь служебного файла.
+        """
+        return str(self.storage.filepath) + suffix
+
+    def add_note(self, title: str, text: str, tags: Iterable[str] = ()) -> Note:
+        """Атомарно добавляет заметку со следующим свободным ID.
+
+        ID выделяется из счетчика файла (JsonStorage.append_record) под
+        исключительной блокировкой, поэтому одновременное добавление из
+        нескольких процессов не теряет заметок, а ID удаленных заметок
+        не выдаются повторно.
+
+        Args:
+            title: Название заметки.
+            text: Текст заметки.
+            tags: Теги заметки.
+
+        Returns:
+            Созданный объект Note.
+        """
+        created: List[Note] = []
+
+        def build(next_id: int) -> dict:
+            note = Note(next_id, title, text, tags=tags)
+            created.append(note)
+            return self.storage.note_to_dict(note)
+
+        old_version, new_version = self.storage.append_record(build)
+        # Если файл менялся после нашей загрузки, версию не сдвигаем:
+        # последующая полная запись должна обнаружить конфликт.
+        if old_version == self._version:
+            self._version = new_version
+        return created[0]
+
+    def update_note(
+        self, note_id: int, title: str, text: str, tags: Optional[Iterable[str]] = None
+    ) -> Note:
+        """Атомарно заменяет название и текст заметки.
+
+        Как и add_note, изменение применяется к актуальному содержимому
+        файла под исключительной блокировкой, поэтому не затирает
+        изменения других процессов. Новая версия заметки дописывается в
+        журнал изменений хранилища, файл целиком не перезаписывается.
+
+        Args:
+            note_id: ID изменяемой заметки.
+            title: Новое название.
+            text: Новый текст.
+            tags: Новые теги или None, чтобы оставить прежние.
+
+        Returns:
+            Новая версия заметки.
+
+        Raises:
+            NoteNotFoundError: Если заметки с таким ID нет.
+        """
+        edited: List[Note] = []
+
+        def replace(item: Optional[dict]) -> dict:
+            if item is None:
+                raise NoteNotFoundError(note_id)
+            note = self.storage.to_note(item).edited(title, text, tags)
+            edited.append(note)
+            return self.storage.note_to_dict(note)
+
+        old_version, new_version = self.storage.update_record(note_id, replace)
+        if old_version == self._version:
+            self._version = new_version
+        return edited[0]
+
+    def delete_note(self, note_id: int) -> None:
+        """Атомарно удаляет заметку.
+
+        Args:
+            note_id: ID удаляемой заметки.
+
+        Raises:
+            NoteNotFoundError: Если заметки с таким ID нет.
+        """
+        def remove(item: Optional[dict]) -> None:
+            if item is None:
+                raise NoteNotFoundError(note_id)
+
+        old_version, new_version = self.storage.update_record(note_id, remove)
+        if old_version == self._version:
+            self._version = new_version
+
+    def apply_changes(self, notes: List[Note], deleted: Iterable[int] = ()) -> None:
+        """Атомарно записывает заметки с их ID и версиями и удаляет заметки.
+
+        Изменения применяются одной записью файла к его актуальному
+        содержимому, без загрузки заметок в объекты Note.
+
+        Args:
+            notes: Добавляемые и заменяемые заметки.
+            deleted: ID удаляемых заметок; отсутствующие пропускаются.
         """
-        data = [self.storage.note_to_dict(note) for note in notes]
-        self.storage.write_data(data)
\ No newline at end of file
+        old_version, new_version = self.storage.apply_changes(
+            [self.storage.to_record(note) for note in notes], deleted
+        )
+        if old_version == self._version:
+            self._version = new_version
\ No newline at end of file
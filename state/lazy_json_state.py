@@ -0,0 +1,227 @@
+"""Модуль состояния JSON-хранилища с отложенной загрузкой текстов."""
+
+from functools import partial
+from threading import Lock
+from typing import BinaryIO, Iterable, List, Optional, Set, Tuple
+from state.base_state import BaseState
+from core.json_storage import JsonStorage
+from core.lazy_note import LazyNote
+from core.exceptions import NoteNotFoundError
+from core.note import Note
+
+
+class LazyJsonState(BaseState):
+    """Состояние JSON-файла, загружающее тексты заметок по требованию.
+
+    load_notes читает только боковой индекс хранилища (ID, название,
+    дату, версию и смещение строки заметки) и возвращает LazyNote: текст
+    конкретной заметки читается из файла по смещению при первом
+    обращении. Просмотр названий и поиск по дате поэтому не читают и не
+    разбирают тексты. Заметки из журнала изменений хранилища загружаются
+    целиком: журнал ограничен долей размера файла. Если раскладка файла
+    не позволяет построить индекс, заметки загружаются целиком, как в
+    JsonState.
+
+    Тексты читаются из той версии файла, которая была загружена, даже если
+    файл с тех пор заменили: заметки держат ссылку на открытый файл своей
+    версии, и он закрывается вместе с последней из них.
+
+    Attributes:
+        storage: Экземпляр JsonStorage для работы с файловой системой.
+        _version: Версия файла, на основе которой загружены заметки.
+        __lock: Блокировка позиционирования в общем файле при чтении текстов.
+    """
+
+    def __init__(self, filepath: str = "data/notes.json", blob_threshold: Optional[int] = None) -> None:
+        """Инициализирует состояние.
+
+        Args:
+            filepath: Путь к JSON-файлу для хранения заметок.
+                      По умолчанию "data/notes.json".
+            blob_threshold: Выносить тексты не короче этой длины в
+                            BlobStore (см. JsonStorage). По умолчанию None.
+        """
+        self.storage: JsonStorage = JsonStorage(filepath, blob_threshold=blob_threshold)
+        self._version: Optional[int] = None
+        self.__lock = Lock()
+
+    def load_notes(self) -> List[Note]:
+        """Загружает заметки без текстов по боковому индексу.
+
+        Returns:
+            Список объектов LazyNote (или Note, если индекс недоступен).
+
+        Raises:
+            StorageCorruptedError: Если файл поврежден.
+        """
+        opened = self.storage.open_indexed()
+        if opened is None:
+            self._version, data = self.storage.read_versioned()
+            return [self.storage.to_note(item) for item in data]
+
+        self._version, f, entries = opened
+        notes: List[Note] = []
+        for entry in entries:
+            if isinstance(entry, dict):
+                # Запись из журнала изменений хранилища: уже разобрана целиком.
+                notes.append(self.storage.to_note(entry))
+                continue
+            note_id, offset, length, title, date, version, blob, tags = entry
+            if blob is None:
+                loader = partial(self.__read_text, f, offset, length)
+            else:
+                # Текст вынесен в BlobStore: строку заметки читать незачем.
+                loader, blob = partial(self.storage.blobs.get, blob[0]), tuple(blob)
+            notes.append(LazyNote(note_id, title, date, version, loader, blob, tags))
+        return notes
+
+    def save_notes(self, notes: List[Note]) -> None:
+        """Сохраняет список заметок в JSON-файл.
+
+        Тексты еще не загруженных заметок читаются из файла по мере записи.
+
+        Args:
+            notes: Список объектов Note для сохранения.
+
+        Raises:
+            StorageConflictError: Если файл изменил другой процесс.
+        """
+        self._version = self.storage.write_data(
+            (self.storage.to_record(note) for note in notes), expected_version=self._version
+        )
+
+    def get_notes(self, note_ids: Iterable[int]) -> List[Note]:
+        """Читает заметки по ID, не перебирая файл (см. JsonStorage.read_records).
+
+        Args:
+            note_ids: ID заметок.
+
+        Returns:
+            Список найденных объектов Note в порядке переданных ID.
+        """
+        return [self.storage.to_note(item) for item in self.storage.read_records(note_ids)]
+
+    def changes_after(self, version: Optional[int]) -> Tuple[Optional[int], Optional[Set[int]]]:
+        """Возвращает версию файла и ID заметок, измененных после version.
+
+        Args:
+            version: Версия файла из предыдущего вызова или None.
+
+        Returns:
+            Кортеж (версия файла, ID или None, см. JsonStorage.changes_after).
+        """
+        return self.storage.changes_after(version)
+
+    def side_path(self, suffix: str) -> Optional[str]:
+        """Возвращает путь служебного файла рядом с JSON-файлом.
+
+        Args:
+            suffix: Суффикс, дописываемый к имени JSON-файла.
+
+        Returns:
+            Путь служебного файла.
+        """
+        return str(self.storage.filepath) + suffix
+
+    def add_note(self, title: str, text: str, tags: Iterable[str] = ()) -> Note:
+        """Атомарно добавляет заметку со следующим свободным ID.
+
+        Args:
+            title: Название заметки.
+            text: Текст заметки.
+            tags: Теги заметки.
+
+        Returns:
+            Созданный объект Note.
+        """
+        created: List[Note] = []
+
+        def build(next_id: int) -> dict:
+            note = Note(next_id, title, text, tags=tags)
+            created.append(note)
+            return self.storage.note_to_dict(note)
+
+        old_version, new_version = self.storage.append_record(build)
+        if old_version == self._version:
+            self._version = new_version
+        return created[0]
+
+    def update_note(
+        self, note_id: int, title: str, text: str, tags: Optional[Iterable[str]] = None
+    ) -> Note:
+        """Атомарно заменяет название и текст заметки.
+
+        Как и add_note, изменение применяется к актуальному содержимому
+        файла под исключительной блокировкой, поэтому не затирает
+        изменения других процессов. Новая версия заметки дописывается в
+        журнал изменений хранилища, файл целиком не перезаписывается.
+
+        Args:
+            note_id: ID изменяемой заметки.
+            title: Новое название.
+            text: Новый текст.
+            tags: Новые теги или None, чтобы оставить прежние.
+
+        Returns:
+            Новая версия заметки.
+
+        Raises:
+            NoteNotFoundError: Если заметки с таким ID нет.
+        """
+        edited: List[Note] = []
+
+        def replace(item: Optional[dict]) -> dict:
+            if item is None:
+                raise NoteNotFoundError(note_id)
+            note = self.storage.to_note(item).edited(title, text, tags)
+            edited.append(note)
+            return self.storage.note_to_dict(note)
+
+        old_version, new_version = self.storage.update_record(note_id, replace)
+        if old_version == self._version:
+            self._version = new_version
+        return edited[0]
+
+    def delete_note(self, note_id: int) -> None:
+        """Атомарно удаляет заметку.
+
+        Args:
+            note_id: ID удаляемой заметки.
+
+        Raises:
+            NoteNotFoundError: Если заметки с таким ID нет.
+        """
+        def remove(item: Optional[dict]) -> None:
+            if item is None:
+                raise NoteNotFoundError(note_id)
+
+        old_version, new_version = self.storage.update_record(note_id, remove)
+        if old_version == self._version:
+            self._version = new_version
+
+    def apply_changes(self, notes: List[Note], deleted: Iterable[int] = ()) -> None:
+        """Атомарно записывает заметки с их ID и версиями и удаляет заметки.
+
+        Args:
+            notes: Добавляемые и заменяемые заметки.
+            deleted: ID удаляемых заметок; отсутствующие пропускаются.
+        """
+        old_version, new_version = self.storage.apply_changes(
+            [self.storage.to_record(note) for note in notes], deleted
+        )
+        if old_version == self._version:
+            self._version = new_version
+
+    def __read_text(self, f: BinaryIO, offset: int, length: int) -> str:
+        """Читает текст одной заметки из файла загруженной версии.
+
+        Args:
+            f: Файл загруженной версии.
+            offset: Смещение строки заметки в байтах.
+            length: Длина строки заметки в байтах.
+
+        Returns:
+            Текст заметки.
+        """
+        with self.__lock:
+            return self.storage.read_text(f, offset, length)
@@ -1,8 +1,12 @@
 """Модуль состояния для работы с заметками в оперативной памяти."""
 
 from state.base_state import BaseState
+from core.exceptions import NoteNotFoundError
 from core.note import Note
-from typing import List
+from core.note_columns import NoteColumns
+from core.note_rows import NoteRows
+from core.sequence_view import SequenceView
+from typing import Iterable, Iterator, List, Optional, Sequence, Union
 
 
 class MemoryState(BaseState):
@@ -12,17 +16,38 @@ class MemoryState(BaseState):
     в оперативной памяти без сохранения на диск. Подходит для временного
     хранения данных или тестирования.
 
+    В поколоночном режиме (columnar=True) заметки хранятся в NoteColumns:
+    ID и даты — в массивах чисел, названия и тексты — в таблице строк.
+    Это заметно сокращает память на заметку ценой создания объекта Note
+    при каждом обращении. Иначе заметки хранятся в NoteRows. Для чтения
+    без копирования списка служат view_notes и iter_notes.
+
+    Оба хранилища изменяются на месте: изменение и удаление находят
+    строку заметки по ID без перебора, удаленные строки помечаются и
+    вычищаются уплотнением, а save_notes перезаполняет то же хранилище.
+    Поэтому представления, полученные из view_notes, всегда отражают
+    текущие заметки, а цена изменения не зависит от их числа. ID новых
+    заметок выдает счетчик, который только растет: ID удаленных заметок
+    не выдаются повторно.
+
     Attributes:
-        _notes: Список объектов Note, хранящихся в памяти.
+        columnar: Флаг поколоночного режима.
+        _notes: NoteRows или NoteColumns в поколоночном режиме.
+        __next_id: Следующий свободный ID заметки.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, columnar: bool = False) -> None:
         """Инициализирует состояние оперативной памяти.
 
-        Создает пустой список для хранения заметок в памяти.
+        Создает пустое хранилище заметок в памяти.
+
+        Args:
+            columnar: Хранить заметки по колонкам. По умолчанию False.
         """
-        self._notes: List[Note] = []
-        
+        self.columnar: bool = columnar
+        self._notes: Union[NoteRows, NoteColumns] = NoteColumns() if columnar else NoteRows()
+        self.__next_id: int = 1
+
     def load_notes(self) -> List[Note]:
         """Загружает список заметок из оперативной памяти.
 
@@ -34,13 +59,96 @@ class MemoryState(BaseState):
         """
         return self._notes[:]
 
+    def view_notes(self) -> Sequence[Note]:
+        """Возвращает представление заметок только для чтения без копирования.
+
+        Returns:
+            Последовательность объектов Note, отражающая текущие заметки.
+        """
+        return SequenceView(self._notes)
+
+    def iter_notes(self) -> Iterator[Note]:
+        """Перебирает заметки без копирования списка.
+
+        Yields:
+            Объекты Note в порядке добавления.
+        """
+        yield from self._notes
+
+    def get_notes(self, note_ids: Iterable[int]) -> List[Note]:
+        """Возвращает заметки по списку ID без перебора хранилища.
+
+        Args:
+            note_ids: ID заметок.
+
+        Returns:
+            Список найденных объектов Note в порядке переданных ID.
+        """
+        found = (self._notes.get(note_id) for note_id in note_ids)
+        return [note for note in found if note is not None]
+
     def save_notes(self, notes: List[Note]) -> None:
         """Сохраняет список заметок в оперативную память.
 
-        Сохраняет копию переданного списка заметок в память,
-        заменяя существующие данные.
+        Перезаполняет хранилище переданными заметками, заменяя
+        существующие данные.
 
         Args:
             notes: Список объектов Note для сохранения в память.
         """
-        self._notes = notes[:]
\ No newline at end of file
+        notes = list(notes)  # Список может быть представлением этого же хранилища.
+        self._notes.clear()
+        self._notes.extend(notes)
+        self.__next_id = max(self.__next_id, max((note.id for note in notes), default=0) + 1)
+
+    def add_note(self, title: str, text: str, tags: Iterable[str] = ()) -> Note:
+        """Создает заметку со следующим свободным ID без копирования списка.
+
+        Args:
+            title: Название заметки.
+            text: Текст заметки.
+            tags: Теги заметки.
+
+        Returns:
+            Созданный объект Note.
+        """
+        note = Note(self.__next_id, title, text, tags=tags)
+        self.__next_id += 1
+        self._notes.append(note)
+        return note
+
+    def update_note(
+        self, note_id: int, title: str, text: str, tags: Optional[Iterable[str]] = None
+    ) -> Note:
+        """Заменяет название и текст заметки на месте.
+
+        Args:
+            note_id: ID изменяемой заметки.
+            title: Новое название.
+            text: Новый текст.
+            tags: Новые теги или None, чтобы оставить прежние.
+
+        Returns:
+            Новая версия заметки.
+
+        Raises:
+            NoteNotFoundError: Если заметки с таким ID нет.
+        """
+        current = self._notes.get(note_id)
+        if current is None:
+            raise NoteNotFoundError(note_id)
+        note = current.edited(title, text, tags)
+        self._notes.replace(note)
+        return note
+
+    def delete_note(self, note_id: int) -> None:
+        """Удаляет заметку.
+
+        Args:
+            note_id: ID удаляемой заметки.
+
+        Raises:
+            NoteNotFoundError: Если заметки с таким ID нет.
+        """
+        if not self._notes.remove(note_id):
+            raise NoteNotFoundError(note_id)
@@ -0,0 +1,628 @@
+"""Модуль общего наблюдаемого репозитория заметок."""
+
+from threading import Lock, RLock
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from state.base_state import BaseState
+from core.note import Note
+from core.note_formatter import note_formatter
+from core.note_statistics import NoteStatistics
+from core.statistics_file import StatisticsFile
+from core.tag_index import TagIndex
+from core.text_index import TextIndex
+
+
+class NoteChange:
+    """Описание изменений набора заметок (дельта).
+
+    Передается подписчикам NoteRepository после каждого изменения, чтобы
+    они могли обновить отображение точечно, без полной перезагрузки.
+
+    Attributes:
+        added: ID добавленных заметок.
+        updated: ID измененных заметок.
+        deleted: ID удаленных заметок.
+    """
+
+    def __init__(
+        self,
+        added: Optional[List[int]] = None,
+        updated: Optional[List[int]] = None,
+        deleted: Optional[List[int]] = None
+    ) -> None:
+        """Инициализирует описание изменений.
+
+        Args:
+            added: ID добавленных заметок.
+            updated: ID измененных заметок.
+            deleted: ID удаленных заметок.
+        """
+        self.added: List[int] = added or []
+        self.updated: List[int] = updated or []
+        self.deleted: List[int] = deleted or []
+
+    def __bool__(self) -> bool:
+        """Возвращает True, если дельта содержит хотя бы одно изменение."""
+        return bool(self.added or self.updated or self.deleted)
+
+    def __repr__(self) -> str:
+        """Возвращает строковое представление дельты для отладки."""
+        return (
+            f"NoteChange(added={self.added}, updated={self.updated}, "
+            f"deleted={self.deleted})"
+        )
+
+
+class NoteRepository(BaseState):
+    """Общее для всех окон хранилище заметок в памяти процесса.
+
+    Оборачивает конкретное состояние (например, JsonState): загружает
+    заметки из него один раз, держит их в памяти и записывает изменения
+    обратно. Окна подписываются на изменения и получают дельты NoteChange,
+    поэтому открытые окна узнают о новых заметках без перечитывания файла.
+    Инвертированный индекс текстов, битовый индекс тегов и статистика
+    (NoteStatistics) обновляются точечно по той же дельте.
+
+    Индекс текстов и статистика читают тексты всех заметок, поэтому
+    строятся не при загрузке, а при первом обращении к index или
+    statistics (первый поиск по ключевому слову, окно статистики). Так
+    LazyJsonState не загружает тексты при старте приложения. Индекс
+    тегов строится сразу: теги известны без чтения текстов.
+
+    Индекс текстов и статистика строятся без __lock (build_index,
+    build_statistics): по снимку заметок, а изменения, сделанные во время
+    построения, копятся в __index_backlog и __statistics_backlog и
+    применяются перед публикацией. Приложение строит индекс в фоновом
+    потоке загрузки, окно статистики — статистику в своем фоновом потоке;
+    до готовности окна берут ready_index и ready_statistics (None) и не
+    ждут построения.
+
+    Если backend хранит заметки в файле (side_path), статистика
+    сохраняется рядом с ним в '<имя>.stats' (StatisticsFile): каждое
+    изменение заметок дописывает туда учтенные атрибуты измененных
+    заметок, а build_statistics загружает файл и сверяет его с заметками
+    по версиям, читая тексты только расходящихся заметок.
+
+    Добавление, изменение и удаление одной заметки меняют словарь заметок
+    на месте, поэтому их цена не зависит от числа заметок. Порядок
+    хранится отдельным списком ID, в который только дописывают: читатели
+    (iter_notes, page) перебирают его до длины, запомненной в начале
+    перебора, и не мешают параллельной записи — заметки, добавленные во
+    время перебора, в него не попадают, а удаленные пропускаются. ID
+    удаленных заметок копятся в __gone и вычищаются из списка порядка
+    заменой списка, когда их становится больше, чем живых заметок.
+    Полная замена (save_notes, reload) подменяет словарь и список целиком.
+
+    Кэш блоков note_formatter проверяет только ID и версию, поэтому блоки
+    замененных и удаленных заметок сбрасываются здесь: записанная
+    извне версия (apply_changes) или новая заметка с ID удаленной могут
+    совпасть по версии с закэшированной.
+
+    Attributes:
+        backend: Состояние, через которое заметки читаются и сохраняются.
+        tags: Битовый индекс тегов заметок из памяти репозитория.
+        __notes: Загруженные заметки по ID.
+        __order: ID заметок в порядке добавления, включая удаленные из __gone.
+        __gone: ID удаленных заметок, еще оставшиеся в __order.
+        __versions: Версии заметок на момент последней синхронизации.
+        __subscribers: Функции, вызываемые при изменении заметок.
+        __loaded: Флаг того, что заметки уже загружены из backend.
+        __index: Индекс текстов или None, пока он не построен.
+        __index_backlog: ID заметок, измененных во время построения
+                         индекса текстов, или None, если он не строится.
+        __index_build: Блокировка построения индекса текстов.
+        __statistics: Статистика или None, пока она не построена.
+        __statistics_backlog: ID заметок, измененных во время построения
+                              статистики, или None, если она не строится.
+        __statistics_build: Блокировка построения статистики.
+        __statistics_file: Файл статистики рядом с хранилищем или None.
+        __lock: Блокировка для доступа из фоновых потоков.
+    """
+
+    def __init__(self, backend: BaseState) -> None:
+        """Инициализирует репозиторий.
+
+        Args:
+            backend: Состояние, через которое заметки читаются и сохраняются.
+        """
+        self.backend: BaseState = backend
+        self.tags: TagIndex = TagIndex()
+        self.__index: Optional[TextIndex] = None
+        self.__index_backlog: Optional[Set[int]] = None
+        self.__index_build = Lock()
+        self.__statistics: Optional[NoteStatistics] = None
+        self.__statistics_backlog: Optional[Set[int]] = None
+        self.__statistics_build = Lock()
+        path = backend.side_path(".stats")
+        self.__statistics_file: Optional[StatisticsFile] = (
+            None if path is None else StatisticsFile(path)
+        )
+        self.__notes: Dict[int, Note] = {}
+        self.__order: List[int] = []
+        self.__gone: Set[int] = set()
+        self.__versions: Dict[int, int] = {}
+        self.__subscribers: List[Callable[[NoteChange], None]] = []
+        self.__loaded: bool = False
+        self.__lock = RLock()
+
+    @property
+    def index(self) -> TextIndex:
+        """Инвертированный индекс текстов заметок из памяти репозитория.
+
+        Строится при первом обращении (см. build_index) и дальше
+        обновляется точечно.
+        """
+        return self.build_index()
+
+    @property
+    def ready_index(self) -> Optional[TextIndex]:
+        """Индекс текстов, если он уже построен, иначе None; не блокирует."""
+        return self.__index
+
+    def build_index(self) -> TextIndex:
+        """Строит индекс текстов, если это еще не сделано, и возвращает его.
+
+        Тексты читаются без __lock, поэтому запись и перебор заметок во
+        время построения не ждут. Безопасно вызывать из фонового потока;
+        одновременные вызовы строят индекс один раз.
+
+        Returns:
+            Построенный индекс.
+        """
+        self.warm()
+        with self.__index_build:
+            with self.__lock:
+                if self.__index is not None:
+                    return self.__index
+                notes = list(self.__notes.values())
+                self.__index_backlog = set()
+            index = TextIndex()
+            try:
+                for note in notes:
+                    index.add(note)
+            except BaseException:
+                with self.__lock:
+                    self.__index_backlog = None
+                raise
+            with self.__lock:
+                for note_id in self.__index_backlog:
+                    note = self.__notes.get(note_id)
+                    if note is None:
+                        index.remove(note_id)
+                    else:
+                        index.add(note)
+                self.__index_backlog = None
+                self.__index = index
+            return index
+
+    @property
+    def statistics(self) -> NoteStatistics:
+        """Агрегаты по заметкам из памяти репозитория.
+
+        Строятся при первом обращении (см. build_statistics) и дальше
+        обновляются точечно.
+        """
+        return self.build_statistics()
+
+    @property
+    def ready_statistics(self) -> Optional[NoteStatistics]:
+        """Статистика, если она уже построена, иначе None; не блокирует."""
+        return self.__statistics
+
+    def build_statistics(self) -> NoteStatistics:
+        """Строит статистику, если это еще не сделано, и возвращает ее.
+
+        Статистика загружается из файла рядом с хранилищем и сверяется с
+        заметками по версиям (NoteStatistics.sync): тексты читаются только
+        у заметок, изменившихся с последней записи файла, а без файла — у
+        всех. Если сверка что-то изменила, файл переписывается снимком.
+        Как и build_index, работает без __lock и безопасно вызывается из
+        фонового потока; одновременные вызовы строят статистику один раз.
+
+        Returns:
+            Построенная статистика.
+        """
+        self.warm()
+        with self.__statistics_build:
+            with self.__lock:
+                if self.__statistics is not None:
+                    return self.__statistics
+                notes = list(self.__notes.values())
+                self.__statistics_backlog = set()
+            try:
+                loaded = None if self.__statistics_file is None else self.__statistics_file.load()
+                statistics, clean = loaded if loaded is not None else (NoteStatistics(), False)
+                if statistics.sync(notes) or not clean:
+                    if self.__statistics_file is not None:
+                        self.__statistics_file.save(statistics)
+            except BaseException:
+                with self.__lock:
+                    self.__statistics_backlog = None
+                raise
+            with self.__lock:
+                backlog = self.__statistics_backlog
+                for note_id in backlog:
+                    note = self.__notes.get(note_id)
+                    if note is None:
+                        statistics.remove(note_id)
+                    else:
+                        statistics.add(note)
+                self.__statistics_backlog = None
+                self.__statistics = statistics
+                self.__record_statistics(backlog & self.__notes.keys(), backlog - self.__notes.keys())
+            return statistics
+
+    def subscribe(self, callback: Callable[[NoteChange], None]) -> None:
+        """Подписывает функцию на изменения заметок.
+
+        Args:
+            callback: Функция, принимающая NoteChange.
+        """
+        self.__subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[NoteChange], None]) -> None:
+        """Отписывает функцию от изменений заметок.
+
+        Args:
+            callback: Ранее подписанная функция.
+        """
+        if callback in self.__subscribers:
+            self.__subscribers.remove(callback)
+
+    def warm(self) -> None:
+        """Загружает заметки из backend и строит индекс тегов, если это еще не сделано.
+
+        Безопасно вызывать из фонового потока.
+        """
+        with self.__lock:
+            if self.__loaded:
+                return
+            self.__replace(self.backend.load_notes())
+            self.__loaded = True
+
+    def load_notes(self) -> List[Note]:
+        """Возвращает заметки из памяти без обращения к диску.
+
+        При первом вызове заметки загружаются из backend.
+
+        Returns:
+            Новый список объектов Note в порядке добавления.
+        """
+        self.warm()
+        with self.__lock:
+            return list(self.__notes.values())
+
+    def iter_notes(self) -> Iterator[Note]:
+        """Перебирает заметки в памяти без копирования списка.
+
+        Заметки, добавленные во время перебора, не попадают в него, а
+        удаленные пропускаются.
+
+        Yields:
+            Объекты Note в порядке добавления.
+        """
+        self.warm()
+        with self.__lock:
+            notes, order, end = self.__notes, self.__order, len(self.__order)
+        for position in range(end):
+            note = notes.get(order[position])
+            if note is not None:
+                yield note
+
+    def page(self, offset: int, limit: int) -> Tuple[int, List[Note]]:
+        """Возвращает страницу заметок без копирования всего списка.
+
+        Args:
+            offset: Количество пропускаемых заметок.
+            limit: Максимальное количество заметок на странице.
+
+        Returns:
+            Кортеж (общее количество заметок, заметки страницы).
+        """
+        self.warm()
+        total = len(self.__notes)
+        return total, list(islice(self.iter_notes(), offset, offset + limit))
+
+    def get_note(self, note_id: int) -> Optional[Note]:
+        """Возвращает заметку по ID.
+
+        Args:
+            note_id: ID заметки.
+
+        Returns:
+            Объект Note или None, если заметки нет.
+        """
+        self.warm()
+        return self.__notes.get(note_id)
+
+    def get_notes(self, note_ids: Iterable[int]) -> List[Note]:
+        """Возвращает существующие заметки по списку ID.
+
+        Args:
+            note_ids: ID заметок.
+
+        Returns:
+            Список найденных объектов Note в порядке переданных ID.
+        """
+        self.warm()
+        return [self.__notes[i] for i in note_ids if i in self.__notes]
+
+    def changes_after(self, version: Optional[int]) -> Tuple[Optional[int], Optional[Set[int]]]:
+        """Возвращает версию backend и ID заметок, измененных после version.
+
+        Все записи идут через backend, поэтому историю изменений знает он.
+
+        Args:
+            version: Версия backend из предыдущего вызова или None.
+
+        Returns:
+            Кортеж (версия, ID или None, см. BaseState.changes_after).
+        """
+        return self.backend.changes_after(version)
+
+    def save_notes(self, notes: List[Note]) -> None:
+        """Сохраняет полный список заметок и оповещает подписчиков.
+
+        Вычисляет дельту относительно заметок в памяти, записывает
+        список через backend и рассылает NoteChange подписчикам.
+
+        Args:
+            notes: Список объектов Note для сохранения.
+        """
+        self.warm()
+        with self.__lock:
+            self.backend.save_notes(notes)
+            change = self.__replace(notes)
+            self.__record_statistics(change.added + change.updated, change.deleted)
+        self.__notify(change)
+
+    def add_note(self, title: str, text: str, tags: Iterable[str] = ()) -> Note:
+        """Создает новую заметку через backend и оповещает подписчиков.
+
+        ID выделяет backend, поэтому заметки, добавленные другими
+        процессами, не перезаписываются. Заметка дописывается в память
+        на месте, индексы обновляются только для нее.
+
+        Args:
+            title: Название заметки.
+            text: Текст заметки.
+            tags: Теги заметки.
+
+        Returns:
+            Созданный объект Note.
+        """
+        self.warm()
+        with self.__lock:
+            note = self.backend.add_note(title, text, tags)
+            self.__put(note)
+            self.__record_statistics([note.id], ())
+        self.__notify(NoteChange(added=[note.id]))
+        return note
+
+    def update_note(
+        self, note_id: int, title: str, text: str, tags: Optional[Iterable[str]] = None
+    ) -> Note:
+        """Изменяет заметку через backend и оповещает подписчиков.
+
+        Заметка заменяется в памяти на месте, а индекс обновляется только
+        для нее, поэтому цена изменения не зависит от числа заметок
+        (если ее не зависит и запись в backend).
+
+        Args:
+            note_id: ID изменяемой заметки.
+            title: Новое название.
+            text: Новый текст.
+            tags: Новые теги или None, чтобы оставить прежние.
+
+        Returns:
+            Новая версия заметки.
+
+        Raises:
+            NoteNotFoundError: Если заметки с таким ID нет.
+        """
+        self.warm()
+        with self.__lock:
+            note = self.backend.update_note(note_id, title, text, tags)
+            self.__put(note)
+            self.__record_statistics([note.id], ())
+        self.__notify(NoteChange(updated=[note.id]))
+        return note
+
+    def delete_note(self, note_id: int) -> None:
+        """Удаляет заметку через backend и оповещает подписчиков.
+
+        Заметка удаляется из памяти на месте, индексы обновляются только
+        для нее.
+
+        Args:
+            note_id: ID удаляемой заметки.
+
+        Raises:
+            NoteNotFoundError: Если заметки с таким ID нет.
+        """
+        self.warm()
+        with self.__lock:
+            self.backend.delete_note(note_id)
+            self.__drop(note_id)
+            self.__record_statistics((), [note_id])
+        self.__notify(NoteChange(deleted=[note_id]))
+
+    def apply_changes(self, notes: List[Note], deleted: Iterable[int] = ()) -> None:
+        """Записывает заметки с их ID и версиями через backend и оповещает подписчиков.
+
+        Память и индексы обновляются только для переданных заметок.
+
+        Args:
+            notes: Добавляемые и заменяемые заметки.
+            deleted: ID удаляемых заметок; отсутствующие пропускаются.
+        """
+        self.warm()
+        deleted = list(deleted)
+        change = NoteChange()
+        with self.__lock:
+            self.backend.apply_changes(notes, deleted)
+            for note in notes:
+                if self.__put(note) is None:
+                    change.added.append(note.id)
+                else:
+                    change.updated.append(note.id)
+            change.deleted = [note_id for note_id in deleted if self.__drop(note_id) is not None]
+            self.__record_statistics(change.added + change.updated, change.deleted)
+        self.__notify(change)
+
+    def reload(self) -> NoteChange:
+        """Перечитывает заметки из backend и оповещает о различиях.
+
+        Returns:
+            Дельта между заметками в памяти и в backend.
+        """
+        with self.__lock:
+            change = self.__replace(self.backend.load_notes())
+            self.__loaded = True
+            self.__record_statistics(change.added + change.updated, change.deleted)
+        self.__notify(change)
+        return change
+
+    def __put(self, note: Note) -> Optional[Note]:
+        """Добавляет или заменяет заметку в памяти и индексах на месте.
+
+        Вызывается под __lock.
+
+        Args:
+            note: Новая заметка или новая версия заметки.
+
+        Returns:
+            Прежняя версия заметки или None, если заметка новая.
+        """
+        old = self.__notes.get(note.id)
+        if old is None and note.id in self.__gone:
+            # ID уже есть в списке порядка: сначала вычищаем удаленные.
+            self.__compact_order()
+        self.__notes[note.id] = note
+        if old is None:
+            self.__order.append(note.id)
+        else:
+            note_formatter.invalidate(note.id)
+        self.__versions[note.id] = note.version
+        if self.__index is not None:
+            self.__index.add(note)
+        elif self.__index_backlog is not None:
+            self.__index_backlog.add(note.id)
+        self.tags.add(note)
+        if self.__statistics is not None:
+            self.__statistics.add(note)
+        elif self.__statistics_backlog is not None:
+            self.__statistics_backlog.add(note.id)
+        return old
+
+    def __drop(self, note_id: int) -> Optional[Note]:
+        """Удаляет заметку из памяти и индексов на месте.
+
+        Вызывается под __lock.
+
+        Args:
+            note_id: ID удаляемой заметки.
+
+        Returns:
+            Удаленная заметка или None, если ее не было.
+        """
+        old = self.__notes.pop(note_id, None)
+        if old is None:
+            return None
+        self.__versions.pop(note_id, None)
+        note_formatter.invalidate(note_id)
+        self.__gone.add(note_id)
+        if len(self.__gone) > len(self.__notes):
+            self.__compact_order()
+        if self.__index is not None:
+            self.__index.remove(note_id)
+        elif self.__index_backlog is not None:
+            self.__index_backlog.add(note_id)
+        self.tags.remove(note_id)
+        if self.__statistics is not None:
+            self.__statistics.remove(note_id)
+        elif self.__statistics_backlog is not None:
+            self.__statistics_backlog.add(note_id)
+        return old
+
+    def __record_statistics(self, put: Iterable[int], deleted: Iterable[int]) -> None:
+        """Дописывает изменение построенной статистики в файл статистики.
+
+        Вызывается под __lock после обновления статистики в памяти.
+
+        Args:
+            put: ID добавленных и измененных заметок.
+            deleted: ID удаленных заметок.
+        """
+        if self.__statistics is not None and self.__statistics_file is not None:
+            self.__statistics_file.append(self.__statistics, put, deleted)
+
+    def __compact_order(self) -> None:
+        """Заменяет список порядка новым, без ID удаленных заметок.
+
+        Список заменяется, а не изменяется, поэтому читатели, уже
+        перебирающие прежний список, не замечают замены.
+        """
+        self.__order = list(self.__notes)
+        self.__gone = set()
+
+    def __replace(self, notes: List[Note]) -> NoteChange:
+        """Заменяет заметки в памяти и вычисляет дельту.
+
+        Заметка считается измененной, если изменился номер ее версии.
+        Индексы обновляются только для добавленных, измененных и удаленных
+        заметок.
+
+        Args:
+            notes: Новый полный список заметок.
+
+        Returns:
+            Дельта между старым и новым набором заметок.
+        """
+        change = NoteChange()
+        new_notes: Dict[int, Note] = {}
+        new_versions: Dict[int, int] = {}
+        for note in notes:
+            new_notes[note.id] = note
+            new_versions[note.id] = note.version
+            old_version = self.__versions.get(note.id)
+            if old_version is None:
+                change.added.append(note.id)
+            elif old_version != note.version:
+                change.updated.append(note.id)
+        change.deleted = [i for i in self.__notes if i not in new_notes]
+        index, statistics = self.__index, self.__statistics
+        changed = [new_notes[note_id] for note_id in change.added + change.updated]
+        for note_id in change.deleted + change.updated:
+            note_formatter.invalidate(note_id)
+        if index is not None:
+            for note_id in change.deleted:
+                index.remove(note_id)
+            for note in changed:
+                index.add(note)
+        elif self.__index_backlog is not None:
+            self.__index_backlog.update(change.deleted + change.added + change.updated)
+        if statistics is not None:
+            for note_id in change.deleted:
+                statistics.remove(note_id)
+            for note in changed:
+                statistics.add(note)
+        elif self.__statistics_backlog is not None:
+            self.__statistics_backlog.update(change.deleted + change.added + change.updated)
+        self.tags.update(changed, change.deleted)
+        self.__notes = new_notes
+        self.__order = list(new_notes)
+        self.__gone = set()
+        self.__versions = new_versions
+        return change
+
+    def __notify(self, change: NoteChange) -> None:
+        """Рассылает дельту всем подписчикам.
+
+        Args:
+            change: Дельта изменений.
+        """
+        if not change:
+            return
+        for callback in list(self.__subscribers):
+            callback(change)
@@ -0,0 +1,239 @@
+"""Модуль реестра состояний и выбора хранилища по конфигурации."""
+
+import importlib
+import inspect
+import json
+import os
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+from state.base_state import BaseState
+
+Factory = Callable[..., BaseState]
+
+
+class StateRegistry:
+    """Реестр состояний (хранилищ заметок) по короткому имени.
+
+    Состояние регистрируется под именем вместе с фабрикой — классом или
+    функцией, возвращающей BaseState, — либо строкой "модуль:атрибут".
+    Строки импортируются только при создании состояния, поэтому реестр
+    не загружает модули хранилищ, которые не используются.
+
+    Выбор хранилища (resolve) берется из JSON-файла конфигурации вида
+    {"backend": "lazy", "options": {"filepath": "data/notes.json"}} и
+    переменных окружения: NOTES_BACKEND переопределяет имя из файла,
+    NOTES_CONFIG задает путь к файлу (по умолчанию CONFIG_PATH).
+    Параметры options передаются фабрике как именованные аргументы.
+
+    Attributes:
+        BACKEND_VARIABLE: Переменная окружения с именем хранилища.
+        CONFIG_VARIABLE: Переменная окружения с путем к файлу конфигурации.
+        CONFIG_PATH: Путь к файлу конфигурации по умолчанию.
+        default: Имя хранилища, если оно не задано конфигурацией.
+        __factories: Фабрики или строки "модуль:атрибут" по имени.
+        __descriptions: Описания хранилищ по имени.
+        __accepts: Имена общих параметров, которые принимает хранилище.
+    """
+
+    BACKEND_VARIABLE = "NOTES_BACKEND"
+    CONFIG_VARIABLE = "NOTES_CONFIG"
+    CONFIG_PATH = "notes_config.json"
+
+    def __init__(self, default: str = "json") -> None:
+        """Инициализирует пустой реестр.
+
+        Args:
+            default: Имя хранилища, если оно не задано конфигурацией.
+        """
+        self.default: str = default
+        self.__factories: Dict[str, Union[Factory, str]] = {}
+        self.__descriptions: Dict[str, str] = {}
+        self.__accepts: Dict[str, Tuple[str, ...]] = {}
+
+    def register(
+        self,
+        name: str,
+        factory: Union[Factory, str],
+        description: str = "",
+        accepts: Tuple[str, ...] = ()
+    ) -> None:
+        """Регистрирует состояние под именем, заменяя прежнее.
+
+        Args:
+            name: Короткое имя хранилища (json, memory, ...).
+            factory: Класс или функция, создающая BaseState, либо строка
+                     "модуль:атрибут" для отложенного импорта.
+            description: Описание для списка хранилищ.
+            accepts: Общие параметры приложения (filepath,
+                     blob_threshold, ...), которые from_config передает
+                     этому хранилищу.
+        """
+        self.__factories[name] = factory
+        self.__descriptions[name] = description
+        self.__accepts[name] = accepts
+
+    def names(self) -> List[str]:
+        """Возвращает имена зарегистрированных хранилищ.
+
+        Returns:
+            Отсортированный список имен.
+        """
+        return sorted(self.__factories)
+
+    def describe(self) -> Dict[str, str]:
+        """Возвращает описания зарегистрированных хранилищ.
+
+        Returns:
+            Словарь имя -> описание в порядке имен.
+        """
+        return {name: self.__descriptions[name] for name in self.names()}
+
+    def create(self, name: str, **options: Any) -> BaseState:
+        """Создает состояние по имени.
+
+        Args:
+            name: Имя зарегистрированного хранилища.
+            **options: Параметры фабрики.
+
+        Returns:
+            Новое (или общее, как у JsonState) состояние.
+
+        Raises:
+            ValueError: Если хранилище не зарегистрировано или не
+                        принимает переданные параметры.
+        """
+        factory = self.__factories.get(name)
+        if factory is None:
+            raise ValueError(
+                f"Неизвестное хранилище: {name} (доступны: {', '.join(self.names())})"
+            )
+        if isinstance(factory, str):
+            module_name, _, attribute = factory.partition(":")
+            factory = getattr(importlib.import_module(module_name), attribute)
+            self.__factories[name] = factory
+        try:
+            inspect.signature(factory).bind(**options)
+        except TypeError as error:
+            raise ValueError(f"Некорректные параметры хранилища {name}: {error}") from error
+        return factory(**options)
+
+    def resolve(
+        self,
+        backend: Optional[str] = None,
+        config: Optional[str] = None,
+        environ: Optional[Mapping[str, str]] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Определяет имя хранилища и его параметры.
+
+        Порядок приоритета имени: аргумент backend, переменная
+        NOTES_BACKEND, поле "backend" файла конфигурации, default.
+        Параметры берутся из поля "options" файла. Отсутствующий файл
+        конфигурации не ошибка, если путь к нему не задан явно.
+
+        Args:
+            backend: Имя хранилища, заданное явно (например, из командной строки).
+            config: Путь к файлу конфигурации, заданный явно.
+            environ: Переменные окружения. По умолчанию os.environ.
+
+        Returns:
+            Кортеж (имя хранилища, параметры фабрики).
+
+        Raises:
+            ValueError: Если файл конфигурации некорректен или явно
+                        заданный файл не найден.
+        """
+        environ = os.environ if environ is None else environ
+        explicit = config is not None or self.CONFIG_VARIABLE in environ
+        path = config if config is not None else environ.get(self.CONFIG_VARIABLE, self.CONFIG_PATH)
+
+        data: Dict[str, Any] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            if explicit:
+                raise ValueError(f"Файл конфигурации не найден: {path}") from None
+        except json.JSONDecodeError as error:
+            raise ValueError(f"Некорректный файл конфигурации {path}: {error}") from error
+
+        options = data.get("options", {}) if isinstance(data, dict) else None
+        if not isinstance(options, dict):
+            raise ValueError(f"Некорректный файл конфигурации {path}: ожидается объект options")
+        name = backend or environ.get(self.BACKEND_VARIABLE) or data.get("backend") or self.default
+        return name, options
+
+    def from_config(
+        self,
+        backend: Optional[str] = None,
+        config: Optional[str] = None,
+        environ: Optional[Mapping[str, str]] = None,
+        **defaults: Any
+    ) -> BaseState:
+        """Создает состояние, выбранное конфигурацией (см. resolve).
+
+        Args:
+            backend: Имя хранилища, заданное явно.
+            config: Путь к файлу конфигурации, заданный явно.
+            environ: Переменные окружения. По умолчанию os.environ.
+            **defaults: Общие параметры приложения; хранилищу передаются
+                        только перечисленные при регистрации в accepts,
+                        параметры из файла конфигурации их переопределяют.
+
+        Returns:
+            Созданное состояние.
+
+        Raises:
+            ValueError: Если конфигурация или параметры некорректны.
+        """
+        name, options = self.resolve(backend, config, environ)
+        accepted = self.__accepts.get(name, ())
+        shared = {key: value for key, value in defaults.items() if key in accepted}
+        return self.create(name, **{**shared, **options})
+
+
+def _memory_state(columnar: bool = False, preload: Optional[str] = None) -> BaseState:
+    """Создает MemoryState, при необходимости заполняя его из JSON-файла.
+
+    Args:
+        columnar: Хранить заметки по колонкам.
+        preload: Путь к JSON-файлу хранилища, заметки которого копируются
+                 в память (например, корпус benchmarks.corpus для
+                 нагрузочной проверки интерфейса). Файл не изменяется.
+
+    Returns:
+        Состояние в оперативной памяти.
+    """
+    from state.memory_state import MemoryState
+    state = MemoryState(columnar)
+    if preload:
+        from state.lazy_json_state import LazyJsonState
+        state.save_notes(LazyJsonState(preload).load_notes())
+    return state
+
+
+def _columnar_state(preload: Optional[str] = None) -> BaseState:
+    """Создает поколоночный MemoryState (см. _memory_state).
+
+    Args:
+        preload: Путь к JSON-файлу, заметки которого копируются в память.
+
+    Returns:
+        Поколоночное состояние в оперативной памяти.
+    """
+    return _memory_state(True, preload)
+
+
+registry = StateRegistry()
+registry.register(
+    "json", "state.json_state:JsonState", "JSON-файл целиком в памяти",
+    ("filepath", "compact_dates", "blob_threshold")
+)
+registry.register(
+    "lazy", "state.lazy_json_state:LazyJsonState", "JSON-файл, тексты по требованию",
+    ("filepath", "blob_threshold")
+)
+registry.register(
+    "durable", "state.durable_json_state:DurableJsonState", "JSON-снимок с журналом WAL",
+    ("filepath",)
+)
+registry.register("memory", _memory_state, "только оперативная память")
+registry.register("columnar", _columnar_state, "оперативная память по колонкам")
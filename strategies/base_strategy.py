@@ -1,36 +1,113 @@
 """Модуль базового класса стратегии для паттерна 'Стратегия'."""
 
 from abc import ABC, abstractmethod
+from core.metrics import metrics
 from core.note import Note
-from typing import List
+from core.note_formatter import NoteFormatter, note_formatter
+from core.search_hit import SearchHit
+from typing import Any, Iterable, Iterator
 
 
 class BaseStrategy(ABC):
     """Абстрактный базовый класс для реализации паттерна 'Стратегия'.
 
     Определяет общий интерфейс для всех конкретных стратегий поиска и
-    отображения заметок. Каждая конкретная стратегия должна реализовать
-    метод execute для выполнения специфической логики обработки списка заметок.
+    отображения заметок. Каждая конкретная стратегия описывает, какие
+    заметки подходят (iter_matches) и в каком формате NoteFormatter их
+    выводить (result_format). Результаты можно получать целиком через
+    execute, постепенно через iter_results или вместе с позициями
+    совпадений через iter_hits.
+
+    Методы INSTRUMENTED каждой стратегии замеряются через core.metrics
+    под именем "<Класс>.<метод>"; для iter_matches учитывается только
+    время поиска, без вывода найденного.
 
     Attributes:
         notes: Список объектов Note для обработки.
+        result_format: Формат блока NoteFormatter для найденных заметок.
     """
 
+    result_format: str = NoteFormatter.FULL
+
+    INSTRUMENTED = ("iter_matches", "execute")
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Оборачивает методы стратегии в замер времени.
+
+        Args:
+            **kwargs: Параметры, передаваемые родительскому классу.
+        """
+        super().__init_subclass__(**kwargs)
+        metrics.instrument(cls, cls.INSTRUMENTED)
+
     @abstractmethod
-    def execute(self, notes: List[Note]) -> str:
-        """Выполняет стратегию обработки списка заметок.
+    def iter_matches(self, notes: Iterable[Note]) -> Iterator[Note]:
+        """Лениво перебирает заметки, подходящие под условие стратегии.
 
         Абстрактный метод, который должен быть реализован в дочерних классах.
-        Принимает список заметок и возвращает отформатированную строку
-        с результатом обработки.
+        Заметки выдаются по мере нахождения, поэтому первые результаты
+        доступны до окончания обхода всего списка.
 
         Args:
-            notes: Список объектов Note для обработки.
+            notes: Последовательность объектов Note для обработки.
 
-        Returns:
-            Отформатированная строка с результатом выполнения стратегии.
+        Yields:
+            Объекты Note, удовлетворяющие условию стратегии.
 
         Raises:
             NotImplementedError: Если метод не реализован в дочернем классе.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def iter_hits(self, notes: Iterable[Note]) -> Iterator[SearchHit]:
+        """Лениво выдает найденные заметки вместе с позициями совпадений.
+
+        Базовая реализация не знает позиций и выдает совпадения без них.
+        Стратегии поиска переопределяют метод, вычисляя позиции за тот же
+        проход, что и само сравнение.
+
+        Args:
+            notes: Последовательность объектов Note для обработки.
+
+        Yields:
+            Объекты SearchHit для каждой найденной заметки.
+        """
+        for note in self.iter_matches(notes):
+            yield SearchHit(note)
+
+    def render(self, note: Note) -> str:
+        """Форматирует одну найденную заметку в формате result_format.
+
+        Args:
+            note: Объект Note для форматирования.
+
+        Returns:
+            Отформатированный блок текста для одной заметки.
+        """
+        return note_formatter.render(note, self.result_format)
+
+    def iter_results(self, notes: Iterable[Note]) -> Iterator[str]:
+        """Лениво выдает отформатированные блоки найденных заметок.
+
+        Args:
+            notes: Последовательность объектов Note для обработки.
+
+        Yields:
+            Отформатированный блок текста для каждой найденной заметки.
+        """
+        for note in self.iter_matches(notes):
+            yield self.render(note)
+
+    def execute(self, notes: Iterable[Note]) -> str:
+        """Выполняет стратегию обработки списка заметок.
+
+        Собирает все блоки из iter_results в одну строку, разделяя их
+        символом новой строки.
+
+        Args:
+            notes: Список объектов Note для обработки.
+
+        Returns:
+            Отформатированная строка с результатом выполнения стратегии.
+        """
+        return "\n".join(self.iter_results(notes))
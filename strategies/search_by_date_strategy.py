@@ -2,7 +2,10 @@
 
 from strategies.base_strategy import BaseStrategy
 from core.note import Note
-from typing import List
+from core.note_dates import parse_range
+from core.note_formatter import NoteFormatter
+from core.search_hit import SearchHit
+from typing import Iterable, Iterator
 
 
 class SearchByDateStrategy(BaseStrategy):
@@ -12,39 +15,60 @@ class SearchByDateStrategy(BaseStrategy):
     заметок по заданной дате. Наследуется от абстрактного базового класса
     BaseStrategy.
 
+    Запрос разбирается один раз в полуинтервал секунд, и заметки
+    отбираются сравнением чисел Note.timestamp без форматирования дат.
+    Кроме точной минуты ("ДД.ММ.ГГГГ ЧЧ:ММ") можно искать по дню
+    ("ДД.ММ.ГГГГ") и месяцу ("ММ.ГГГГ"). Запрос, не являющийся датой,
+    сравнивается со строкой даты как раньше.
+
     Attributes:
         __data: Строка с датой для поиска заметок.
+        __range: Полуинтервал секунд (начало, конец) или None.
     """
 
+    result_format = NoteFormatter.HIT
+
     def __init__(self, data: str) -> None:
         """Инициализирует стратегию поиска по дате.
 
         Args:
-            data: Строка с датой в формате, соответствующем формату
-                  хранения даты в объектах Note (например, "DD.MM.YYYY HH:MM").
+            data: Дата "ДД.ММ.ГГГГ ЧЧ:ММ", день "ДД.ММ.ГГГГ" или
+                  месяц "ММ.ГГГГ".
         """
         self.__data = data
+        self.__range = parse_range(data)
 
-    def execute(self, notes: List[Note]) -> str:
-        """Выполняет поиск заметок по дате и форматирует результат.
-
-        Фильтрует список заметок, оставляя только те, у которых дата
-        совпадает с заданной. Возвращает отформатированную строку с
-        результатами поиска.
+    def iter_matches(self, notes: Iterable[Note]) -> Iterator[Note]:
+        """Выдает заметки, дата которых попадает в заданный период.
 
         Args:
-            notes: Список объектов Note для обработки.
+            notes: Последовательность объектов Note для обработки.
 
-        Returns:
-            Отформатированная строка с найденными заметками или пустая
-            строка, если заметки не найдены.
+        Yields:
+            Объекты Note с датой создания в периоде запроса.
         """
-        notes = [note for note in notes if note.date == self.__data]
-        results = []
+        if self.__range is None:
+            for note in notes:
+                if note.date == self.__data:
+                    yield note
+            return
+
+        start, end = self.__range
         for note in notes:
-            results.append(f"Название: {note.title}")
-            results.append(f"Текст: \n{note.text}")
-            results.append(f"Дата: {note.date}")
-            results.append("-" * 40)
+            timestamp = note.timestamp
+            if timestamp is not None and start <= timestamp < end:
+                yield note
+
+    def iter_hits(self, notes: Iterable[Note]) -> Iterator[SearchHit]:
+        """Выдает найденные заметки с позицией совпадения.
 
-        return "\n".join(results)
\ No newline at end of file
+        Совпадает дата целиком, поэтому позиция охватывает всю дату.
+
+        Args:
+            notes: Последовательность объектов Note для обработки.
+
+        Yields:
+            Объекты SearchHit с совпадением в поле date.
+        """
+        for note in self.iter_matches(notes):
+            yield SearchHit(note, SearchHit.DATE, [(0, len(note.date))])
@@ -2,7 +2,11 @@
 
 from strategies.base_strategy import BaseStrategy
 from core.note import Note
-from typing import List
+from core.note_formatter import NoteFormatter
+from core.search_hit import SearchHit
+from core.text_index import TextIndex
+from core.tokenizer import iter_tokens
+from typing import Iterable, Iterator, Optional
 
 
 class SearchKeywordStrategy(BaseStrategy):
@@ -12,39 +16,74 @@ class SearchKeywordStrategy(BaseStrategy):
     заданное ключевое слово в тексте. Наследуется от абстрактного
     базового класса BaseStrategy.
 
+    Если передан TextIndex, совпадения и их позиции берутся из индекса
+    без сканирования текста заметок.
+
     Attributes:
         __data: Ключевое слово для поиска в тексте заметок.
+        __index: Инвертированный индекс текстов заметок или None.
     """
 
-    def __init__(self, data: str) -> None:
+    result_format = NoteFormatter.FULL
+
+    def __init__(self, data: str, index: Optional[TextIndex] = None) -> None:
         """Инициализирует стратегию поиска по ключевому слову.
 
         Args:
             data: Ключевое слово для поиска в тексте заметок.
+            index: Индекс, построенный по тем же заметкам, что будут
+                   переданы в стратегию. Если не указан, тексты сканируются.
         """
         self.__data = data
+        self.__index = index
+
+    def iter_matches(self, notes: Iterable[Note]) -> Iterator[Note]:
+        """Выдает заметки, в тексте которых встречается ключевое слово.
+
+        Сравнение выполняется по словам, разделенным пробелами. Каждая
+        заметка выдается не более одного раза, даже если слово встречается
+        в ней несколько раз.
+
+        Args:
+            notes: Последовательность объектов Note для обработки.
+
+        Yields:
+            Объекты Note, содержащие ключевое слово.
+        """
+        if self.__index is not None:
+            postings = self.__index.lookup(self.__data)
+            for note in notes:
+                if note.id in postings:
+                    yield note
+            return
+        for note in notes:
+            if self.__data in note.text.split():
+                yield note
 
-    def execute(self, notes: List[Note]) -> str:
-        """Выполняет поиск заметок по ключевому слову и форматирует результат.
+    def iter_hits(self, notes: Iterable[Note]) -> Iterator[SearchHit]:
+        """Выдает найденные заметки с позициями всех вхождений слова.
 
-        Производит поиск заданного ключевого слова в тексте каждой заметки
-        (сравнение по словам, разделенным пробелами). Возвращает
-        отформатированную строку со всеми найденными заметками.
+        Позиции берутся из индекса, а без него вычисляются токенизатором
+        за один проход по тексту заметки.
 
         Args:
-            notes: Список объектов Note для обработки.
+            notes: Последовательность объектов Note для обработки.
 
-        Returns:
-            Отформатированная строка с найденными заметками или пустая
-            строка, если заметки не найдены.
+        Yields:
+            Объекты SearchHit с позициями вхождений в поле text.
         """
-        result = []
+        length = len(self.__data)
+        if self.__index is not None:
+            postings = self.__index.lookup(self.__data)
+            for note in notes:
+                starts = postings.get(note.id)
+                if starts:
+                    yield SearchHit(note, SearchHit.TEXT, [(s, s + length) for s in starts])
+            return
         for note in notes:
-            for word in note.text.split():
-                if word == self.__data:
-                    result.append(f"ID: {note.id}")
-                    result.append(f"Название: {note.title}")
-                    result.append(f"Текст: \n{note.text}")
-                    result.append(f"Дата: {note.date}")
-                    result.append("=" * 40)
-        return "\n".join(result)
\ No newline at end of file
+            spans = [
+                (start, end) for word, start, end in iter_tokens(note.text)
+                if word == self.__data
+            ]
+            if spans:
+                yield SearchHit(note, SearchHit.TEXT, spans)
@@ -0,0 +1,74 @@
+"""Модуль стратегии поиска заметок по выражению над тегами."""
+
+from strategies.base_strategy import BaseStrategy
+from core.note import Note
+from core.note_formatter import NoteFormatter
+from core.tag_index import TagExpression, TagIndex
+from typing import Iterable, Iterator, List, Optional
+
+
+class SearchByTagsStrategy(BaseStrategy):
+    """Стратегия поиска заметок по логическому выражению над тегами.
+
+    Реализует паттерн 'Стратегия' для фильтрации заметок по тегам,
+    например "работа & !архив" (см. TagExpression). Наследуется от
+    абстрактного базового класса BaseStrategy.
+
+    Если передан TagIndex, подходящие заметки вычисляются побитовыми
+    операциями над масками индекса при каждом поиске, а не проверкой
+    тегов каждой заметки.
+
+    Attributes:
+        __expression: Разобранное выражение над тегами.
+        __index: Битовый индекс тегов или None.
+    """
+
+    result_format = NoteFormatter.HIT
+
+    def __init__(self, data: str, index: Optional[TagIndex] = None) -> None:
+        """Инициализирует стратегию поиска по тегам.
+
+        Args:
+            data: Выражение над тегами.
+            index: Индекс, построенный по тем же заметкам, что будут
+                   переданы в стратегию. Если не указан, проверяются теги
+                   каждой заметки.
+
+        Raises:
+            ValueError: Если выражение синтаксически неверно.
+        """
+        self.__expression = TagExpression(data)
+        self.__index = index
+
+    def match_ids(self) -> Optional[List[int]]:
+        """Возвращает ID подходящих заметок по индексу, не перебирая заметки.
+
+        Позволяет взять из хранилища только найденные заметки (например,
+        NoteRepository.get_notes) вместо фильтрации всех заметок.
+
+        Returns:
+            ID заметок в порядке добавления в индекс или None, если
+            стратегия создана без индекса.
+        """
+        if self.__index is None:
+            return None
+        return self.__index.match(self.__expression)
+
+    def iter_matches(self, notes: Iterable[Note]) -> Iterator[Note]:
+        """Выдает заметки, теги которых удовлетворяют выражению.
+
+        Args:
+            notes: Последовательность объектов Note для обработки.
+
+        Yields:
+            Объекты Note с подходящими тегами.
+        """
+        if self.__index is not None:
+            found = set(self.__index.match(self.__expression))
+            for note in notes:
+                if note.id in found:
+                    yield note
+            return
+        for note in notes:
+            if self.__expression.matches(note.tags):
+                yield note
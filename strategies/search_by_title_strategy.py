@@ -2,7 +2,9 @@
 
 from strategies.base_strategy import BaseStrategy
 from core.note import Note
-from typing import List
+from core.note_formatter import NoteFormatter
+from core.search_hit import SearchHit
+from typing import Iterable, Iterator
 
 
 class SearchTitleStrategy(BaseStrategy):
@@ -15,6 +17,8 @@ class SearchTitleStrategy(BaseStrategy):
         __ Строка с названием для поиска заметок.
     """
 
+    result_format = NoteFormatter.HIT
+
     def __init__(self,  data: str) -> None:
         """Инициализирует стратегию поиска по названию.
 
@@ -23,27 +27,29 @@ class SearchTitleStrategy(BaseStrategy):
         """
         self.__data = data
 
-    def execute(self, notes: List[Note]) -> str:
-        """Выполняет поиск заметок по названию и форматирует результат.
-
-        Фильтрует список заметок, оставляя только те, у которых название
-        точно совпадает с заданным. Возвращает отформатированную строку
-        с результатами поиска.
+    def iter_matches(self, notes: Iterable[Note]) -> Iterator[Note]:
+        """Выдает заметки, название которых точно совпадает с заданным.
 
         Args:
-            notes: Список объектов Note для обработки.
+            notes: Последовательность объектов Note для обработки.
 
-        Returns:
-            Отформатированная строка с найденными заметками или пустая
-            строка, если заметки не найдены.
+        Yields:
+            Объекты Note с совпадающим названием.
         """
-        results = [note for note in notes if note.title == self.__data]
+        for note in notes:
+            if note.title == self.__data:
+                yield note
+
+    def iter_hits(self, notes: Iterable[Note]) -> Iterator[SearchHit]:
+        """Выдает найденные заметки с позицией совпадения.
 
-        output = []
-        for note in results:
-            output.append(f"Название: {note.title}")
-            output.append(f"Текст: \n{note.text}")
-            output.append(f"Дата: {note.date}")
-            output.append("-" * 40)
+        Совпадение точное, поэтому позиция охватывает название целиком.
 
-        return "\n".join(output)
\ No newline at end of file
+        Args:
+            notes: Последовательность объектов Note для обработки.
+
+        Yields:
+            Объекты SearchHit с совпадением в поле title.
+        """
+        for note in self.iter_matches(notes):
+            yield SearchHit(note, SearchHit.TITLE, [(0, len(note.title))])
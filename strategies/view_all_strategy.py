@@ -2,7 +2,8 @@
 
 from strategies.base_strategy import BaseStrategy
 from core.note import Note
-from typing import List
+from core.note_formatter import NoteFormatter
+from typing import Iterable, Iterator
 
 
 class ViewAllStrategy(BaseStrategy):
@@ -13,26 +14,15 @@ class ViewAllStrategy(BaseStrategy):
     BaseStrategy.
     """
 
-    def execute(self, notes: List[Note]) -> str:
-        """Форматирует и возвращает строковое представление всех заметок.
+    result_format = NoteFormatter.FULL
 
-        Преобразует список объектов Note в отформатированную строку,
-        где каждая заметка отображается с ID, названием, текстом и датой,
-        разделенных декоративной линией.
+    def iter_matches(self, notes: Iterable[Note]) -> Iterator[Note]:
+        """Выдает все заметки без фильтрации.
 
         Args:
-            notes: Список объектов Note для форматирования.
+            notes: Последовательность объектов Note для отображения.
 
-        Returns:
-            Отформатированная строка со всеми заметками или пустая
-            строка, если список заметок пуст.
+        Yields:
+            Каждый объект Note в исходном порядке.
         """
-        result = []
-        for note in notes:
-            result.append(f"ID: {note.id}")
-            result.append(f"Название: {note.title}")
-            result.append(f"Текст: \n{note.text}")
-            result.append(f"Дата: {note.date}")
-            result.append("=" * 40) 
-
-        return "\n".join(result)
\ No newline at end of file
+        yield from notes
@@ -2,7 +2,8 @@
 
 from strategies.base_strategy import BaseStrategy
 from core.note import Note
-from typing import List
+from core.note_formatter import NoteFormatter
+from typing import Iterable, Iterator
 
 
 class SearchByIDStrategy(BaseStrategy):
@@ -15,6 +16,8 @@ class SearchByIDStrategy(BaseStrategy):
         __data: Целочисленный идентификатор заметки для поиска.
     """
 
+    result_format = NoteFormatter.FULL
+
     def __init__(self, data: int) -> None:
         """Инициализирует стратегию поиска по ID.
 
@@ -23,26 +26,19 @@ class SearchByIDStrategy(BaseStrategy):
         """
         self.__data = data
 
-    def execute(self, notes: List[Note]) -> str:
-        """Выполняет поиск заметки по ID и форматирует результат.
+    def iter_matches(self, notes: Iterable[Note]) -> Iterator[Note]:
+        """Выдает заметку с заданным ID.
 
-        Производит поиск заметки с заданным ID в списке заметок.
-        Возвращает отформатированную строку с найденной заметкой.
+        Идентификаторы уникальны, поэтому обход прекращается сразу
+        после первого совпадения.
 
         Args:
-            notes: Список объектов Note для обработки.
+            notes: Последовательность объектов Note для обработки.
 
-        Returns:
-            Отформатированная строка с найденной заметкой или пустая
-            строка, если заметка не найдена.
+        Yields:
+            Объект Note с совпадающим ID, если он найден.
         """
-        result = []
         for note in notes:
             if note.id == self.__data:
-                result.append(f"ID: {note.id}")
-                result.append(f"Название: {note.title}")
-                result.append(f"Текст: \n{note.text}")
-                result.append(f"Дата: {note.date}")
-                result.append("=" * 40) 
-
-        return "\n".join(result)
\ No newline at end of file
+                yield note
+                return
@@ -2,7 +2,8 @@
 
 from strategies.base_strategy import BaseStrategy
 from core.note import Note
-from typing import List
+from core.note_formatter import NoteFormatter
+from typing import Iterable, Iterator
 
 
 class SearchTitlesStrategy(BaseStrategy):
@@ -13,20 +14,15 @@ class SearchTitlesStrategy(BaseStrategy):
     Наследуется от абстрактного базового класса BaseStrategy.
     """
 
-    def execute(self, notes: List[Note]) -> str:
-        """Извлекает и возвращает список названий всех заметок.
+    result_format = NoteFormatter.TITLE
 
-        Преобразует список объектов Note в строку, содержащую только
-        названия заметок, каждое с новой строки.
+    def iter_matches(self, notes: Iterable[Note]) -> Iterator[Note]:
+        """Выдает все заметки без фильтрации.
 
         Args:
-            notes: Список объектов Note для обработки.
+            notes: Последовательность объектов Note для обработки.
 
-        Returns:
-            Строка с названиями заметок, разделенными символом новой строки,
-            или пустая строка, если список заметок пуст.
+        Yields:
+            Каждый объект Note в исходном порядке.
         """
-        list_titles = []
-        for note in notes:
-            list_titles.append(note.title)
-        return "\n".join(list_titles)
\ No newline at end of file
+        yield from notes
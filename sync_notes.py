@@ -0,0 +1,58 @@
+"""Консольная инкрементальная синхронизация двух JSON-хранилищ заметок.
+
+Примеры запуска:
+
+    python sync_notes.py data/notes.json /mnt/backup/notes.json
+    python sync_notes.py data/notes.json ../replica/notes.json --dry-run
+
+Журнал изменений источника хранится в файле "<источник>.changes.json",
+контрольная точка приемника — в "<приемник>.sync.json".
+"""
+
+import argparse
+import sys
+from core.exceptions import StorageError
+from core.sync_engine import SyncEngine
+from state.json_state import JsonState
+
+
+def main() -> int:
+    """Разбирает аргументы командной строки и выполняет синхронизацию.
+
+    Returns:
+        Код возврата процесса: 0 при успехе, 1 при ошибке.
+    """
+    parser = argparse.ArgumentParser(description="Инкрементальная синхронизация заметок")
+    parser.add_argument("source", help="файл хранилища-источника")
+    parser.add_argument("target", help="файл хранилища-приемника")
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="только показать размер дельты, ничего не записывая"
+    )
+    args = parser.parse_args()
+
+    engine = SyncEngine(JsonState(args.source), args.source + ".changes.json")
+    try:
+        if args.dry_run:
+            delta = engine.pending(args.target + ".sync.json")
+            print(
+                f"К передаче: {len(delta.notes)} заметок, удалений: {len(delta.deleted)}, "
+                f"номер изменения {delta.to_seq}"
+            )
+            return 0
+        report = engine.sync(JsonState(args.target), args.target + ".sync.json")
+    except (OSError, StorageError) as error:
+        print(f"Ошибка синхронизации: {error}", file=sys.stderr)
+        return 1
+
+    print(
+        f"Применено: {len(report.applied)}, удалено: {len(report.deleted)}, "
+        f"конфликтов: {len(report.conflicts)}, номер изменения: {report.seq}"
+    )
+    if report.conflicts:
+        print(f"Конфликты (оставлены версии приемника): {report.conflicts}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""Проверка восстановления DurableJsonState после аварийного завершения.
+
+Запуск из корня проекта:
+
+    python -m tools.crash_test --rounds 20 --fsync always
+
+В каждом раунде дочерний процесс добавляет заметки и после каждого
+успешного add_note сообщает ID родителю через канал. Родитель убивает
+его SIGKILL в случайный момент (в том числе во время контрольной точки,
+которая делается часто), иногда дописывает в журнал обрывок записи,
+имитируя недописанную строку, затем восстанавливает состояние и
+проверяет, что все подтвержденные заметки на месте и совпадают по
+содержимому. Код возврата 1 означает потерю данных.
+
+SIGKILL не сбрасывает кэш страниц ОС, поэтому без потерь должны
+проходить все политики fsync; разницу между ними проявило бы только
+отключение питания.
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import signal
+import sys
+import tempfile
+import time
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Dict
+
+
+def _writer(filepath: str, fsync: str, checkpoint_every: int, pipe: Connection) -> None:
+    """Бесконечно добавляет заметки и сообщает ID подтвержденных.
+
+    Args:
+        filepath: Путь к файлу снимка.
+        fsync: Политика fsync журнала.
+        checkpoint_every: Количество записей журнала до контрольной точки.
+        pipe: Канал для передачи ID родителю.
+    """
+    from state.durable_json_state import DurableJsonState
+
+    state = DurableJsonState(filepath, fsync, checkpoint_every)
+    while True:
+        note = state.add_note(f"crash-{os.getpid()}", f"текст {time.perf_counter_ns()}")
+        pipe.send((note.id, note.text))
+
+
+def run(rounds: int, fsync: str, checkpoint_every: int, max_delay: float) -> bool:
+    """Выполняет раунды аварийного завершения и проверки.
+
+    Args:
+        rounds: Количество раундов.
+        fsync: Политика fsync журнала.
+        checkpoint_every: Количество записей журнала до контрольной точки.
+        max_delay: Максимальное время работы писателя до SIGKILL в секундах.
+
+    Returns:
+        True, если ни одна подтвержденная заметка не потеряна.
+    """
+    from state.durable_json_state import DurableJsonState
+
+    rng = random.Random()
+    committed: Dict[int, str] = {}
+    ok = True
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = str(Path(directory) / "notes.json")
+        for number in range(1, rounds + 1):
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(
+                target=_writer, args=(filepath, fsync, checkpoint_every, sender)
+            )
+            process.start()
+            sender.close()
+            time.sleep(rng.uniform(0.05, max_delay))
+            os.kill(process.pid, signal.SIGKILL)
+            process.join()
+            while True:
+                try:
+                    note_id, text = receiver.recv()
+                except (EOFError, OSError):
+                    break
+                committed[note_id] = text
+            receiver.close()
+
+            torn = rng.random() < 0.3
+            if torn:
+                with open(filepath + ".wal", "ab") as f:
+                    f.write(b"deadbeef {\"op\": \"put\", \"note\": {\"id\"")
+
+            state = DurableJsonState(filepath, fsync, checkpoint_every)
+            recovered = {note.id: note.text for note in state.load_notes()}
+            state.close()
+            lost = [i for i, text in committed.items() if recovered.get(i) != text]
+            print(
+                f"раунд {number}: подтверждено {len(committed)}, "
+                f"восстановлено {len(recovered)}, потеряно {len(lost)}"
+                + (", рваный хвост" if torn else "")
+            )
+            if lost:
+                ok = False
+                print(f"  потерянные ID: {lost[:10]}", file=sys.stderr)
+    return ok
+
+
+def main() -> int:
+    """Разбирает аргументы командной строки и запускает проверку.
+
+    Returns:
+        Код возврата процесса: 0 без потерь, 1 при потере данных.
+    """
+    from core.write_ahead_log import WriteAheadLog
+
+    parser = argparse.ArgumentParser(description="Проверка восстановления после SIGKILL")
+    parser.add_argument("--rounds", type=int, default=20, help="количество раундов")
+    parser.add_argument("--fsync", choices=WriteAheadLog.POLICIES, default=WriteAheadLog.ALWAYS)
+    parser.add_argument("--checkpoint-every", type=int, default=50, help="записей до контрольной точки")
+    parser.add_argument("--max-delay", type=float, default=0.5, help="максимум секунд до SIGKILL")
+    args = parser.parse_args()
+    ok = run(args.rounds, args.fsync, args.checkpoint_every, args.max_delay)
+    print("Потерь нет" if ok else "ОБНАРУЖЕНА ПОТЕРЯ ДАННЫХ")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Нагрузочная проверка локального API заметок (api_server.py).
+
+Запуск из корня проекта при работающем сервере:
+
+    python -m tools.load_test --connections 32 --duration 10
+
+Каждое соединение держится открытым (keep-alive) и по кругу выполняет
+смесь запросов: страница списка, заметка по ID и поиск по ключевому
+слову. По окончании печатаются запросы в секунду и задержки p50/p99.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import List, Tuple
+from urllib.parse import quote
+
+
+async def _request(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    host: str,
+    path: str
+) -> int:
+    """Выполняет один GET-запрос в открытом соединении.
+
+    Args:
+        reader: Поток чтения соединения.
+        writer: Поток записи соединения.
+        host: Значение заголовка Host.
+        path: Путь запроса.
+
+    Returns:
+        Код состояния ответа.
+    """
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+    status = int(head.split(" ", 2)[1])
+    length = 0
+    for line in head.split("\r\n")[1:]:
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(
+    host: str,
+    port: int,
+    paths: List[str],
+    deadline: float,
+    latencies: List[float]
+) -> Tuple[int, int]:
+    """Выполняет запросы в одном keep-alive соединении до истечения времени.
+
+    Args:
+        host: Адрес сервера.
+        port: Порт сервера.
+        paths: Пути запросов, выполняемые по кругу.
+        deadline: Момент окончания (time.perf_counter()).
+        latencies: Список, в который добавляются задержки в секундах.
+
+    Returns:
+        Кортеж (количество запросов, количество ошибок).
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    requests = errors = 0
+    try:
+        while time.perf_counter() < deadline:
+            path = paths[requests % len(paths)]
+            started = time.perf_counter()
+            status = await _request(reader, writer, f"{host}:{port}", path)
+            latencies.append(time.perf_counter() - started)
+            requests += 1
+            if status >= 400:
+                errors += 1
+    finally:
+        writer.close()
+    return requests, errors
+
+
+async def _paths(host: str, port: int, word: str) -> List[str]:
+    """Составляет смесь путей запросов по данным сервера.
+
+    Args:
+        host: Адрес сервера.
+        port: Порт сервера.
+        word: Слово для поиска по ключевому слову.
+
+    Returns:
+        Список путей запросов.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET /notes?limit=1 HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    page = json.loads(response.split(b"\r\n\r\n", 1)[1])
+    note_id = page["notes"][0]["id"] if page["notes"] else 1
+    return [
+        "/notes?offset=0&limit=20",
+        f"/notes/{note_id}",
+        f"/search?by=keyword&q={quote(word)}&limit=20",
+    ]
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Возвращает перцентиль отсортированного списка.
+
+    Args:
+        values: Отсортированные значения.
+        percent: Перцентиль от 0 до 100.
+
+    Returns:
+        Значение перцентиля или 0.0 для пустого списка.
+    """
+    if not values:
+        return 0.0
+    position = min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))
+    return values[position]
+
+
+async def run(host: str, port: int, connections: int, duration: float, word: str) -> bool:
+    """Запускает нагрузку и печатает результат.
+
+    Args:
+        host: Адрес сервера.
+        port: Порт сервера.
+        connections: Количество одновременных keep-alive соединений.
+        duration: Длительность нагрузки в секундах.
+        word: Слово для поиска по ключевому слову.
+
+    Returns:
+        True, если все ответы были успешными.
+    """
+    paths = await _paths(host, port, word)
+    latencies: List[float] = []
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        _client(host, port, paths[i % len(paths):] + paths[:i % len(paths)],
+                started + duration, latencies)
+        for i in range(connections)
+    ))
+    elapsed = time.perf_counter() - started
+
+    requests = sum(result[0] for result in results)
+    errors = sum(result[1] for result in results)
+    latencies.sort()
+    print(
+        f"{requests} запросов за {elapsed:.1f} с через {connections} соединений: "
+        f"{requests / elapsed:.0f} запр/с, "
+        f"p50 {_percentile(latencies, 50) * 1000:.2f} мс, "
+        f"p99 {_percentile(latencies, 99) * 1000:.2f} мс, "
+        f"max {(latencies[-1] if latencies else 0.0) * 1000:.2f} мс, "
+        f"ошибок {errors}"
+    )
+    return errors == 0
+
+
+def main() -> int:
+    """Разбирает аргументы командной строки и запускает нагрузку.
+
+    Returns:
+        Код возврата процесса: 0 без ошибок, 1 при ошибочных ответах.
+    """
+    parser = argparse.ArgumentParser(description="Нагрузочная проверка API заметок")
+    parser.add_argument("--host", default="127.0.0.1", help="адрес сервера")
+    parser.add_argument("--port", type=int, default=8765, help="порт сервера")
+    parser.add_argument("--connections", type=int, default=32, help="одновременных соединений")
+    parser.add_argument("--duration", type=float, default=10.0, help="длительность в секундах")
+    parser.add_argument("--word", default="заметка", help="слово для поиска по ключевому слову")
+    args = parser.parse_args()
+    try:
+        ok = asyncio.run(run(args.host, args.port, args.connections, args.duration, args.word))
+    except OSError as error:
+        print(f"Не удалось подключиться к серверу: {error}", file=sys.stderr)
+        return 1
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
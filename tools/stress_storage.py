@@ -0,0 +1,82 @@
+"""Стресс-проверка JsonStorage: одновременное добавление заметок из N процессов.
+
+Запуск из корня проекта:
+
+    python -m tools.stress_storage --processes 8 --notes 50
+
+Каждый процесс добавляет заметки через JsonState.add_note во временный
+файл. По окончании проверяется, что ни одна заметка не потеряна и все ID
+уникальны. Код возврата 1 означает потерю данных.
+"""
+
+import argparse
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def _worker(filepath: str, worker: int, count: int) -> None:
+    """Добавляет count заметок от имени одного процесса.
+
+    Args:
+        filepath: Путь к общему JSON-файлу.
+        worker: Номер процесса (попадает в названия заметок).
+        count: Количество добавляемых заметок.
+    """
+    from state.json_state import JsonState
+
+    state = JsonState(filepath)
+    for i in range(count):
+        state.add_note(f"worker-{worker}", f"note {i}")
+
+
+def run(processes: int, notes: int) -> bool:
+    """Запускает стресс-проверку и печатает результат.
+
+    Args:
+        processes: Количество одновременно пишущих процессов.
+        notes: Количество заметок, добавляемых каждым процессом.
+
+    Returns:
+        True, если все заметки сохранены и ID уникальны.
+    """
+    from core.json_storage import JsonStorage
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = str(Path(directory) / "notes.json")
+        started = time.perf_counter()
+        workers = [
+            multiprocessing.Process(target=_worker, args=(filepath, worker, notes))
+            for worker in range(processes)
+        ]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+        elapsed = time.perf_counter() - started
+
+        version, data = JsonStorage(filepath).read_versioned()
+        expected = processes * notes
+        ids = [item["id"] for item in data]
+        ok = (
+            len(data) == expected
+            and len(set(ids)) == expected
+            and all(process.exitcode == 0 for process in workers)
+        )
+        print(
+            f"процессов: {processes}, ожидалось заметок: {expected}, "
+            f"сохранено: {len(data)}, уникальных ID: {len(set(ids))}, "
+            f"версия файла: {version}, время: {elapsed:.2f} с"
+        )
+        print("OK" if ok else "ПОТЕРЯ ДАННЫХ")
+        return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=8, help="количество процессов")
+    parser.add_argument("--notes", type=int, default=50, help="заметок на процесс")
+    args = parser.parse_args()
+    sys.exit(0 if run(args.processes, args.notes) else 1)
@@ -1,29 +1,31 @@
 """Модуль окна добавления новой заметки."""
 
 import tkinter as tk
-from state.json_state import JsonState
-from core.note import Note
+from state.note_repository import NoteRepository
 from tkinter import messagebox
-from datetime import datetime
+from core.exceptions import StorageError
 
 
 class AddNote(tk.Toplevel):
     """Окно для добавления новой заметки.
 
-    Предоставляет пользовательский интерфейс для ввода названия и содержания
-    новой заметки с последующим сохранением в JSON-файл через JsonState.
+    Предоставляет пользовательский интерфейс для ввода названия, содержания
+    и тегов новой заметки с последующим сохранением через общий
+    репозиторий заметок.
 
     Attributes:
-        state: Экземпляр JsonState для работы с данными заметок.
+        repository: Общий репозиторий заметок приложения.
         __title_label: Метка для поля названия заметки.
         __title_entry: Поле ввода для названия заметки.
         __text_label: Метка для поля содержания заметки.
         __text_input: Текстовое поле для содержания заметки.
+        __tags_label: Метка для поля тегов заметки.
+        __tags_entry: Поле ввода тегов через пробел или запятую.
         __save_button: Кнопка для сохранения заметки.
         __cancel_button: Кнопка для очистки полей ввода.
     """
 
-    def __init__(self, parent: tk.Tk) -> None:
+    def __init__(self, parent: tk.Tk, repository: NoteRepository) -> None:
         """Инициализирует окно добавления заметки.
 
         Создает дочернее окно Toplevel, настраивает его параметры,
@@ -31,9 +33,10 @@ class AddNote(tk.Toplevel):
 
         Args:
             parent: Родительское окно Tkinter.
+            repository: Общий репозиторий заметок приложения.
         """
         super().__init__(parent)
-        self.state = JsonState()
+        self.repository = repository
 
         self.__configure_window()
         self.__configure_widgets()
@@ -46,6 +49,9 @@ class AddNote(tk.Toplevel):
         self.__text_label: tk.Label
         self.__text_input: tk.Text
 
+        self.__tags_label: tk.Label
+        self.__tags_entry: tk.Entry
+
         self.__save_button: tk.Button
         self.__cancel_button: tk.Button
 
@@ -56,7 +62,7 @@ class AddNote(tk.Toplevel):
         и цвет фона окна.
         """
         self.title("Добавить заметку")
-        self.geometry("600x500")
+        self.geometry("600x580")
         self.resizable(True, True)
         self.configure(bg="#f8f9fa")
 
@@ -103,6 +109,24 @@ class AddNote(tk.Toplevel):
             height=12
         )
 
+        self.__tags_label = tk.Label(
+            self,
+            text="Теги (через пробел или запятую):",
+            font=("Arial", 12, "bold"),
+            bg="#f8f9fa",
+            fg="#212529"
+        )
+
+        self.__tags_entry = tk.Entry(
+            self,
+            font=("Arial", 11),
+            relief=tk.FLAT,
+            bg="white",
+            highlightbackground="#ced4da",
+            highlightcolor="#28a745",
+            highlightthickness=1
+        )
+
         self.__save_button = tk.Button(
             self,
             text="💾 Сохранить",
@@ -143,6 +167,9 @@ class AddNote(tk.Toplevel):
         self.__text_label.pack(anchor="w", **padding)
         self.__text_input.pack(fill=tk.BOTH, expand=True, **padding)
 
+        self.__tags_label.pack(anchor="w", **padding)
+        self.__tags_entry.pack(fill=tk.X, **padding)
+
         self.__save_button.pack(pady=(20, 10))
         self.__cancel_button.pack(pady=(0, 20))
 
@@ -162,22 +189,24 @@ class AddNote(tk.Toplevel):
         """Сохраняет новую заметку.
 
         Получает данные из полей ввода, выполняет валидацию,
-        создает новую заметку и сохраняет ее через JsonState.
+        создает новую заметку и сохраняет ее через репозиторий,
+        который оповещает открытые окна о добавлении.
         При успешном сохранении показывает информационное сообщение
-        и закрывает окно.
+        и закрывает окно, при ошибке хранилища — сообщение об ошибке.
         """
         title = self.__title_entry.get().strip()
         text = self.__text_input.get("1.0", tk.END).strip()
+        tags = self.__tags_entry.get().replace(",", " ").split()
 
         if not title or not text:
             messagebox.showerror("Ошибка", "Заполните все поля!")
             return
 
-        notes = self.state.load_notes()
-        next_id = max([n.id for n in notes], default=0) + 1
-        new_note = Note(next_id, title, text, date=datetime.now().strftime("%d.%m.%Y %H:%M"))
-        notes.append(new_note)
-        self.state.save_notes(notes)
+        try:
+            self.repository.add_note(title, text, tags)
+        except StorageError as error:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить заметку: {error}")
+            return
 
         messagebox.showinfo("Успех", "Заметка успешно добавлена!")
         self.destroy()
@@ -185,7 +214,8 @@ class AddNote(tk.Toplevel):
     def __cancel_note(self) -> None:
         """Очищает поля ввода.
 
-        Удаляет весь текст из поля названия и текстового поля содержания.
+        Удаляет весь текст из полей названия, содержания и тегов.
         """
         self.__title_entry.delete(0, tk.END)
         self.__text_input.delete('1.0', tk.END)
+        self.__tags_entry.delete(0, tk.END)
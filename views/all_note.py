@@ -2,27 +2,29 @@
 
 import tkinter as tk
 from strategies.view_all_strategy import ViewAllStrategy
-from state.json_state import JsonState
+from state.note_repository import NoteChange, NoteRepository
+from views.result_stream import ResultStream
 
 
 class AllNote(tk.Toplevel):
     """Окно для просмотра всех сохраненных заметок.
 
     Предоставляет пользовательский интерфейс для отображения списка всех
-    заметок с возможностью прокрутки длинного содержимого через Canvas
-    и Scrollbar.
+    заметок в текстовом поле только для чтения с прокруткой через
+    Scrollbar.
 
     Attributes:
-        state: Экземпляр JsonState для загрузки данных заметок.
+        repository: Общий репозиторий заметок приложения.
         __button: Кнопка для инициации загрузки и отображения заметок.
-        __label_notes: Метка для отображения содержимого заметок.
+        __text_notes: Текстовое поле для отображения содержимого заметок.
         __label_error: Метка для отображения сообщений об ошибках.
-        __canvas: Canvas для создания прокручиваемой области.
+        __label_counter: Метка со счетчиком найденных заметок.
+        __stream: Потоковый вывод результатов в текстовое поле заметок.
+        __shown: Флаг того, что список заметок уже выведен в окно.
         __scrollbar: Вертикальный скроллбар для прокрутки содержимого.
-        __scrollable_frame: Frame внутри Canvas для размещения метки с заметками.
     """
 
-    def __init__(self, parent: tk.Tk) -> None:
+    def __init__(self, parent: tk.Tk, repository: NoteRepository) -> None:
         """Инициализирует окно просмотра всех заметок.
 
         Создает дочернее окно Toplevel, настраивает его параметры,
@@ -30,22 +32,28 @@ class AllNote(tk.Toplevel):
 
         Args:
             parent: Родительское окно Tkinter.
+            repository: Общий репозиторий заметок приложения.
         """
         super().__init__(parent)
 
-        self.state = JsonState()
+        self.repository = repository
+        self.__shown = False
 
         self.__configure_window()
         self.__configure_widgets()
         self.__pack_widgets()
         self.__add_icon()
 
+        self.repository.subscribe(self.__on_notes_changed)
+        self.bind("<Destroy>", self.__on_destroy)
+
         self.__button: tk.Button
-        self.__label_notes: tk.Label
+        self.__text_notes: tk.Text
         self.__label_error: tk.Label
-        self.__canvas: tk.Canvas
+        self.__label_counter: tk.Label
+        self.__stream: ResultStream
+        self.__shown: bool
         self.__scrollbar: tk.Scrollbar
-        self.__scrollable_frame: tk.Frame
 
     def __configure_window(self) -> None:
         """Настраивает параметры окна просмотра заметок.
@@ -59,8 +67,8 @@ class AllNote(tk.Toplevel):
     def __configure_widgets(self) -> None:
         """Инициализирует и настраивает виджеты окна.
 
-        Создает кнопку просмотра, Canvas с Scrollbar для прокрутки,
-        Frame для размещения метки и саму метку для отображения заметок.
+        Создает кнопку просмотра, текстовое поле для отображения заметок
+        и Scrollbar для его прокрутки.
         """
         self.__button = tk.Button(
             self, 
@@ -75,22 +83,18 @@ class AllNote(tk.Toplevel):
             cursor="hand2"
         )
 
-        self.__canvas = tk.Canvas(self, bg="#f8f9fa", highlightthickness=0)
-        self.__scrollbar = tk.Scrollbar(self, orient="vertical", command=self.__canvas.yview)
-        self.__canvas.configure(yscrollcommand=self.__scrollbar.set)
-
-        self.__scrollable_frame = tk.Frame(self.__canvas, bg="#f8f9fa")
-        self.__canvas.create_window((0, 0), window=self.__scrollable_frame, anchor="nw")
-
-        self.__label_notes = tk.Label(
-            self.__scrollable_frame,
-            text="", 
+        self.__text_notes = tk.Text(
+            self,
             font=("Arial", 11),
             bg="#f8f9fa",
             fg="#212529",
-            justify=tk.LEFT,
-            wraplength=700
+            relief=tk.FLAT,
+            highlightthickness=0,
+            wrap=tk.WORD,
+            state=tk.DISABLED
         )
+        self.__scrollbar = tk.Scrollbar(self, orient="vertical", command=self.__text_notes.yview)
+        self.__text_notes.configure(yscrollcommand=self.__scrollbar.set)
 
         self.__label_error = tk.Label(
             self, 
@@ -99,26 +103,33 @@ class AllNote(tk.Toplevel):
             font=("Arial", 11, "bold"),
             bg="#f8f9fa"
         )
+
+        self.__label_counter = tk.Label(
+            self,
+            text="",
+            font=("Arial", 10),
+            bg="#f8f9fa",
+            fg="#6c757d"
+        )
+
+        self.__stream = ResultStream(
+            self.__text_notes,
+            self.__label_counter,
+            on_finish=self.__on_stream_finish
+        )
     
     def __pack_widgets(self) -> None:
         """Размещает виджеты в окне.
 
-        Упаковывает кнопку, Canvas с Scrollbar и метки с заданными отступами
-        и параметрами размещения для обеспечения корректного отображения
-        и функциональности прокрутки.
+        Упаковывает кнопку, метки и текстовое поле со Scrollbar с заданными
+        отступами и параметрами размещения.
         """
-        self.__button.pack(pady=(40, 30))
-
-        self.__canvas.pack(side="left", fill="both", expand=True, padx=30, pady=10)
-        self.__scrollbar.pack(side="right", fill="y", pady=10)
-
-        self.__label_notes.pack(anchor="w")
+        self.__button.pack(pady=(40, 10))
+        self.__label_counter.pack(pady=(0, 10))
         self.__label_error.pack(pady=10)
 
-        self.__scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.__canvas.configure(scrollregion=self.__canvas.bbox("all"))
-        )
+        self.__text_notes.pack(side="left", fill="both", expand=True, padx=30, pady=10)
+        self.__scrollbar.pack(side="right", fill="y", pady=10)
 
     def __add_icon(self) -> None:
         """Устанавливает иконку окна.
@@ -135,16 +146,50 @@ class AllNote(tk.Toplevel):
     def __show_notes(self) -> None:
         """Отображает все сохраненные заметки.
 
-        Очищает предыдущие результаты, загружает все заметки через JsonState,
-        применяет стратегию ViewAllStrategy для форматирования и отображает
-        результат в метке. Если заметок нет, показывает соответствующее сообщение.
+        Очищает предыдущие результаты и запускает потоковый вывод блоков
+        ViewAllStrategy по заметкам репозитория: заметки перебираются
+        лениво, поэтому первые появляются сразу, а остальные догружаются
+        порциями без предварительного копирования списка.
         """
         self.__label_error["text"] = ""
-        self.__label_notes["text"] = ""
 
+        self.__shown = True
         strategy = ViewAllStrategy()
-        notes = self.state.load_notes()
-        if strategy.execute(notes):
-            self.__label_notes["text"] += strategy.execute(notes)
-        else:
-            self.__label_error["text"] = "Заметок нет"
+        self.__stream.start(strategy.iter_results(self.repository.iter_notes()))
+
+    def __on_notes_changed(self, change: NoteChange) -> None:
+        """Обновляет выведенный список при изменении заметок.
+
+        Новые заметки дописываются в конец списка; при изменении или
+        удалении список перестраивается из памяти репозитория.
+
+        Args:
+            change: Дельта изменений заметок.
+        """
+        if not self.__shown:
+            return
+        if change.updated or change.deleted:
+            self.__show_notes()
+            return
+        self.__label_error["text"] = ""
+        added = self.repository.get_notes(change.added)
+        self.__stream.extend(ViewAllStrategy().iter_results(added))
+
+    def __on_destroy(self, event: tk.Event) -> None:
+        """Отписывает окно от репозитория при закрытии.
+
+        Args:
+            event: Событие уничтожения виджета.
+        """
+        if event.widget is self:
+            self.__stream.cancel()
+            self.repository.unsubscribe(self.__on_notes_changed)
+
+    def __on_stream_finish(self, count: int) -> None:
+        """Обрабатывает окончание потокового вывода заметок.
+
+        Args:
+            count: Количество выведенных заметок.
+        """
+        if not count:
+            self.__label_error["text"] = "Заметок нет"
\ No newline at end of file
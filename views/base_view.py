@@ -1,11 +1,8 @@
 """Модуль главного меню приложения менеджера заметок."""
 
 import tkinter as tk
-from views.add_note import AddNote
-from views.all_note import AllNote
-from views.by_id_note import ByIdNote
-from views.title_note import TitleNote
-from views.search_note import SearchNote
+from core.startup_profiler import startup_profiler
+from state.note_repository import NoteRepository
 
 
 class BaseView(tk.Frame):
@@ -13,8 +10,11 @@ class BaseView(tk.Frame):
 
     Предоставляет централизованное меню для навигации между различными
     функциональными окнами приложения: добавление, просмотр и поиск заметок.
+    Модули окон (а вместе с ними стратегии) импортируются при первом
+    открытии соответствующего окна, а не при запуске приложения.
 
     Attributes:
+        repository: Общий репозиторий заметок, передаваемый дочерним окнам.
         children_windows: Список дочерних окон, открытых из главного меню.
         __title_label: Метка заголовка главного меню.
         __menu_label: Метка подзаголовка с инструкцией выбора действия.
@@ -23,9 +23,11 @@ class BaseView(tk.Frame):
         __button_by_id_note: Кнопка для открытия окна просмотра заметки по ID.
         __button_title_notes: Кнопка для открытия окна просмотра названий заметок.
         __search_note: Кнопка для открытия окна поиска по заметкам.
+        __button_statistics: Кнопка для открытия окна статистики и хронологии.
+        __button_diagnostics: Кнопка для открытия окна диагностики.
     """
 
-    def __init__(self, container: tk.Tk) -> None:
+    def __init__(self, container: tk.Tk, repository: NoteRepository) -> None:
         """Инициализирует главное меню приложения.
 
         Создает фрейм главного меню с кнопками навигации и настраивает
@@ -33,8 +35,11 @@ class BaseView(tk.Frame):
 
         Args:
             container: Родительское окно Tkinter, в котором размещается фрейм.
+            repository: Общий репозиторий заметок приложения.
         """
         super().__init__(container, bg="#f8f9fa")
+
+        self.repository = repository
         
         self.children_windows: list = []
         
@@ -46,6 +51,8 @@ class BaseView(tk.Frame):
         self.__button_by_id_note: tk.Button
         self.__button_title_notes: tk.Button
         self.__search_note: tk.Button
+        self.__button_statistics: tk.Button
+        self.__button_diagnostics: tk.Button
         
         self.__configure_widgets()
         self.__pack_widgets()
@@ -118,6 +125,24 @@ class BaseView(tk.Frame):
             **button_style
         )
 
+        self.__button_statistics = tk.Button(
+            self,
+            text="📅 Статистика и хронология",
+            command=self.open_statistics_window,
+            **button_style
+        )
+
+        self.__button_diagnostics = tk.Button(
+            self,
+            text="📈 Диагностика",
+            command=self.open_diagnostics_window,
+            font=("Arial", 10),
+            bg="#f8f9fa",
+            fg="#6c757d",
+            relief=tk.FLAT,
+            cursor="hand2"
+        )
+
     def __pack_widgets(self) -> None:
         """Размещает виджеты в фрейме главного меню.
 
@@ -133,18 +158,23 @@ class BaseView(tk.Frame):
             self.__button_all_note,
             self.__button_by_id_note,
             self.__button_title_notes,
-            self.__search_note
+            self.__search_note,
+            self.__button_statistics
         ]
         
         for btn in buttons:
             btn.pack(pady=8, padx=20)
+
+        self.__button_diagnostics.pack(pady=(20, 0))
     
     def open_add_window(self) -> None:
         """Открывает окно добавления новой заметки.
 
         Создает экземпляр AddNote и добавляет его в список дочерних окон.
         """
-        window = AddNote(self.winfo_toplevel())
+        with startup_profiler.phase("импорт views.add_note"):
+            from views.add_note import AddNote
+        window = AddNote(self.winfo_toplevel(), self.repository)
         self.children_windows.append(window)
     
     def open_all_window(self) -> None:
@@ -152,7 +182,9 @@ class BaseView(tk.Frame):
 
         Создает экземпляр AllNote и добавляет его в список дочерних окон.
         """
-        window = AllNote(self.winfo_toplevel())
+        with startup_profiler.phase("импорт views.all_note"):
+            from views.all_note import AllNote
+        window = AllNote(self.winfo_toplevel(), self.repository)
         self.children_windows.append(window)
     
     def open_by_id_window(self) -> None:
@@ -160,7 +192,9 @@ class BaseView(tk.Frame):
 
         Создает экземпляр ByIdNote и добавляет его в список дочерних окон.
         """
-        window = ByIdNote(self.winfo_toplevel())
+        with startup_profiler.phase("импорт views.by_id_note"):
+            from views.by_id_note import ByIdNote
+        window = ByIdNote(self.winfo_toplevel(), self.repository)
         self.children_windows.append(window)
     
     def open_title_window(self) -> None:
@@ -168,7 +202,9 @@ class BaseView(tk.Frame):
 
         Создает экземпляр TitleNote и добавляет его в список дочерних окон.
         """
-        window = TitleNote(self.winfo_toplevel())
+        with startup_profiler.phase("импорт views.title_note"):
+            from views.title_note import TitleNote
+        window = TitleNote(self.winfo_toplevel(), self.repository)
         self.children_windows.append(window)
     
     def open_searech_note_window(self) -> None:
@@ -176,5 +212,27 @@ class BaseView(tk.Frame):
 
         Создает экземпляр SearchNote и добавляет его в список дочерних окон.
         """
-        window = SearchNote(self.winfo_toplevel())
+        with startup_profiler.phase("импорт views.search_note"):
+            from views.search_note import SearchNote
+        window = SearchNote(self.winfo_toplevel(), self.repository)
+        self.children_windows.append(window)
+
+    def open_statistics_window(self) -> None:
+        """Открывает окно статистики и хронологии заметок.
+
+        Создает экземпляр StatisticsNote и добавляет его в список дочерних окон.
+        """
+        with startup_profiler.phase("импорт views.statistics_note"):
+            from views.statistics_note import StatisticsNote
+        window = StatisticsNote(self.winfo_toplevel(), self.repository)
+        self.children_windows.append(window)
+
+    def open_diagnostics_window(self) -> None:
+        """Открывает окно диагностики с метриками времени выполнения.
+
+        Создает экземпляр Diagnostics и добавляет его в список дочерних окон.
+        """
+        with startup_profiler.phase("импорт views.diagnostics"):
+            from views.diagnostics import Diagnostics
+        window = Diagnostics(self.winfo_toplevel())
         self.children_windows.append(window)
@@ -1,8 +1,13 @@
 """Модуль окна просмотра заметки по ID."""
 
 import tkinter as tk
+from typing import Optional
+from tkinter import messagebox
+from core.exceptions import StorageError
+from core.metrics import metrics
 from strategies.view_by_id_strategy import SearchByIDStrategy
-from state.json_state import JsonState
+from state.note_repository import NoteChange, NoteRepository
+from views.edit_note import EditNote
 
 
 class ByIdNote(tk.Toplevel):
@@ -10,18 +15,23 @@ class ByIdNote(tk.Toplevel):
 
     Предоставляет пользовательский интерфейс для ввода ID заметки
     и отображения найденной заметки с использованием стратегии поиска.
+    Найденную заметку можно изменить (окно EditNote) или удалить.
 
     Attributes:
         parent: Родительское окно Tkinter.
-        state: Экземпляр JsonState для загрузки данных заметок.
+        repository: Общий репозиторий заметок приложения.
         __label_id: Метка для поля ввода ID заметки.
         __entry_id: Поле ввода для ID заметки.
         __button_search: Кнопка для инициации поиска заметки.
         __label_note: Метка для отображения найденной заметки.
         __label_error: Метка для отображения сообщений об ошибках.
+        __actions: Рамка с кнопками изменения и удаления заметки.
+        __button_edit: Кнопка открытия окна изменения заметки.
+        __button_delete: Кнопка удаления заметки.
+        __note_id: ID последней запрошенной заметки.
     """
 
-    def __init__(self, parent: tk.Tk) -> None:
+    def __init__(self, parent: tk.Tk, repository: NoteRepository) -> None:
         """Инициализирует окно просмотра заметки по ID.
 
         Создает дочернее окно Toplevel, настраивает его параметры,
@@ -29,16 +39,21 @@ class ByIdNote(tk.Toplevel):
 
         Args:
             parent: Родительское окно Tkinter.
+            repository: Общий репозиторий заметок приложения.
         """
         super().__init__(parent)
         self.parent = parent
         
-        self.state = JsonState()
+        self.repository = repository
+        self.__note_id: Optional[int] = None
         
         self.__configure_window()
         self.__configure_widgets()
         self.__pack_widgets()
         self.__add_icon()
+
+        self.repository.subscribe(self.__on_notes_changed)
+        self.bind("<Destroy>", self.__on_destroy)
         
         self.__label_id: tk.Label
         self.__entry_id: tk.Entry
@@ -47,6 +62,10 @@ class ByIdNote(tk.Toplevel):
         self.__label_note: tk.Label
         self.__label_error: tk.Label
 
+        self.__actions: tk.Frame
+        self.__button_edit: tk.Button
+        self.__button_delete: tk.Button
+
     def __configure_window(self) -> None:
         """Настраивает параметры окна просмотра заметки по ID.
 
@@ -112,6 +131,31 @@ class ByIdNote(tk.Toplevel):
             font=("Arial", 11, "bold"),
             bg="#f8f9fa"
         )
+
+        action_style = {
+            "font": ("Arial", 11),
+            "fg": "white",
+            "relief": tk.FLAT,
+            "padx": 15,
+            "pady": 5,
+            "cursor": "hand2",
+            "state": tk.DISABLED
+        }
+        self.__actions = tk.Frame(self, bg="#f8f9fa")
+        self.__button_edit = tk.Button(
+            self.__actions,
+            text="✏️ Изменить",
+            command=self.__edit_note,
+            bg="#007bff",
+            **action_style
+        )
+        self.__button_delete = tk.Button(
+            self.__actions,
+            text="🗑️ Удалить",
+            command=self.__delete_note,
+            bg="#dc3545",
+            **action_style
+        )
     
     def __pack_widgets(self) -> None:
         """Размещает виджеты в окне.
@@ -123,6 +167,9 @@ class ByIdNote(tk.Toplevel):
         self.__label_id.pack(anchor="w", padx=30, pady=(20, 5))
         self.__entry_id.pack(pady=(0, 20), padx=30)
         self.__button_search.pack(pady=20)
+        self.__actions.pack(pady=(0, 10))
+        self.__button_edit.pack(side=tk.LEFT, padx=5)
+        self.__button_delete.pack(side=tk.LEFT, padx=5)
         self.__label_note.pack(padx=30, pady=10, anchor="w")
         self.__label_error.pack(pady=10)
     
@@ -141,16 +188,72 @@ class ByIdNote(tk.Toplevel):
     def __show_note(self) -> None:
         """Отображает заметку по введенному ID.
 
-        Очищает предыдущие результаты, загружает все заметки через JsonState,
-        применяет стратегию SearchByIDStrategy для поиска заметки по ID
-        и отображает результат. Если заметка не найдена, показывает
-        соответствующее сообщение об ошибке.
+        Запоминает введенный ID и выводит соответствующую заметку.
+        """
+        self.__note_id = int(self.__entry_id.get())
+        self.__render_note()
+
+    def __render_note(self) -> None:
+        """Выводит заметку с запомненным ID.
+
+        Очищает предыдущие результаты, берет заметку из репозитория по ID
+        (без копирования списка заметок), форматирует ее стратегией
+        SearchByIDStrategy и отображает результат. Если заметка не
+        найдена, показывает соответствующее сообщение об ошибке.
         """
         self.__label_note["text"] = ""
         self.__label_error["text"] = ""
-        notes = self.state.load_notes()
-        strategy = SearchByIDStrategy(int(self.__entry_id.get()))
-        if strategy.execute(notes):
-            self.__label_note["text"] += strategy.execute(notes)
-        else:
-            self.__label_error["text"] = "Заметки с таким номером не найдено"
\ No newline at end of file
+        note = self.repository.get_note(self.__note_id)
+        strategy = SearchByIDStrategy(self.__note_id)
+        result = strategy.execute([note] if note is not None else [])
+        with metrics.timer("ByIdNote.render"):
+            if result:
+                self.__label_note["text"] += result
+            else:
+                self.__label_error["text"] = "Заметки с таким номером не найдено"
+        state = tk.NORMAL if result else tk.DISABLED
+        self.__button_edit["state"] = state
+        self.__button_delete["state"] = state
+
+    def __edit_note(self) -> None:
+        """Открывает окно изменения показанной заметки."""
+        note = self.repository.get_note(self.__note_id)
+        if note is None:
+            self.__render_note()
+            return
+        window = EditNote(self.parent, self.repository, note)
+        window.focus_set()
+
+    def __delete_note(self) -> None:
+        """Удаляет показанную заметку после подтверждения.
+
+        Окно перерисуется по оповещению репозитория об удалении.
+        """
+        if not messagebox.askyesno(
+            "Удаление", f"Удалить заметку №{self.__note_id}?", parent=self
+        ):
+            return
+        try:
+            self.repository.delete_note(self.__note_id)
+        except StorageError as error:
+            messagebox.showerror("Ошибка", f"Не удалось удалить заметку: {error}", parent=self)
+
+    def __on_notes_changed(self, change: NoteChange) -> None:
+        """Перерисовывает заметку, если изменения ее затронули.
+
+        Args:
+            change: Дельта изменений заметок.
+        """
+        if self.__note_id is None:
+            return
+        if self.__note_id in change.added + change.updated + change.deleted:
+            self.__render_note()
+
+    def __on_destroy(self, event: tk.Event) -> None:
+        """Отписывает окно от репозитория при закрытии.
+
+        Args:
+            event: Событие уничтожения виджета.
+        """
+        if event.widget is self:
+            self.repository.unsubscribe(self.__on_notes_changed)
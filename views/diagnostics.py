@@ -0,0 +1,173 @@
+"""Модуль окна диагностики с метриками времени выполнения."""
+
+import tkinter as tk
+from tkinter import filedialog, messagebox
+from typing import Optional
+from core.metrics import metrics
+
+
+class Diagnostics(tk.Toplevel):
+    """Окно с задержками операций хранилища, стратегий и отрисовки.
+
+    Показывает для каждой операции, замеренной через core.metrics, число
+    вызовов, p50, p95, максимум и суммарное время, а также счетчики
+    событий. Таблица обновляется раз в REFRESH_MS миллисекунд. Сбор
+    метрик можно включить или выключить прямо в окне, сбросить собранные
+    данные и сохранить их в JSON-файл.
+
+    Attributes:
+        parent: Родительское окно Tkinter.
+        __enabled: Переменная флажка включенного сбора метрик.
+        __check_enabled: Флажок включения сбора метрик.
+        __button_reset: Кнопка сброса собранных данных.
+        __button_dump: Кнопка сохранения данных в JSON.
+        __text: Текстовое поле с таблицей метрик.
+        __after_id: Идентификатор запланированного обновления.
+    """
+
+    REFRESH_MS = 1000
+
+    def __init__(self, parent: tk.Tk) -> None:
+        """Инициализирует окно диагностики.
+
+        Args:
+            parent: Родительское окно Tkinter.
+        """
+        super().__init__(parent)
+        self.parent = parent
+        self.__after_id: Optional[str] = None
+
+        self.__enabled: tk.BooleanVar
+        self.__check_enabled: tk.Checkbutton
+        self.__button_reset: tk.Button
+        self.__button_dump: tk.Button
+        self.__text: tk.Text
+
+        self.__configure_window()
+        self.__configure_widgets()
+        self.__pack_widgets()
+        self.__add_icon()
+
+        self.bind("<Destroy>", self.__on_destroy)
+        self.__refresh()
+
+    def __configure_window(self) -> None:
+        """Настраивает заголовок, размеры и цвет фона окна."""
+        self.title("Диагностика")
+        self.geometry("820x520")
+        self.configure(bg="#f8f9fa")
+
+    def __configure_widgets(self) -> None:
+        """Создает флажок, кнопки и текстовое поле таблицы."""
+        self.__enabled = tk.BooleanVar(self, value=metrics.enabled)
+        self.__check_enabled = tk.Checkbutton(
+            self,
+            text="Сбор метрик",
+            variable=self.__enabled,
+            command=self.__toggle,
+            font=("Arial", 11),
+            bg="#f8f9fa"
+        )
+
+        button_style = {
+            "font": ("Arial", 11),
+            "bg": "#28a745",
+            "fg": "white",
+            "relief": tk.FLAT,
+            "padx": 15,
+            "pady": 5,
+            "cursor": "hand2"
+        }
+        self.__button_reset = tk.Button(
+            self, text="Сбросить", command=self.__reset, **button_style
+        )
+        self.__button_dump = tk.Button(
+            self, text="💾 Сохранить JSON", command=self.__dump, **button_style
+        )
+
+        self.__text = tk.Text(
+            self,
+            font=("Courier", 10),
+            bg="white",
+            fg="#212529",
+            relief=tk.FLAT,
+            wrap=tk.NONE
+        )
+
+    def __pack_widgets(self) -> None:
+        """Размещает виджеты в окне."""
+        self.__check_enabled.pack(anchor="w", padx=20, pady=(15, 5))
+        self.__button_reset.pack(anchor="w", padx=20, pady=2)
+        self.__button_dump.pack(anchor="w", padx=20, pady=(2, 10))
+        self.__text.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+
+    def __add_icon(self) -> None:
+        """Устанавливает иконку окна.
+
+        Raises:
+            tk.TclError: Если формат иконки не поддерживается.
+        """
+        self.iconbitmap("static/icons/app.ico")
+
+    def __refresh(self) -> None:
+        """Перерисовывает таблицу метрик и планирует следующее обновление."""
+        summary = metrics.summary()
+        lines = [f"{'операция':<36} {'вызовов':>8} {'p50, мс':>9} {'p95, мс':>9} {'max, мс':>9} {'всего, мс':>10}"]
+        for name, row in summary["operations"].items():
+            lines.append(
+                f"{name:<36} {row['count']:>8} {row['p50']:>9.2f} {row['p95']:>9.2f} "
+                f"{row['max']:>9.2f} {row['total']:>10.1f}"
+            )
+        if not summary["operations"]:
+            lines.append("Нет данных" + ("" if metrics.enabled else ": включите сбор метрик"))
+        if summary["counters"]:
+            lines.append("")
+            lines.append(f"{'счетчик':<36} {'значение':>8}")
+            for name, value in summary["counters"].items():
+                lines.append(f"{name:<36} {value:>8}")
+
+        self.__text.configure(state=tk.NORMAL)
+        self.__text.delete("1.0", tk.END)
+        self.__text.insert("1.0", "\n".join(lines))
+        self.__text.configure(state=tk.DISABLED)
+        self.__after_id = self.after(self.REFRESH_MS, self.__refresh)
+
+    def __toggle(self) -> None:
+        """Включает или выключает сбор метрик по флажку."""
+        if self.__enabled.get():
+            metrics.enable()
+        else:
+            metrics.disable()
+
+    def __reset(self) -> None:
+        """Удаляет собранные данные и обновляет таблицу."""
+        metrics.reset()
+        if self.__after_id is not None:
+            self.after_cancel(self.__after_id)
+        self.__refresh()
+
+    def __dump(self) -> None:
+        """Сохраняет сводку метрик в выбранный JSON-файл."""
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            title="Сохранить метрики",
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json")],
+            initialfile="metrics.json"
+        )
+        if not path:
+            return
+        try:
+            metrics.dump(path)
+        except OSError as error:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить метрики: {error}", parent=self)
+
+    def __on_destroy(self, event: tk.Event) -> None:
+        """Останавливает обновление таблицы при закрытии окна.
+
+        Args:
+            event: Событие уничтожения виджета.
+        """
+        if event.widget is self and self.__after_id is not None:
+            self.after_cancel(self.__after_id)
+            self.__after_id = None
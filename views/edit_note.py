@@ -0,0 +1,211 @@
+"""Модуль окна изменения и удаления заметки."""
+
+import tkinter as tk
+from state.note_repository import NoteRepository
+from tkinter import messagebox
+from core.exceptions import StorageError
+from core.note import Note
+
+
+class EditNote(tk.Toplevel):
+    """Окно для изменения или удаления существующей заметки.
+
+    Поля заполняются названием, текстом и тегами заметки; изменения сохраняются
+    через общий репозиторий заметок, который оповещает открытые окна.
+    Дата создания и ID заметки не меняются.
+
+    Attributes:
+        repository: Общий репозиторий заметок приложения.
+        note_id: ID изменяемой заметки.
+        __title_label: Метка для поля названия заметки.
+        __title_entry: Поле ввода для названия заметки.
+        __text_label: Метка для поля содержания заметки.
+        __text_input: Текстовое поле для содержания заметки.
+        __tags_label: Метка для поля тегов заметки.
+        __tags_entry: Поле ввода тегов через пробел или запятую.
+        __save_button: Кнопка для сохранения изменений.
+        __delete_button: Кнопка для удаления заметки.
+    """
+
+    def __init__(self, parent: tk.Tk, repository: NoteRepository, note: Note) -> None:
+        """Инициализирует окно изменения заметки.
+
+        Args:
+            parent: Родительское окно Tkinter.
+            repository: Общий репозиторий заметок приложения.
+            note: Изменяемая заметка.
+        """
+        super().__init__(parent)
+        self.repository = repository
+        self.note_id: int = note.id
+
+        self.__title_label: tk.Label
+        self.__title_entry: tk.Entry
+
+        self.__text_label: tk.Label
+        self.__text_input: tk.Text
+
+        self.__tags_label: tk.Label
+        self.__tags_entry: tk.Entry
+
+        self.__save_button: tk.Button
+        self.__delete_button: tk.Button
+
+        self.__configure_window()
+        self.__configure_widgets()
+        self.__pack_widgets()
+        self.__add_icon()
+
+        self.__title_entry.insert(0, note.title)
+        self.__text_input.insert("1.0", note.text)
+        self.__tags_entry.insert(0, " ".join(note.tags))
+
+    def __configure_window(self) -> None:
+        """Настраивает заголовок, размеры и цвет фона окна."""
+        self.title(f"Изменить заметку №{self.note_id}")
+        self.geometry("600x580")
+        self.resizable(True, True)
+        self.configure(bg="#f8f9fa")
+
+    def __configure_widgets(self) -> None:
+        """Создает метки, поля ввода и кнопки окна."""
+        self.__title_label = tk.Label(
+            self,
+            text="Название:",
+            font=("Arial", 12, "bold"),
+            bg="#f8f9fa",
+            fg="#212529"
+        )
+
+        self.__title_entry = tk.Entry(
+            self,
+            font=("Arial", 11),
+            relief=tk.FLAT,
+            bg="white",
+            highlightbackground="#ced4da",
+            highlightcolor="#28a745",
+            highlightthickness=1
+        )
+
+        self.__text_label = tk.Label(
+            self,
+            text="Содержание:",
+            font=("Arial", 12, "bold"),
+            bg="#f8f9fa",
+            fg="#212529"
+        )
+
+        self.__text_input = tk.Text(
+            self,
+            font=("Arial", 11),
+            relief=tk.FLAT,
+            bg="white",
+            highlightbackground="#ced4da",
+            highlightcolor="#28a745",
+            highlightthickness=1,
+            height=12
+        )
+
+        self.__tags_label = tk.Label(
+            self,
+            text="Теги (через пробел или запятую):",
+            font=("Arial", 12, "bold"),
+            bg="#f8f9fa",
+            fg="#212529"
+        )
+
+        self.__tags_entry = tk.Entry(
+            self,
+            font=("Arial", 11),
+            relief=tk.FLAT,
+            bg="white",
+            highlightbackground="#ced4da",
+            highlightcolor="#28a745",
+            highlightthickness=1
+        )
+
+        self.__save_button = tk.Button(
+            self,
+            text="💾 Сохранить изменения",
+            command=self.__save_note,
+            font=("Arial", 11, "bold"),
+            bg="#28a745",
+            fg="white",
+            relief=tk.FLAT,
+            padx=20,
+            pady=8,
+            cursor="hand2"
+        )
+
+        self.__delete_button = tk.Button(
+            self,
+            text="🗑️ Удалить заметку",
+            command=self.__delete_note,
+            font=("Arial", 11),
+            bg="#dc3545",
+            fg="white",
+            relief=tk.FLAT,
+            padx=20,
+            pady=8,
+            cursor="hand2"
+        )
+
+    def __pack_widgets(self) -> None:
+        """Размещает виджеты в окне."""
+        padding = {'padx': 30, 'pady': (10, 5)}
+
+        self.__title_label.pack(anchor="w", **padding)
+        self.__title_entry.pack(fill=tk.X, **padding)
+
+        self.__text_label.pack(anchor="w", **padding)
+        self.__text_input.pack(fill=tk.BOTH, expand=True, **padding)
+
+        self.__tags_label.pack(anchor="w", **padding)
+        self.__tags_entry.pack(fill=tk.X, **padding)
+
+        self.__save_button.pack(pady=(20, 10))
+        self.__delete_button.pack(pady=(0, 20))
+
+    def __add_icon(self) -> None:
+        """Устанавливает иконку окна.
+
+        Raises:
+            tk.TclError: Если формат иконки не поддерживается.
+        """
+        self.iconbitmap("static/icons/app.ico")
+
+    def __save_note(self) -> None:
+        """Сохраняет новое название, текст и теги заметки.
+
+        При ошибке хранилища (в том числе если заметку уже удалили)
+        показывает сообщение и оставляет окно открытым.
+        """
+        title = self.__title_entry.get().strip()
+        text = self.__text_input.get("1.0", tk.END).strip()
+        tags = self.__tags_entry.get().replace(",", " ").split()
+
+        if not title or not text:
+            messagebox.showerror("Ошибка", "Заполните все поля!", parent=self)
+            return
+
+        try:
+            self.repository.update_note(self.note_id, title, text, tags)
+        except StorageError as error:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить заметку: {error}", parent=self)
+            return
+
+        messagebox.showinfo("Успех", "Заметка изменена!", parent=self)
+        self.destroy()
+
+    def __delete_note(self) -> None:
+        """Удаляет заметку после подтверждения и закрывает окно."""
+        if not messagebox.askyesno(
+            "Удаление", f"Удалить заметку №{self.note_id}?", parent=self
+        ):
+            return
+        try:
+            self.repository.delete_note(self.note_id)
+        except StorageError as error:
+            messagebox.showerror("Ошибка", f"Не удалось удалить заметку: {error}", parent=self)
+            return
+        self.destroy()
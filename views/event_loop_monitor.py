@@ -0,0 +1,387 @@
+"""Модуль наблюдения за задержками цикла событий Tkinter."""
+
+import sys
+import time
+import tkinter as tk
+from collections import deque
+from functools import partial, wraps
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from core.metrics import metrics
+
+# Misc.after регистрирует не саму функцию, а замыкание callit вокруг нее.
+_AFTER_CALLBACK = "Misc.after.<locals>.callit"
+
+
+def _stderr(message: str) -> None:
+    """Печатает сообщение монитора в stderr.
+
+    Args:
+        message: Текст сообщения.
+    """
+    print(message, file=sys.stderr, flush=True)
+
+
+class _CallbackStats:
+    """Накопленная статистика одного обработчика.
+
+    Attributes:
+        count: Количество вызовов.
+        total: Суммарное время вызовов в секундах.
+        max: Наибольшее время вызова в секундах.
+    """
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        """Инициализирует пустую статистику."""
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+
+class EventLoopMonitor:
+    """Замеряет, насколько обработчики Tk блокируют mainloop.
+
+    Задержка цикла событий измеряется тиками: монитор планирует себя
+    через after() каждые interval_ms миллисекунд и считает, насколько
+    позже срока тик выполнился. Обработчики (command кнопок, bind,
+    after и after_idle, трассировки переменных) оборачиваются замером
+    времени при регистрации в Tcl: монитор подменяет Misc._register,
+    поэтому замеряются только обработчики, зарегистрированные после
+    install. Обработчик называется по __qualname__ функции, например
+    "SearchNote.__search_by_keyword"; у after — по вызываемой функции.
+
+    Тики и обработчики дольше threshold_ms миллисекунд записываются в
+    журнал (по умолчанию stderr); при включенном core.metrics задержки
+    тиков попадают в окно диагностики как "Tk.lag".
+
+    Без дисплея монитор работает с интерпретатором tkinter.Tcl(): pump
+    прокручивает цикл событий заданное время, а assert_budget проверяет
+    наибольшую задержку и наибольшее время обработчика.
+
+    Attributes:
+        interval_ms: Период тиков в миллисекундах.
+        threshold_ms: Порог медленного тика или обработчика в миллисекундах.
+        capacity: Количество последних задержек и медленных обработчиков,
+                  хранимых для сводки.
+        log: Функция записи сообщений о медленных тиках и обработчиках.
+        enabled: Флаг того, что обертки замеряют обработчики.
+        __root: Корневой объект Tk или Tcl, в котором идут тики.
+        __after_id: Идентификатор запланированного тика.
+        __expected: Момент (time.perf_counter()), когда ожидается тик.
+        __lags: Последние задержки тиков в секундах.
+        __max_lag: Наибольшая задержка тика в секундах.
+        __ticks: Количество выполненных тиков.
+        __callbacks: Статистика по имени обработчика.
+        __slow: Последние медленные обработчики: (имя, секунды).
+        __culprit: Самый долгий обработчик с предыдущего тика: (имя, секунды).
+        __originals: Исходные Misc._register и Misc.register до install.
+        __pumping: Флаг того, что pump еще прокручивает цикл событий.
+    """
+
+    def __init__(
+        self,
+        interval_ms: int = 100,
+        threshold_ms: float = 100.0,
+        capacity: int = 1000,
+        log: Callable[[str], None] = _stderr
+    ) -> None:
+        """Инициализирует выключенный монитор.
+
+        Args:
+            interval_ms: Период тиков в миллисекундах.
+            threshold_ms: Порог медленного тика или обработчика в миллисекундах.
+            capacity: Количество последних задержек и медленных обработчиков.
+            log: Функция записи сообщений. По умолчанию печать в stderr.
+        """
+        self.interval_ms: int = interval_ms
+        self.threshold_ms: float = threshold_ms
+        self.capacity: int = capacity
+        self.log: Callable[[str], None] = log
+        self.enabled: bool = False
+        self.__root: Optional[tk.Misc] = None
+        self.__after_id: Optional[str] = None
+        self.__expected: float = 0.0
+        self.__lags: Deque[float] = deque(maxlen=capacity)
+        self.__max_lag: float = 0.0
+        self.__ticks: int = 0
+        self.__callbacks: Dict[str, _CallbackStats] = {}
+        self.__slow: Deque[Tuple[str, float]] = deque(maxlen=capacity)
+        self.__culprit: Optional[Tuple[str, float]] = None
+        self.__originals: Optional[Tuple[Callable[..., str], Callable[..., str]]] = None
+        self.__pumping: bool = False
+
+    def install(self) -> None:
+        """Начинает оборачивать регистрируемые обработчики Tk замером времени."""
+        self.enabled = True
+        if self.__originals is not None:
+            return
+        original_register, original_public = tk.Misc._register, tk.Misc.register
+        self.__originals = (original_register, original_public)
+        monitor = self
+
+        def _register(widget: tk.Misc, func: Callable[..., Any], *args: Any, **kwargs: Any) -> str:
+            return original_register(widget, monitor.wrap(func), *args, **kwargs)
+
+        tk.Misc._register = _register  # type: ignore[method-assign]
+        tk.Misc.register = _register  # type: ignore[method-assign]
+
+    def uninstall(self) -> None:
+        """Возвращает исходную регистрацию обработчиков.
+
+        Уже обернутые обработчики остаются обернутыми, но перестают
+        замеряться.
+        """
+        self.enabled = False
+        if self.__originals is not None:
+            tk.Misc._register, tk.Misc.register = self.__originals  # type: ignore[method-assign]
+            self.__originals = None
+
+    def start(self, root: tk.Misc) -> None:
+        """Включает замер обработчиков и начинает тики в цикле событий root.
+
+        Args:
+            root: Корневое окно Tk или интерпретатор tkinter.Tcl().
+        """
+        self.install()
+        self.stop_ticks()
+        self.__root = root
+        self.__schedule()
+
+    def stop(self) -> None:
+        """Останавливает тики и замер обработчиков, сохраняя статистику."""
+        self.stop_ticks()
+        self.uninstall()
+
+    def stop_ticks(self) -> None:
+        """Отменяет запланированный тик."""
+        if self.__root is not None and self.__after_id is not None:
+            try:
+                self.__root.after_cancel(self.__after_id)
+            except tk.TclError:
+                pass
+        self.__after_id = None
+
+    def reset(self) -> None:
+        """Удаляет собранную статистику."""
+        self.__lags.clear()
+        self.__max_lag = 0.0
+        self.__ticks = 0
+        self.__callbacks.clear()
+        self.__slow.clear()
+        self.__culprit = None
+
+    def wrap(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Оборачивает обработчик замером времени.
+
+        Args:
+            func: Обработчик Tk.
+
+        Returns:
+            Обертка с тем же именем или сам func для тиков монитора.
+        """
+        target = self.__after_target(func)
+        if getattr(target, "__self__", None) is self:
+            return func
+        name = self.__callback_name(target)
+
+        @wraps(func)
+        def callback(*args: Any) -> Any:
+            if not self.enabled:
+                return func(*args)
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                self.__record(name, time.perf_counter() - started)
+        return callback
+
+    def pump(self, seconds: float) -> None:
+        """Прокручивает цикл событий root заданное время (режим без дисплея).
+
+        Нужен, когда mainloop не запущен: например, в проверках с
+        интерпретатором tkinter.Tcl(). Монитор должен быть запущен (start).
+
+        Args:
+            seconds: Длительность в секундах.
+
+        Raises:
+            RuntimeError: Если монитор не запущен.
+        """
+        if self.__root is None:
+            raise RuntimeError("Монитор цикла событий не запущен")
+        self.__pumping = True
+        self.__root.after(max(int(seconds * 1000), 1), self.__stop_pump)
+        while self.__pumping:
+            self.__root.tk.dooneevent(0)
+
+    def summary(self) -> Dict[str, Any]:
+        """Возвращает сводку задержек и обработчиков.
+
+        Returns:
+            Словарь {"ticks", "lag": {"p50", "p95", "max"}, "callbacks":
+            {имя: {"count", "max", "total"}}, "slow": [[имя, время]]};
+            время в миллисекундах.
+        """
+        lags = sorted(self.__lags)
+        return {
+            "ticks": self.__ticks,
+            "lag": {
+                "p50": self.__percentile(lags, 0.50) * 1000,
+                "p95": self.__percentile(lags, 0.95) * 1000,
+                "max": self.__max_lag * 1000,
+            },
+            "callbacks": {
+                name: {
+                    "count": stats.count,
+                    "max": stats.max * 1000,
+                    "total": stats.total * 1000,
+                }
+                for name, stats in sorted(
+                    self.__callbacks.items(), key=lambda item: item[1].max, reverse=True
+                )
+            },
+            "slow": [[name, seconds * 1000] for name, seconds in self.__slow],
+        }
+
+    def check(
+        self,
+        max_lag_ms: Optional[float] = None,
+        max_callback_ms: Optional[float] = None
+    ) -> List[str]:
+        """Сверяет собранную статистику с бюджетами.
+
+        Args:
+            max_lag_ms: Допустимая задержка тика или None.
+            max_callback_ms: Допустимое время одного обработчика или None.
+
+        Returns:
+            Описания нарушений; пустой список, если бюджеты соблюдены.
+        """
+        violations = []
+        if max_lag_ms is not None and self.__max_lag * 1000 > max_lag_ms:
+            violations.append(
+                f"задержка цикла событий {self.__max_lag * 1000:.1f} мс > {max_lag_ms:.1f} мс"
+            )
+        if max_callback_ms is not None:
+            for name, stats in self.__callbacks.items():
+                if stats.max * 1000 > max_callback_ms:
+                    violations.append(
+                        f"обработчик {name}: {stats.max * 1000:.1f} мс > {max_callback_ms:.1f} мс"
+                    )
+        return violations
+
+    def assert_budget(
+        self,
+        max_lag_ms: Optional[float] = None,
+        max_callback_ms: Optional[float] = None
+    ) -> None:
+        """Проверяет бюджеты задержки (см. check) для автоматических проверок.
+
+        Args:
+            max_lag_ms: Допустимая задержка тика или None.
+            max_callback_ms: Допустимое время одного обработчика или None.
+
+        Raises:
+            AssertionError: Если хотя бы один бюджет превышен.
+        """
+        violations = self.check(max_lag_ms, max_callback_ms)
+        if violations:
+            raise AssertionError("; ".join(violations))
+
+    def __schedule(self) -> None:
+        """Планирует следующий тик."""
+        assert self.__root is not None
+        self.__expected = time.perf_counter() + self.interval_ms / 1000
+        self.__after_id = self.__root.after(self.interval_ms, self.__tick)
+
+    def __tick(self) -> None:
+        """Записывает задержку тика и планирует следующий."""
+        lag = max(time.perf_counter() - self.__expected, 0.0)
+        self.__ticks += 1
+        self.__lags.append(lag)
+        self.__max_lag = max(self.__max_lag, lag)
+        if metrics.enabled:
+            metrics.record("Tk.lag", lag)
+        if lag * 1000 >= self.threshold_ms:
+            message = f"Цикл событий Tk задержан на {lag * 1000:.0f} мс"
+            if self.__culprit is not None:
+                name, seconds = self.__culprit
+                message += f" (дольше всех: {name}, {seconds * 1000:.0f} мс)"
+            self.log(message)
+        self.__culprit = None
+        self.__schedule()
+
+    def __stop_pump(self) -> None:
+        """Завершает прокрутку цикла событий в pump."""
+        self.__pumping = False
+
+    def __record(self, name: str, seconds: float) -> None:
+        """Добавляет вызов обработчика в статистику.
+
+        Args:
+            name: Имя обработчика.
+            seconds: Время вызова в секундах.
+        """
+        stats = self.__callbacks.get(name)
+        if stats is None:
+            stats = self.__callbacks[name] = _CallbackStats()
+        stats.count += 1
+        stats.total += seconds
+        stats.max = max(stats.max, seconds)
+        if self.__culprit is None or seconds > self.__culprit[1]:
+            self.__culprit = (name, seconds)
+        if seconds * 1000 >= self.threshold_ms:
+            self.__slow.append((name, seconds))
+            metrics.count("Tk.slow_callbacks")
+            self.log(f"Медленный обработчик {name}: {seconds * 1000:.0f} мс")
+
+    @staticmethod
+    def __after_target(func: Callable[..., Any]) -> Callable[..., Any]:
+        """Возвращает функцию, запланированную через after, вместо ее обертки.
+
+        Args:
+            func: Регистрируемый обработчик.
+
+        Returns:
+            Функция из замыкания callit или сам func.
+        """
+        if getattr(func, "__qualname__", None) == _AFTER_CALLBACK:
+            cells = dict(zip(func.__code__.co_freevars, func.__closure__ or ()))
+            if "func" in cells:
+                return cells["func"].cell_contents
+        return func
+
+    @staticmethod
+    def __callback_name(func: Callable[..., Any]) -> str:
+        """Возвращает имя обработчика для журнала и сводки.
+
+        Args:
+            func: Обработчик Tk (для after — запланированная функция).
+
+        Returns:
+            __qualname__ функции или имя класса вызываемого объекта.
+        """
+        while isinstance(func, partial):
+            func = func.func
+        name = getattr(func, "__qualname__", None)
+        return name if isinstance(name, str) else type(func).__qualname__
+
+    @staticmethod
+    def __percentile(values: List[float], fraction: float) -> float:
+        """Возвращает перцентиль отсортированных значений (ближайший ранг).
+
+        Args:
+            values: Отсортированные значения.
+            fraction: Доля от 0 до 1.
+
+        Returns:
+            Значение перцентиля или 0 для пустого списка.
+        """
+        if not values:
+            return 0.0
+        index = max(int(len(values) * fraction + 0.5) - 1, 0)
+        return values[min(index, len(values) - 1)]
+
+
+event_loop_monitor = EventLoopMonitor()
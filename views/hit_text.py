@@ -0,0 +1,179 @@
+"""Модуль текстового поля для вывода результатов поиска с подсветкой."""
+
+import tkinter as tk
+from typing import Any, List, Tuple
+from core.note_formatter import note_formatter
+from core.search_hit import SearchHit
+
+
+class HitText(tk.Text):
+    """Текстовое поле только для чтения, подсвечивающее совпадения поиска.
+
+    Выводит блоки, построенные NoteFormatter (и взятые из его кэша), и
+    помечает тегом "hit" позиции совпадений, уже вычисленные стратегией:
+    по положениям полей в блоке (NoteFormatter.render_fields) позиции
+    поля переводятся в позиции блока. Для текстов длиннее
+    snippet_threshold, а в режиме фрагментов — для всех текстов, вместо
+    полного текста показываются только окрестности совпадений, поэтому
+    длинные заметки не вставляются в виджет целиком.
+
+    Attributes:
+        snippet_mode: Флаг режима фрагментов для всех заметок.
+        snippet_radius: Количество символов до и после совпадения во фрагменте.
+        snippet_threshold: Длина текста, начиная с которой фрагменты
+                           показываются и без snippet_mode.
+    """
+
+    ELLIPSIS = "…"
+
+    def __init__(
+        self,
+        parent: tk.Misc,
+        snippet_radius: int = 80,
+        snippet_threshold: int = 2000,
+        **kwargs: Any
+    ) -> None:
+        """Инициализирует текстовое поле результатов.
+
+        Args:
+            parent: Родительский виджет.
+            snippet_radius: Количество символов до и после совпадения во
+                            фрагменте. По умолчанию 80.
+            snippet_threshold: Длина текста, начиная с которой всегда
+                               показываются фрагменты. По умолчанию 2000.
+            **kwargs: Дополнительные параметры tk.Text.
+        """
+        super().__init__(parent, wrap=tk.WORD, state=tk.DISABLED, **kwargs)
+        self.snippet_mode: bool = False
+        self.snippet_radius: int = snippet_radius
+        self.snippet_threshold: int = snippet_threshold
+        self.tag_configure("hit", background="#ffe066")
+
+    def clear(self) -> None:
+        """Удаляет весь выведенный текст."""
+        self.configure(state=tk.NORMAL)
+        self.delete("1.0", tk.END)
+        self.configure(state=tk.DISABLED)
+
+    def append_hits(self, hits: List[SearchHit], result_format: str) -> None:
+        """Дописывает порцию результатов поиска одним вызовом insert.
+
+        Args:
+            hits: Найденные заметки с позициями совпадений.
+            result_format: Формат блока NoteFormatter (FULL или HIT).
+        """
+        args: List[Any] = []
+        for hit in hits:
+            for chunk, tags in self.__segments(hit, result_format):
+                args.append(chunk)
+                args.append(tags)
+        if not args:
+            return
+        self.configure(state=tk.NORMAL)
+        self.insert(tk.END, *args)
+        self.configure(state=tk.DISABLED)
+
+    def __segments(self, hit: SearchHit, result_format: str) -> List[Tuple[str, Tuple[str, ...]]]:
+        """Разбивает блок заметки на фрагменты с тегами.
+
+        Args:
+            hit: Найденная заметка с позициями совпадений.
+            result_format: Формат блока NoteFormatter (FULL или HIT).
+
+        Returns:
+            Список пар (текст, теги) для вставки в виджет.
+        """
+        block, fields = note_formatter.render_fields(hit.note, result_format)
+        segments: List[Tuple[str, Tuple[str, ...]]] = []
+        position = 0
+        for name, start, end in fields:
+            if start > position:
+                segments.append((block[position:start], ()))
+            spans = hit.spans if name == hit.field else []
+            if name == SearchHit.TEXT:
+                segments.extend(self.__text_segments(block, start, end, spans))
+            else:
+                segments.extend(self.__highlight(block[start:end], spans))
+            position = end
+        segments.append((block[position:] + "\n", ()))
+        return segments
+
+    def __text_segments(
+        self,
+        block: str,
+        offset: int,
+        stop: int,
+        spans: List[Tuple[int, int]]
+    ) -> List[Tuple[str, Tuple[str, ...]]]:
+        """Возвращает фрагменты текста заметки с учетом режима фрагментов.
+
+        Текст не копируется из блока целиком, если показываются только
+        фрагменты.
+
+        Args:
+            block: Блок заметки.
+            offset: Начало текста в блоке.
+            stop: Конец текста в блоке.
+            spans: Позиции совпадений в тексте.
+
+        Returns:
+            Список пар (текст, теги).
+        """
+        length = stop - offset
+        if not self.snippet_mode and length < self.snippet_threshold:
+            return self.__highlight(block[offset:stop], spans)
+
+        radius = self.snippet_radius
+        if not spans:
+            if length <= 2 * radius:
+                return [(block[offset:stop], ())]
+            return [(block[offset:offset + 2 * radius] + self.ELLIPSIS, ())]
+
+        # Объединяем пересекающиеся окна вокруг совпадений.
+        windows: List[List[int]] = []
+        for start, end in spans:
+            low, high = max(0, start - radius), min(length, end + radius)
+            if windows and low <= windows[-1][1]:
+                windows[-1][1] = max(windows[-1][1], high)
+            else:
+                windows.append([low, high])
+
+        segments: List[Tuple[str, Tuple[str, ...]]] = []
+        position = 0
+        for low, high in windows:
+            if low > 0:
+                segments.append((self.ELLIPSIS, ()))
+            local: List[Tuple[int, int]] = []
+            while position < len(spans) and spans[position][0] < high:
+                start, end = spans[position]
+                local.append((start - low, end - low))
+                position += 1
+            segments.extend(self.__highlight(block[offset + low:offset + high], local))
+        if windows[-1][1] < length:
+            segments.append((self.ELLIPSIS, ()))
+        return segments
+
+    @staticmethod
+    def __highlight(
+        value: str,
+        spans: List[Tuple[int, int]]
+    ) -> List[Tuple[str, Tuple[str, ...]]]:
+        """Разбивает строку на обычные и подсвеченные фрагменты.
+
+        Args:
+            value: Исходная строка.
+            spans: Отсортированные позиции совпадений в строке.
+
+        Returns:
+            Список пар (текст, теги).
+        """
+        segments: List[Tuple[str, Tuple[str, ...]]] = []
+        position = 0
+        for start, end in spans:
+            if start > position:
+                segments.append((value[position:start], ()))
+            segments.append((value[start:end], ("hit",)))
+            position = end
+        if position < len(value):
+            segments.append((value[position:], ()))
+        return segments
@@ -0,0 +1,152 @@
+"""Модуль постепенного вывода результатов стратегий в окна приложения."""
+
+import tkinter as tk
+from itertools import chain, islice
+from typing import Any, Callable, Iterator, List, Optional
+from core.memory_profiler import memory_profiler
+from core.metrics import metrics
+
+
+class ResultStream:
+    """Постепенно выводит результаты стратегии в текстовое поле порциями.
+
+    Забирает из итератора результатов по chunk_size блоков за один тик
+    цикла событий Tkinter (через after()), дописывает их в конец
+    текстового поля одним вызовом insert и обновляет счетчик найденного.
+    Уже выведенный текст не копируется и не перерисовывается заново,
+    поэтому цена тика зависит только от размера порции. Первый экран
+    результатов появляется сразу, а остальные догружаются, не блокируя
+    интерфейс. Итератор результатов обычно ленивый (например, поверх
+    NoteRepository.iter_notes), и заметки перебираются по мере вывода, а
+    не загружаются заранее. Вместо строк результаты можно выводить в
+    произвольном виде, передав функции writer и clearer.
+
+    Вывод каждой порции в виджет замеряется через core.metrics как
+    "<Окно>.render"; поиск результатов замеряет сама стратегия. При
+    включенном профилировщике памяти весь перебор результатов замеряется
+    как "<Окно>.stream" с разбивкой пика по строкам (MemoryProfiler.stream).
+
+    Attributes:
+        chunk_size: Количество блоков, выводимых за один тик.
+        count: Количество уже выведенных блоков.
+        __target: Текстовое поле, в которое дописываются результаты.
+        __counter: Метка со счетчиком найденных результатов.
+        __on_finish: Функция, вызываемая по окончании вывода с итоговым числом.
+        __writer: Функция вывода порции результатов или None для строк.
+        __clearer: Функция очистки вывода или None для строк.
+        __results: Текущий итератор результатов.
+        __after_id: Идентификатор запланированного тика.
+        __metric: Имя замера вывода порции.
+        __stream_name: Имя операции профилировщика памяти для перебора.
+    """
+
+    def __init__(
+        self,
+        target: tk.Text,
+        counter: tk.Label,
+        on_finish: Optional[Callable[[int], None]] = None,
+        chunk_size: int = 50,
+        writer: Optional[Callable[[List[Any]], None]] = None,
+        clearer: Optional[Callable[[], None]] = None
+    ) -> None:
+        """Инициализирует потоковый вывод результатов.
+
+        Args:
+            target: Текстовое поле только для чтения (или другой виджет
+                    при заданном writer), в которое дописываются результаты.
+            counter: Метка для отображения счетчика "Найдено".
+            on_finish: Функция, вызываемая по окончании вывода с итоговым
+                       количеством результатов.
+            chunk_size: Количество блоков, выводимых за один тик.
+            writer: Функция, дописывающая порцию результатов в target.
+                    По умолчанию порции строк дописываются в конец target.
+            clearer: Функция, очищающая target перед новым выводом.
+        """
+        self.chunk_size: int = chunk_size
+        self.count: int = 0
+        self.__target = target
+        self.__counter = counter
+        self.__on_finish = on_finish
+        self.__writer = writer
+        self.__clearer = clearer
+        self.__results: Optional[Iterator[Any]] = None
+        self.__after_id: Optional[str] = None
+        window = type(target.winfo_toplevel()).__name__
+        self.__metric: str = f"{window}.render"
+        self.__stream_name: str = f"{window}.stream"
+
+    def start(self, results: Iterator[Any]) -> None:
+        """Начинает вывод новой последовательности результатов.
+
+        Предыдущий незавершенный вывод отменяется, текстовое поле и
+        счетчик очищаются.
+
+        Args:
+            results: Итератор отформатированных блоков (например,
+                     результат BaseStrategy.iter_results) или элементов,
+                     понятных функции writer.
+        """
+        self.cancel()
+        self.count = 0
+        if memory_profiler.enabled:
+            results = memory_profiler.stream(self.__stream_name, results)
+        self.__results = results
+        if self.__clearer is not None:
+            self.__clearer()
+        else:
+            self.__target.configure(state=tk.NORMAL)
+            self.__target.delete("1.0", tk.END)
+            self.__target.configure(state=tk.DISABLED)
+        self.__counter["text"] = ""
+        self.__tick()
+
+    def extend(self, results: Iterator[Any]) -> None:
+        """Дописывает новые результаты к уже выведенным.
+
+        Если вывод еще идет, новые результаты ставятся в очередь после
+        текущих; иначе вывод возобновляется с сохранением счетчика.
+
+        Args:
+            results: Итератор дополнительных отформатированных блоков.
+        """
+        if self.__results is not None:
+            self.__results = chain(self.__results, results)
+            return
+        self.__results = results
+        self.__tick()
+
+    def cancel(self) -> None:
+        """Останавливает текущий вывод, если он выполняется."""
+        if self.__after_id is not None:
+            self.__target.after_cancel(self.__after_id)
+            self.__after_id = None
+        self.__results = None
+
+    def __tick(self) -> None:
+        """Выводит очередную порцию результатов и планирует следующий тик."""
+        self.__after_id = None
+        if self.__results is None or not self.__target.winfo_exists():
+            return
+
+        chunk: List[Any] = list(islice(self.__results, self.chunk_size))
+        with metrics.timer(self.__metric):
+            if chunk and self.__writer is not None:
+                self.__writer(chunk)
+                self.count += len(chunk)
+            elif chunk:
+                text = "\n".join(chunk)
+                self.__target.configure(state=tk.NORMAL)
+                self.__target.insert(tk.END, "\n" + text if self.count else text)
+                self.__target.configure(state=tk.DISABLED)
+                self.count += len(chunk)
+        metrics.count(f"{self.__metric}.blocks", len(chunk))
+
+        if len(chunk) < self.chunk_size:
+            self.__results = None
+            self.__counter["text"] = f"Найдено: {self.count}"
+            if self.__on_finish is not None:
+                self.__on_finish(self.count)
+            return
+
+        self.__counter["text"] = f"Найдено: {self.count}…"
+        self.__after_id = self.__target.after(1, self.__tick)
@@ -1,33 +1,46 @@
 """Модуль окна расширенного поиска по заметкам."""
 
 import tkinter as tk
+from typing import Iterator, List, Optional
 from strategies.search_by_date_strategy import SearchByDateStrategy
 from strategies.search_by_title_strategy import SearchTitleStrategy
 from strategies.search_by_keyword_strategy import SearchKeywordStrategy
-from state.json_state import JsonState
+from strategies.search_by_tags_strategy import SearchByTagsStrategy
+from state.note_repository import NoteChange, NoteRepository
+from strategies.base_strategy import BaseStrategy
+from views.result_stream import ResultStream
+from views.hit_text import HitText
+from core.search_hit import SearchHit
 
 
 class SearchNote(tk.Toplevel):
     """Окно для расширенного поиска по заметкам.
 
     Предоставляет пользовательский интерфейс для выполнения поиска
-    по различным критериям: дата, название или ключевые слова,
-    с возможностью прокрутки длинных результатов через Canvas и Scrollbar.
+    по различным критериям: дата, название, ключевые слова или выражение
+    над тегами (например, "работа & !архив").
+    Результаты выводятся в текстовое поле с подсветкой совпадений;
+    в режиме фрагментов показываются только окрестности совпадений.
 
     Attributes:
-        state: Экземпляр JsonState для загрузки данных заметок.
+        repository: Общий репозиторий заметок приложения.
         __entry_word_search: Поле ввода для поискового запроса.
         __button_by_date: Кнопка для поиска по дате.
         __button_by_keyword: Кнопка для поиска по ключевым словам.
         __button_by_title: Кнопка для поиска по названию.
-        __label_result: Метка для отображения результатов поиска.
+        __button_by_tags: Кнопка для поиска по выражению над тегами.
+        __text_result: Текстовое поле для результатов поиска с подсветкой.
+        __snippet_var: Переменная флажка режима фрагментов.
+        __check_snippets: Флажок режима фрагментов.
         __label_error: Метка для отображения сообщений об ошибках.
-        __canvas: Canvas для создания прокручиваемой области.
-        __scrollbar: Вертикальный скроллбар для прокрутки содержимого.
-        __scrollable_frame: Frame внутри Canvas для размещения меток.
+        __label_counter: Метка со счетчиком найденных заметок.
+        __stream: Потоковый вывод результатов поиска.
+        __empty_message: Сообщение, показываемое при пустом результате.
+        __strategy: Стратегия последнего выполненного поиска.
+        __scrollbar: Вертикальный скроллбар для прокрутки результатов.
     """
 
-    def __init__(self, parent: tk.Tk) -> None:
+    def __init__(self, parent: tk.Tk, repository: NoteRepository) -> None:
         """Инициализирует окно расширенного поиска.
 
         Создает дочернее окно Toplevel, настраивает его параметры,
@@ -35,27 +48,36 @@ class SearchNote(tk.Toplevel):
 
         Args:
             parent: Родительское окно Tkinter.
+            repository: Общий репозиторий заметок приложения.
         """
         super().__init__(parent)
         
-        self.state = JsonState()
+        self.repository = repository
+        self.__strategy: Optional[BaseStrategy] = None
 
         self.__configure_window()
         self.__configure_widgets()
         self.__pack_widgets()
         self.__add_icon()
+
+        self.repository.subscribe(self.__on_notes_changed)
+        self.bind("<Destroy>", self.__on_destroy)
         
         self.__entry_word_search: tk.Entry
         
         self.__button_by_date: tk.Button
         self.__button_by_keyword: tk.Button
         self.__button_by_title: tk.Button
+        self.__button_by_tags: tk.Button
         
-        self.__label_result: tk.Label
+        self.__text_result: HitText
+        self.__snippet_var: tk.BooleanVar
+        self.__check_snippets: tk.Checkbutton
         self.__label_error: tk.Label
-        self.__canvas: tk.Canvas
+        self.__label_counter: tk.Label
+        self.__stream: ResultStream
+        self.__empty_message: str
         self.__scrollbar: tk.Scrollbar
-        self.__scrollable_frame: tk.Frame
 
     def __configure_window(self) -> None:
         """Настраивает параметры окна расширенного поиска.
@@ -63,7 +85,7 @@ class SearchNote(tk.Toplevel):
         Устанавливает заголовок, размеры и цвет фона окна.
         """
         self.title("Поиск по заметкам")
-        self.geometry("700x600")
+        self.geometry("700x650")
         self.configure(bg="#f8f9fa")
     
     def __configure_widgets(self) -> None:
@@ -114,42 +136,69 @@ class SearchNote(tk.Toplevel):
             command=self.__search_by_title,
             **button_style
         )
+        self.__button_by_tags = tk.Button(
+            self,
+            text="🏷️ Поиск по тегам",
+            command=self.__search_by_tags,
+            **button_style
+        )
         
-        # Создаём Canvas для прокрутки
-        self.__canvas = tk.Canvas(self, bg="#f8f9fa", highlightthickness=0)
-        self.__scrollbar = tk.Scrollbar(self, orient="vertical", command=self.__canvas.yview)
-        self.__canvas.configure(yscrollcommand=self.__scrollbar.set)
-        
-        # Frame внутри Canvas для размещения метки
-        self.__scrollable_frame = tk.Frame(self.__canvas, bg="#f8f9fa")
-        self.__canvas.create_window((0, 0), window=self.__scrollable_frame, anchor="nw")
+        # Режим фрагментов: только окрестности совпадений (длинные тексты
+        # показываются фрагментами всегда, см. HitText.snippet_threshold)
+        self.__snippet_var = tk.BooleanVar(value=False)
+        self.__check_snippets = tk.Checkbutton(
+            self,
+            text="Показывать только фрагменты с совпадениями",
+            variable=self.__snippet_var,
+            font=("Arial", 10),
+            bg="#f8f9fa"
+        )
         
-        # Метка результата теперь внутри scrollable_frame
-        self.__label_result = tk.Label(
-            self.__scrollable_frame,
-            text="", 
+        # Текстовое поле результатов с подсветкой и собственной прокруткой
+        self.__text_result = HitText(
+            self,
             font=("Arial", 11),
             bg="#f8f9fa",
             fg="#212529",
-            justify=tk.LEFT,
-            wraplength=600
+            relief=tk.FLAT,
+            highlightthickness=0
         )
+        self.__scrollbar = tk.Scrollbar(self, orient="vertical", command=self.__text_result.yview)
+        self.__text_result.configure(yscrollcommand=self.__scrollbar.set)
         
-        # Ошибки (остаются вне прокрутки)
+        # Ошибки
         self.__label_error = tk.Label(
-            self.__scrollable_frame, 
+            self, 
             text="", 
             foreground="#dc3545",
             font=("Arial", 11, "bold"),
             bg="#f8f9fa"
         )
+
+        # Счетчик найденного (обновляется по мере вывода)
+        self.__label_counter = tk.Label(
+            self,
+            text="",
+            font=("Arial", 10),
+            bg="#f8f9fa",
+            fg="#6c757d"
+        )
+
+        self.__empty_message = ""
+        self.__stream = ResultStream(
+            self.__text_result,
+            self.__label_counter,
+            on_finish=self.__on_stream_finish,
+            writer=self.__write_hits,
+            clearer=self.__text_result.clear
+        )
     
     def __pack_widgets(self) -> None:
         """Размещает виджеты в окне.
 
-        Упаковывает поле ввода, кнопки поиска, Canvas с Scrollbar и метки
-        с заданными отступами и параметрами размещения для обеспечения
-        корректного отображения и функциональности прокрутки.
+        Упаковывает поле ввода, кнопки поиска, флажок режима фрагментов,
+        текстовое поле результатов со Scrollbar и метки с заданными
+        отступами и параметрами размещения.
         """
         # Отступы для лучшего восприятия
         self.__entry_word_search.pack(pady=(30, 20), padx=30)
@@ -160,19 +209,15 @@ class SearchNote(tk.Toplevel):
         self.__button_by_date.pack(pady=5, padx=20, fill=tk.X)
         self.__button_by_keyword.pack(pady=5, padx=20, fill=tk.X)
         self.__button_by_title.pack(pady=5, padx=20, fill=tk.X)
+        self.__button_by_tags.pack(pady=5, padx=20, fill=tk.X)
+
+        self.__check_snippets.pack()
+        self.__label_counter.pack()
+        self.__label_error.pack()
         
-        # Упаковываем canvas и scrollbar
-        self.__canvas.pack(side="left", fill="both", expand=True, padx=30, pady=10)
+        # Упаковываем текстовое поле и scrollbar
+        self.__text_result.pack(side="left", fill="both", expand=True, padx=30, pady=10)
         self.__scrollbar.pack(side="right", fill="y", pady=10)
-        
-        self.__label_result.pack(anchor="w")
-        self.__label_error.pack(pady=10)
-        
-        # Обновляем прокрутку при изменении содержимого
-        self.__scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.__canvas.configure(scrollregion=self.__canvas.bbox("all"))
-        )
     
     def __add_icon(self) -> None:
         """Устанавливает иконку окна.
@@ -187,55 +232,133 @@ class SearchNote(tk.Toplevel):
         self.iconbitmap("static/icons/app.ico")
     
     def __search_by_date(self) -> None:
-        """Выполняет поиск заметок по дате.
+        """Выполняет поиск заметок по дате, дню ("ДД.ММ.ГГГГ") или месяцу ("ММ.ГГГГ").
 
-        Очищает предыдущие результаты, загружает все заметки через JsonState,
-        применяет стратегию SearchByDateStrategy для поиска по дате
-        и отображает результат. Если заметки не найдены, показывает
-        соответствующее сообщение об ошибке.
+        Запускает потоковый вывод результатов стратегии SearchByDateStrategy.
+        Если заметки не найдены, показывает соответствующее сообщение об ошибке.
         """
-        self.__label_error["text"] = ""
-        self.__label_result["text"] = ""
-        notes = self.state.load_notes()
-        
-        strategy = SearchByDateStrategy(self.__entry_word_search.get())
-        if strategy.execute(notes):
-            self.__label_result["text"] += strategy.execute(notes)
-        else:
-            self.__label_error["text"] = "Заметок с такой датой не найдено"
+        self.__run_search(
+            SearchByDateStrategy(self.__entry_word_search.get()),
+            "Заметок с такой датой не найдено"
+        )
     
     def __search_by_title(self) -> None:
         """Выполняет поиск заметок по названию.
 
-        Очищает предыдущие результаты, загружает все заметки через JsonState,
-        применяет стратегию SearchTitleStrategy для поиска по названию
-        и отображает результат. Если заметки не найдены, показывает
-        соответствующее сообщение об ошибке.
+        Запускает потоковый вывод результатов стратегии SearchTitleStrategy.
+        Если заметки не найдены, показывает соответствующее сообщение об ошибке.
         """
-        self.__label_error["text"] = ""
-        self.__label_result["text"] = ""
-        notes = self.state.load_notes()
-        
-        strategy = SearchTitleStrategy(self.__entry_word_search.get())
-        if strategy.execute(notes):
-            self.__label_result["text"] += strategy.execute(notes)
-        else:
-            self.__label_error["text"] = "Заметок с таким ключевым словом не найдено"
+        self.__run_search(
+            SearchTitleStrategy(self.__entry_word_search.get()),
+            "Заметок с таким ключевым словом не найдено"
+        )
     
     def __search_by_keyword(self) -> None:
         """Выполняет поиск заметок по ключевым словам.
 
-        Очищает предыдущие результаты, загружает все заметки через JsonState,
-        применяет стратегию SearchKeywordStrategy для поиска по ключевым словам
-        и отображает результат. Если заметки не найдены, показывает
-        соответствующее сообщение об ошибке.
+        Запускает потоковый вывод результатов стратегии SearchKeywordStrategy.
+        Индекс текстов строится в фоновом потоке приложения; пока он не
+        готов, стратегия перебирает тексты порциями потокового вывода, а
+        не ждет построения в главном потоке.
+        Если заметки не найдены, показывает соответствующее сообщение об ошибке.
+        """
+        self.__run_search(
+            SearchKeywordStrategy(self.__entry_word_search.get(), self.repository.ready_index),
+            "Заметок с таким заданным словом не найдено"
+        )
+
+    def __search_by_tags(self) -> None:
+        """Выполняет поиск заметок по выражению над тегами.
+
+        Запускает потоковый вывод результатов стратегии SearchByTagsStrategy
+        по битовому индексу тегов репозитория: ID находятся операциями над
+        масками, и из репозитория берутся только найденные заметки. Если
+        выражение некорректно или заметки не найдены, показывает сообщение
+        об ошибке.
+        """
+        try:
+            strategy = SearchByTagsStrategy(self.__entry_word_search.get(), self.repository.tags)
+        except ValueError as error:
+            self.__label_error["text"] = str(error)
+            return
+        self.__run_search(strategy, "Заметок с такими тегами не найдено")
+
+    def __run_search(self, strategy: BaseStrategy, empty_message: str) -> None:
+        """Запускает потоковый вывод результатов стратегии.
+
+        Очищает предыдущие результаты и выводит найденные заметки порциями
+        по мере их нахождения, подсвечивая позиции совпадений, вычисленные
+        стратегией. Заметки репозитория перебираются лениво, без
+        предварительного копирования списка (см. __iter_hits).
+
+        Args:
+            strategy: Стратегия поиска для применения к заметкам.
+            empty_message: Сообщение об ошибке, если ничего не найдено.
         """
         self.__label_error["text"] = ""
-        self.__label_result["text"] = ""
-        notes = self.state.load_notes()
-        
-        strategy = SearchKeywordStrategy(self.__entry_word_search.get())
-        if strategy.execute(notes):
-            self.__label_result["text"] += strategy.execute(notes)
-        else:
-            self.__label_error["text"] = "Заметок с таким заданным словом не найдено"
\ No newline at end of file
+        self.__empty_message = empty_message
+        self.__strategy = strategy
+        self.__text_result.snippet_mode = self.__snippet_var.get()
+        self.__stream.start(self.__iter_hits(strategy))
+
+    def __iter_hits(self, strategy: BaseStrategy) -> Iterator[SearchHit]:
+        """Возвращает ленивый перебор совпадений стратегии по репозиторию.
+
+        Если стратегия умеет найти ID по индексу (SearchByTagsStrategy с
+        TagIndex), из репозитория берутся только эти заметки; иначе
+        стратегия перебирает все заметки репозитория.
+
+        Args:
+            strategy: Стратегия поиска.
+
+        Returns:
+            Итератор найденных заметок с позициями совпадений.
+        """
+        ids = strategy.match_ids() if isinstance(strategy, SearchByTagsStrategy) else None
+        if ids is None:
+            return strategy.iter_hits(self.repository.iter_notes())
+        return (SearchHit(note) for note in self.repository.get_notes(ids))
+
+    def __on_notes_changed(self, change: NoteChange) -> None:
+        """Обновляет результаты последнего поиска при изменении заметок.
+
+        Новые заметки проверяются стратегией, и подходящие дописываются
+        к результатам; при изменении или удалении поиск повторяется по
+        заметкам в памяти репозитория.
+
+        Args:
+            change: Дельта изменений заметок.
+        """
+        if self.__strategy is None:
+            return
+        if change.updated or change.deleted:
+            self.__run_search(self.__strategy, self.__empty_message)
+            return
+        added = self.repository.get_notes(change.added)
+        self.__stream.extend(self.__strategy.iter_hits(added))
+
+    def __write_hits(self, hits: List[SearchHit]) -> None:
+        """Дописывает порцию найденных заметок в текстовое поле.
+
+        Args:
+            hits: Найденные заметки с позициями совпадений.
+        """
+        self.__text_result.append_hits(hits, self.__strategy.result_format)
+
+    def __on_destroy(self, event: tk.Event) -> None:
+        """Отписывает окно от репозитория при закрытии.
+
+        Args:
+            event: Событие уничтожения виджета.
+        """
+        if event.widget is self:
+            self.__stream.cancel()
+            self.repository.unsubscribe(self.__on_notes_changed)
+
+    def __on_stream_finish(self, count: int) -> None:
+        """Обрабатывает окончание потокового вывода результатов поиска.
+
+        Args:
+            count: Количество найденных заметок.
+        """
+        self.__label_error["text"] = "" if count else self.__empty_message
\ No newline at end of file
@@ -0,0 +1,272 @@
+"""Модуль окна статистики и хронологии заметок."""
+
+import threading
+import tkinter as tk
+from typing import List, Optional, Tuple
+from core.note_formatter import NoteFormatter, note_formatter
+from state.note_repository import NoteChange, NoteRepository
+
+
+class StatisticsNote(tk.Toplevel):
+    """Окно со статистикой заметок и навигатором по хронологии.
+
+    Сводка (количество заметок, объем текстов, самые частые слова) и
+    гистограммы по месяцам и дням берутся из агрегатов
+    repository.ready_statistics, которые обновляются при каждом
+    изменении, а не подсчитываются по заметкам. Выбор месяца показывает
+    его дни, выбор дня — названия заметок этого дня по списку их ID из
+    статистики. Окно обновляется при изменении заметок.
+
+    Если статистика еще не построена, окно запускает build_statistics в
+    фоновом потоке и, пока она строится, раз в POLL_MS миллисекунд
+    проверяет ее готовность: главный поток не загружает заметки и не
+    читает их тексты.
+
+    Attributes:
+        BAR_WIDTH: Длина самой длинной полосы гистограммы в символах.
+        TOP_TERMS: Количество самых частых слов в сводке.
+        POLL_MS: Интервал проверки готовности статистики в миллисекундах.
+        repository: Общий репозиторий заметок приложения.
+        __summary: Текстовое поле сводки.
+        __navigator: Фрейм со списками месяцев и дней.
+        __months: Список месяцев с гистограммой.
+        __days: Список дней выбранного месяца с гистограммой.
+        __notes: Текстовое поле с названиями заметок выбранного дня.
+        __month_items: Месяцы в порядке строк списка месяцев.
+        __day_items: Дни в порядке строк списка дней.
+        __month: Выбранный месяц или None.
+        __build: Фоновый поток построения статистики или None.
+        __build_error: Ошибка построения статистики или None.
+        __after_id: Идентификатор запланированной проверки готовности.
+    """
+
+    BAR_WIDTH = 30
+    TOP_TERMS = 10
+    POLL_MS = 200
+
+    def __init__(self, parent: tk.Tk, repository: NoteRepository) -> None:
+        """Инициализирует окно статистики.
+
+        Args:
+            parent: Родительское окно Tkinter.
+            repository: Общий репозиторий заметок приложения.
+        """
+        super().__init__(parent)
+        self.repository = repository
+        self.__month_items: List[str] = []
+        self.__day_items: List[str] = []
+        self.__month: Optional[str] = None
+        self.__build: Optional[threading.Thread] = None
+        self.__build_error: Optional[BaseException] = None
+        self.__after_id: Optional[str] = None
+
+        self.__summary: tk.Text
+        self.__navigator: tk.Frame
+        self.__months: tk.Listbox
+        self.__days: tk.Listbox
+        self.__notes: tk.Text
+
+        self.__configure_window()
+        self.__configure_widgets()
+        self.__pack_widgets()
+        self.__add_icon()
+
+        self.repository.subscribe(self.__on_notes_changed)
+        self.bind("<Destroy>", self.__on_destroy)
+        self.__refresh()
+
+    def __configure_window(self) -> None:
+        """Настраивает заголовок, размеры и цвет фона окна."""
+        self.title("Статистика и хронология")
+        self.geometry("820x640")
+        self.configure(bg="#f8f9fa")
+
+    def __configure_widgets(self) -> None:
+        """Создает поле сводки, списки месяцев и дней и поле заметок."""
+        text_style = {
+            "font": ("Courier", 10),
+            "bg": "white",
+            "fg": "#212529",
+            "relief": tk.FLAT,
+        }
+        self.__summary = tk.Text(self, height=8, wrap=tk.WORD, **text_style)
+
+        self.__navigator = tk.Frame(self, bg="#f8f9fa")
+        self.__months = tk.Listbox(
+            self.__navigator, exportselection=False, activestyle="none", **text_style
+        )
+        self.__days = tk.Listbox(
+            self.__navigator, exportselection=False, activestyle="none", **text_style
+        )
+        self.__months.bind("<<ListboxSelect>>", self.__on_month_selected)
+        self.__days.bind("<<ListboxSelect>>", self.__on_day_selected)
+
+        self.__notes = tk.Text(self, height=8, wrap=tk.WORD, **text_style)
+
+    def __pack_widgets(self) -> None:
+        """Размещает виджеты в окне."""
+        self.__summary.pack(fill=tk.X, padx=20, pady=(15, 10))
+        self.__navigator.pack(fill=tk.BOTH, expand=True, padx=20)
+        self.__months.pack(side="left", fill=tk.BOTH, expand=True, padx=(0, 5))
+        self.__days.pack(side="left", fill=tk.BOTH, expand=True, padx=(5, 0))
+        self.__notes.pack(fill=tk.X, padx=20, pady=(10, 20))
+
+    def __add_icon(self) -> None:
+        """Устанавливает иконку окна.
+
+        Raises:
+            tk.TclError: Если формат иконки не поддерживается.
+        """
+        self.iconbitmap("static/icons/app.ico")
+
+    def __refresh(self) -> None:
+        """Перерисовывает сводку и хронологию, сохраняя выбранный месяц.
+
+        Пока статистика строится, показывает сообщение об этом.
+        """
+        statistics = self.repository.ready_statistics
+        if statistics is None:
+            self.__wait_for_statistics()
+            return
+        summary = statistics.summary()
+        period = (
+            f"{summary['first_month']} — {summary['last_month']}"
+            if summary["first_month"] else "нет"
+        )
+        terms = ", ".join(
+            f"{term} ({count})" for term, count in statistics.top_terms(self.TOP_TERMS)
+        )
+        lines = [
+            f"Заметок: {summary['total']}   дней с заметками: {summary['days']}   "
+            f"месяцев: {summary['months']}   период: {period}",
+            f"Текст: {summary['text_chars']} символов, {summary['words']} слов, "
+            f"в среднем {summary['average_text']:.0f} символов на заметку",
+            f"Названия: {summary['title_chars']} символов",
+            f"Частые слова: {terms or 'нет'}",
+        ]
+        if summary["undated"]:
+            lines.append(f"Без разбираемой даты: {summary['undated']}")
+        self.__set_text(self.__summary, "\n".join(lines))
+
+        months = statistics.months()
+        self.__month_items = [month for month, _ in months]
+        self.__fill(self.__months, months)
+        if self.__month in self.__month_items:
+            self.__months.selection_set(self.__month_items.index(self.__month))
+        elif self.__month_items:
+            self.__month = self.__month_items[-1]
+            self.__months.selection_set(len(self.__month_items) - 1)
+            self.__months.see(len(self.__month_items) - 1)
+        else:
+            self.__month = None
+        self.__show_days()
+
+    def __wait_for_statistics(self) -> None:
+        """Запускает построение статистики в фоне и планирует проверку готовности."""
+        if self.__build_error is not None:
+            self.__set_text(self.__summary, f"Не удалось посчитать статистику: {self.__build_error}")
+            return
+        if self.__build is None:
+            self.__build = threading.Thread(target=self.__build_statistics, daemon=True)
+            self.__build.start()
+        self.__set_text(self.__summary, "Статистика считается…")
+        if self.__after_id is None:
+            self.__after_id = self.after(self.POLL_MS, self.__poll)
+
+    def __poll(self) -> None:
+        """Проверяет, готова ли статистика, и перерисовывает окно."""
+        self.__after_id = None
+        self.__refresh()
+
+    def __build_statistics(self) -> None:
+        """Строит статистику репозитория; выполняется в фоновом потоке."""
+        try:
+            self.repository.build_statistics()
+        except Exception as error:
+            self.__build_error = error
+
+    def __show_days(self) -> None:
+        """Заполняет список дней выбранного месяца."""
+        statistics = self.repository.ready_statistics
+        days = statistics.days(self.__month) if statistics is not None and self.__month else []
+        self.__day_items = [day for day, _ in days]
+        self.__fill(self.__days, days)
+
+    def __fill(self, listbox: tk.Listbox, rows: List[Tuple[str, int]]) -> None:
+        """Заполняет список строками с полосами гистограммы.
+
+        Args:
+            listbox: Заполняемый список.
+            rows: Пары (подпись, количество заметок).
+        """
+        peak = max((count for _, count in rows), default=0)
+        listbox.delete(0, tk.END)
+        for label, count in rows:
+            width = max(1, round(count * self.BAR_WIDTH / peak))
+            listbox.insert(tk.END, f"{label:<10} {'█' * width} {count}")
+
+    def __on_month_selected(self, event: tk.Event) -> None:
+        """Показывает дни выбранного месяца.
+
+        Args:
+            event: Событие выбора в списке месяцев.
+        """
+        selection = self.__months.curselection()
+        if not selection:
+            return
+        self.__month = self.__month_items[selection[0]]
+        self.__show_days()
+        self.__set_text(self.__notes, "")
+
+    def __on_day_selected(self, event: tk.Event) -> None:
+        """Показывает названия заметок выбранного дня.
+
+        Заметки дня берутся из репозитория по списку их ID из статистики,
+        без перебора заметок.
+
+        Args:
+            event: Событие выбора в списке дней.
+        """
+        selection = self.__days.curselection()
+        statistics = self.repository.ready_statistics
+        if not selection or statistics is None:
+            return
+        day = self.__day_items[selection[0]]
+        titles = [
+            f"№{note.id}  {note_formatter.render(note, NoteFormatter.TITLE)}"
+            for note in self.repository.get_notes(statistics.day_ids(day))
+        ]
+        self.__set_text(self.__notes, f"{day}:\n" + "\n".join(titles))
+
+    @staticmethod
+    def __set_text(widget: tk.Text, text: str) -> None:
+        """Заменяет содержимое текстового поля только для чтения.
+
+        Args:
+            widget: Текстовое поле.
+            text: Новый текст.
+        """
+        widget.configure(state=tk.NORMAL)
+        widget.delete("1.0", tk.END)
+        widget.insert("1.0", text)
+        widget.configure(state=tk.DISABLED)
+
+    def __on_notes_changed(self, change: NoteChange) -> None:
+        """Обновляет статистику при изменении заметок.
+
+        Args:
+            change: Дельта изменений заметок.
+        """
+        self.__refresh()
+
+    def __on_destroy(self, event: tk.Event) -> None:
+        """Отписывает окно от репозитория и останавливает проверку готовности при закрытии.
+
+        Args:
+            event: Событие уничтожения виджета.
+        """
+        if event.widget is self:
+            self.repository.unsubscribe(self.__on_notes_changed)
+            if self.__after_id is not None:
+                self.after_cancel(self.__after_id)
+                self.__after_id = None
@@ -1,29 +1,31 @@
 """Модуль окна просмотра названий заметок."""
 
 import tkinter as tk
-from state.json_state import JsonState
+from state.note_repository import NoteChange, NoteRepository
 from strategies.view_titles_strategy import SearchTitlesStrategy
+from views.result_stream import ResultStream
 
 
 class TitleNote(tk.Toplevel):
     """Окно для просмотра списка названий всех заметок.
 
     Предоставляет пользовательский интерфейс для отображения только
-    заголовков заметок с возможностью прокрутки длинного списка
-    через Canvas и Scrollbar.
+    заголовков заметок в текстовом поле только для чтения с прокруткой
+    длинного списка через Scrollbar.
 
     Attributes:
         parent: Родительское окно Tkinter.
-        state: Экземпляр JsonState для загрузки данных заметок.
+        repository: Общий репозиторий заметок приложения.
         __button_title: Кнопка для инициации загрузки и отображения названий.
-        __label_title: Метка для отображения списка названий заметок.
+        __text_title: Текстовое поле для отображения списка названий заметок.
         __label_error: Метка для отображения сообщений об ошибках.
-        __canvas: Canvas для создания прокручиваемой области.
+        __label_counter: Метка со счетчиком найденных названий.
+        __stream: Потоковый вывод результатов в текстовое поле названий.
+        __shown: Флаг того, что список названий уже выведен в окно.
         __scrollbar: Вертикальный скроллбар для прокрутки содержимого.
-        __scrollable_frame: Frame внутри Canvas для размещения метки с названиями.
     """
 
-    def __init__(self, parent: tk.Tk) -> None:
+    def __init__(self, parent: tk.Tk, repository: NoteRepository) -> None:
         """Инициализирует окно просмотра названий заметок.
 
         Создает дочернее окно Toplevel, настраивает его параметры,
@@ -31,23 +33,29 @@ class TitleNote(tk.Toplevel):
 
         Args:
             parent: Родительское окно Tkinter.
+            repository: Общий репозиторий заметок приложения.
         """
         super().__init__(parent)
         self.parent = parent
         
-        self.state = JsonState()
+        self.repository = repository
+        self.__shown = False
         
         self.__configure_window()
         self.__configure_widgets()
         self.__pack_widgets()
         self.__add_icon()
+
+        self.repository.subscribe(self.__on_notes_changed)
+        self.bind("<Destroy>", self.__on_destroy)
         
         self.__button_title: tk.Button
-        self.__label_title: tk.Label
+        self.__text_title: tk.Text
         self.__label_error: tk.Label
-        self.__canvas: tk.Canvas
+        self.__label_counter: tk.Label
+        self.__stream: ResultStream
+        self.__shown: bool
         self.__scrollbar: tk.Scrollbar
-        self.__scrollable_frame: tk.Frame
 
     def __configure_window(self) -> None:
         """Настраивает параметры окна просмотра названий заметок.
@@ -61,8 +69,8 @@ class TitleNote(tk.Toplevel):
     def __configure_widgets(self) -> None:
         """Инициализирует и настраивает виджеты окна.
 
-        Создает кнопку просмотра, Canvas с Scrollbar для прокрутки,
-        Frame для размещения метки и саму метку для отображения названий.
+        Создает кнопку просмотра, текстовое поле для отображения названий
+        и Scrollbar для его прокрутки.
         """
         # Кнопка просмотра
         self.__button_title = tk.Button(
@@ -78,25 +86,19 @@ class TitleNote(tk.Toplevel):
             cursor="hand2"
         )
         
-        # Создаём Canvas для прокрутки
-        self.__canvas = tk.Canvas(self, bg="#f8f9fa", highlightthickness=0)
-        self.__scrollbar = tk.Scrollbar(self, orient="vertical", command=self.__canvas.yview)
-        self.__canvas.configure(yscrollcommand=self.__scrollbar.set)
-        
-        # Frame внутри Canvas для размещения метки
-        self.__scrollable_frame = tk.Frame(self.__canvas, bg="#f8f9fa")
-        self.__canvas.create_window((0, 0), window=self.__scrollable_frame, anchor="nw")
-        
-        # Метка теперь внутри scrollable_frame
-        self.__label_title = tk.Label(
-            self.__scrollable_frame,
-            text="", 
+        # Текстовое поле названий с собственной прокруткой
+        self.__text_title = tk.Text(
+            self,
             font=("Arial", 11),
             bg="#f8f9fa",
             fg="#212529",
-            justify=tk.LEFT,
-            wraplength=600
+            relief=tk.FLAT,
+            highlightthickness=0,
+            wrap=tk.WORD,
+            state=tk.DISABLED
         )
+        self.__scrollbar = tk.Scrollbar(self, orient="vertical", command=self.__text_title.yview)
+        self.__text_title.configure(yscrollcommand=self.__scrollbar.set)
         
         # Метка ошибок (остаётся вне прокрутки)
         self.__label_error = tk.Label(
@@ -106,29 +108,36 @@ class TitleNote(tk.Toplevel):
             font=("Arial", 11, "bold"),
             bg="#f8f9fa"
         )
+
+        # Счетчик найденного (обновляется по мере вывода)
+        self.__label_counter = tk.Label(
+            self,
+            text="",
+            font=("Arial", 10),
+            bg="#f8f9fa",
+            fg="#6c757d"
+        )
+
+        self.__stream = ResultStream(
+            self.__text_title,
+            self.__label_counter,
+            on_finish=self.__on_stream_finish
+        )
     
     def __pack_widgets(self) -> None:
         """Размещает виджеты в окне.
 
-        Упаковывает кнопку, Canvas с Scrollbar и метки с заданными отступами
-        и параметрами размещения для обеспечения корректного отображения
-        и функциональности прокрутки.
+        Упаковывает кнопку, метки и текстовое поле со Scrollbar с заданными
+        отступами и параметрами размещения.
         """
         # Центрирование и отступы
-        self.__button_title.pack(pady=(40, 30))
-        
-        # Упаковываем canvas и scrollbar
-        self.__canvas.pack(side="left", fill="both", expand=True, padx=30, pady=10)
-        self.__scrollbar.pack(side="right", fill="y", pady=10)
-        
-        self.__label_title.pack(anchor="w")
+        self.__button_title.pack(pady=(40, 10))
+        self.__label_counter.pack(pady=(0, 10))
         self.__label_error.pack(pady=10)
         
-        # Обновляем прокрутку при изменении содержимого
-        self.__scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.__canvas.configure(scrollregion=self.__canvas.bbox("all"))
-        )
+        # Упаковываем текстовое поле и scrollbar
+        self.__text_title.pack(side="left", fill="both", expand=True, padx=30, pady=10)
+        self.__scrollbar.pack(side="right", fill="y", pady=10)
     
     def __add_icon(self) -> None:
         """Устанавливает иконку окна.
@@ -145,16 +154,47 @@ class TitleNote(tk.Toplevel):
     def __show_title_note(self) -> None:
         """Отображает список названий всех заметок.
 
-        Очищает предыдущие результаты, загружает все заметки через JsonState,
-        применяет стратегию SearchTitlesStrategy для получения только названий
-        и отображает результат. Если заметок нет, показывает соответствующее
-        сообщение об ошибке.
+        Очищает предыдущие результаты и запускает потоковый вывод названий
+        SearchTitlesStrategy по заметкам репозитория, перебираемым лениво.
         """
-        self.__label_title["text"] = ""
         self.__label_error["text"] = ""
+        self.__shown = True
         strategy = SearchTitlesStrategy()
-        notes = self.state.load_notes()
-        if strategy.execute(notes):
-            self.__label_title["text"] += strategy.execute(notes)
-        else:
+        self.__stream.start(strategy.iter_results(self.repository.iter_notes()))
+
+    def __on_notes_changed(self, change: NoteChange) -> None:
+        """Обновляет выведенный список названий при изменении заметок.
+
+        Названия новых заметок дописываются в конец; при изменении или
+        удалении список перестраивается из памяти репозитория.
+
+        Args:
+            change: Дельта изменений заметок.
+        """
+        if not self.__shown:
+            return
+        if change.updated or change.deleted:
+            self.__show_title_note()
+            return
+        self.__label_error["text"] = ""
+        added = self.repository.get_notes(change.added)
+        self.__stream.extend(SearchTitlesStrategy().iter_results(added))
+
+    def __on_destroy(self, event: tk.Event) -> None:
+        """Отписывает окно от репозитория при закрытии.
+
+        Args:
+            event: Событие уничтожения виджета.
+        """
+        if event.widget is self:
+            self.__stream.cancel()
+            self.repository.unsubscribe(self.__on_notes_changed)
+
+    def __on_stream_finish(self, count: int) -> None:
+        """Обрабатывает окончание потокового вывода названий.
+
+        Args:
+            count: Количество выведенных названий.
+        """
+        if not count:
             self.__label_error["text"] = "Список названий пуст"
\ No newline at end of file